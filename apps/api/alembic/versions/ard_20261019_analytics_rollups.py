@@ -0,0 +1,60 @@
+"""Admin analytics daily rollups and retention cohorts.
+
+Revision ID: ard_20261019_analytics_rollups
+Revises: mks_20261019_market_signals
+Create Date: 2026-10-19
+
+Precomputed dashboard numbers — see models/analytics_rollup.py. Tables
+start empty: the admin endpoints roll up any day they read that isn't
+there yet, and backfill_analytics_rollups.py fills history in chunks
+ahead of time so the first 1y view doesn't have to.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'ard_20261019_analytics_rollups'
+down_revision: Union[str, None] = 'mks_20261019_market_signals'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("app", sa.String(20), primary_key=True),
+        sa.Column("metric", sa.String(48), primary_key=True),
+        sa.Column("dimension", sa.String(64), primary_key=True, server_default=""),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "analytics_rollup_days",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "computed_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+    op.create_table(
+        "analytics_retention_cohorts",
+        sa.Column("cohort_month", sa.Date(), primary_key=True),
+        sa.Column("cohort_size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("eligible_day_1", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retained_day_1", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("eligible_day_7", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retained_day_7", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("eligible_day_30", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retained_day_30", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "computed_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_retention_cohorts")
+    op.drop_table("analytics_rollup_days")
+    op.drop_table("analytics_daily")
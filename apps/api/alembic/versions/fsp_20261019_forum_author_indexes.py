@@ -0,0 +1,38 @@
+"""Forum author/created_at indexes.
+
+Revision ID: fsp_20261019_forum_author_indexes
+Revises: rlc_20261019_rate_limit_counters
+Create Date: 2026-10-19
+
+The forum spam rate limit seeds each author's recent-post window with one
+query over threads and posts by author and time (utils/spam_protection.py).
+The author-only indexes found every row the author ever wrote and filtered
+by time; (author_id, created_at) reads just the window. It also serves every
+lookup the author-only indexes did, so they're replaced rather than kept.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'fsp_20261019_forum_author_indexes'
+down_revision: Union[str, None] = 'rlc_20261019_rate_limit_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_forum_threads_author_created", "forum_threads", ["author_id", "created_at"],
+    )
+    op.create_index(
+        "ix_forum_posts_author_created", "forum_posts", ["author_id", "created_at"],
+    )
+    op.drop_index("ix_forum_threads_author", table_name="forum_threads")
+    op.drop_index("ix_forum_posts_author", table_name="forum_posts")
+
+
+def downgrade() -> None:
+    op.create_index("ix_forum_posts_author", "forum_posts", ["author_id"])
+    op.create_index("ix_forum_threads_author", "forum_threads", ["author_id"])
+    op.drop_index("ix_forum_posts_author_created", table_name="forum_posts")
+    op.drop_index("ix_forum_threads_author_created", table_name="forum_threads")
@@ -0,0 +1,89 @@
+"""Composite and partial indexes for the hot query shapes.
+
+Revision ID: idx_20261019_hot_path_indexes
+Revises: ard_20261019_analytics_rollups
+Create Date: 2026-10-19
+
+Each index matches a query the app runs on every screen load, and
+tests/test_query_plans.py checks with EXPLAIN that the endpoint's query
+plans onto it:
+
+  feeding_logs     (invert_id, fed_at)          an animal's log, newest first
+                   (invert_id, fed_at)          last ACCEPTED feeding per animal
+                     WHERE accepted IS TRUE       (feeding status, digest)
+  direct_messages  (conversation_id, created_at) a thread in order
+                   (conversation_id, sender_id) unread counts
+                     WHERE is_read = false
+  inverts          (user_id, created_at)        the active collection
+                     WHERE transferred_out_at IS NULL AND died_at IS NULL
+
+activity_feed already has the composite its feeds need,
+ix_activity_feed_user_created (user_id, created_at DESC) from h5i6j7k8l9m0,
+so nothing is added there.
+
+The single-column indexes whose column now leads a composite one are
+dropped, ix_activity_feed_user included. The composite serves every lookup
+they did, and each index costs on every insert.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'idx_20261019_hot_path_indexes'
+down_revision: Union[str, None] = 'ard_20261019_analytics_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_feeding_logs_invert_id_fed_at", "feeding_logs", ["invert_id", "fed_at"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_feeding_logs_invert_id_accepted_fed_at", "feeding_logs", ["invert_id", "fed_at"],
+        postgresql_where=sa.text("accepted IS TRUE"),
+        if_not_exists=True,
+    )
+    op.drop_index("ix_feeding_logs_invert_id", table_name="feeding_logs", if_exists=True)
+
+    # ix_activity_feed_user_created already covers (user_id, created_at DESC).
+    op.drop_index("ix_activity_feed_user", table_name="activity_feed", if_exists=True)
+
+    op.create_index(
+        "ix_direct_messages_conversation_created_at", "direct_messages",
+        ["conversation_id", "created_at"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_direct_messages_unread", "direct_messages", ["conversation_id", "sender_id"],
+        postgresql_where=sa.text("is_read = false"),
+        if_not_exists=True,
+    )
+    op.drop_index("idx_dm_conversation", table_name="direct_messages", if_exists=True)
+
+    op.create_index(
+        "ix_inverts_user_id_active", "inverts", ["user_id", "created_at"],
+        postgresql_where=sa.text("transferred_out_at IS NULL AND died_at IS NULL"),
+        if_not_exists=True,
+    )
+
+    # Fresh statistics so the planner picks the new indexes straight away
+    # rather than after the next autovacuum.
+    for table in ("feeding_logs", "activity_feed", "direct_messages", "inverts"):
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inverts_user_id_active", table_name="inverts")
+
+    op.create_index("idx_dm_conversation", "direct_messages", ["conversation_id"])
+    op.drop_index("ix_direct_messages_unread", table_name="direct_messages")
+    op.drop_index("ix_direct_messages_conversation_created_at", table_name="direct_messages")
+
+    op.create_index("ix_activity_feed_user", "activity_feed", ["user_id"])
+
+    op.create_index("ix_feeding_logs_invert_id", "feeding_logs", ["invert_id"])
+    op.drop_index("ix_feeding_logs_invert_id_accepted_fed_at", table_name="feeding_logs")
+    op.drop_index("ix_feeding_logs_invert_id_fed_at", table_name="feeding_logs")
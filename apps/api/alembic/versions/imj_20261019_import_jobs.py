@@ -0,0 +1,57 @@
+"""Background collection import jobs.
+
+Revision ID: imj_20261019_import_jobs
+Revises: fcd_20260809_keeper_feeding_cadence
+Create Date: 2026-10-19
+
+A 20k-row breeder spreadsheet can't be committed inside one request, so large
+imports now run as a background job that commits in chunks. This table holds
+the job's progress counters so the client can poll; see models/import_job.py.
+
+No CHECK on status or target, matching animal_events: the API owns the
+vocabulary and the database stays permissive.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = 'imj_20261019_import_jobs'
+down_revision: Union[str, None] = 'fcd_20260809_keeper_feeding_cadence'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("target", sa.String(20), nullable=False, server_default="invert"),
+        sa.Column("filename", sa.String(255), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("processed_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("imported", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped_duplicates", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors", JSONB(), nullable=True),
+        sa.Column("cap_reached", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("failure", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=True,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_import_jobs_user_id", "import_jobs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_user_id", table_name="import_jobs")
+    op.drop_table("import_jobs")
@@ -0,0 +1,92 @@
+"""Keyset pagination indexes, keeper search trigrams, count repair.
+
+Revision ID: kpr_20261019_keyset_pagination
+Revises: idx_20261019_hot_path_indexes
+Create Date: 2026-10-19
+
+The forum thread and post lists and the keeper directory page by cursor
+now (utils/pagination.py). Each cursor key gets the index it walks:
+
+  forum_threads  (category_id, is_pinned, updated_at, id)   recent / pinned
+                 (category_id, view_count, id)              popular
+  forum_posts    (thread_id, created_at, id)                a thread in order
+  users          (created_at, id) WHERE public              keeper directory
+
+Keeper search is a substring ILIKE on three columns, which no btree can
+serve. A pg_trgm GIN index on each lets Postgres combine them for the OR.
+
+The list totals now come from the cached forum_threads.post_count and
+forum_categories.thread_count / post_count rather than a COUNT per
+request. The routers used to update them read-modify-write in Python,
+which lost increments under concurrency, so they are recomputed here once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'kpr_20261019_keyset_pagination'
+down_revision: Union[str, None] = 'idx_20261019_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("username", "display_name", "profile_location")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_forum_threads_category_pinned_updated", "forum_threads",
+        ["category_id", "is_pinned", "updated_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_forum_threads_category_views", "forum_threads", ["category_id", "view_count", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_forum_posts_thread_created", "forum_posts", ["thread_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_users_public_created_at", "users", ["created_at", "id"],
+        postgresql_where=sa.text("collection_visibility = 'public'"),
+        if_not_exists=True,
+    )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_users_{column}_trgm", "users", [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+    op.execute("""
+        UPDATE forum_threads t SET post_count = c.n
+        FROM (
+            SELECT t2.id, count(p.id) AS n
+            FROM forum_threads t2 LEFT JOIN forum_posts p ON p.thread_id = t2.id
+            GROUP BY t2.id
+        ) c
+        WHERE c.id = t.id AND t.post_count IS DISTINCT FROM c.n
+    """)
+    op.execute("""
+        UPDATE forum_categories fc SET thread_count = c.threads, post_count = c.posts
+        FROM (
+            SELECT fc2.id, count(t.id) AS threads, coalesce(sum(t.post_count), 0) AS posts
+            FROM forum_categories fc2 LEFT JOIN forum_threads t ON t.category_id = fc2.id
+            GROUP BY fc2.id
+        ) c
+        WHERE c.id = fc.id
+          AND (fc.thread_count, fc.post_count) IS DISTINCT FROM (c.threads, c.posts)
+    """)
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f"ix_users_{column}_trgm", table_name="users")
+    op.drop_index("ix_users_public_created_at", table_name="users")
+    op.drop_index("ix_forum_posts_thread_created", table_name="forum_posts")
+    op.drop_index("ix_forum_threads_category_views", table_name="forum_threads")
+    op.drop_index("ix_forum_threads_category_pinned_updated", table_name="forum_threads")
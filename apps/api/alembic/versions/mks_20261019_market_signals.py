@@ -0,0 +1,59 @@
+"""Materialized pricing market signals.
+
+Revision ID: mks_20261019_market_signals
+Revises: fsp_20261019_forum_author_indexes
+Create Date: 2026-10-19
+
+One row per (species, life stage, sex group) holding the estimator's
+finished signal, so collection valuation is a join instead of a scoring
+pass per tarantula. See models/market_signal.py. Starts empty: readers
+compute and store any group that is missing or stale, and the daily
+refresh fills the rest.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'mks_20261019_market_signals'
+down_revision: Union[str, None] = 'fsp_20261019_forum_author_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "market_signals",
+        sa.Column(
+            "species_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("species.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("size_category", sa.String(20), primary_key=True),
+        sa.Column("sex_group", sa.String(10), primary_key=True),
+        sa.Column("estimated_low", sa.Numeric(10, 2), nullable=True),
+        sa.Column("estimated_high", sa.Numeric(10, 2), nullable=True),
+        sa.Column("evidence_status", sa.String(32), nullable=False),
+        sa.Column("evidence_quality", sa.String(16), nullable=False),
+        sa.Column("data_points", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("contributor_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("vendor_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("verified_points", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("currency", sa.String(3), nullable=False, server_default="USD"),
+        sa.Column("observation_start", sa.Date(), nullable=True),
+        sa.Column("observation_end", sa.Date(), nullable=True),
+        sa.Column("last_updated", sa.Date(), nullable=True),
+        sa.Column(
+            "limitations", postgresql.JSONB(), nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("computed_on", sa.Date(), nullable=False),
+        sa.Column(
+            "computed_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("market_signals")
@@ -0,0 +1,34 @@
+"""Reference counts for photo objects shared by transfer claims.
+
+Revision ID: pbl_20261019_photo_blobs
+Revises: phv_20261019_photo_variants
+Create Date: 2026-10-19
+
+A claim used to copy every photo object (original, thumbnail, variants)
+to fresh keys, one blocking R2 call after another inside the claim's
+transaction. The buyer's photo rows now point at the seller's objects and
+photo_blobs counts the rows using each shared object, so storage deletes
+one only when the last row goes. Objects without a row have one user; no
+backfill is needed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'pbl_20261019_photo_blobs'
+down_revision: Union[str, None] = 'phv_20261019_photo_variants'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_blobs",
+        sa.Column("url", sa.String(500), primary_key=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("photo_blobs")
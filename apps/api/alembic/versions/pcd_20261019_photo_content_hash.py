@@ -0,0 +1,37 @@
+"""Content hashes for uploaded photos.
+
+Revision ID: pcd_20261019_photo_content_hash
+Revises: pbl_20261019_photo_blobs
+Create Date: 2026-10-19
+
+Every upload got fresh objects, so the same image sent twice (the QR
+flow retrying, a keeper re-adding a photo) was stored, thumbnailed and
+resized twice. An upload's original now gets a photo_blobs row carrying
+the SHA-256 of its bytes; an identical upload shares those objects
+through the reference count instead (services/photo_blobs.py).
+
+Existing photos have no hash and are never matched; nothing is
+backfilled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'pcd_20261019_photo_content_hash'
+down_revision: Union[str, None] = 'pbl_20261019_photo_blobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("photo_blobs", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_photo_blobs_content_hash", "photo_blobs", ["content_hash"],
+        unique=True, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_photo_blobs_content_hash", table_name="photo_blobs", if_exists=True)
+    op.drop_column("photo_blobs", "content_hash")
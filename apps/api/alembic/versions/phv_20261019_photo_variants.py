@@ -0,0 +1,33 @@
+"""Photo dimensions and responsive variants.
+
+Revision ID: phv_20261019_photo_variants
+Revises: kpr_20261019_keyset_pagination
+Create Date: 2026-10-19
+
+Uploads are now resized once to a few responsive widths
+(services/photo_variants.py). The row records the original's width and
+height and the variants as JSONB [{width, height, url}, ...]. Existing
+photos keep nulls and are served as before; nothing is backfilled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'phv_20261019_photo_variants'
+down_revision: Union[str, None] = 'kpr_20261019_keyset_pagination'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("photos", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("photos", sa.Column("height", sa.Integer(), nullable=True))
+    op.add_column("photos", sa.Column("variants", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("photos", "variants")
+    op.drop_column("photos", "height")
+    op.drop_column("photos", "width")
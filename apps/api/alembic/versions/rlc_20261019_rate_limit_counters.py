@@ -0,0 +1,36 @@
+"""Shared rate-limit counters.
+
+Revision ID: rlc_20261019_rate_limit_counters
+Revises: whi_20261019_webhook_inbox
+Create Date: 2026-10-19
+
+Backs the `database://` limiter storage so limits hold across workers and
+instances. UNLOGGED — see models/rate_limit_counter.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'rlc_20261019_rate_limit_counters'
+down_revision: Union[str, None] = 'whi_20261019_webhook_inbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(512), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        "ix_rate_limit_counters_expires_at", "rate_limit_counters", ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_counters_expires_at", table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
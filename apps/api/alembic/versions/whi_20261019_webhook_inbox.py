@@ -0,0 +1,64 @@
+"""Payment webhook inbox.
+
+Revision ID: whi_20261019_webhook_inbox
+Revises: imj_20261019_import_jobs
+Create Date: 2026-10-19
+
+Stripe and Apple webhooks were applied inline, which made acks slow enough
+under renewal bursts for the providers to retry and duplicate work. Verified
+events now land in this table and a worker applies them; see
+models/webhook_event.py for the idempotency and ordering rules.
+
+No CHECK on provider or status, matching import_jobs: the API owns the
+vocabulary and the database stays permissive.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = 'whi_20261019_webhook_inbox'
+down_revision: Union[str, None] = 'imj_20261019_import_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_events",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("provider", sa.String(20), nullable=False),
+        sa.Column("event_id", sa.String(255), nullable=False),
+        sa.Column("event_type", sa.String(100), nullable=False),
+        sa.Column("ordering_key", sa.String(255), nullable=True),
+        sa.Column("payload", JSONB(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "received_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+        sa.Column(
+            "next_attempt_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("provider", "event_id", name="uq_webhook_events_provider_event"),
+    )
+    op.create_index(
+        "ix_webhook_events_pending", "webhook_events", ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_webhook_events_ordering", "webhook_events",
+        ["provider", "ordering_key", "occurred_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_ordering", table_name="webhook_events")
+    op.drop_index("ix_webhook_events_pending", table_name="webhook_events")
+    op.drop_table("webhook_events")
@@ -61,6 +61,13 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: str = ""
     R2_BUCKET_NAME: str = "tarantuverse-photos"
     R2_PUBLIC_URL: str = ""  # e.g., https://pub-xxx.r2.dev
+    # Storage requests in flight at once (services/object_store.py): the R2
+    # connection pool size, and the thread pool size for local files.
+    STORAGE_MAX_CONCURRENCY: int = 8
+    # Originals at least this large go to R2 as a multipart upload, in parts
+    # of STORAGE_PART_SIZE (at least 5 MiB) sent in parallel.
+    STORAGE_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    STORAGE_PART_SIZE: int = 5 * 1024 * 1024
 
     # Email (Resend)
     RESEND_API_KEY: str = ""
@@ -105,6 +112,38 @@ class Settings(BaseSettings):
     NOTION_FEEDBACK_DATABASE_ID: str = ""
     NOTION_METRICS_DATABASE_ID: str = ""
 
+    # Rate limiting (utils/rate_limit.py). memory:// counts per worker process,
+    # so with more than one worker set database:// (Postgres, batched) or
+    # resp://host:6379 (any Redis-protocol server) — see
+    # utils/rate_limit_storage.py for the options each accepts.
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: str = "fixed-window"  # or "sliding-window-counter"
+
+    # Public catalog response cache (utils/response_cache.py). memory:// is
+    # per worker; resp://host:6379 shares entries and invalidations across
+    # workers. Empty disables it.
+    RESPONSE_CACHE_URI: str = "memory://"
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Realtime push fan-out (services/realtime.py). memory:// reaches only
+    # sockets on the publishing worker; database:// fans out over Postgres
+    # LISTEN/NOTIFY so every worker's sockets hear every write.
+    REALTIME_BROKER_URI: str = "memory://"
+
+    # Forum thread views are tallied per process and written in one batched
+    # UPDATE at most this often (services/forum_views.py).
+    FORUM_VIEW_FLUSH_SECONDS: float = 30.0
+
+    # Import and register the routers on a background thread after the
+    # server is up, so a cold container answers / and /health straight away
+    # (utils/startup.py). Other requests wait for the routers.
+    DEFER_ROUTERS: bool = False
+
+    # Per-request SQL instrumentation (utils/query_stats.py). A request over
+    # either threshold is logged as a slow_request record.
+    SLOW_REQUEST_MS: int = 500
+    SLOW_REQUEST_QUERIES: int = 50
+
     # Environment
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -2,89 +2,31 @@
 Tarantuverse API - Main Application Entry Point
 Phase 2C Week 3: Collection Dashboard & Analytics
 """
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import Response
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 import os
-from app.config import settings
-from app.utils.rate_limit import limiter  # shared limiter instance
-import app.routers.auth as auth
-import app.routers.tarantulas as tarantulas
-import app.routers.species as species
-import app.routers.feedings as feedings
-import app.routers.molts as molts
-import app.routers.substrate_changes as substrate_changes
-import app.routers.keepers as keepers
-import app.routers.messages as messages
-import app.routers.photos as photos
-import app.routers.analytics as analytics
-import app.routers.follows as follows
-import app.routers.direct_messages as direct_messages
-import app.routers.forums as forums
-import app.routers.activity as activity
-import app.routers.subscriptions as subscriptions
-import app.routers.pairings as pairings
-import app.routers.egg_sacs as egg_sacs
-import app.routers.offspring as offspring
-import app.routers.notification_preferences as notification_preferences
-import app.routers.notifications as notifications
-import app.routers.import_export as import_export
-import app.routers.admin as admin
-import app.routers.admin_analytics as admin_analytics
-import app.routers.notion as notion
-import app.routers.promo_codes as promo_codes
-import app.routers.user_blocks as user_blocks
-import app.routers.content_reports as content_reports
-import app.routers.pricing as pricing
-import app.routers.theme_preferences as theme_preferences
-import app.routers.enclosures as enclosures
-import app.routers.referrals as referrals
-import app.routers.announcements as announcements
-import app.routers.system_settings as system_settings
-import app.routers.premolt as premolt
-import app.routers.achievements as achievements
-import app.routers.search as search
-import app.routers.discover as discover
-import app.routers.qr as qr
-import app.routers.transfers as transfers
-import app.routers.feeder_species as feeder_species
-import app.routers.feeder_colonies as feeder_colonies
-import app.routers.hv_feeder_species as hv_feeder_species
-import app.routers.hv_feeder_stocks as hv_feeder_stocks
-import app.routers.colonies as colonies  # ADR-010 pet colony mode
-import app.routers.animal_events as animal_events  # ADR-015 per-animal events
-import app.routers.species_shortlist as species_shortlist  # care-sheet bookmarks
-import app.routers.waitlist as waitlist
-import app.routers.animals as animals  # Herpetoverse — unified taxon table (ADR-003)
-import app.routers.sheds as sheds  # Herpetoverse v1
-import app.routers.genes as genes  # Herpetoverse v1 — morph catalog
-import app.routers.reptile_species as reptile_species  # Herpetoverse v1
-import app.routers.animal_genotypes as animal_genotypes  # Herpetoverse v1
-import app.routers.weight_logs as weight_logs  # Herpetoverse v1 — Sprint 5
-import app.routers.reptile_pairings as reptile_pairings  # Herpetoverse breeding
-import app.routers.clutches as clutches  # Herpetoverse breeding
-import app.routers.reptile_offspring as reptile_offspring  # Herpetoverse breeding
-# Scorpion expansion v1 (scp_20260522) — TV gets a sibling taxon.
-import app.routers.scorpions as scorpions
-import app.routers.scorpion_species as scorpion_species
-import app.routers.scorpion_colonies as scorpion_colonies
-# Inverts consolidation v1 (inv_20260527, ADR-005) — unified per-animal
-# surface. New tables are empty until backfill (Phase B). Old per-taxon
-# routes keep working unchanged until the read cutover (Phase C1).
-import app.routers.inverts as inverts
-import app.routers.invert_species as invert_species
-# Centipedes launch on the consolidated surface (ADR-005 Phase C2).
-# No legacy centipedes table — these routers read/write Invert with
-# taxon='centipede' directly.
-import app.routers.centipedes as centipedes
-import app.routers.centipede_species as centipede_species
-# Whip spiders (ADR-006 taxon #1) — also launch directly on `inverts`
-# with taxon='whip_spider'. No legacy table, no dual-write.
-import app.routers.whip_spiders as whip_spiders
-import app.routers.whip_spider_species as whip_spider_species
+
+from app.utils.startup import (
+    DeferredRouters,
+    RouterGate,
+    RouterSpec,
+    StartupTimer,
+    include_routers,
+)
+
+# Phases are logged as they finish and kept on app.state.startup — see
+# utils/startup.py.
+timer = StartupTimer()
+
+with timer.phase("framework"):
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.responses import Response
+    from slowapi import _rate_limit_exceeded_handler
+    from slowapi.errors import RateLimitExceeded
+    from app.config import settings
+    from app.utils.rate_limit import limiter  # shared limiter instance
+    from app.utils.response_cache import ResponseCacheMiddleware
+    from app.utils import query_stats
 
 app = FastAPI(
     title="Tarantuverse API",
@@ -99,6 +41,11 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Public catalog response cache (species, genes, feeders, plans…). Added
+# before CORS so it sits inside it and cached responses still get CORS
+# headers. See utils/response_cache.py.
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configure CORS
 # Automatically include both www and non-www versions of each origin
 cors_origins = settings.CORS_ORIGINS if settings.CORS_ORIGINS else ["*"]
@@ -114,8 +61,6 @@ for origin in cors_origins:
         non_www_version = origin.replace("https://www.", "https://")
         expanded_cors_origins.append(non_www_version)
 
-print(f"[STARTUP] CORS Origins configured: {expanded_cors_origins}")
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=expanded_cors_origins,
@@ -131,7 +76,7 @@ app.add_middleware(
         "X-Requested-With",
         "X-Request-ID",
     ],
-    expose_headers=["X-Request-ID"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor"],
     max_age=3600,
 )
 
@@ -191,185 +136,121 @@ async def maintenance_middleware(request: Request, call_next):
 
     return await call_next(request)
 
-# Include routers
-print("[STARTUP] Registering auth router...")
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-
-print("[STARTUP] Registering tarantulas router...")
-print(f"[STARTUP] Tarantulas router routes: {[route.path for route in tarantulas.router.routes]}")
-print(f"[STARTUP] Tarantulas router methods: {[(route.path, route.methods) for route in tarantulas.router.routes]}")
-app.include_router(tarantulas.router, prefix="/api/v1/tarantulas", tags=["tarantulas"])
-
-print("[STARTUP] Registering species router...")
-app.include_router(species.router, prefix="/api/v1/species", tags=["species"])
-
-print("[STARTUP] Registering feedings router...")
-app.include_router(feedings.router, prefix="/api/v1", tags=["feedings"])
-
-print("[STARTUP] Registering molts router...")
-app.include_router(molts.router, prefix="/api/v1", tags=["molts"])
-
-print("[STARTUP] Registering substrate changes router...")
-app.include_router(substrate_changes.router, prefix="/api/v1", tags=["substrate_changes"])
-
-print("[STARTUP] Registering keepers/community router...")
-app.include_router(keepers.router, prefix="/api/v1/keepers", tags=["keepers", "community"])
-
-print("[STARTUP] Registering messages/board router...")
-app.include_router(messages.router, prefix="/api/v1/messages", tags=["messages", "community"])
-
-print("[STARTUP] Registering photos router...")
-app.include_router(photos.router, prefix="/api/v1", tags=["photos"])
-
-print("[STARTUP] Registering analytics router...")
-app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["analytics"])
-
-print("[STARTUP] Registering follows router...")
-app.include_router(follows.router, tags=["follows", "community"])
-
-print("[STARTUP] Registering direct messages router...")
-app.include_router(direct_messages.router, tags=["direct_messages", "community"])
-
-print("[STARTUP] Registering forums router...")
-app.include_router(forums.router, tags=["forums", "community"])
-
-print("[STARTUP] Registering activity feed router...")
-app.include_router(activity.router, tags=["activity", "community"])
-
-print("[STARTUP] Registering subscriptions router...")
-app.include_router(subscriptions.router, prefix="/api/v1", tags=["subscriptions"])
-
-print("[STARTUP] Registering pairings router...")
-app.include_router(pairings.router, prefix="/api/v1", tags=["pairings", "breeding"])
-
-print("[STARTUP] Registering egg sacs router...")
-app.include_router(egg_sacs.router, prefix="/api/v1", tags=["egg_sacs", "breeding"])
-
-print("[STARTUP] Registering offspring router...")
-app.include_router(offspring.router, prefix="/api/v1", tags=["offspring", "breeding"])
-
-# Registering notification preferences router...
-app.include_router(notification_preferences.router, prefix="/api/v1", tags=["notifications"])
-app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["notifications"])
-
-print("[STARTUP] Registering import/export router...")
-app.include_router(import_export.router, prefix="/api/v1", tags=["import-export"])
-
-print("[STARTUP] Registering admin router...")
-app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
-
-print("[STARTUP] Registering admin analytics router...")
-app.include_router(admin_analytics.router, prefix="/api/v1", tags=["admin-analytics"])
-app.include_router(notion.router, prefix="/api/v1/notion", tags=["notion"])
-
-print("[STARTUP] Registering promo codes router...")
-app.include_router(promo_codes.router, prefix="/api/v1/promo-codes", tags=["promo_codes", "premium"])
-
-print("[STARTUP] Registering user blocks router...")
-app.include_router(user_blocks.router, prefix="/api/v1", tags=["blocks", "moderation"])
-
-print("[STARTUP] Registering content reports router...")
-app.include_router(content_reports.router, prefix="/api/v1", tags=["reports", "moderation"])
-
-print("[STARTUP] Registering pricing router...")
-app.include_router(pricing.router, prefix="/api/v1", tags=["pricing", "valuation"])
-
-print("[STARTUP] Registering theme preferences router...")
-app.include_router(theme_preferences.router, prefix="/api/v1", tags=["theme", "customization"])
-
-print("[STARTUP] Registering enclosures router...")
-app.include_router(enclosures.router, prefix="/api/v1/enclosures", tags=["enclosures", "communal"])
-
-print("[STARTUP] Registering referrals router...")
-app.include_router(referrals.router, prefix="/api/v1", tags=["referrals", "premium"])
-
-print("[STARTUP] Registering announcements router...")
-app.include_router(announcements.router, prefix="/api/v1/announcements", tags=["announcements"])
-
-print("[STARTUP] Registering system settings router...")
-app.include_router(system_settings.router, prefix="/api/v1", tags=["system-settings"])
-
-print("[STARTUP] Registering premolt prediction router...")
-app.include_router(premolt.router, prefix="/api/v1/premolt", tags=["premolt", "analytics"])
-
-print("[STARTUP] Registering achievements router...")
-app.include_router(achievements.router, prefix="/api/v1", tags=["achievements", "gamification"])
-
-print("[STARTUP] Registering global search router...")
-app.include_router(search.router, prefix="/api/v1", tags=["search"])
-
-print("[STARTUP] Registering discover router...")
-app.include_router(discover.router, prefix="/api/v1", tags=["discover", "community"])
-app.include_router(qr.router, prefix="/api/v1", tags=["qr", "identity"])
-app.include_router(transfers.router, prefix="/api/v1", tags=["transfers", "provenance"])
-
-print("[STARTUP] Registering feeder routers...")
-app.include_router(feeder_species.router, prefix="/api/v1/feeder-species", tags=["feeders"])
-app.include_router(feeder_colonies.router, prefix="/api/v1/feeder-colonies", tags=["feeders"])
-app.include_router(hv_feeder_species.router, prefix="/api/v1/hv-feeder-species", tags=["herpetoverse", "feeders"])
-app.include_router(hv_feeder_stocks.router, prefix="/api/v1/hv-feeder-stocks", tags=["herpetoverse", "feeders"])
-app.include_router(colonies.router, prefix="/api/v1/colonies", tags=["colonies"])
-# Mounted at the bare /api/v1 because its routes already carry their own
-# resource prefixes — one router serves both /inverts/{id}/events and
-# /animals/{id}/events, since the concept is identical across the two products.
-app.include_router(animal_events.router, prefix="/api/v1", tags=["events"])
-app.include_router(species_shortlist.router, prefix="/api/v1/species-shortlist", tags=["species"])
-
-print("[STARTUP] Registering waitlist router...")
-app.include_router(waitlist.router, prefix="/api/v1", tags=["waitlist", "public"])
-
-print("[STARTUP] Registering animals router (Herpetoverse — ADR-003)...")
-app.include_router(animals.router, prefix="/api/v1/animals", tags=["animals", "herpetoverse"])
-
-print("[STARTUP] Registering sheds router (Herpetoverse v1)...")
-app.include_router(sheds.router, prefix="/api/v1", tags=["sheds", "herpetoverse"])
-
-# Morph catalog + welfare data for the breeding calculator (Sprint 4)
-app.include_router(genes.router, prefix="/api/v1/genes", tags=["genes", "herpetoverse"])
-app.include_router(reptile_species.router, prefix="/api/v1/reptile-species", tags=["reptile_species", "herpetoverse"])
-# animal_genotypes routes are nested under /snakes/{id}/genotype — keep the generic /api/v1 prefix
-app.include_router(animal_genotypes.router, prefix="/api/v1", tags=["animal_genotypes", "herpetoverse"])
-
-# Sprint 5 — standalone weigh-ins + feeding advisory. Routes include both
-# /snakes/{id}/weight-logs/* and /weight-logs/{id}, so keep the /api/v1 prefix.
-print("[STARTUP] Registering weight logs router (Herpetoverse v1 Sprint 5)...")
-app.include_router(weight_logs.router, prefix="/api/v1", tags=["weight_logs", "herpetoverse"])
-
-# Reptile breeding records — pairings + clutches + offspring. Pairings
-# router prefixes with /reptile-pairings; clutches + offspring use bare
-# /api/v1 because their routes mount at multiple roots
-# (/reptile-pairings/.../clutches, /clutches/{id}, etc.)
-print("[STARTUP] Registering reptile breeding routers (pairings/clutches/offspring)...")
-app.include_router(reptile_pairings.router, prefix="/api/v1/reptile-pairings", tags=["reptile_breeding", "herpetoverse"])
-app.include_router(clutches.router, prefix="/api/v1", tags=["reptile_breeding", "herpetoverse"])
-app.include_router(reptile_offspring.router, prefix="/api/v1", tags=["reptile_breeding", "herpetoverse"])
+# Per-request SQL statement counts and DB time: a Server-Timing header outside
+# production and a slow_request log record over the thresholds. Added after
+# the others so it wraps them. See utils/query_stats.py.
+query_stats.install()
+app.add_middleware(query_stats.QueryStatsMiddleware)
+
+# Include routers. Order is match order. Each module is imported as its entry
+# is reached, so a router's import time is its own.
+ROUTERS = (
+    RouterSpec("auth", "/api/v1/auth", ("auth",)),
+    RouterSpec("tarantulas", "/api/v1/tarantulas", ("tarantulas",)),
+    RouterSpec("species", "/api/v1/species", ("species",)),
+    RouterSpec("feedings", "/api/v1", ("feedings",)),
+    RouterSpec("molts", "/api/v1", ("molts",)),
+    RouterSpec("substrate_changes", "/api/v1", ("substrate_changes",)),
+    RouterSpec("keepers", "/api/v1/keepers", ("keepers", "community")),
+    RouterSpec("messages", "/api/v1/messages", ("messages", "community")),
+    RouterSpec("photos", "/api/v1", ("photos",)),
+    RouterSpec("analytics", "/api/v1/analytics", ("analytics",)),
+    RouterSpec("follows", "", ("follows", "community")),
+    RouterSpec("direct_messages", "", ("direct_messages", "community")),
+    RouterSpec("forums", "", ("forums", "community")),
+    RouterSpec("activity", "", ("activity", "community")),
+    RouterSpec("subscriptions", "/api/v1", ("subscriptions",)),
+    RouterSpec("pairings", "/api/v1", ("pairings", "breeding")),
+    RouterSpec("egg_sacs", "/api/v1", ("egg_sacs", "breeding")),
+    RouterSpec("offspring", "/api/v1", ("offspring", "breeding")),
+    RouterSpec("notification_preferences", "/api/v1", ("notifications",)),
+    RouterSpec("notifications", "/api/v1/notifications", ("notifications",)),
+    RouterSpec("realtime", "/api/v1/realtime", ("realtime", "notifications")),
+    RouterSpec("import_export", "/api/v1", ("import-export",)),
+    RouterSpec("admin", "/api/v1/admin", ("admin",)),
+    RouterSpec("admin_analytics", "/api/v1", ("admin-analytics",)),
+    RouterSpec("admin_analytics", "/api/v1", ("admin-analytics",), attr="cron_router"),
+    RouterSpec("notion", "/api/v1/notion", ("notion",)),
+    RouterSpec("promo_codes", "/api/v1/promo-codes", ("promo_codes", "premium")),
+    RouterSpec("user_blocks", "/api/v1", ("blocks", "moderation")),
+    RouterSpec("content_reports", "/api/v1", ("reports", "moderation")),
+    RouterSpec("pricing", "/api/v1", ("pricing", "valuation")),
+    RouterSpec("theme_preferences", "/api/v1", ("theme", "customization")),
+    RouterSpec("enclosures", "/api/v1/enclosures", ("enclosures", "communal")),
+    RouterSpec("referrals", "/api/v1", ("referrals", "premium")),
+    RouterSpec("announcements", "/api/v1/announcements", ("announcements",)),
+    RouterSpec("system_settings", "/api/v1", ("system-settings",)),
+    RouterSpec("premolt", "/api/v1/premolt", ("premolt", "analytics")),
+    RouterSpec("achievements", "/api/v1", ("achievements", "gamification")),
+    RouterSpec("search", "/api/v1", ("search",)),
+    RouterSpec("discover", "/api/v1", ("discover", "community")),
+    RouterSpec("qr", "/api/v1", ("qr", "identity")),
+    RouterSpec("transfers", "/api/v1", ("transfers", "provenance")),
+    RouterSpec("feeder_species", "/api/v1/feeder-species", ("feeders",)),
+    RouterSpec("feeder_colonies", "/api/v1/feeder-colonies", ("feeders",)),
+    RouterSpec("hv_feeder_species", "/api/v1/hv-feeder-species", ("herpetoverse", "feeders")),
+    RouterSpec("hv_feeder_stocks", "/api/v1/hv-feeder-stocks", ("herpetoverse", "feeders")),
+    RouterSpec("colonies", "/api/v1/colonies", ("colonies",)),  # ADR-010 pet colony mode
+    # Mounted at the bare /api/v1 because its routes already carry their own
+    # resource prefixes — one router serves both /inverts/{id}/events and
+    # /animals/{id}/events, since the concept is identical across the two products.
+    RouterSpec("animal_events", "/api/v1", ("events",)),  # ADR-015 per-animal events
+    RouterSpec("species_shortlist", "/api/v1/species-shortlist", ("species",)),  # care-sheet bookmarks
+    RouterSpec("waitlist", "/api/v1", ("waitlist", "public")),
+    # Herpetoverse — unified taxon table (ADR-003)
+    RouterSpec("animals", "/api/v1/animals", ("animals", "herpetoverse")),
+    RouterSpec("sheds", "/api/v1", ("sheds", "herpetoverse")),
+    # Morph catalog + welfare data for the breeding calculator (Sprint 4)
+    RouterSpec("genes", "/api/v1/genes", ("genes", "herpetoverse")),
+    RouterSpec("reptile_species", "/api/v1/reptile-species", ("reptile_species", "herpetoverse")),
+    # animal_genotypes routes are nested under /snakes/{id}/genotype — keep the generic /api/v1 prefix
+    RouterSpec("animal_genotypes", "/api/v1", ("animal_genotypes", "herpetoverse")),
+    # Sprint 5 — standalone weigh-ins + feeding advisory. Routes include both
+    # /snakes/{id}/weight-logs/* and /weight-logs/{id}, so keep the /api/v1 prefix.
+    RouterSpec("weight_logs", "/api/v1", ("weight_logs", "herpetoverse")),
+    # Reptile breeding records — pairings + clutches + offspring. Pairings
+    # router prefixes with /reptile-pairings; clutches + offspring use bare
+    # /api/v1 because their routes mount at multiple roots
+    # (/reptile-pairings/.../clutches, /clutches/{id}, etc.)
+    RouterSpec("reptile_pairings", "/api/v1/reptile-pairings", ("reptile_breeding", "herpetoverse")),
+    RouterSpec("clutches", "/api/v1", ("reptile_breeding", "herpetoverse")),
+    RouterSpec("reptile_offspring", "/api/v1", ("reptile_breeding", "herpetoverse")),
+    # Scorpion expansion v1 (scp_20260522) — per-animal CRUD, public catalog,
+    # and colony grouping layer for communal setups. Breeding (broods) ships
+    # in Phase 5.
+    RouterSpec("scorpions", "/api/v1/scorpions", ("scorpions",)),
+    RouterSpec("scorpion_species", "/api/v1/scorpion-species", ("scorpion_species",)),
+    RouterSpec("scorpion_colonies", "/api/v1/scorpion-colonies", ("scorpion_colonies",)),
+    # Inverts consolidation (inv_20260527, ADR-005). Additive in Phase A1 —
+    # these routes serve the new tables, the legacy /tarantulas/ and
+    # /scorpions/ routes keep serving the old tables. Read cutover at Phase C1.
+    RouterSpec("inverts", "/api/v1/inverts", ("inverts",)),
+    RouterSpec("invert_species", "/api/v1/invert-species", ("invert_species",)),
+    # Centipedes (ADR-005 Phase C2) — per-taxon facade over inverts WHERE
+    # taxon='centipede'. No legacy table; this is the first taxon launched
+    # directly on the consolidated surface.
+    RouterSpec("centipedes", "/api/v1/centipedes", ("centipedes",)),
+    RouterSpec("centipede_species", "/api/v1/centipede-species", ("centipede_species",)),
+    # Whip spiders (ADR-006 taxon #1) — per-taxon facade over inverts WHERE
+    # taxon='whip_spider'. No legacy table; same shape as centipedes.
+    RouterSpec("whip_spiders", "/api/v1/whip-spiders", ("whip_spiders",)),
+    RouterSpec("whip_spider_species", "/api/v1/whip-spider-species", ("whip_spider_species",)),
+)
 
-# Scorpion expansion v1 — per-animal CRUD, public catalog, and colony
-# grouping layer for communal setups. Breeding (broods) ships in Phase 5.
-print("[STARTUP] Registering scorpion routers (scorpions/species/colonies)...")
-app.include_router(scorpions.router, prefix="/api/v1/scorpions", tags=["scorpions"])
-app.include_router(scorpion_species.router, prefix="/api/v1/scorpion-species", tags=["scorpion_species"])
-app.include_router(scorpion_colonies.router, prefix="/api/v1/scorpion-colonies", tags=["scorpion_colonies"])
 
-# Inverts consolidation (ADR-005). Additive in Phase A1 — these routes
-# serve the new tables, the legacy /tarantulas/ and /scorpions/ routes
-# keep serving the old tables. Read cutover at Phase C1.
-print("[STARTUP] Registering inverts routers (consolidation Phase A1)...")
-app.include_router(inverts.router, prefix="/api/v1/inverts", tags=["inverts"])
-app.include_router(invert_species.router, prefix="/api/v1/invert-species", tags=["invert_species"])
+def _register_routers() -> None:
+    with timer.phase("routers"):
+        include_routers(app, ROUTERS, timer)
+    timer.finish(len(app.routes))
 
-# Centipedes (ADR-005 Phase C2) — per-taxon facade over inverts WHERE
-# taxon='centipede'. No legacy table; this is the first taxon launched
-# directly on the consolidated surface.
-print("[STARTUP] Registering centipede routers (Phase C2)...")
-app.include_router(centipedes.router, prefix="/api/v1/centipedes", tags=["centipedes"])
-app.include_router(centipede_species.router, prefix="/api/v1/centipede-species", tags=["centipede_species"])
 
-# Whip spiders (ADR-006 taxon #1) — per-taxon facade over inverts WHERE
-# taxon='whip_spider'. No legacy table; same shape as centipedes.
-print("[STARTUP] Registering whip spider routers (ADR-006 taxon #1)...")
-app.include_router(whip_spiders.router, prefix="/api/v1/whip-spiders", tags=["whip_spiders"])
-app.include_router(whip_spider_species.router, prefix="/api/v1/whip-spider-species", tags=["whip_spider_species"])
+app.state.startup = timer
+if settings.DEFER_ROUTERS:
+    deferred_routers = DeferredRouters(_register_routers)
+    app.add_middleware(RouterGate, deferred=deferred_routers)
+    deferred_routers.start()
+else:
+    _register_routers()
 
 # Mount static files for uploaded photos
 uploads_dir = "uploads"
@@ -377,13 +258,6 @@ os.makedirs(uploads_dir, exist_ok=True)
 os.makedirs(os.path.join(uploads_dir, "photos"), exist_ok=True)
 os.makedirs(os.path.join(uploads_dir, "thumbnails"), exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
-print("[STARTUP] Mounted /uploads static files directory")
-
-print("[STARTUP] All routers registered successfully!")
-print(f"[STARTUP] Total app routes: {len(app.routes)}")
-for route in app.routes:
-    if hasattr(route, 'methods') and hasattr(route, 'path'):
-        print(f"[STARTUP]   {route.methods} {route.path}")
 
 
 @app.get("/")
@@ -424,4 +298,5 @@ async def health_check():
     return {
         "status": "healthy",
         "database": db_status,
+        "startup": timer.summary(),
     }
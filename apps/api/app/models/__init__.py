@@ -83,6 +83,28 @@ from app.models.species_shortlist import SpeciesShortlist
 # Per-animal event log (ADR-015). Depends on Invert + Animal above (FK targets).
 from app.models.animal_event import AnimalEvent
 
+# Background collection imports (imj_20261019) — progress for chunked commits.
+from app.models.import_job import ImportJob
+
+# Payment webhook inbox (whi_20261019) — verified events awaiting the worker.
+from app.models.webhook_event import WebhookEvent
+
+# Shared rate-limit counters (rlc_20261019) — the `database://` limiter storage.
+from app.models.rate_limit_counter import RateLimitCounter
+
+# Materialized pricing market signals (mks_20261019) — valuation reads these.
+from app.models.market_signal import MarketSignalSnapshot
+
+# Admin analytics rollups (ard_20261019) — the dashboard reads these.
+from app.models.analytics_rollup import (
+    AnalyticsDaily,
+    AnalyticsRetentionCohort,
+    AnalyticsRollupDay,
+)
+
+# Shared photo object reference counts (pbl_20261019) — transfer claims.
+from app.models.photo_blob import PhotoBlob
+
 __all__ = [
     "User",
     "Tarantula",
@@ -147,4 +169,12 @@ __all__ = [
     "Colony",
     "ColonyEvent",
     "SpeciesShortlist",
+    "ImportJob",
+    "WebhookEvent",
+    "RateLimitCounter",
+    "MarketSignalSnapshot",
+    "AnalyticsDaily",
+    "AnalyticsRollupDay",
+    "AnalyticsRetentionCohort",
+    "PhotoBlob",
 ]
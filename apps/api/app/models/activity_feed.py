@@ -1,7 +1,7 @@
 """
 Activity feed model for tracking user actions
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,8 +10,18 @@ from app.database import Base
 
 class ActivityFeed(Base):
     __tablename__ = "activity_feed"
+    __table_args__ = (
+        # One keeper's activity and the followed feed, newest first
+        # (h5i6j7k8l9m0); the global feed walks _created.
+        Index(
+            "ix_activity_feed_user_created", "user_id", "created_at",
+            postgresql_ops={"created_at": "DESC"},
+        ),
+        Index("ix_activity_feed_created", "created_at"),
+        Index("ix_activity_feed_action_type", "action_type"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     action_type = Column(String(50), nullable=False)
     # Action types: 'new_tarantula', 'molt', 'feeding', 'follow', 'forum_thread', 'forum_post'
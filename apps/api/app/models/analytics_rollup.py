@@ -0,0 +1,62 @@
+"""Precomputed admin analytics (services/analytics_rollups.py).
+
+The admin dashboard used to answer every load with date-grouped scans over
+users, activity_feed, feeding/molt logs, forum posts, messages and follows,
+plus three COUNT(DISTINCT … IN (…ids…)) queries per retention cohort.
+These tables hold the answers instead:
+
+  analytics_daily           one count per (day, app, metric, dimension) —
+                            e.g. (2026-10-18, herpetoverse, feedings, "")
+                            or (2026-10-18, all, new_users, "google")
+  analytics_rollup_days     which days analytics_daily covers and when each
+                            was computed; a day with no activity has no
+                            metric rows, so coverage can't be read off them
+  analytics_retention_cohorts
+                            per signup month: cohort size and, for day 1, 7
+                            and 30, how many members were active that day
+                            after their own signup and how many have reached
+                            it yet
+
+Days are UTC calendar days.
+"""
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class AnalyticsDaily(Base):
+    __tablename__ = "analytics_daily"
+
+    day = Column(Date, primary_key=True)
+    app = Column(String(20), primary_key=True)  # tarantuverse, herpetoverse, all
+    metric = Column(String(48), primary_key=True)
+    dimension = Column(String(64), primary_key=True, default="")
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AnalyticsDaily {self.day} {self.app}/{self.metric}/{self.dimension}={self.value}>"
+
+
+class AnalyticsRollupDay(Base):
+    __tablename__ = "analytics_rollup_days"
+
+    day = Column(Date, primary_key=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AnalyticsRetentionCohort(Base):
+    __tablename__ = "analytics_retention_cohorts"
+
+    cohort_month = Column(Date, primary_key=True)  # first of the month
+    cohort_size = Column(Integer, nullable=False, default=0)
+    eligible_day_1 = Column(Integer, nullable=False, default=0)
+    retained_day_1 = Column(Integer, nullable=False, default=0)
+    eligible_day_7 = Column(Integer, nullable=False, default=0)
+    retained_day_7 = Column(Integer, nullable=False, default=0)
+    eligible_day_30 = Column(Integer, nullable=False, default=0)
+    retained_day_30 = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AnalyticsRetentionCohort {self.cohort_month} n={self.cohort_size}>"
@@ -3,7 +3,7 @@ AnimalTransfer — seller→buyer record handoff ("rehome").
 
 BRIEF-animal-transfer-provenance. A seller generates a claim link/QR for an
 animal they own; the buyer claims it and gets a NEW invert pre-loaded with
-species, provenance, and copied photos. The seller's source record is badged
+species, provenance, and the seller's photos. The seller's source record is badged
 "Transferred" (see Invert.transferred_out_at) and drops out of their active
 collection counts/cap/reminders.
 
@@ -1,7 +1,7 @@
 """
 Direct messaging models for private conversations between users
 """
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Text, Index
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -49,9 +49,14 @@ class DirectMessage(Base):
     conversation = relationship("Conversation", back_populates="messages")
     sender = relationship("User", foreign_keys=[sender_id])
 
-    # Indexes
+    # Indexes. A thread in order, and the unread counts the bell polls
+    # (idx_20261019_hot_path_indexes).
     __table_args__ = (
-        Index('idx_dm_conversation', 'conversation_id'),
+        Index('ix_direct_messages_conversation_created_at', 'conversation_id', 'created_at'),
+        Index(
+            'ix_direct_messages_unread', 'conversation_id', 'sender_id',
+            postgresql_where=text('is_read = false'),
+        ),
         Index('idx_dm_sender', 'sender_id'),
     )
 
@@ -1,7 +1,7 @@
 """
 Feeding log model
 """
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Numeric, Text, CheckConstraint
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Numeric, Text, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
@@ -27,6 +27,13 @@ class FeedingLog(Base):
             'AND num_nonnulls(invert_id, colony_id) = 1)',
             name='feeding_logs_must_have_exactly_one_parent',
         ),
+        # Hot query shapes (idx_20261019_hot_path_indexes): an animal's log
+        # newest-first, and its last ACCEPTED feeding (feeding status, digest).
+        Index('ix_feeding_logs_invert_id_fed_at', 'invert_id', 'fed_at'),
+        Index(
+            'ix_feeding_logs_invert_id_accepted_fed_at', 'invert_id', 'fed_at',
+            postgresql_where=text('accepted IS TRUE'),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -61,7 +68,6 @@ class FeedingLog(Base):
         UUID(as_uuid=True),
         ForeignKey("inverts.id", ondelete="CASCADE"),
         nullable=True,
-        index=True,
     )
 
     fed_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,7 +1,7 @@
 """
 Forum models for community discussions
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -28,6 +28,14 @@ class ForumCategory(Base):
 
 class ForumThread(Base):
     __tablename__ = "forum_threads"
+    __table_args__ = (
+        # Seeding the spam rate limit's per-author window (utils/spam_protection.py).
+        Index("ix_forum_threads_author_created", "author_id", "created_at"),
+        # Keyset pages of a category, one per sort (routers/forums.py
+        # list_threads). Scanned backwards for the DESC order.
+        Index("ix_forum_threads_category_pinned_updated", "category_id", "is_pinned", "updated_at", "id"),
+        Index("ix_forum_threads_category_views", "category_id", "view_count", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     category_id = Column(Integer, ForeignKey("forum_categories.id", ondelete="CASCADE"), nullable=False)
@@ -52,6 +60,11 @@ class ForumThread(Base):
 
 class ForumPost(Base):
     __tablename__ = "forum_posts"
+    __table_args__ = (
+        Index("ix_forum_posts_author_created", "author_id", "created_at"),
+        # Keyset pages of a thread (list_posts).
+        Index("ix_forum_posts_thread_created", "thread_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     thread_id = Column(Integer, ForeignKey("forum_threads.id", ondelete="CASCADE"), nullable=False)
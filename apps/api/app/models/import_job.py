@@ -0,0 +1,60 @@
+"""Background collection import job.
+
+A breeder's inventory spreadsheet can run to tens of thousands of rows, and
+committing that inside the request meant the import either timed out behind
+the load balancer or — worse — half-finished with no way for the keeper to
+tell how far it got. A job row is the progress bar: the upload route creates
+it and returns, the worker commits the file in chunks and bumps the counters
+after each one, and the client polls `GET /import/jobs/{id}`.
+
+The file itself is NOT stored here. It's handed to the worker in memory; a
+job that dies with its process is left `running` and the keeper re-uploads.
+Persisting uploads would make this table a second copy of everyone's
+collection spreadsheet, which is not a trade worth making for a retry.
+"""
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.database import Base
+
+
+IMPORT_JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # "invert" (Tarantuverse) or "animal" (Herpetoverse) — same switch as
+    # the synchronous /import/commit route.
+    target = Column(String(20), nullable=False, default="invert")
+    filename = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False, default="queued")
+
+    # Progress. total_rows is filled once the worker has counted the file;
+    # processed_rows moves after every committed chunk.
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, nullable=False, default=0)
+
+    # Same counters the synchronous route returns.
+    imported = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    skipped_duplicates = Column(Integer, nullable=False, default=0)
+    error_rows = Column(Integer, nullable=False, default=0)
+    errors = Column(JSONB, nullable=True)  # first 50 row errors
+    cap_reached = Column(Boolean, nullable=False, default=False)
+    failure = Column(Text, nullable=True)  # why a `failed` job failed
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<ImportJob {self.id} {self.status} {self.processed_rows}/{self.total_rows}>"
@@ -17,7 +17,7 @@ extend it in additive migrations when a new taxon needs a column.
 """
 from sqlalchemy import (
     Boolean, CheckConstraint, Column, Date, DateTime, Enum as SQLEnum, ForeignKey,
-    Integer, Numeric, String, Text,
+    Index, Integer, Numeric, String, Text, text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -54,6 +54,12 @@ class Invert(Base):
             "visibility IS NULL OR visibility IN ('private', 'public')",
             name='inverts_visibility_check',
         ),
+        # The active collection (utils/limits.active_inverts_query and the
+        # default list view), newest first (idx_20261019_hot_path_indexes).
+        Index(
+            'ix_inverts_user_id_active', 'user_id', 'created_at',
+            postgresql_where=text('transferred_out_at IS NULL AND died_at IS NULL'),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -0,0 +1,54 @@
+"""Materialized market signals, one row per comparison group.
+
+PricingEstimator builds a signal from the raw purchase reports of one
+(species, life stage, sex group). Collection valuation needs that for every
+animal a keeper owns, so it used to re-read and re-score the reports once
+per tarantula. Rows here hold the estimator's finished output — range,
+evidence status, counts, limitations — so valuation is one join.
+
+A row is only as good as the day it was computed on: the lookback window
+moves daily, so `computed_on` earlier than today means stale and the
+reader recomputes. Submission writes refresh their group immediately;
+services/market_signals.py has the details.
+
+`sex_group` is "male", "female" or "unknown" for subadults and adults,
+whose groups are split by sex, and "any" for slings and juveniles.
+"""
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class MarketSignalSnapshot(Base):
+    __tablename__ = "market_signals"
+
+    species_id = Column(
+        UUID(as_uuid=True), ForeignKey("species.id", ondelete="CASCADE"), primary_key=True
+    )
+    size_category = Column(String(20), primary_key=True)
+    sex_group = Column(String(10), primary_key=True)
+
+    estimated_low = Column(Numeric(10, 2), nullable=True)
+    estimated_high = Column(Numeric(10, 2), nullable=True)
+    evidence_status = Column(String(32), nullable=False)
+    evidence_quality = Column(String(16), nullable=False)
+    data_points = Column(Integer, nullable=False, default=0)
+    contributor_count = Column(Integer, nullable=False, default=0)
+    vendor_count = Column(Integer, nullable=False, default=0)
+    verified_points = Column(Integer, nullable=False, default=0)
+    currency = Column(String(3), nullable=False, default="USD")
+    observation_start = Column(Date, nullable=True)
+    observation_end = Column(Date, nullable=True)
+    last_updated = Column(Date, nullable=True)
+    limitations = Column(JSONB, nullable=False, default=list)
+
+    computed_on = Column(Date, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<MarketSignalSnapshot {self.species_id} {self.size_category}/{self.sex_group} "
+            f"{self.evidence_status}>"
+        )
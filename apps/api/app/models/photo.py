@@ -7,8 +7,8 @@ exactly one. Enforced by DB CHECK constraint
 pht_20260421_extend_photos_polymorphic, extended to three-parent in
 lzp_20260423_extend_polymorphic_tables.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, CheckConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
 import uuid
@@ -74,6 +74,13 @@ class Photo(Base):
     thumbnail_url = Column(String(500))
     caption = Column(Text)
 
+    # Responsive sizes (services/photo_variants.py, phv_20261019). width and
+    # height are the original's as displayed; variants is a list of
+    # {width, height, url}, ascending. All null for earlier uploads.
+    width = Column(Integer)
+    height = Column(Integer)
+    variants = Column(JSONB)
+
     taken_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -0,0 +1,32 @@
+"""Reference counts for stored photo objects shared between photo rows.
+
+A transfer claim gives the buyer photo rows that point at the seller's
+objects instead of copying them (services/photo_blobs.py). Each shared
+object gets a row here counting the photo rows that use it, and an object
+is deleted from storage only when the last of them goes.
+
+An object with no row has exactly one user — every upload before sharing
+existed, and every upload that has never been shared — so the table only
+holds objects that are shared, plus one row per upload's original keyed
+by the SHA-256 of the uploaded bytes (pcd_20261019). A second upload of
+the same bytes finds that row and shares the first one's objects instead
+of storing its own.
+"""
+from sqlalchemy import Column, Index, Integer, String
+
+from app.database import Base
+
+
+class PhotoBlob(Base):
+    __tablename__ = "photo_blobs"
+    __table_args__ = (
+        Index("ix_photo_blobs_content_hash", "content_hash", unique=True),
+    )
+
+    url = Column(String(500), primary_key=True)
+    ref_count = Column(Integer, nullable=False)
+    # Hex SHA-256 of the uploaded file; set on an original's row only.
+    content_hash = Column(String(64))
+
+    def __repr__(self):
+        return f"<PhotoBlob {self.url} refs={self.ref_count}>"
@@ -0,0 +1,29 @@
+"""Rate-limit counters shared by every API worker.
+
+With more than one worker (or instance) the in-memory limiter counts each
+process separately, so "5/minute" on login really meant 5 per worker. The
+`database://` limiter storage (utils/rate_limit_storage.py) keeps one row per
+(limit, key, window) here instead.
+
+The table is UNLOGGED: counters are worthless after a crash and are rebuilt
+within one window, so they skip the WAL — and replication — entirely.
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from app.database import Base
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = (
+        # Sweeping expired windows.
+        Index("ix_rate_limit_counters_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    key = Column(String(512), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<RateLimitCounter {self.key} {self.count}>"
@@ -1,7 +1,7 @@
 """
 User model
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -31,6 +31,16 @@ HV_FREE_TIER_MAX_ANIMALS = 5
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pages of the keeper directory (routers/keepers.py). Its
+        # search columns also have pg_trgm indexes, created only by the
+        # migration (kpr_20261019_keyset_pagination) since they need the
+        # extension.
+        Index(
+            "ix_users_public_created_at", "created_at", "id",
+            postgresql_where=text("collection_visibility = 'public'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
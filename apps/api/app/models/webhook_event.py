@@ -0,0 +1,65 @@
+"""Webhook inbox — one row per provider event (Stripe, Apple).
+
+Payment webhooks used to be verified AND applied inside the request:
+subscription upserts, commits, and on Apple the certificate-chain check, all
+before the 200. On the first of the month, when renewals arrive in a burst,
+acks slowed past the providers' timeouts, they retried, and the retries
+re-ran work that had already half-happened. Now the endpoint verifies,
+writes a row here and acks; services/webhook_inbox.py applies it.
+
+`(provider, event_id)` is unique, so a provider retry of an event we already
+hold is a no-op insert. A row is applied in the same transaction that marks
+it `done`, so an event's effect lands exactly once however often it's
+delivered or retried.
+
+Ordering: events sharing an `ordering_key` (the Stripe customer, the Apple
+original transaction) apply strictly in `occurred_at` order — a renewal must
+not land after the cancellation that followed it. A failing event holds back
+the ones behind it until it succeeds or is dead-lettered.
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.database import Base
+
+
+WEBHOOK_EVENT_STATUSES = ("pending", "done", "dead")
+
+
+class WebhookEvent(Base):
+    __tablename__ = "webhook_events"
+    __table_args__ = (
+        UniqueConstraint("provider", "event_id", name="uq_webhook_events_provider_event"),
+        # The worker's claim query: pending rows due now, oldest first.
+        Index(
+            "ix_webhook_events_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # The per-customer ordering check.
+        Index("ix_webhook_events_ordering", "provider", "ordering_key", "occurred_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    provider = Column(String(20), nullable=False)  # "stripe" | "apple"
+    event_id = Column(String(255), nullable=False)
+    event_type = Column(String(100), nullable=False)
+    ordering_key = Column(String(255), nullable=True)
+
+    # What the handler needs, already verified: the Stripe event's data.object,
+    # or the flattened Apple notification fields. Never the raw signed blob.
+    payload = Column(JSONB, nullable=False)
+
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    occurred_at = Column(DateTime(timezone=True), nullable=False)  # provider's timestamp
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<WebhookEvent {self.provider}:{self.event_id} {self.status}>"
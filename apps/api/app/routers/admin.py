@@ -13,6 +13,7 @@ from app.models.content_report import ContentReport
 from app.utils.subscription import active_subscription_clause
 from app.schemas.user import UserResponse
 from app.utils.dependencies import get_current_admin
+from app.utils.response_cache import response_cache
 from app.services.email import EmailService
 from app.config import settings
 import secrets
@@ -70,6 +71,14 @@ async def get_admin_stats(
         "pending_reports": pending_reports
     }
 
+@router.get("/response-cache")
+async def get_response_cache_stats():
+    """
+    Catalog response cache hit ratio and bytes saved, for this worker
+    (see utils/response_cache.py)
+    """
+    return response_cache.stats()
+
 @router.get("/users")
 async def list_users(
     skip: int = 0,
@@ -7,10 +7,15 @@ Provides comprehensive analytics endpoints for admin dashboard:
 - Revenue: Subscriptions, MRR, churn
 - Activity: Platform usage (tarantulas, feedings, molts)
 - Community: Forum activity, messaging, follows
+
+Per-day series and period counts are read from the precomputed rollups in
+services/analytics_rollups.py; periods are whole UTC days ending today.
 """
-from fastapi import APIRouter, Depends, Query
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, and_, or_, case, text
+from sqlalchemy import func, distinct, or_, case, text
 from datetime import datetime, timedelta, timezone, date
 from typing import Literal
 
@@ -20,16 +25,12 @@ from app.models.tarantula import Tarantula
 from app.models.invert import Invert
 from app.models.animal import Animal
 from app.models.colony import Colony
-from app.models.feeding_log import FeedingLog
-from app.models.molt_log import MoltLog
-from app.models.substrate_change import SubstrateChange
 from app.models.species import Species
 from app.models.subscription import UserSubscription, SubscriptionPlan
 from app.utils.subscription import active_subscription_clause
-from app.models.activity_feed import ActivityFeed
 from app.models.forum import ForumCategory, ForumThread, ForumPost
-from app.models.direct_message import DirectMessage
 from app.models.follow import Follow
+from app.services import analytics_rollups
 from app.utils.dependencies import get_current_admin
 from app.schemas.admin_analytics import (
     AdminAnalyticsOverview,
@@ -56,31 +57,24 @@ router = APIRouter(
     dependencies=[Depends(get_current_admin)]
 )
 
-PeriodType = Literal["7d", "30d", "90d", "1y"]
+# Cron entrypoints: no user, so no admin dependency — CRON_SECRET instead.
+cron_router = APIRouter(prefix="/admin/analytics", tags=["admin-analytics"])
 
+PeriodType = Literal["7d", "30d", "90d", "1y"]
 
-def get_period_dates(period: PeriodType) -> tuple[datetime, datetime]:
-    """Convert period string to start and end dates"""
-    now = datetime.now(timezone.utc)
-    end_date = now
+PERIOD_DAYS = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
 
-    if period == "7d":
-        start_date = now - timedelta(days=7)
-    elif period == "30d":
-        start_date = now - timedelta(days=30)
-    elif period == "90d":
-        start_date = now - timedelta(days=90)
-    else:  # 1y
-        start_date = now - timedelta(days=365)
 
-    return start_date, end_date
+def get_period_days(period: PeriodType) -> tuple[date, date]:
+    """First and last UTC day of the period; the last day is today"""
+    end_day = analytics_rollups.utc_today()
+    return end_day - timedelta(days=PERIOD_DAYS[period] - 1), end_day
 
 
-def get_previous_period_dates(period: PeriodType) -> tuple[datetime, datetime]:
+def get_previous_period_days(period: PeriodType) -> tuple[date, date]:
     """Get the previous period for comparison"""
-    start_date, end_date = get_period_dates(period)
-    period_length = end_date - start_date
-    return start_date - period_length, start_date
+    start_day, _ = get_period_days(period)
+    return start_day - timedelta(days=PERIOD_DAYS[period]), start_day - timedelta(days=1)
 
 
 @router.get("/overview", response_model=AdminAnalyticsOverview)
@@ -91,47 +85,36 @@ async def get_analytics_overview(
     Get real-time overview of all key platform metrics
     """
     now = datetime.now(timezone.utc)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
+    today = now.date()
+    analytics_rollups.ensure_range(db, today - timedelta(days=59), today)
+    today_counts = analytics_rollups.series(
+        db,
+        ["active_users", "active_users_7d", "active_users_30d", "feedings", "molts",
+         "substrate_changes", "messages"],
+        today,
+        today,
+    )
+
+    def counted_today(metric: str) -> int:
+        return today_counts[metric].get(today, 0)
 
     # User counts
     total_users = db.query(func.count(User.id)).scalar() or 0
 
-    # Active users (users with activity feed entries)
-    active_users_today = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-        ActivityFeed.created_at >= today_start
-    ).scalar() or 0
-
-    active_users_7d = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-        ActivityFeed.created_at >= seven_days_ago
-    ).scalar() or 0
-
-    active_users_30d = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-        ActivityFeed.created_at >= thirty_days_ago
-    ).scalar() or 0
+    # Active users (users with activity feed entries), today and trailing windows
+    active_users_today = counted_today("active_users")
+    active_users_7d = counted_today("active_users_7d")
+    active_users_30d = counted_today("active_users_30d")
 
     # New users
-    new_users_today = db.query(func.count(User.id)).filter(
-        User.created_at >= today_start
-    ).scalar() or 0
-
-    new_users_7d = db.query(func.count(User.id)).filter(
-        User.created_at >= seven_days_ago
-    ).scalar() or 0
-
-    new_users_30d = db.query(func.count(User.id)).filter(
-        User.created_at >= thirty_days_ago
-    ).scalar() or 0
+    new_users_today = analytics_rollups.total(db, "new_users", today, today)
+    new_users_7d = analytics_rollups.total(db, "new_users", today - timedelta(days=6), today)
+    new_users_30d = analytics_rollups.total(db, "new_users", today - timedelta(days=29), today)
 
     # Previous 30 days for growth rate
-    sixty_days_ago = now - timedelta(days=60)
-    new_users_prev_30d = db.query(func.count(User.id)).filter(
-        and_(
-            User.created_at >= sixty_days_ago,
-            User.created_at < thirty_days_ago
-        )
-    ).scalar() or 0
+    new_users_prev_30d = analytics_rollups.total(
+        db, "new_users", today - timedelta(days=59), today - timedelta(days=30)
+    )
 
     user_growth_rate = 0.0
     if new_users_prev_30d > 0:
@@ -238,25 +221,15 @@ async def get_analytics_overview(
     total_colonies = db.query(func.count(Colony.id)).scalar() or 0
     total_collection = total_inverts + total_animals + total_colonies
 
-    total_feedings_today = db.query(func.count(FeedingLog.id)).filter(
-        FeedingLog.fed_at >= today_start
-    ).scalar() or 0
-
-    total_molts_today = db.query(func.count(MoltLog.id)).filter(
-        MoltLog.molted_at >= today_start
-    ).scalar() or 0
-
-    total_substrate_changes_today = db.query(func.count(SubstrateChange.id)).filter(
-        SubstrateChange.changed_at >= today_start.date()
-    ).scalar() or 0
+    total_feedings_today = counted_today("feedings")
+    total_molts_today = counted_today("molts")
+    total_substrate_changes_today = counted_today("substrate_changes")
 
     # Community
     total_forum_threads = db.query(func.count(ForumThread.id)).scalar() or 0
     total_forum_posts = db.query(func.count(ForumPost.id)).scalar() or 0
 
-    total_messages_today = db.query(func.count(DirectMessage.id)).filter(
-        DirectMessage.created_at >= today_start
-    ).scalar() or 0
+    total_messages_today = counted_today("messages")
 
     return AdminAnalyticsOverview(
         total_users=total_users,
@@ -297,46 +270,26 @@ async def get_user_analytics(
     """
     Get user growth, retention, and OAuth breakdown analytics
     """
-    start_date, end_date = get_period_dates(period)
-    prev_start, prev_end = get_previous_period_dates(period)
+    start_day, end_day = get_period_days(period)
+    prev_start, prev_end = get_previous_period_days(period)
+    analytics_rollups.ensure_range(db, prev_start, end_day)
 
-    # Time series: Daily new users and cumulative count
-    daily_users = db.query(
-        func.date_trunc('day', User.created_at).label('date'),
-        func.count(User.id).label('count')
-    ).filter(
-        User.created_at >= start_date,
-        User.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', User.created_at)
-    ).order_by('date').all()
+    # Time series: daily new and active users, with a cumulative count
+    daily = analytics_rollups.series(db, ["new_users", "active_users"], start_day, end_day)
+    new_by_day, active_by_day = daily["new_users"], daily["active_users"]
 
-    # Build time series with cumulative count
     time_series = []
-    base_count = db.query(func.count(User.id)).filter(
-        User.created_at < start_date
+    cumulative = db.query(func.count(User.id)).filter(
+        User.created_at < analytics_rollups.day_start(start_day)
     ).scalar() or 0
-    cumulative = base_count
 
-    # Get active users per day
-    active_by_day = dict(db.query(
-        func.date_trunc('day', ActivityFeed.created_at).label('date'),
-        func.count(distinct(ActivityFeed.user_id)).label('count')
-    ).filter(
-        ActivityFeed.created_at >= start_date,
-        ActivityFeed.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', ActivityFeed.created_at)
-    ).all())
-
-    for row in daily_users:
-        cumulative += row.count
-        active = active_by_day.get(row.date, 0)
+    for day in sorted(set(new_by_day) | set(active_by_day)):
+        cumulative += new_by_day.get(day, 0)
         time_series.append(UserTimeSeriesPoint(
-            date=row.date.date(),
-            new_users=row.count,
+            date=day,
+            new_users=new_by_day.get(day, 0),
             cumulative_users=cumulative,
-            active_users=active
+            active_users=active_by_day.get(day, 0)
         ))
 
     # OAuth breakdown
@@ -357,60 +310,31 @@ async def get_user_analytics(
         for r in oauth_counts
     ]
 
-    # Retention cohorts (simplified - last 3 months)
-    retention_cohorts = []
-    for months_ago in range(3):
-        cohort_start = (end_date.replace(day=1) - timedelta(days=months_ago * 30)).replace(day=1)
-        cohort_end = (cohort_start + timedelta(days=32)).replace(day=1)
-
-        cohort_users = db.query(User.id).filter(
-            User.created_at >= cohort_start,
-            User.created_at < cohort_end
-        ).all()
-        cohort_size = len(cohort_users)
-
-        if cohort_size > 0:
-            cohort_ids = [u.id for u in cohort_users]
-
-            # Day 1 retention
-            retained_d1 = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-                ActivityFeed.user_id.in_(cohort_ids),
-                ActivityFeed.created_at >= cohort_start + timedelta(days=1),
-                ActivityFeed.created_at < cohort_start + timedelta(days=2)
-            ).scalar() or 0
-
-            # Day 7 retention
-            retained_d7 = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-                ActivityFeed.user_id.in_(cohort_ids),
-                ActivityFeed.created_at >= cohort_start + timedelta(days=7),
-                ActivityFeed.created_at < cohort_start + timedelta(days=8)
-            ).scalar() or 0
-
-            # Day 30 retention
-            retained_d30 = db.query(func.count(distinct(ActivityFeed.user_id))).filter(
-                ActivityFeed.user_id.in_(cohort_ids),
-                ActivityFeed.created_at >= cohort_start + timedelta(days=30),
-                ActivityFeed.created_at < cohort_start + timedelta(days=31)
-            ).scalar() or 0
-
-            retention_cohorts.append(UserRetentionCohort(
-                cohort_month=cohort_start.strftime("%Y-%m"),
-                cohort_size=cohort_size,
-                retained_day_1=round((retained_d1 / cohort_size * 100), 1),
-                retained_day_7=round((retained_d7 / cohort_size * 100), 1),
-                retained_day_30=round((retained_d30 / cohort_size * 100), 1)
-            ))
+    # Retention cohorts (last 3 signup months). Day N is measured from each
+    # member's own signup, over members who have reached day N.
+    cohorts = analytics_rollups.ensure_cohorts(
+        db, [analytics_rollups.month_start(end_day, months_back) for months_back in range(3)]
+    )
 
-    # Summary stats
-    total_new_users = db.query(func.count(User.id)).filter(
-        User.created_at >= start_date,
-        User.created_at < end_date
-    ).scalar() or 0
+    def retained_pct(cohort, n: int) -> float:
+        eligible = getattr(cohort, f"eligible_day_{n}")
+        return round(getattr(cohort, f"retained_day_{n}") / eligible * 100, 1) if eligible else 0.0
+
+    retention_cohorts = [
+        UserRetentionCohort(
+            cohort_month=cohort.cohort_month.strftime("%Y-%m"),
+            cohort_size=cohort.cohort_size,
+            retained_day_1=retained_pct(cohort, 1),
+            retained_day_7=retained_pct(cohort, 7),
+            retained_day_30=retained_pct(cohort, 30)
+        )
+        for cohort in reversed(cohorts)
+        if cohort.cohort_size > 0
+    ]
 
-    prev_new_users = db.query(func.count(User.id)).filter(
-        User.created_at >= prev_start,
-        User.created_at < prev_end
-    ).scalar() or 0
+    # Summary stats
+    total_new_users = sum(new_by_day.values())
+    prev_new_users = analytics_rollups.total(db, "new_users", prev_start, prev_end)
 
     growth_rate = 0.0
     if prev_new_users > 0:
@@ -438,41 +362,28 @@ async def get_revenue_analytics(
     """
     Get subscription and revenue analytics
     """
-    start_date, end_date = get_period_dates(period)
+    start_day, end_day = get_period_days(period)
+    analytics_rollups.ensure_range(db, start_day, end_day)
 
-    # Time series: Daily subscriptions
-    daily_subs = db.query(
-        func.date_trunc('day', UserSubscription.started_at).label('date'),
-        func.count(UserSubscription.id).label('count')
-    ).filter(
-        UserSubscription.started_at >= start_date,
-        UserSubscription.started_at < end_date
-    ).group_by(
-        func.date_trunc('day', UserSubscription.started_at)
-    ).order_by('date').all()
-
-    daily_cancellations = dict(db.query(
-        func.date_trunc('day', UserSubscription.cancelled_at).label('date'),
-        func.count(UserSubscription.id).label('count')
-    ).filter(
-        UserSubscription.cancelled_at >= start_date,
-        UserSubscription.cancelled_at < end_date
-    ).group_by(
-        func.date_trunc('day', UserSubscription.cancelled_at)
-    ).all())
+    # Time series: daily subscriptions and cancellations
+    daily = analytics_rollups.series(
+        db, ["subscriptions_started", "subscriptions_cancelled"], start_day, end_day
+    )
+    daily_subs, daily_cancellations = daily["subscriptions_started"], daily["subscriptions_cancelled"]
 
     time_series = []
     active_count = db.query(func.count(UserSubscription.id)).filter(
         UserSubscription.status == "active",
-        UserSubscription.started_at < start_date
+        UserSubscription.started_at < analytics_rollups.day_start(start_day)
     ).scalar() or 0
 
-    for row in daily_subs:
-        cancels = daily_cancellations.get(row.date, 0)
-        active_count += row.count - cancels
+    for day in sorted(set(daily_subs) | set(daily_cancellations)):
+        started = daily_subs.get(day, 0)
+        cancels = daily_cancellations.get(day, 0)
+        active_count += started - cancels
         time_series.append(RevenueTimeSeriesPoint(
-            date=row.date.date(),
-            new_subscriptions=row.count,
+            date=day,
+            new_subscriptions=started,
             cancellations=cancels,
             active_subscriptions=max(0, active_count)
         ))
@@ -527,10 +438,7 @@ async def get_revenue_analytics(
     ).scalar() or 0.0
 
     # Churn rate
-    total_cancellations = db.query(func.count(UserSubscription.id)).filter(
-        UserSubscription.cancelled_at >= start_date,
-        UserSubscription.cancelled_at < end_date
-    ).scalar() or 0
+    total_cancellations = sum(daily_cancellations.values())
 
     churn_rate = 0.0
     if total_active > 0:
@@ -561,62 +469,23 @@ async def get_activity_analytics(
     """
     Get platform activity analytics (tarantulas, feedings, molts)
     """
-    start_date, end_date = get_period_dates(period)
-
-    # Time series for tarantulas
-    daily_tarantulas = dict(db.query(
-        func.date_trunc('day', Tarantula.created_at).label('date'),
-        func.count(Tarantula.id).label('count')
-    ).filter(
-        Tarantula.created_at >= start_date,
-        Tarantula.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', Tarantula.created_at)
-    ).all())
-
-    # Time series for feedings
-    daily_feedings = dict(db.query(
-        func.date_trunc('day', FeedingLog.fed_at).label('date'),
-        func.count(FeedingLog.id).label('count')
-    ).filter(
-        FeedingLog.fed_at >= start_date,
-        FeedingLog.fed_at < end_date
-    ).group_by(
-        func.date_trunc('day', FeedingLog.fed_at)
-    ).all())
+    start_day, end_day = get_period_days(period)
+    analytics_rollups.ensure_range(db, start_day, end_day)
 
-    # Time series for molts
-    daily_molts = dict(db.query(
-        func.date_trunc('day', MoltLog.molted_at).label('date'),
-        func.count(MoltLog.id).label('count')
-    ).filter(
-        MoltLog.molted_at >= start_date,
-        MoltLog.molted_at < end_date
-    ).group_by(
-        func.date_trunc('day', MoltLog.molted_at)
-    ).all())
-
-    # Time series for substrate changes
-    daily_substrate = dict(db.query(
-        func.date_trunc('day', SubstrateChange.changed_at).label('date'),
-        func.count(SubstrateChange.id).label('count')
-    ).filter(
-        SubstrateChange.changed_at >= start_date.date(),
-        SubstrateChange.changed_at < end_date.date()
-    ).group_by(
-        func.date_trunc('day', SubstrateChange.changed_at)
-    ).all())
+    daily = analytics_rollups.series(
+        db, ["new_tarantulas", "feedings", "molts", "substrate_changes"], start_day, end_day
+    )
 
     # Combine into time series
-    all_dates = set(daily_tarantulas.keys()) | set(daily_feedings.keys()) | set(daily_molts.keys())
+    all_dates = set().union(*daily.values())
     time_series = []
     for d in sorted(all_dates):
         time_series.append(ActivityTimeSeriesPoint(
-            date=d.date() if hasattr(d, 'date') else d,
-            new_tarantulas=daily_tarantulas.get(d, 0),
-            feedings=daily_feedings.get(d, 0),
-            molts=daily_molts.get(d, 0),
-            substrate_changes=daily_substrate.get(d, 0)
+            date=d,
+            new_tarantulas=daily["new_tarantulas"].get(d, 0),
+            feedings=daily["feedings"].get(d, 0),
+            molts=daily["molts"].get(d, 0),
+            substrate_changes=daily["substrate_changes"].get(d, 0)
         ))
 
     # Top species
@@ -643,14 +512,8 @@ async def get_activity_analytics(
 
     # Summary stats
     total_tarantulas = db.query(func.count(Tarantula.id)).scalar() or 0
-    total_feedings = db.query(func.count(FeedingLog.id)).filter(
-        FeedingLog.fed_at >= start_date,
-        FeedingLog.fed_at < end_date
-    ).scalar() or 0
-    total_molts = db.query(func.count(MoltLog.id)).filter(
-        MoltLog.molted_at >= start_date,
-        MoltLog.molted_at < end_date
-    ).scalar() or 0
+    total_feedings = sum(daily["feedings"].values())
+    total_molts = sum(daily["molts"].values())
 
     user_count = db.query(func.count(User.id)).scalar() or 1
     average_collection_size = total_tarantulas / user_count
@@ -673,62 +536,23 @@ async def get_community_analytics(
     """
     Get community engagement analytics (forums, messages, follows)
     """
-    start_date, end_date = get_period_dates(period)
-
-    # Time series for threads
-    daily_threads = dict(db.query(
-        func.date_trunc('day', ForumThread.created_at).label('date'),
-        func.count(ForumThread.id).label('count')
-    ).filter(
-        ForumThread.created_at >= start_date,
-        ForumThread.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', ForumThread.created_at)
-    ).all())
-
-    # Time series for posts
-    daily_posts = dict(db.query(
-        func.date_trunc('day', ForumPost.created_at).label('date'),
-        func.count(ForumPost.id).label('count')
-    ).filter(
-        ForumPost.created_at >= start_date,
-        ForumPost.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', ForumPost.created_at)
-    ).all())
+    start_day, end_day = get_period_days(period)
+    analytics_rollups.ensure_range(db, start_day, end_day)
 
-    # Time series for messages
-    daily_messages = dict(db.query(
-        func.date_trunc('day', DirectMessage.created_at).label('date'),
-        func.count(DirectMessage.id).label('count')
-    ).filter(
-        DirectMessage.created_at >= start_date,
-        DirectMessage.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', DirectMessage.created_at)
-    ).all())
-
-    # Time series for follows
-    daily_follows = dict(db.query(
-        func.date_trunc('day', Follow.created_at).label('date'),
-        func.count(Follow.follower_id).label('count')
-    ).filter(
-        Follow.created_at >= start_date,
-        Follow.created_at < end_date
-    ).group_by(
-        func.date_trunc('day', Follow.created_at)
-    ).all())
+    daily = analytics_rollups.series(
+        db, ["forum_threads", "forum_posts", "messages", "follows"], start_day, end_day
+    )
 
     # Combine into time series
-    all_dates = set(daily_threads.keys()) | set(daily_posts.keys()) | set(daily_messages.keys()) | set(daily_follows.keys())
+    all_dates = set().union(*daily.values())
     time_series = []
     for d in sorted(all_dates):
         time_series.append(CommunityTimeSeriesPoint(
-            date=d.date() if hasattr(d, 'date') else d,
-            new_threads=daily_threads.get(d, 0),
-            new_posts=daily_posts.get(d, 0),
-            new_messages=daily_messages.get(d, 0),
-            new_follows=daily_follows.get(d, 0)
+            date=d,
+            new_threads=daily["forum_threads"].get(d, 0),
+            new_posts=daily["forum_posts"].get(d, 0),
+            new_messages=daily["messages"].get(d, 0),
+            new_follows=daily["follows"].get(d, 0)
         ))
 
     # Forum category stats
@@ -764,8 +588,8 @@ async def get_community_analytics(
     ).join(
         ForumPost, ForumPost.author_id == User.id
     ).filter(
-        ForumPost.created_at >= start_date,
-        ForumPost.created_at < end_date
+        ForumPost.created_at >= datetime.combine(start_day, datetime.min.time()),
+        ForumPost.created_at < datetime.combine(end_day + timedelta(days=1), datetime.min.time())
     ).group_by(
         User.id, User.username, User.display_name
     ).order_by(
@@ -800,3 +624,19 @@ async def get_community_analytics(
         total_follows=total_follows,
         average_posts_per_thread=round(avg_posts_per_thread, 1)
     )
+
+
+@cron_router.post("/rollup")
+async def run_analytics_rollup(
+    x_cron_secret: str = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Secret-gated nightly cron: recompute the last few days of rollups
+    (picking up backdated logs) and every retention cohort still maturing.
+    Guarded by the CRON_SECRET env var via the X-Cron-Secret header."""
+    secret = os.environ.get("CRON_SECRET")
+    if not secret or x_cron_secret != secret:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    rows = analytics_rollups.recompute_recent(db)
+    cohorts = analytics_rollups.refresh_cohorts(db, analytics_rollups.open_cohort_months())
+    return {"rows_written": rows, "cohorts_refreshed": cohorts}
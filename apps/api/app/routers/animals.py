@@ -44,9 +44,9 @@ from app.schemas.feeding import (
     AnimalBulkFeedingResult,
     AnimalBulkFeedingSkip,
 )
+from app.services import bulk_logs, public_profiles
 from app.services.feeding_reminder_service import parse_frequency_string
 from app.utils.dependencies import get_current_user
-from app.utils.feeding_pause import resume_if_accepted
 from app.schemas.death import MarkDiedRequest
 
 router = APIRouter()
@@ -397,50 +397,46 @@ async def bulk_create_animal_feedings(
     `animals.last_fed_at` is bumped so collection cards + status refresh.
     """
     requested = list(dict.fromkeys(payload.animal_ids))
-    # Full rows, not just ids — an accepted feeding resumes a paused animal.
-    owned = (
-        db.query(Animal)
+    owned_ids = {
+        row.id
+        for row in db.query(Animal.id)
         .filter(Animal.id.in_(requested), Animal.user_id == current_user.id)
         .all()
-    )
-    owned_by_id = {a.id: a for a in owned}
-    owned_ids = set(owned_by_id)
+    }
     fed_at = payload.fed_at or datetime.now(timezone.utc)
 
-    created_ids = []
-    skipped = []
-    resumed_ids = []
-    for aid in requested:
-        if aid not in owned_ids:
-            skipped.append(AnimalBulkFeedingSkip(animal_id=aid, reason="Not found or not yours"))
-            continue
-        db.add(
-            FeedingLog(
-                animal_id=aid,
-                fed_at=fed_at,
-                food_type=payload.food_type,
-                food_size=payload.food_size,
-                quantity=payload.quantity,
-                accepted=payload.accepted,
-                notes=payload.notes,
-            )
-        )
-        created_ids.append(aid)
-        # Taking food ends a pause; refusing confirms it. See utils/feeding_pause.
-        if resume_if_accepted(owned_by_id[aid], payload.accepted):
-            resumed_ids.append(aid)
-
+    created_ids = [aid for aid in requested if aid in owned_ids]
+    skipped = [
+        AnimalBulkFeedingSkip(animal_id=aid, reason="Not found or not yours")
+        for aid in requested
+        if aid not in owned_ids
+    ]
+    bulk_logs.insert_rows(db, FeedingLog, [
+        {
+            "animal_id": aid,
+            "fed_at": fed_at,
+            "food_type": payload.food_type,
+            "food_size": payload.food_size,
+            "quantity": payload.quantity,
+            "accepted": payload.accepted,
+            "notes": payload.notes,
+        }
+        for aid in created_ids
+    ])
+
+    resumed = set()
     if payload.accepted and created_ids:
-        db.query(Animal).filter(Animal.id.in_(created_ids)).update(
-            {Animal.last_fed_at: fed_at}, synchronize_session=False
-        )
+        # Taking food ends a pause; refusing confirms it. See utils/feeding_pause.
+        resumed = set(bulk_logs.resume_paused(db, Animal, created_ids))
+        bulk_logs.bump_last_fed_at(db, Animal, created_ids, fed_at)
 
     db.commit()
+    public_profiles.invalidate(*created_ids)
     return AnimalBulkFeedingResult(
         created_count=len(created_ids),
         created_ids=created_ids,
         skipped=skipped,
-        resumed_ids=resumed_ids,
+        resumed_ids=[aid for aid in created_ids if aid in resumed],
     )
 
 
@@ -490,6 +486,7 @@ async def update_animal(
 
     db.commit()
     db.refresh(animal)
+    public_profiles.invalidate(animal.id)
     return animal
 
 
@@ -574,6 +571,7 @@ async def delete_animal(
 
     db.delete(animal)
     db.commit()
+    public_profiles.invalidate(animal_id)
     return None
 
 
@@ -16,6 +16,7 @@ from app.schemas.announcement import (
     AnnouncementResponse,
 )
 from app.utils.dependencies import get_current_admin
+from app.utils import response_cache
 
 router = APIRouter()
 
@@ -82,6 +83,7 @@ async def create_announcement(
     )
     db.add(announcement)
     db.commit()
+    response_cache.invalidate("announcements")
     db.refresh(announcement)
     return announcement
 
@@ -111,6 +113,7 @@ async def update_announcement(
         setattr(announcement, key, value)
 
     db.commit()
+    response_cache.invalidate("announcements")
     db.refresh(announcement)
     return announcement
 
@@ -128,4 +131,5 @@ async def delete_announcement(
 
     db.delete(announcement)
     db.commit()
+    response_cache.invalidate("announcements")
     return {"message": "Announcement deleted"}
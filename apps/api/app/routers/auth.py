@@ -27,6 +27,7 @@ from app.utils.oauth import (
 )
 from app.services.email import EmailService
 from app.services.storage import storage_service
+from app.services import public_profiles
 from app.services.oauth_verification import (
     OAuthVerificationError,
     verify_google_id_token,
@@ -326,6 +327,7 @@ async def update_profile(
 
     db.commit()
     db.refresh(current_user)
+    public_profiles.invalidate_keeper(db, current_user.id)
 
     return UserResponse.from_orm(current_user)
 
@@ -360,6 +362,7 @@ async def update_visibility(
 
     db.commit()
     db.refresh(current_user)
+    public_profiles.invalidate_keeper(db, current_user.id)
 
     return UserResponse.from_orm(current_user)
 
@@ -6,11 +6,12 @@ Two access patterns:
 
 The /clutches/{id}/parent-genotypes endpoint packages each parent's
 recorded zygosities so the front-end morph calculator can run the
-prediction with all its citation + welfare context. Backend
-intentionally doesn't reimplement combineOffspring — keeping the math
-in one place (the calculator UI) avoids drift.
+prediction with all its citation + welfare context. Server-side scoring
+(many loci, every pairing in a collection) lives in
+app/services/morph_genetics.py and mirrors combineOffspring's math; see
+the /reptile-pairings prediction routes.
 """
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -32,6 +33,7 @@ from app.schemas.reptile_breeding import (
     GenotypeEntry,
     ParentGenotypeBundle,
 )
+from app.services import batch_enrich
 from app.utils.dependencies import get_current_user
 from app.utils.limits import enforce_hv_premium
 
@@ -41,12 +43,15 @@ router = APIRouter()
 # ─── Helpers ───────────────────────────────────────────────────────────
 
 
-def _enrich(c: Clutch, db: Session) -> ClutchResponse:
-    offspring_count = (
-        db.query(ReptileOffspring)
-        .filter(ReptileOffspring.clutch_id == c.id)
-        .count()
-    )
+def _offspring_counts(db: Session, clutches: List[Clutch]) -> dict:
+    """Offspring per clutch for a page of clutches, one GROUP BY (batch_enrich)."""
+    return batch_enrich.counts_by(db, ReptileOffspring.clutch_id, [c.id for c in clutches])
+
+
+def _enrich(c: Clutch, db: Session, offspring_counts: Optional[dict] = None) -> ClutchResponse:
+    if offspring_counts is None:
+        offspring_counts = _offspring_counts(db, [c])
+    offspring_count = offspring_counts.get(c.id, 0)
     return ClutchResponse(
         id=c.id,
         pairing_id=c.pairing_id,
@@ -121,7 +126,8 @@ async def list_clutches_for_pairing(
         .order_by(Clutch.laid_date.desc())
         .all()
     )
-    return [_enrich(c, db) for c in clutches]
+    counts = _offspring_counts(db, clutches)
+    return [_enrich(c, db, counts) for c in clutches]
 
 
 @router.post(
@@ -32,6 +32,7 @@ from app.schemas.colony import (
     ColonyEventUpdate,
     ColonyEventResponse,
 )
+from app.services import batch_enrich
 from app.utils.dependencies import get_current_user
 from app.utils.limits import enforce_collection_limit
 
@@ -59,13 +60,19 @@ def _total_count(colony: Colony) -> int:
         return 0
 
 
-def _build_response(colony: Colony, db: Session) -> dict:
-    sp: Optional[InvertSpecies] = None
-    species_missing = False
-    if colony.species_id:
-        sp = db.query(InvertSpecies).filter(InvertSpecies.id == colony.species_id).first()
-        if sp is None:
-            species_missing = True
+def _species_for(db: Session, colonies: List[Colony]) -> dict:
+    """Species names for a page of colonies, in one query (batch_enrich)."""
+    return batch_enrich.rows_by_id(
+        db, InvertSpecies, [c.species_id for c in colonies],
+        "scientific_name", "common_names",
+    )
+
+
+def _build_response(colony: Colony, db: Session, species_by_id: Optional[dict] = None) -> dict:
+    if species_by_id is None:
+        species_by_id = _species_for(db, [colony])
+    sp = species_by_id.get(colony.species_id) if colony.species_id else None
+    species_missing = colony.species_id is not None and sp is None
 
     display, scientific = _species_names(sp)
     data = {c.name: getattr(colony, c.name) for c in colony.__table__.columns}
@@ -154,10 +161,11 @@ async def list_colonies(
         )
         last_fed = {r[0]: r[1] for r in rows}
 
+    species_by_id = _species_for(db, colonies)
     now = datetime.now(timezone.utc)
     items = []
     for c in colonies:
-        data = _build_response(c, db)
+        data = _build_response(c, db, species_by_id)
         fed_at = last_fed.get(c.id)
         data["last_feeding_date"] = fed_at
         # Days since only — deliberately NOT an overdue flag. Overdue needs a
@@ -14,6 +14,7 @@ from app.models.direct_message import Conversation, DirectMessage
 from app.models.notification_preferences import NotificationPreferences
 from app.utils.dependencies import get_current_user
 from app.utils.push_notifications import send_direct_message_notification
+from app.services import realtime
 from app.services.notification_service import create_notification
 from app.utils.rate_limit import limiter
 
@@ -139,6 +140,13 @@ async def send_message(
 
     db.commit()
     db.refresh(message)
+    realtime.publish(recipient.id, {
+        "type": "message",
+        "conversation_id": str(conversation.id),
+        "message_id": str(message.id),
+        "sender_username": current_user.username,
+        "unread_delta": {"messages": 1},
+    })
 
     # Notification center row (+ best-effort push) for the recipient.
     try:
@@ -204,12 +212,17 @@ async def get_conversation_with_user(
         }
     
     # Mark messages as read BEFORE querying so response reflects true state
-    db.query(DirectMessage).filter(
+    marked = db.query(DirectMessage).filter(
         DirectMessage.conversation_id == conversation.id,
         DirectMessage.sender_id != current_user.id,
         DirectMessage.is_read == False
     ).update({"is_read": True})
     db.commit()
+    if marked:
+        realtime.publish(
+            current_user.id,
+            realtime.read_event("messages", marked, conversation_id=str(conversation.id)),
+        )
 
     # Get messages (now with correct is_read values)
     messages = db.query(DirectMessage).filter(
@@ -29,6 +29,7 @@ from app.schemas.feeder_care_log import (
     FeederCareLogUpdate,
     FeederCareLogResponse,
 )
+from app.services import batch_enrich
 from app.utils.dependencies import get_current_user
 
 router = APIRouter()
@@ -55,13 +56,21 @@ def _compute_total_count(colony: FeederColony) -> Optional[int]:
     return None
 
 
-def _build_colony_response(colony: FeederColony, db: Session) -> dict:
-    sp: Optional[FeederSpecies] = None
-    species_missing = False
-    if colony.feeder_species_id:
-        sp = db.query(FeederSpecies).filter(FeederSpecies.id == colony.feeder_species_id).first()
-        if sp is None:
-            species_missing = True
+def _species_for(db: Session, colonies: List[FeederColony]) -> dict:
+    """Species names for a page of colonies, in one query (batch_enrich)."""
+    return batch_enrich.rows_by_id(
+        db, FeederSpecies, [c.feeder_species_id for c in colonies],
+        "scientific_name", "common_names",
+    )
+
+
+def _build_colony_response(
+    colony: FeederColony, db: Session, species_by_id: Optional[dict] = None,
+) -> dict:
+    if species_by_id is None:
+        species_by_id = _species_for(db, [colony])
+    sp = species_by_id.get(colony.feeder_species_id) if colony.feeder_species_id else None
+    species_missing = colony.feeder_species_id is not None and sp is None
 
     total = _compute_total_count(colony)
     is_low = False
@@ -124,9 +133,10 @@ async def list_colonies(
         q = q.filter(FeederColony.is_active.is_(True))
     colonies = q.order_by(FeederColony.created_at.desc()).all()
 
+    species_by_id = _species_for(db, colonies)
     result: List[FeederColonyListItem] = []
     for c in colonies:
-        data = _build_colony_response(c, db)
+        data = _build_colony_response(c, db, species_by_id)
         result.append(FeederColonyListItem(**data))
     return result
 
@@ -20,6 +20,7 @@ from app.schemas.feeder_species import (
     FeederSpeciesListItem,
 )
 from app.utils.dependencies import get_current_user
+from app.utils import response_cache
 
 router = APIRouter()
 
@@ -99,6 +100,7 @@ async def create_feeder_species(
     )
     db.add(sp)
     db.commit()
+    response_cache.invalidate("feeder_species")
     db.refresh(sp)
     return sp
 
@@ -141,6 +143,7 @@ async def update_feeder_species(
         setattr(sp, k, v)
 
     db.commit()
+    response_cache.invalidate("feeder_species")
     db.refresh(sp)
     return sp
 
@@ -162,4 +165,5 @@ async def delete_feeder_species(
 
     db.delete(sp)
     db.commit()
+    response_cache.invalidate("feeder_species")
     return None
@@ -26,10 +26,11 @@ from app.schemas.feeding import (
 from app.schemas.feeding_reminder import FeedingReminderSummary
 from app.utils.dependencies import get_current_user
 from app.utils.feeding_pause import resume_if_accepted
+from app.services import bulk_logs, public_profiles
 from app.services.activity_service import create_activity
 from app.services.feeding_reminder_service import get_user_feeding_reminders
 # ADR-005 Phase A2 — opportunistically populate invert_id on new logs.
-from app.services.inverts_dualwrite import invert_id_if_exists
+from app.services.inverts_dualwrite import invert_id_in_insert
 
 router = APIRouter()
 
@@ -122,7 +123,7 @@ async def create_feeding_log(
     # constraint doesn't fail on pre-A2 parents.
     new_feeding = FeedingLog(
         tarantula_id=tarantula_id,
-        invert_id=invert_id_if_exists(db, tarantula_id),
+        invert_id=invert_id_in_insert(tarantula_id),
         **feeding_data.model_dump()
     )
 
@@ -134,6 +135,7 @@ async def create_feeding_log(
     db.add(new_feeding)
     db.commit()
     db.refresh(new_feeding)
+    public_profiles.invalidate(tarantula_id)
     
     # Create activity feed entry
     await create_activity(
@@ -227,6 +229,7 @@ async def create_animal_feeding_log(
 
     db.commit()
     db.refresh(new_feeding)
+    public_profiles.invalidate(animal_id)
     return new_feeding
 
 
@@ -282,6 +285,7 @@ async def quick_feed_animal(
 
     db.commit()
     db.refresh(new_feeding)
+    public_profiles.invalidate(animal_id)
     return new_feeding
 
 
@@ -337,7 +341,7 @@ async def create_scorpion_feeding_log(
     # ADR-005 A2 — also set invert_id when the corresponding row exists.
     new_feeding = FeedingLog(
         scorpion_id=scorpion_id,
-        invert_id=invert_id_if_exists(db, scorpion_id),
+        invert_id=invert_id_in_insert(scorpion_id),
         **feeding_data.model_dump(),
     )
     # Taking food ends a pause; a refusal confirms it. This path was the only
@@ -614,46 +618,47 @@ async def bulk_create_invert_feedings(
     """
     # De-dupe while preserving the caller's order.
     requested = list(dict.fromkeys(payload.invert_ids))
-    # Load the rows, not just the ids — an accepted feeding resumes a paused
-    # animal, and that needs the ORM objects.
-    owned = (
-        db.query(Invert)
+    # Ids only — the derived updates below are set-based, so there's no need
+    # to hydrate 300 ORM rows just to read their pause columns.
+    owned_ids = {
+        row.id
+        for row in db.query(Invert.id)
         .filter(Invert.id.in_(requested), Invert.user_id == current_user.id)
         .all()
-    )
-    owned_by_id = {inv.id: inv for inv in owned}
-    owned_ids = set(owned_by_id)
+    }
     fed_at = payload.fed_at or datetime.now(timezone.utc)
 
-    created_ids = []
-    skipped = []
-    resumed_ids = []
-    for iid in requested:
-        if iid not in owned_ids:
-            skipped.append(BulkFeedingSkip(invert_id=iid, reason="Not found or not yours"))
-            continue
-        db.add(
-            FeedingLog(
-                invert_id=iid,
-                fed_at=fed_at,
-                food_type=payload.food_type,
-                food_size=payload.food_size,
-                quantity=payload.quantity,
-                accepted=payload.accepted,
-                notes=payload.notes,
-            )
-        )
-        created_ids.append(iid)
-        # Taking food ends a pause. A refusal doesn't — see utils/feeding_pause.
-        if resume_if_accepted(owned_by_id[iid], payload.accepted, db):
-            resumed_ids.append(iid)
+    created_ids = [iid for iid in requested if iid in owned_ids]
+    skipped = [
+        BulkFeedingSkip(invert_id=iid, reason="Not found or not yours")
+        for iid in requested
+        if iid not in owned_ids
+    ]
+    bulk_logs.insert_rows(db, FeedingLog, [
+        {
+            "invert_id": iid,
+            "fed_at": fed_at,
+            "food_type": payload.food_type,
+            "food_size": payload.food_size,
+            "quantity": payload.quantity,
+            "accepted": payload.accepted,
+            "notes": payload.notes,
+        }
+        for iid in created_ids
+    ])
+    # Taking food ends a pause. A refusal doesn't — see utils/feeding_pause.
+    resumed = (
+        set(bulk_logs.resume_paused(db, Invert, created_ids))
+        if payload.accepted
+        else set()
+    )
 
     db.commit()
     return BulkFeedingResult(
         created_count=len(created_ids),
         created_ids=created_ids,
         skipped=skipped,
-        resumed_ids=resumed_ids,
+        resumed_ids=[iid for iid in created_ids if iid in resumed],
     )
 
 
@@ -702,6 +707,7 @@ async def update_feeding_log(
 
     db.commit()
     db.refresh(feeding)
+    public_profiles.invalidate(feeding.tarantula_id, feeding.animal_id)
 
     return feeding
 
@@ -727,8 +733,10 @@ async def delete_feeding_log(
     if parent_row is None:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    profile_ids = (feeding.tarantula_id, feeding.animal_id)
     db.delete(feeding)
     db.commit()
+    public_profiles.invalidate(*profile_ids)
 
     return None
 
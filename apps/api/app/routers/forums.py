@@ -19,11 +19,13 @@ from app.schemas.forum import (
     ForumThreadList, ForumPostList
 )
 from app.routers.auth import get_current_user
+from app.utils import pagination
 from app.utils.dependencies import get_current_user_optional
 from app.services.activity_service import create_activity
+from app.services.forum_views import views as thread_views
 from app.utils.push_notifications import send_forum_reply_notification
 from app.services.notification_service import create_notification
-from app.utils.spam_protection import full_spam_check
+from app.utils.spam_protection import full_spam_check, record_post
 
 router = APIRouter(prefix="/api/v1/forums", tags=["forums"])
 
@@ -146,12 +148,18 @@ async def delete_category(
 @router.get("/categories/{category_slug}/threads", response_model=ForumThreadList)
 async def list_threads(
     category_slug: str,
-    page: int = Query(1, ge=1, le=10000),
+    page: int = Query(1, ge=1, le=10000, description="Deprecated: pass cursor instead"),
     limit: int = Query(20, ge=1, le=100),
     sort: str = Query("recent", regex="^(recent|popular|pinned)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Get threads in a category with pagination"""
+    """Get threads in a category, a page at a time.
+
+    Pass the previous page's `next_cursor` to continue (utils/pagination.py);
+    `page` still works for older clients but costs more the deeper it goes.
+    `total` is the category's cached thread count.
+    """
     # Find category
     category = db.query(ForumCategory).filter(ForumCategory.slug == category_slug).first()
     if not category:
@@ -164,27 +172,35 @@ async def list_threads(
         joinedload(ForumThread.last_post_user)
     )
     
-    # Apply sorting
-    if sort == "pinned":
-        query = query.order_by(desc(ForumThread.is_pinned), desc(ForumThread.updated_at))
-    elif sort == "popular":
-        query = query.order_by(desc(ForumThread.view_count))
-    else:  # recent
-        query = query.order_by(desc(ForumThread.is_pinned), desc(ForumThread.updated_at))
-    
-    # Get total count
-    total = query.count()
-    
+    # Apply sorting. "pinned" and "recent" are the same order. Each key ends
+    # in id so it is unique, and is matched by an index on
+    # (category_id, *key) — see forum model.
+    if sort == "popular":
+        key_columns = (ForumThread.view_count, ForumThread.id)
+        key_types = (int, int)
+    else:  # recent, pinned
+        key_columns = (ForumThread.is_pinned, ForumThread.updated_at, ForumThread.id)
+        key_types = (bool, datetime, int)
+    query = query.order_by(*(desc(c) for c in key_columns))
+
     # Apply pagination
-    offset = (page - 1) * limit
-    threads = query.offset(offset).limit(limit).all()
-    
+    if cursor:
+        key = pagination.decode_cursor(cursor, key_types)
+        query = query.filter(pagination.after(key_columns, key, descending=True))
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+    threads, next_cursor = pagination.page(
+        query.limit(limit + 1).all(), limit,
+        lambda t: [getattr(t, c.key) for c in key_columns],
+    )
+
     return {
         "threads": threads,
-        "total": total,
+        "total": category.thread_count,
         "page": page,
         "limit": limit,
-        "has_more": (offset + limit) < total
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
 
@@ -203,10 +219,10 @@ async def get_thread(
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    # Only increment view count if viewer is not the thread author
+    # Only count the view if viewer is not the thread author. Buffered and
+    # written in batches (services/forum_views.py), so reading stays a read.
     if not current_user or str(current_user.id) != str(thread.author_id):
-        thread.view_count += 1
-        db.commit()
+        thread_views.record(thread.id)
     
     # Get first post
     first_post = db.query(ForumPost).filter(
@@ -223,7 +239,7 @@ async def get_thread(
         "slug": thread.slug,
         "is_pinned": thread.is_pinned,
         "is_locked": thread.is_locked,
-        "view_count": thread.view_count,
+        "view_count": thread.view_count + thread_views.pending(thread.id),
         "post_count": thread.post_count,
         "created_at": thread.created_at,
         "updated_at": thread.updated_at,
@@ -283,11 +299,14 @@ async def create_thread(
     )
     db.add(first_post)
     
-    # Update category counts
-    category.thread_count += 1
-    category.post_count += 1
+    # Update category counts. In SQL, not Python: the cached counts are
+    # what list totals report, and a read-modify-write loses concurrent
+    # increments.
+    category.thread_count = ForumCategory.thread_count + 1
+    category.post_count = ForumCategory.post_count + 1
     
     db.commit()
+    record_post(current_user.id, count=2)  # the thread and its first post
     db.refresh(thread)
     
     # Create activity feed entry
@@ -372,8 +391,8 @@ async def delete_thread(
     # Update category counts
     category = db.query(ForumCategory).filter(ForumCategory.id == thread.category_id).first()
     if category:
-        category.thread_count = max(0, category.thread_count - 1)
-        category.post_count = max(0, category.post_count - thread.post_count)
+        category.thread_count = func.greatest(ForumCategory.thread_count - 1, 0)
+        category.post_count = func.greatest(ForumCategory.post_count - thread.post_count, 0)
     
     db.delete(thread)
     db.commit()
@@ -387,34 +406,44 @@ async def delete_thread(
 @router.get("/threads/{thread_id}/posts", response_model=ForumPostList)
 async def list_posts(
     thread_id: int,
-    page: int = Query(1, ge=1, le=10000),
+    page: int = Query(1, ge=1, le=10000, description="Deprecated: pass cursor instead"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Get posts in a thread with pagination"""
+    """Get posts in a thread, oldest first, a page at a time.
+
+    Pass the previous page's `next_cursor` to continue (utils/pagination.py).
+    `total` is the thread's cached post count.
+    """
     # Verify thread exists
     thread = db.query(ForumThread).filter(ForumThread.id == thread_id).first()
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
     
     # Build query
+    key_columns = (ForumPost.created_at, ForumPost.id)
     query = db.query(ForumPost).filter(ForumPost.thread_id == thread_id)
     query = query.options(joinedload(ForumPost.author))
-    query = query.order_by(ForumPost.created_at)
-    
-    # Get total count
-    total = query.count()
-    
+    query = query.order_by(*key_columns)
+
     # Apply pagination
-    offset = (page - 1) * limit
-    posts = query.offset(offset).limit(limit).all()
-    
+    if cursor:
+        key = pagination.decode_cursor(cursor, (datetime, int))
+        query = query.filter(pagination.after(key_columns, key, descending=False))
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+    posts, next_cursor = pagination.page(
+        query.limit(limit + 1).all(), limit, lambda p: [p.created_at, p.id]
+    )
+
     return {
         "posts": posts,
-        "total": total,
+        "total": thread.post_count,
         "page": page,
         "limit": limit,
-        "has_more": (offset + limit) < total
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
 
@@ -453,7 +482,7 @@ async def create_post(
     db.add(post)
     
     # Update thread
-    thread.post_count += 1
+    thread.post_count = ForumThread.post_count + 1
     thread.last_post_at = datetime.utcnow()
     thread.last_post_user_id = current_user.id
     thread.updated_at = datetime.utcnow()
@@ -461,9 +490,10 @@ async def create_post(
     # Update category count
     category = db.query(ForumCategory).filter(ForumCategory.id == thread.category_id).first()
     if category:
-        category.post_count += 1
+        category.post_count = ForumCategory.post_count + 1
     
     db.commit()
+    record_post(current_user.id)
     db.refresh(post)
     
     # Create activity feed entry (only for replies, not first post)
@@ -560,9 +590,9 @@ async def delete_post(
     
     # Update counts
     if thread:
-        thread.post_count = max(0, thread.post_count - 1)
+        thread.post_count = func.greatest(ForumThread.post_count - 1, 0)
     if category:
-        category.post_count = max(0, category.post_count - 1)
+        category.post_count = func.greatest(ForumCategory.post_count - 1, 0)
     
     db.delete(post)
     db.commit()
@@ -25,6 +25,7 @@ from app.schemas.gene import (
     GeneUpdate,
 )
 from app.utils.dependencies import get_current_user
+from app.utils import response_cache
 
 
 router = APIRouter()
@@ -150,6 +151,7 @@ async def create_gene(
 
     db.add(new_gene)
     db.commit()
+    response_cache.invalidate("genes")
     db.refresh(new_gene)
 
     return new_gene
@@ -186,6 +188,7 @@ async def update_gene(
         setattr(gene, field, value)
 
     db.commit()
+    response_cache.invalidate("genes")
     db.refresh(gene)
     return gene
 
@@ -210,4 +213,5 @@ async def delete_gene(
 
     db.delete(gene)
     db.commit()
+    response_cache.invalidate("genes")
     return None
@@ -24,6 +24,7 @@ from app.schemas.hv_feeder import (
     HvFeederStockCreate, HvFeederStockUpdate, HvFeederStockResponse,
     HvFeederStockListItem, HvFeederLogCreate, HvFeederLogResponse,
 )
+from app.services import batch_enrich
 from app.utils.dependencies import get_current_user
 from app.utils.limits import enforce_hv_premium
 
@@ -51,12 +52,18 @@ def _total_count(stock: HvFeederStock) -> Optional[int]:
     return None
 
 
-def _build_stock(stock: HvFeederStock, db: Session) -> dict:
-    sp: Optional[HvFeederSpecies] = None
-    if stock.hv_feeder_species_id:
-        sp = db.query(HvFeederSpecies).filter(
-            HvFeederSpecies.id == stock.hv_feeder_species_id
-        ).first()
+def _species_for(db: Session, stocks: List[HvFeederStock]) -> dict:
+    """Species names for a page of stocks, in one query (batch_enrich)."""
+    return batch_enrich.rows_by_id(
+        db, HvFeederSpecies, [s.hv_feeder_species_id for s in stocks],
+        "scientific_name", "common_names",
+    )
+
+
+def _build_stock(stock: HvFeederStock, db: Session, species_by_id: Optional[dict] = None) -> dict:
+    if species_by_id is None:
+        species_by_id = _species_for(db, [stock])
+    sp = species_by_id.get(stock.hv_feeder_species_id) if stock.hv_feeder_species_id else None
     total = _total_count(stock)
     is_low = (
         stock.low_threshold is not None
@@ -96,7 +103,8 @@ async def list_stocks(
     if not include_inactive:
         q = q.filter(HvFeederStock.is_active.is_(True))
     stocks = q.order_by(HvFeederStock.created_at.desc()).all()
-    return [HvFeederStockListItem(**_build_stock(s, db)) for s in stocks]
+    species_by_id = _species_for(db, stocks)
+    return [HvFeederStockListItem(**_build_stock(s, db, species_by_id)) for s in stocks]
 
 
 @router.post("/", response_model=HvFeederStockResponse, status_code=status.HTTP_201_CREATED)
@@ -5,13 +5,18 @@ Export endpoints are available to ALL users (free + premium) for GDPR
 compliance.  Import is also available to all users (subject to the
 per-tier tarantula limit enforced by the tarantulas router).
 """
-from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, UploadFile, File, Form, HTTPException, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Callable, Dict, Iterable, Optional
+from collections import Counter
+from datetime import datetime, timezone
+from uuid import UUID
 import io
 import json
+import logging
 import re
 import httpx
 
@@ -21,13 +26,23 @@ from app.utils.dependencies import get_current_user
 from app.utils.rate_limit import limiter
 from app.services import import_service
 from app.services.export_service import ExportService
+from app.services.species_resolver import SpeciesResolver
 from app.services.activity_service import create_activity
 from app.routers.inverts import create_invert_row
 from app.schemas.invert import InvertCreate
 from app.models.animal import Animal
+from app.models.import_job import ImportJob
+from app.models.invert_species import InvertSpecies
+from app.models.reptile_species import ReptileSpecies
 from app.models.tarantula import Sex, Source
 from app.schemas.animal import AnimalCreate
-from app.utils.limits import active_inverts_query, enforce_animal_limit
+from app.utils.limits import (
+    active_inverts_query,
+    remaining_animal_capacity,
+    remaining_collection_capacity,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     tags=["import-export"]
@@ -112,125 +127,263 @@ async def import_analyze(
         raise HTTPException(status_code=400, detail=f"Couldn't read that file: {e}")
 
 
-async def _import_commit_animals(
+# ---------------------------------------------------------------------------
+# Commit engine — shared by the synchronous route and the background job.
+#
+# Rows are streamed and committed in chunks of import_service.CHUNK_SIZE. Per
+# chunk: one species-column resolve, one commit, one times_kept bump per species.
+# The cap is counted once up front and counted down, instead of re-counting
+# the collection before every row. `on_chunk` is called after each commit
+# with the running totals — the job uses it as its progress bar.
+# ---------------------------------------------------------------------------
+
+ChunkCallback = Callable[[Dict[str, Any], int], None]
+
+
+def _empty_result() -> Dict[str, Any]:
+    return {
+        "imported": 0,
+        "updated": 0,
+        "skipped_duplicates": 0,
+        "error_rows": 0,
+        "errors": [],
+        "cap_reached": False,
+    }
+
+
+def _row_error(result: Dict[str, Any], message: str) -> None:
+    result["error_rows"] += 1
+    if len(result["errors"]) < 50:
+        result["errors"].append(message)
+
+
+def _bump_times_kept(db: Session, kept: Counter) -> None:
+    for species_id, n in kept.items():
+        db.query(InvertSpecies).filter(InvertSpecies.id == species_id).update(
+            {InvertSpecies.times_kept: func.coalesce(InvertSpecies.times_kept, 0) + n},
+            synchronize_session=False,
+        )
+    kept.clear()
+
+
+def _commit_invert_rows(
     db: Session,
     current_user: User,
-    content: bytes,
-    filename: str,
+    rows: Iterable[Dict[str, Any]],
+    col_map: Dict[str, Optional[str]],
+    default_taxon: str,
+    duplicate_mode: str,
+    unmapped_to_notes: bool,
+    on_chunk: Optional[ChunkCallback] = None,
+) -> Dict[str, Any]:
+    """Create (or update) inverts from the confirmed column mapping."""
+    from app.services.inverts_dualwrite import mirror_invert_update_to_legacy
+
+    existing_by_key: Dict[tuple, Any] = {}
+    for inv in active_inverts_query(db, current_user.id).all():
+        key = ((inv.name or "").strip().lower(), (inv.scientific_name or "").strip().lower())
+        existing_by_key.setdefault(key, inv)
+
+    result = _empty_result()
+    remaining = remaining_collection_capacity(db, current_user)
+    resolver = SpeciesResolver(db, InvertSpecies)
+    kept: Counter = Counter()
+    processed = 0
+
+    for chunk in import_service.chunked(rows):
+        resolver.resolve_many(import_service._mapped_values(chunk, col_map, "scientific_name"))
+        for raw in chunk:
+            processed += 1
+            norm = import_service.normalize_row(
+                db, raw, col_map, default_taxon, unmapped_to_notes,
+                resolver=resolver,
+            )
+            if norm["errors"]:
+                _row_error(result, f"Row {processed} ({norm['display_name']}): {', '.join(norm['errors'])}")
+                continue
+
+            payload = norm["payload"]
+            key = (
+                (payload.get("name") or "").strip().lower(),
+                (payload.get("scientific_name") or "").strip().lower(),
+            )
+            existing = existing_by_key.get(key) if key != ("", "") else None
+
+            if existing is not None:
+                if duplicate_mode == "update":
+                    for fld, val in payload.items():
+                        if fld == "taxon":  # taxon is immutable
+                            continue
+                        if hasattr(existing, fld):
+                            setattr(existing, fld, val)
+                    # ADR-005 dual-write. Without this a re-import updates the
+                    # unified row and leaves the legacy twin stale across the whole
+                    # file at once — the renamed-communal symptom multiplied by the
+                    # row count, and on a surface where nobody would think to look.
+                    mirror_invert_update_to_legacy(db, existing)
+                    result["updated"] += 1
+                else:
+                    result["skipped_duplicates"] += 1
+                continue
+
+            try:
+                create = InvertCreate(**payload)
+            except Exception as e:
+                _row_error(result, f"Row {processed} ({norm['display_name']}): {e}")
+                continue
+
+            if remaining is not None and remaining <= 0:
+                result["cap_reached"] = True
+                break
+            try:
+                inv = create_invert_row(
+                    db, current_user, create, enforce_limit=False, commit=False,
+                )
+            except HTTPException as he:
+                # Species/colony validation — raised before anything is added,
+                # so the rest of the chunk is unaffected.
+                _row_error(result, f"Row {processed} ({norm['display_name']}): {he.detail}")
+                continue
+            if remaining is not None:
+                remaining -= 1
+            if inv.species_id:
+                kept[inv.species_id] += 1
+            result["imported"] += 1
+            existing_by_key[key] = inv  # dedupe later rows within the same file
+
+        _bump_times_kept(db, kept)
+        db.commit()
+        if on_chunk:
+            on_chunk(result, processed)
+        if result["cap_reached"]:
+            break
+
+    return result
+
+
+def _commit_animal_rows(
+    db: Session,
+    current_user: User,
+    rows: Iterable[Dict[str, Any]],
     col_map: Dict[str, Optional[str]],
     default_taxon: str,
     duplicate_mode: str,
     unmapped_to_notes: bool,
+    on_chunk: Optional[ChunkCallback] = None,
 ) -> Dict[str, Any]:
     """Create (or update) Herpetoverse animals from the confirmed mapping.
 
     Mirrors the invert commit path but writes to the `animals` table and matches
     against `herp_species`. Cap-aware: stops at the HV free-tier animal limit and
     reports it (premium keepers are uncapped)."""
-    _headers, rows = import_service.parse_bytes(content, filename)
-
     existing_by_key: Dict[tuple, Any] = {}
     for a in db.query(Animal).filter(Animal.user_id == current_user.id).all():
         key = ((a.name or "").strip().lower(), (a.scientific_name or "").strip().lower())
         existing_by_key.setdefault(key, a)
 
-    imported = updated = skipped = error_rows = 0
-    errors: List[str] = []
-    cap_reached = False
+    result = _empty_result()
+    remaining = remaining_animal_capacity(db, current_user)
+    resolver = SpeciesResolver(db, ReptileSpecies)
+    processed = 0
+
+    for chunk in import_service.chunked(rows):
+        resolver.resolve_many(import_service._mapped_values(chunk, col_map, "scientific_name"))
+        for raw in chunk:
+            processed += 1
+            norm = import_service.normalize_animal_row(
+                db, raw, col_map, default_taxon, unmapped_to_notes,
+                resolver=resolver,
+            )
+            if norm["errors"]:
+                _row_error(result, f"Row {processed} ({norm['display_name']}): {', '.join(norm['errors'])}")
+                continue
+
+            payload = norm["payload"]
+            key = (
+                (payload.get("name") or "").strip().lower(),
+                (payload.get("scientific_name") or "").strip().lower(),
+            )
+            existing = existing_by_key.get(key) if key != ("", "") else None
 
-    for i, raw in enumerate(rows):
-        norm = import_service.normalize_animal_row(
-            db, raw, col_map, default_taxon, unmapped_to_notes
-        )
-        if norm["errors"]:
-            error_rows += 1
-            errors.append(f"Row {i + 1} ({norm['display_name']}): {', '.join(norm['errors'])}")
-            continue
-
-        payload = norm["payload"]
-        key = (
-            (payload.get("name") or "").strip().lower(),
-            (payload.get("scientific_name") or "").strip().lower(),
-        )
-        existing = existing_by_key.get(key) if key != ("", "") else None
-
-        if existing is not None:
-            if duplicate_mode == "update":
-                for fld, val in payload.items():
-                    if fld == "taxon":  # taxon is immutable
-                        continue
-                    if fld == "sex" and val:
-                        try:
-                            val = Sex(val)
-                        except ValueError:
-                            continue
-                    if fld == "source" and val:
-                        try:
-                            val = Source(val)
-                        except ValueError:
+            if existing is not None:
+                if duplicate_mode == "update":
+                    for fld, val in payload.items():
+                        if fld == "taxon":  # taxon is immutable
                             continue
-                    if hasattr(existing, fld):
-                        setattr(existing, fld, val)
-                db.commit()
-                updated += 1
-            else:
-                skipped += 1
-            continue
+                        if fld == "sex" and val:
+                            try:
+                                val = Sex(val)
+                            except ValueError:
+                                continue
+                        if fld == "source" and val:
+                            try:
+                                val = Source(val)
+                            except ValueError:
+                                continue
+                        if hasattr(existing, fld):
+                            setattr(existing, fld, val)
+                    result["updated"] += 1
+                else:
+                    result["skipped_duplicates"] += 1
+                continue
 
-        try:
-            create = AnimalCreate(**payload)
-        except Exception as e:
-            error_rows += 1
-            errors.append(f"Row {i + 1} ({norm['display_name']}): {e}")
-            continue
-
-        # Free-tier cap: stop importing NEW animals once the keeper is at the
-        # limit (updates to existing animals above are always allowed).
-        try:
-            enforce_animal_limit(db, current_user)
-        except HTTPException as he:
-            if he.status_code == status.HTTP_402_PAYMENT_REQUIRED:
-                cap_reached = True
+            try:
+                create = AnimalCreate(**payload)
+            except Exception as e:
+                _row_error(result, f"Row {processed} ({norm['display_name']}): {e}")
+                continue
+
+            # Free-tier cap: stop importing NEW animals once the keeper is at the
+            # limit (updates to existing animals above are always allowed).
+            if remaining is not None and remaining <= 0:
+                result["cap_reached"] = True
                 break
-            raise
 
-        data = create.model_dump()
-        if data.get("sex"):
-            try:
-                data["sex"] = Sex(data["sex"])
-            except ValueError:
-                data["sex"] = None
-        if data.get("source"):
-            try:
-                data["source"] = Source(data["source"])
-            except ValueError:
-                data["source"] = None
+            data = create.model_dump()
+            if data.get("sex"):
+                try:
+                    data["sex"] = Sex(data["sex"])
+                except ValueError:
+                    data["sex"] = None
+            if data.get("source"):
+                try:
+                    data["source"] = Source(data["source"])
+                except ValueError:
+                    data["source"] = None
+
+            animal = Animal(user_id=current_user.id, **data)
+            db.add(animal)
+            if remaining is not None:
+                remaining -= 1
+            result["imported"] += 1
+            existing_by_key[key] = animal
 
-        animal = Animal(user_id=current_user.id, **data)
-        db.add(animal)
         db.commit()
-        db.refresh(animal)
-        imported += 1
-        existing_by_key[key] = animal
+        if on_chunk:
+            on_chunk(result, processed)
+        if result["cap_reached"]:
+            break
+
+    return result
 
-    if imported or updated:
+
+async def _record_import_activity(db: Session, user_id, result: Dict[str, Any]) -> None:
+    if result["imported"] or result["updated"]:
         await create_activity(
             db=db,
-            user_id=current_user.id,
+            user_id=user_id,
             action_type="import_collection",
             target_type="collection",
-            target_id=current_user.id,
-            metadata={"imported": imported, "updated": updated},
+            target_id=user_id,
+            metadata={"imported": result["imported"], "updated": result["updated"]},
         )
 
-    return {
-        "imported": imported,
-        "updated": updated,
-        "skipped_duplicates": skipped,
-        "error_rows": error_rows,
-        "errors": errors[:50],
-        "cap_reached": cap_reached,
-    }
+
+def _parse_mapping(mapping: str) -> Dict[str, Optional[str]]:
+    try:
+        return json.loads(mapping)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid column mapping.")
 
 
 @router.post("/import/commit", status_code=status.HTTP_200_OK)
@@ -249,103 +402,168 @@ async def import_commit(
     stops at the free-tier limit and reports it. Duplicates (same name +
     scientific name) are skipped or updated per `duplicate_mode`.
 
-    `target="animal"` routes to the Herpetoverse `animals` table instead."""
+    `target="animal"` routes to the Herpetoverse `animals` table instead.
+    Large files should go through `POST /import/jobs`, which runs the same
+    commit in the background and reports progress."""
     content, filename = await _read_source(file, sheet_url)
-    try:
-        col_map: Dict[str, Optional[str]] = json.loads(mapping)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid column mapping.")
+    col_map = _parse_mapping(mapping)
 
+    _headers, rows = import_service.iter_rows(content, filename)
     if target == "animal":
-        return await _import_commit_animals(
-            db, current_user, content, filename, col_map,
+        result = _commit_animal_rows(
+            db, current_user, rows, col_map,
             default_taxon or "snake", duplicate_mode, unmapped_to_notes,
         )
+    else:
+        result = _commit_invert_rows(
+            db, current_user, rows, col_map,
+            default_taxon or "tarantula", duplicate_mode, unmapped_to_notes,
+        )
+    await _record_import_activity(db, current_user.id, result)
+    return result
 
-    _headers, rows = import_service.parse_bytes(content, filename)
 
-    existing_by_key: Dict[tuple, Any] = {}
-    for inv in active_inverts_query(db, current_user.id).all():
-        key = ((inv.name or "").strip().lower(), (inv.scientific_name or "").strip().lower())
-        existing_by_key.setdefault(key, inv)
+# ---------------------------------------------------------------------------
+# Background import jobs
+# ---------------------------------------------------------------------------
+
+def _job_response(job: ImportJob) -> Dict[str, Any]:
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "target": job.target,
+        "filename": job.filename,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "imported": job.imported,
+        "updated": job.updated,
+        "skipped_duplicates": job.skipped_duplicates,
+        "error_rows": job.error_rows,
+        "errors": job.errors or [],
+        "cap_reached": job.cap_reached,
+        "failure": job.failure,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
 
-    imported = updated = skipped = error_rows = 0
-    errors: List[str] = []
-    cap_reached = False
 
-    for i, raw in enumerate(rows):
-        norm = import_service.normalize_row(
-            db, raw, col_map, default_taxon or "tarantula", unmapped_to_notes
-        )
-        if norm["errors"]:
-            error_rows += 1
-            errors.append(f"Row {i + 1} ({norm['display_name']}): {', '.join(norm['errors'])}")
-            continue
-
-        payload = norm["payload"]
-        key = (
-            (payload.get("name") or "").strip().lower(),
-            (payload.get("scientific_name") or "").strip().lower(),
+def _run_import_job_sync(
+    db: Session,
+    job_id,
+    content: bytes,
+    filename: str,
+    col_map: Dict[str, Optional[str]],
+    default_taxon: str,
+    duplicate_mode: str,
+    unmapped_to_notes: bool,
+) -> Optional[Dict[str, Any]]:
+    job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    if job is None:
+        return None
+    user = db.query(User).filter(User.id == job.user_id).first()
+    try:
+        # A counting pass first so the client can show "x of N". Streaming
+        # keeps it cheap on memory; it's one extra parse, not a second copy.
+        _headers, counted = import_service.iter_rows(content, filename)
+        job.total_rows = sum(1 for _ in counted)
+        job.status = "running"
+        db.commit()
+
+        def on_chunk(result: Dict[str, Any], processed: int) -> None:
+            # Called right after the chunk's commit; the counters ride along
+            # with the next one, so progress never runs ahead of the data.
+            job.processed_rows = processed
+            for fld in ("imported", "updated", "skipped_duplicates", "error_rows", "cap_reached"):
+                setattr(job, fld, result[fld])
+            job.errors = list(result["errors"])
+            db.commit()
+
+        _headers, rows = import_service.iter_rows(content, filename)
+        commit_rows = _commit_animal_rows if job.target == "animal" else _commit_invert_rows
+        result = commit_rows(
+            db, user, rows, col_map, default_taxon, duplicate_mode,
+            unmapped_to_notes, on_chunk=on_chunk,
         )
-        existing = existing_by_key.get(key) if key != ("", "") else None
-
-        if existing is not None:
-            if duplicate_mode == "update":
-                for fld, val in payload.items():
-                    if fld == "taxon":  # taxon is immutable
-                        continue
-                    if hasattr(existing, fld):
-                        setattr(existing, fld, val)
-                # ADR-005 dual-write. Without this a re-import updates the
-                # unified row and leaves the legacy twin stale across the whole
-                # file at once — the renamed-communal symptom multiplied by the
-                # row count, and on a surface where nobody would think to look.
-                from app.services.inverts_dualwrite import (
-                    mirror_invert_update_to_legacy,
-                )
+        on_chunk(result, job.processed_rows if result["cap_reached"] else job.total_rows)
+        job.status = "succeeded"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return result
+    except Exception as e:
+        logger.exception("import job %s failed", job_id)
+        db.rollback()
+        job.status = "failed"
+        job.failure = str(e)[:500]
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return None
 
-                mirror_invert_update_to_legacy(db, existing)
-                db.commit()
-                updated += 1
-            else:
-                skipped += 1
-            continue
 
-        try:
-            create = InvertCreate(**payload)
-        except Exception as e:
-            error_rows += 1
-            errors.append(f"Row {i + 1} ({norm['display_name']}): {e}")
-            continue
+async def _run_import_job(session_factory, job_id, *args) -> None:
+    """Background task body. Runs the blocking commit loop off the event
+    loop, then records the activity entry like the synchronous route does."""
+    db = session_factory()
+    try:
+        result = await run_in_threadpool(_run_import_job_sync, db, job_id, *args)
+        if result is not None:
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            await _record_import_activity(db, job.user_id, result)
+    finally:
+        db.close()
 
-        try:
-            inv = create_invert_row(db, current_user, create, enforce_limit=True)
-        except HTTPException as he:
-            if he.status_code == status.HTTP_402_PAYMENT_REQUIRED:
-                cap_reached = True
-                break
-            raise
-        imported += 1
-        existing_by_key[key] = inv  # dedupe later rows within the same file
 
-    if imported or updated:
-        await create_activity(
-            db=db,
-            user_id=current_user.id,
-            action_type="import_collection",
-            target_type="collection",
-            target_id=current_user.id,
-            metadata={"imported": imported, "updated": updated},
-        )
+@router.post("/import/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(None),
+    sheet_url: str = Form(None),
+    mapping: str = Form(...),
+    default_taxon: str = Form("tarantula"),
+    duplicate_mode: str = Form("skip"),
+    unmapped_to_notes: bool = Form(True),
+    target: str = Form("invert"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Queue the same commit as `/import/commit` to run in the background.
 
-    return {
-        "imported": imported,
-        "updated": updated,
-        "skipped_duplicates": skipped,
-        "error_rows": error_rows,
-        "errors": errors[:50],
-        "cap_reached": cap_reached,
-    }
+    Returns immediately with the job; poll `GET /import/jobs/{id}` for
+    progress. This is the path for big breeder spreadsheets — a 20k-row file
+    would otherwise hold the request open past any proxy timeout."""
+    content, filename = await _read_source(file, sheet_url)
+    col_map = _parse_mapping(mapping)
+    target = "animal" if target == "animal" else "invert"
+
+    job = ImportJob(user_id=current_user.id, target=target, filename=filename[:255])
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    # Same bind as the request's session, so the job writes wherever the
+    # request would have (tests bind sessions to a single connection).
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False)
+    background_tasks.add_task(
+        _run_import_job, session_factory, job.id, content, filename, col_map,
+        default_taxon or ("snake" if target == "animal" else "tarantula"),
+        duplicate_mode, unmapped_to_notes,
+    )
+    return _job_response(job)
+
+
+@router.get("/import/jobs/{job_id}")
+async def get_import_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Progress and result of a background import."""
+    job = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.user_id == current_user.id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return _job_response(job)
 
 
 # ---------------------------------------------------------------------------
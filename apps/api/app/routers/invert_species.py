@@ -29,6 +29,8 @@ from app.schemas.invert_species import (
     TAXON_PATTERN, InvertSpeciesCreate, InvertSpeciesResponse, InvertSpeciesUpdate,
 )
 from app.utils.dependencies import get_current_user
+from app.services import species_resolver
+from app.utils import response_cache
 
 router = APIRouter()
 
@@ -173,6 +175,8 @@ async def create_invert_species(
     )
     db.add(new_species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species", "species")
     db.refresh(new_species)
     return new_species
 
@@ -219,6 +223,8 @@ async def update_invert_species(
     mirror_invert_species_update_to_legacy(db, species)
 
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species", "species")
     db.refresh(species)
     return species
 
@@ -248,4 +254,6 @@ async def delete_invert_species(
         )
     db.delete(species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species", "species")
     return None
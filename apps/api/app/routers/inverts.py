@@ -20,8 +20,8 @@ from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -43,9 +43,11 @@ from app.schemas.invert import (
     InvertResponse,
     InvertUpdate,
 )
+from app.services import batch_enrich, public_profiles
 from app.services.growth_service import compute_growth_fields
 from app.services.feeding_reminder_service import parse_frequency_string
 from app.utils.dependencies import get_current_user
+from app.utils.etag import conditional_json
 from app.utils.limits import active_inverts_query, enforce_collection_limit
 from app.schemas.death import MarkDiedRequest
 
@@ -187,13 +189,18 @@ def create_invert_row(
     user: User,
     payload: InvertCreate,
     enforce_limit: bool = True,
+    commit: bool = True,
 ) -> Invert:
     """Create one invert for `user`. Shared by the create endpoint and the
     bulk importer so both go through the same validation, enum coercion,
     default visibility, and species times_kept bump.
 
-    enforce_limit=False lets the importer gate capacity itself (it catches the
-    402 once, rather than per row) — callers that pass False must handle the cap.
+    enforce_limit=False lets the importer gate capacity itself (it counts the
+    remaining room once, rather than per row) — callers that pass False must
+    handle the cap.
+
+    commit=False only flushes, and leaves the species times_kept bump to the
+    caller — the importer commits per chunk and bumps each species once.
     """
     if enforce_limit:
         enforce_collection_limit(db, user)
@@ -218,6 +225,9 @@ def create_invert_row(
 
     mirror_invert_create_to_legacy(db, new_invert)
 
+    if not commit:
+        return new_invert
+
     db.commit()
     db.refresh(new_invert)
 
@@ -450,6 +460,170 @@ async def list_feeding_status(
     return items
 
 
+# --- Feeding stats ----------------------------------------------------------
+#
+# Shared by the per-animal route and the collection-wide batch route, so a
+# card renders the same badge whichever one it was fed from.
+
+
+def _feeding_totals(db: Session, invert_ids: List[UUID]) -> dict:
+    """{invert_id: (total, accepted, last_accepted_fed_at)} in one pass over
+    feeding_logs. The aggregates are windowed per animal and one row per
+    partition is kept, so the database never ships the log history itself.
+    Animals with no logs are absent.
+
+    `accepted IS TRUE`, not truthiness at the SQL level: a NULL accepted
+    isn't a meal, matching how the per-animal route always counted it.
+    """
+    if not invert_ids:
+        return {}
+    per_animal = {"partition_by": FeedingLog.invert_id}
+    accepted = FeedingLog.accepted.is_(True)
+    windowed = (
+        db.query(
+            FeedingLog.invert_id.label("invert_id"),
+            func.count().over(**per_animal).label("total"),
+            func.count().filter(accepted).over(**per_animal).label("accepted"),
+            func.max(FeedingLog.fed_at).filter(accepted).over(**per_animal).label("last_accepted"),
+            func.row_number().over(**per_animal).label("rn"),
+        )
+        .filter(FeedingLog.invert_id.in_(invert_ids))
+        .subquery()
+    )
+    rows = (
+        db.query(windowed.c.invert_id, windowed.c.total, windowed.c.accepted, windowed.c.last_accepted)
+        .filter(windowed.c.rn == 1)
+        .all()
+    )
+    return {r.invert_id: (r.total, r.accepted, r.last_accepted) for r in rows}
+
+
+def _feeding_stats(
+    db: Session,
+    inverts: List[Invert],
+    tz_offset_minutes: Optional[int],
+) -> List[InvertFeedingStats]:
+    """InvertFeedingStats for each invert, in order — two queries whatever
+    the collection size (feeding totals + the referenced species)."""
+    totals = _feeding_totals(db, [inv.id for inv in inverts])
+    species_by_id = batch_enrich.rows_by_id(db, InvertSpecies, (inv.species_id for inv in inverts))
+
+    now = datetime.now(timezone.utc)
+    # Pause state — a paused animal (premolt / recovering / etc.) shouldn't
+    # trigger overdue treatment. Trumps the days-since badge on the client.
+    today_local = (
+        (now + timedelta(minutes=-(tz_offset_minutes or 0))).date()
+        if tz_offset_minutes is not None
+        else now.date()
+    )
+
+    out: List[InvertFeedingStats] = []
+    for inv in inverts:
+        total_feedings, total_accepted, last_feeding_date = totals.get(inv.id, (0, 0, None))
+        acceptance_rate = (
+            round(total_accepted / total_feedings * 100, 1) if total_feedings else 0.0
+        )
+        days_since_last_feeding = (
+            _calendar_day_diff(now, last_feeding_date, tz_offset_minutes)
+            if last_feeding_date is not None else None
+        )
+        is_feeding_paused = bool(
+            inv.feeding_paused_reason
+            and (inv.feeding_paused_until is None or inv.feeding_paused_until >= today_local)
+        )
+
+        # Cadence, computed the SAME way as the list endpoint and the daily
+        # digest. Without these two fields the detail screen could only say
+        # "fed 11d ago" and had to guess whether that was fine — which is how
+        # the collection grid ended up with a flat day threshold that
+        # disagreed with everything else.
+        interval_days, interval_source = _recommended_feeding_interval_with_source(
+            inv.life_stage, species_by_id.get(inv.species_id), inv.feeding_interval_days
+        )
+        is_overdue = (
+            (not is_feeding_paused)
+            and interval_days is not None
+            and last_feeding_date is not None
+            and days_since_last_feeding is not None
+            and days_since_last_feeding >= interval_days
+        )
+
+        out.append(InvertFeedingStats(
+            invert_id=inv.id,
+            total_feedings=total_feedings,
+            total_accepted=total_accepted,
+            acceptance_rate=acceptance_rate,
+            last_feeding_date=last_feeding_date,
+            days_since_last_feeding=days_since_last_feeding,
+            is_feeding_paused=is_feeding_paused,
+            feeding_paused_reason=inv.feeding_paused_reason,
+            feeding_paused_until=inv.feeding_paused_until,
+            interval_days=interval_days,
+            interval_source=interval_source,
+            is_overdue=is_overdue,
+        ))
+    return out
+
+
+_FEEDING_STATS_LIST = TypeAdapter(List[InvertFeedingStats])
+
+# One collection screen's worth. A keeper past this is paging anyway, and an
+# unbounded IN list in a query string eventually hits proxy URL limits.
+MAX_FEEDING_STATS_IDS = 500
+
+
+@router.get("/feeding-stats", response_model=List[InvertFeedingStats])
+async def list_feeding_stats(
+    request: Request,
+    ids: Optional[List[UUID]] = Query(
+        None,
+        description=(
+            "Animals to summarize (repeat the parameter). Omit for the whole "
+            "active collection. Ids that aren't yours are skipped, not 404'd — "
+            "one stale card shouldn't fail the batch."
+        ),
+    ),
+    tz_offset_minutes: Optional[int] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Feeding stats for many animals in one request — the batch form of
+    `/{invert_id}/feeding-stats`, same shape per item, same rules.
+
+    The collection list used to fetch this per card: a 400-animal collection
+    was 400 requests and ~1,200 queries. This is three queries (animals,
+    feeding totals, species) regardless of size.
+
+    Conditional: the response carries an ETag and a matching If-None-Match
+    gets a bodiless 304, so a client re-polling an unchanged collection
+    doesn't re-download or re-render it. Revalidation is required on every
+    request (`no-cache`) because days-since-fed changes at midnight.
+
+    NOTE: declared before `/{invert_id}` for the same reason as
+    /feeding-status.
+    """
+    if ids:
+        if len(ids) > MAX_FEEDING_STATS_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_FEEDING_STATS_IDS} ids per request.",
+            )
+        inverts = (
+            db.query(Invert)
+            .filter(Invert.user_id == current_user.id, Invert.id.in_(ids))
+            .all()
+        )
+        position = {}
+        for i, invert_id in enumerate(ids):
+            position.setdefault(invert_id, i)
+        inverts.sort(key=lambda inv: position[inv.id])
+    else:
+        inverts = active_inverts_query(db, current_user.id).order_by(Invert.created_at.desc()).all()
+
+    body = _FEEDING_STATS_LIST.dump_json(_feeding_stats(db, inverts, tz_offset_minutes))
+    return conditional_json(request, body, headers={"Cache-Control": "private, no-cache"})
+
+
 @router.get("/{invert_id}", response_model=InvertResponse)
 async def get_invert(
     invert_id: UUID,
@@ -515,6 +689,8 @@ async def update_invert(
 
     db.commit()
     db.refresh(invert)
+    # The legacy twin shares the id, so this is the /t/{id} profile too.
+    public_profiles.invalidate(invert.id)
     return invert
 
 
@@ -607,12 +783,19 @@ async def delete_invert(
 
     db.delete(invert)
     db.commit()
+    public_profiles.invalidate(invert_id)
     return None
 
 
 @router.get("/{invert_id}/growth", response_model=InvertGrowthAnalytics)
 async def get_invert_growth(
     invert_id: UUID,
+    start: Optional[datetime] = Query(None, description="Only molts on or after this time."),
+    end: Optional[datetime] = Query(None, description="Only molts on or before this time."),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=5000,
+        description="Downsample data_points to about this many (LTTB). Summary stats still cover every molt.",
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -634,16 +817,9 @@ async def get_invert_growth(
             detail="Invert not found",
         )
 
-    molt_logs = (
-        db.query(MoltLog)
-        .filter(MoltLog.invert_id == invert_id)
-        .order_by(MoltLog.molted_at)
-        .all()
-    )
-
     return InvertGrowthAnalytics(
         invert_id=invert_id,
-        **compute_growth_fields(molt_logs),
+        **compute_growth_fields(db, MoltLog.invert_id, invert_id, start, end, max_points),
     )
 
 
@@ -661,8 +837,9 @@ async def get_invert_feeding_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Lean feeding summary for any invert — powers the collection list
-    feeding badge (days-since + paused), taxon-agnostic.
+    """Lean feeding summary for any invert — the collection list feeding
+    badge (days-since + paused), taxon-agnostic. Lists should use the batch
+    GET /feeding-stats rather than calling this per card.
 
     `days_since_last_feeding` is measured from the last ACCEPTED feeding;
     refusals are tracked but aren't meals (same rule as the tarantula
@@ -679,75 +856,7 @@ async def get_invert_feeding_stats(
             detail="Invert not found",
         )
 
-    # Pause state — a paused animal (premolt / recovering / etc.) shouldn't
-    # trigger overdue treatment. Trumps the days-since badge on the client.
-    today_local = (
-        datetime.now(timezone.utc) + timedelta(minutes=-(tz_offset_minutes or 0))
-    ).date() if tz_offset_minutes is not None else datetime.now(timezone.utc).date()
-    is_feeding_paused = bool(
-        invert.feeding_paused_reason
-        and (
-            invert.feeding_paused_until is None
-            or invert.feeding_paused_until >= today_local
-        )
-    )
-
-    feeding_logs = (
-        db.query(FeedingLog)
-        .filter(FeedingLog.invert_id == invert_id)
-        .order_by(FeedingLog.fed_at)
-        .all()
-    )
-
-    total_feedings = len(feeding_logs)
-    accepted_logs = [log for log in feeding_logs if log.accepted]
-    total_accepted = len(accepted_logs)
-    acceptance_rate = (
-        round(total_accepted / total_feedings * 100, 1) if total_feedings else 0.0
-    )
-
-    if accepted_logs:
-        last_feeding_date = accepted_logs[-1].fed_at
-        days_since_last_feeding = _calendar_day_diff(
-            datetime.now(timezone.utc), last_feeding_date, tz_offset_minutes
-        )
-    else:
-        last_feeding_date = None
-        days_since_last_feeding = None
-
-    # Cadence, computed the SAME way as the list endpoint and the daily digest.
-    # Without these two fields the detail screen could only say "fed 11d ago"
-    # and had to guess whether that was fine — which is how the collection grid
-    # ended up with a flat day threshold that disagreed with everything else.
-    species = (
-        db.query(InvertSpecies).filter(InvertSpecies.id == invert.species_id).first()
-        if invert.species_id else None
-    )
-    interval_days, interval_source = _recommended_feeding_interval_with_source(
-        invert.life_stage, species, invert.feeding_interval_days
-    )
-    is_overdue = (
-        (not is_feeding_paused)
-        and interval_days is not None
-        and last_feeding_date is not None
-        and days_since_last_feeding is not None
-        and days_since_last_feeding >= interval_days
-    )
-
-    return InvertFeedingStats(
-        invert_id=invert_id,
-        total_feedings=total_feedings,
-        total_accepted=total_accepted,
-        acceptance_rate=acceptance_rate,
-        last_feeding_date=last_feeding_date,
-        days_since_last_feeding=days_since_last_feeding,
-        is_feeding_paused=is_feeding_paused,
-        feeding_paused_reason=invert.feeding_paused_reason,
-        feeding_paused_until=invert.feeding_paused_until,
-        interval_days=interval_days,
-        interval_source=interval_source,
-        is_overdue=is_overdue,
-    )
+    return _feeding_stats(db, [invert], tz_offset_minutes)[0]
 
 
 # --- Death (ADR-015) --------------------------------------------------------
@@ -1,15 +1,18 @@
 """
 Community/Keeper routes - Public profiles and discovery
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from typing import List, Optional
+from datetime import datetime
+import uuid
 from app.database import get_db
 from app.models.user import User
 from app.models.tarantula import Tarantula
 from app.schemas.user import UserResponse
 from app.schemas.tarantula import TarantulaResponse
+from app.utils import pagination
 from app.utils.dependencies import get_current_user_optional
 
 router = APIRouter()
@@ -17,11 +20,13 @@ router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
 async def list_public_keepers(
+    response: Response,
     experience_level: Optional[str] = Query(None, description="Filter by experience level"),
     specialty: Optional[str] = Query(None, description="Filter by specialty"),
     search: Optional[str] = Query(None, description="Search by username, display name, or location"),
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
-    offset: int = Query(0, ge=0, le=10000, description="Number of results to skip"),
+    offset: int = Query(0, ge=0, le=10000, description="Deprecated: pass cursor instead"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     """
@@ -31,7 +36,9 @@ async def list_public_keepers(
     - **specialty**: Filter by specialty (e.g., 'arboreal', 'breeding')
     - **search**: Search username, display name, or location
     - **limit**: Max 100 results
-    - **offset**: For pagination
+    - **cursor**: For pagination — the previous page's `X-Next-Cursor`
+      response header, absent on the last page (utils/pagination.py)
+    - **offset**: Older clients; slower the deeper it goes
     """
     # Base query - only public keepers
     query = db.query(User).filter(User.collection_visibility == 'public')
@@ -45,6 +52,8 @@ async def list_public_keepers(
         query = query.filter(User.profile_specialties.contains([specialty]))
     
     if search:
+        # Each column has a trigram index (kpr_20261019_keyset_pagination),
+        # so a substring match doesn't scan every public keeper.
         search_term = f"%{search}%"
         query = query.filter(
             or_(
@@ -54,11 +63,25 @@ async def list_public_keepers(
             )
         )
     
-    # Order by most recently created/updated profiles first
-    query = query.order_by(User.created_at.desc())
+    # Newest profiles first; id breaks ties so the order is total.
+    key_columns = (User.created_at, User.id)
+    query = query.order_by(*(c.desc() for c in key_columns))
     
     # Apply pagination
-    keepers = query.offset(offset).limit(limit).all()
+    if cursor:
+        created_at, keeper_id = pagination.decode_cursor(cursor, (datetime, str))
+        try:
+            key = (created_at, uuid.UUID(keeper_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(pagination.after(key_columns, key, descending=True))
+    elif offset:
+        query = query.offset(offset)
+    keepers, next_cursor = pagination.page(
+        query.limit(limit + 1).all(), limit, lambda k: [k.created_at, str(k.id)]
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return [UserResponse.from_orm(keeper) for keeper in keepers]
 
@@ -12,10 +12,17 @@ from app.models.tarantula import Tarantula
 from app.models.scorpion import Scorpion
 from app.models.invert import Invert
 from app.models.molt_log import MoltLog
-from app.schemas.molt import MoltLogCreate, MoltLogUpdate, MoltLogResponse
+from app.schemas.bulk_log import BulkLogResult, BulkLogSkip
+from app.schemas.molt import (
+    BulkMoltRequest,
+    MoltLogCreate,
+    MoltLogResponse,
+    MoltLogUpdate,
+)
 from app.utils.dependencies import get_current_user
+from app.services import bulk_logs, public_profiles
 from app.services.activity_service import create_activity
-from app.services.inverts_dualwrite import invert_id_if_exists  # ADR-005 A2
+from app.services.inverts_dualwrite import invert_id_in_insert  # ADR-005 A2
 
 router = APIRouter()
 
@@ -103,13 +110,14 @@ async def create_molt_log(
 
     new_molt = MoltLog(
         tarantula_id=tarantula_id,
-        invert_id=invert_id_if_exists(db, tarantula_id),  # ADR-005 A2
+        invert_id=invert_id_in_insert(tarantula_id),  # ADR-005 A2
         **molt_data.model_dump()
     )
 
     db.add(new_molt)
     db.commit()
     db.refresh(new_molt)
+    public_profiles.invalidate(tarantula_id)
     
     # Create activity feed entry
     await create_activity(
@@ -179,7 +187,7 @@ async def create_scorpion_molt_log(
 
     new_molt = MoltLog(
         scorpion_id=scorpion_id,
-        invert_id=invert_id_if_exists(db, scorpion_id),  # ADR-005 A2
+        invert_id=invert_id_in_insert(scorpion_id),  # ADR-005 A2
         **molt_data.model_dump(),
     )
     db.add(new_molt)
@@ -353,6 +361,46 @@ async def create_invert_molt_log(
     return new_molt
 
 
+@router.post(
+    "/inverts/bulk-molts",
+    response_model=BulkLogResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_invert_molts(
+    payload: BulkMoltRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Log the same molt across many owned inverts in one write.
+
+    Sets only invert_id, like the single-invert path. Unowned ids are
+    skipped and reported. One multi-row INSERT via
+    services/bulk_logs, not one flush per animal.
+    """
+    requested = list(dict.fromkeys(payload.invert_ids))
+    owned_ids = {
+        row.id
+        for row in db.query(Invert.id)
+        .filter(Invert.id.in_(requested), Invert.user_id == current_user.id)
+        .all()
+    }
+    created_ids = [iid for iid in requested if iid in owned_ids]
+    molt_fields = payload.model_dump(exclude={"invert_ids"})
+    bulk_logs.insert_rows(
+        db, MoltLog, [{"invert_id": iid, **molt_fields} for iid in created_ids]
+    )
+    db.commit()
+    return BulkLogResult(
+        created_count=len(created_ids),
+        created_ids=created_ids,
+        skipped=[
+            BulkLogSkip(invert_id=iid, reason="Not found or not yours")
+            for iid in requested
+            if iid not in owned_ids
+        ],
+    )
+
+
 @router.get("/molts/{molt_id}", response_model=MoltLogResponse)
 async def get_molt_log(
     molt_id: uuid.UUID,
@@ -391,6 +439,7 @@ async def update_molt_log(
 
     db.commit()
     db.refresh(molt)
+    public_profiles.invalidate(molt.tarantula_id)
     return molt
 
 
@@ -407,8 +456,10 @@ async def delete_molt_log(
     if _molt_owner_parent(molt, db, current_user) is None:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    tarantula_id = molt.tarantula_id
     db.delete(molt)
     db.commit()
+    public_profiles.invalidate(tarantula_id)
     return None
 
 
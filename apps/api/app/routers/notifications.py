@@ -15,6 +15,7 @@ from app.database import get_db
 from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import NotificationResponse, UnreadCountResponse
+from app.services import realtime
 from app.utils.dependencies import get_current_user
 
 router = APIRouter()
@@ -62,8 +63,11 @@ async def mark_read(
     )
     if not notif:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    was_unread = not notif.is_read
     notif.is_read = True
     db.commit()
+    if was_unread:
+        realtime.publish(current_user.id, realtime.read_event("notifications", 1))
     return {"ok": True}
 
 
@@ -72,11 +76,13 @@ async def mark_all_read(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db.query(Notification).filter(
+    marked = db.query(Notification).filter(
         Notification.user_id == current_user.id,
         Notification.is_read.is_(False),
     ).update({"is_read": True})
     db.commit()
+    if marked:
+        realtime.publish(current_user.id, realtime.read_event("notifications", marked))
     return {"ok": True}
 
 
@@ -94,8 +100,11 @@ async def delete_notification(
     )
     if not notif:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    was_unread = not notif.is_read
     db.delete(notif)
     db.commit()
+    if was_unread:
+        realtime.publish(current_user.id, realtime.read_event("notifications", 1))
     return None
 
 
@@ -107,6 +116,7 @@ async def clear_all_notifications(
     """Clear (delete) all of the current user's notifications."""
     db.query(Notification).filter(Notification.user_id == current_user.id).delete()
     db.commit()
+    realtime.publish(current_user.id, realtime.unread_event(notifications=0))
     return None
 
 
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
 from pydantic import BaseModel, Field
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Literal, Optional
 import logging
 import uuid
 from datetime import datetime
@@ -14,6 +15,8 @@ from app.models.scorpion import Scorpion
 from app.models.invert import Invert
 from app.routers.auth import get_current_user
 from app.models.user import User
+from app.services import photo_blobs, public_profiles
+from app.services.photo_variants import photo_payload
 from app.services.storage import storage_service
 from app.config import settings
 from app.utils.file_validation import validate_image_bytes
@@ -102,7 +105,8 @@ async def upload_photo(
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
         # Upload to storage service (R2 or local)
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,  # use verified MIME, not client-supplied
@@ -113,8 +117,7 @@ async def upload_photo(
             id=str(uuid.uuid4()),
             tarantula_id=tarantula_id,
             invert_id=invert_id_if_exists(db, tarantula_id),  # ADR-005 A2
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow()
@@ -127,19 +130,13 @@ async def upload_photo(
         # photos predating the ADR-005 backfill — sync_hero_photo keys on the
         # shared primary key instead, so those are covered too.
         if not tarantula.photo_url:
-            sync_hero_photo(db, tarantula, photo_url)
+            sync_hero_photo(db, tarantula, uploaded.url)
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat()
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -169,17 +166,7 @@ async def get_photos(
         Photo.tarantula_id == tarantula_id
     ).order_by(Photo.created_at.desc()).all()
 
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat()
-        }
-        for photo in photos
-    ]
+    return [photo_payload(photo) for photo in photos]
 
 
 def _photo_owner_parent(photo: Photo, db: Session, user: User):
@@ -258,7 +245,8 @@ async def upload_animal_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -267,8 +255,7 @@ async def upload_animal_photo(
         photo = Photo(
             id=str(uuid.uuid4()),
             animal_id=animal_id,
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -278,19 +265,13 @@ async def upload_animal_photo(
 
         # First photo becomes the animal's main photo (mirrors tarantula path).
         if not animal.photo_url:
-            animal.photo_url = photo_url
+            animal.photo_url = uploaded.url
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -322,17 +303,7 @@ async def get_animal_photos(
         .all()
     )
 
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
-        for photo in photos
-    ]
+    return [photo_payload(photo) for photo in photos]
 
 
 @router.post("/scorpions/{scorpion_id}/photos")
@@ -371,7 +342,8 @@ async def upload_scorpion_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -381,8 +353,7 @@ async def upload_scorpion_photo(
             id=str(uuid.uuid4()),
             scorpion_id=scorpion_id,
             invert_id=invert_id_if_exists(db, scorpion_id),  # ADR-005 A2
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -395,19 +366,13 @@ async def upload_scorpion_photo(
         # generic invert detail/collection (which read Invert.photo_url) show
         # it rather than the generic glyph. ADR-008.
         if not scorpion.photo_url:
-            sync_hero_photo(db, scorpion, photo_url)
+            sync_hero_photo(db, scorpion, uploaded.url)
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -439,17 +404,7 @@ async def get_scorpion_photos(
         .all()
     )
 
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
-        for photo in photos
-    ]
+    return [photo_payload(photo) for photo in photos]
 
 
 @router.post("/centipedes/{centipede_id}/photos")
@@ -487,7 +442,8 @@ async def upload_centipede_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -496,8 +452,7 @@ async def upload_centipede_photo(
         photo = Photo(
             id=str(uuid.uuid4()),
             invert_id=centipede_id,
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -505,19 +460,13 @@ async def upload_centipede_photo(
         db.add(photo)
 
         if not centipede.photo_url:
-            sync_hero_photo(db, centipede, photo_url)
+            sync_hero_photo(db, centipede, uploaded.url)
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -549,17 +498,7 @@ async def get_centipede_photos(
         .all()
     )
 
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
-        for photo in photos
-    ]
+    return [photo_payload(photo) for photo in photos]
 
 
 @router.post("/whip-spiders/{whip_spider_id}/photos")
@@ -593,7 +532,8 @@ async def upload_whip_spider_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -602,8 +542,7 @@ async def upload_whip_spider_photo(
         photo = Photo(
             id=str(uuid.uuid4()),
             invert_id=whip_spider_id,
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -611,19 +550,13 @@ async def upload_whip_spider_photo(
         db.add(photo)
 
         if not whip_spider.photo_url:
-            sync_hero_photo(db, whip_spider, photo_url)
+            sync_hero_photo(db, whip_spider, uploaded.url)
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -655,17 +588,7 @@ async def get_whip_spider_photos(
         .all()
     )
 
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
-        for photo in photos
-    ]
+    return [photo_payload(photo) for photo in photos]
 
 
 # ---------------------------------------------------------------------------
@@ -698,7 +621,8 @@ async def upload_invert_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -706,8 +630,7 @@ async def upload_invert_photo(
         photo = Photo(
             id=str(uuid.uuid4()),
             invert_id=invert_id,
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -717,17 +640,11 @@ async def upload_invert_photo(
         # a tarantula's very first photo would show on the detail screen and
         # not on the collection card.
         if not invert.photo_url:
-            sync_hero_photo(db, invert, photo_url)
+            sync_hero_photo(db, invert, uploaded.url)
         db.commit()
         db.refresh(photo)
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
+        return photo_payload(photo)
     except HTTPException:
         raise
     except Exception:
@@ -771,7 +688,8 @@ async def upload_colony_photo(
         if len(file_data) > max_size:
             raise HTTPException(status_code=400, detail="File size exceeds 15 MB limit")
 
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=detected_mime,
@@ -779,8 +697,7 @@ async def upload_colony_photo(
         photo = Photo(
             id=str(uuid.uuid4()),
             colony_id=colony_id,
-            url=photo_url,
-            thumbnail_url=thumbnail_url,
+            **uploaded.columns(),
             caption=caption,
             taken_at=datetime.utcnow(),
             created_at=datetime.utcnow(),
@@ -788,17 +705,11 @@ async def upload_colony_photo(
         db.add(photo)
         # First upload becomes the hero, same as every other parent type.
         if not colony.photo_url:
-            colony.photo_url = photo_url
+            colony.photo_url = uploaded.url
         db.commit()
         db.refresh(photo)
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
+        return photo_payload(photo)
     except HTTPException:
         raise
     except Exception:
@@ -828,17 +739,7 @@ async def get_colony_photos(
         .order_by(Photo.created_at.desc())
         .all()
     )
-    return [
-        {
-            "id": p.id,
-            "url": p.url,
-            "thumbnail_url": p.thumbnail_url,
-            "caption": p.caption,
-            "taken_at": p.taken_at.isoformat() if p.taken_at else None,
-            "created_at": p.created_at.isoformat(),
-        }
-        for p in photos
-    ]
+    return [photo_payload(p) for p in photos]
 
 
 @router.get("/inverts/{invert_id}/photos")
@@ -860,17 +761,87 @@ async def get_invert_photos(
         .order_by(Photo.created_at.desc())
         .all()
     )
-    return [
-        {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
-        for photo in photos
+    return [photo_payload(photo) for photo in photos]
+
+
+# One collection screen's worth, as for /inverts/feeding-stats.
+MAX_BATCH_PARENTS = 500
+
+
+def _batch_parent(kind: str):
+    """(parent model, Photo FK column) for a batch `kind`."""
+    from app.models.colony import Colony
+
+    return {
+        "tarantula": (Tarantula, Photo.tarantula_id),
+        "animal": (Animal, Photo.animal_id),
+        "scorpion": (Scorpion, Photo.scorpion_id),
+        "invert": (Invert, Photo.invert_id),
+        "colony": (Colony, Photo.colony_id),
+    }[kind]
+
+
+@router.get("/photos/batch")
+async def get_photos_batch(
+    kind: Literal["tarantula", "animal", "scorpion", "invert", "colony"],
+    ids: List[uuid.UUID] = Query(
+        ...,
+        description=(
+            "Parents to list (repeat the parameter). Ids that aren't yours "
+            "are left out of the result, not 404'd."
+        ),
+    ),
+    per_parent: Optional[int] = Query(
+        None, ge=1, le=100,
+        description="Only each parent's most recent N photos (e.g. 1 for a grid cover).",
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Photos for many parents of one kind in one request: `{parent_id:
+    [photo, ...]}`, most recent first, same shape per photo as the
+    per-parent lists. Every owned parent asked for gets a key, so an empty
+    list means "no photos", not "not loaded".
+
+    A collection grid used to call `/{kind}s/{id}/photos` once per card;
+    this is two queries (owned parents, then their photos) whatever the
+    count. With `per_parent` the cut is made in SQL by row_number(), so a
+    grid asking for covers doesn't pull every photo of every animal.
+    Centipedes and whip spiders are `invert`.
+
+    NOTE: declared before the `/photos/{photo_id}` routes.
+    """
+    if len(ids) > MAX_BATCH_PARENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_PARENTS} ids per request.",
+        )
+    model, parent_column = _batch_parent(kind)
+    owned = [
+        row.id for row in db.query(model.id).filter(
+            model.id.in_(ids),
+            model.user_id == current_user.id,
+        )
     ]
+    result = {str(parent_id): [] for parent_id in owned}
+    if not owned:
+        return result
+
+    rank = func.row_number().over(
+        partition_by=parent_column,
+        order_by=(Photo.created_at.desc(), Photo.id.desc()),
+    ).label("rank")
+    ranked = (
+        db.query(Photo.id.label("id"), rank)
+        .filter(parent_column.in_(owned))
+        .subquery()
+    )
+    query = db.query(Photo).join(ranked, ranked.c.id == Photo.id)
+    if per_parent is not None:
+        query = query.filter(ranked.c.rank <= per_parent)
+    for photo in query.order_by(ranked.c.rank):
+        result[str(getattr(photo, parent_column.key))].append(photo_payload(photo))
+    return result
 
 
 @router.delete("/photos/{photo_id}")
@@ -909,8 +880,11 @@ async def delete_photo(
             else None
         )
 
-        # Delete files from storage service (R2 or local)
-        await storage_service.delete_photo(photo.url, photo.thumbnail_url)
+        profile_ids = (photo.tarantula_id, photo.animal_id, photo.invert_id)
+
+        # Objects shared with a transferred copy of this photo stay until
+        # their last user goes (services/photo_blobs.py).
+        unused = photo_blobs.release(db, photo_blobs.photo_urls(photo))
 
         # Delete from database
         db.delete(photo)
@@ -929,6 +903,11 @@ async def delete_photo(
             sync_hero_photo(db, parent, new_url)
 
         db.commit()
+        public_profiles.invalidate(*profile_ids)
+
+        # Only once the row is gone for good — storage used to be cleared
+        # first, so a failed commit left a row pointing at deleted files.
+        await storage_service.delete_objects(unused)
 
         return {"message": "Photo deleted successfully"}
 
@@ -975,15 +954,9 @@ async def update_photo(
 
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id, photo.invert_id)
 
-        return {
-            "id": photo.id,
-            "url": photo.url,
-            "thumbnail_url": photo.thumbnail_url,
-            "caption": photo.caption,
-            "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
-            "created_at": photo.created_at.isoformat(),
-        }
+        return photo_payload(photo)
 
     except HTTPException:
         raise
@@ -1015,8 +988,10 @@ async def set_main_photo(
         # tarantula_id, so the owner resolves as the Invert) updated the
         # detail screen but not the collection card, which reads the legacy
         # table. See utils/hero_photo.
+        profile_ids = (photo.tarantula_id, photo.animal_id, photo.invert_id)
         sync_hero_photo(db, parent, photo.url)
         db.commit()
+        public_profiles.invalidate(*profile_ids)
 
         return {
             "message": "Main photo updated successfully",
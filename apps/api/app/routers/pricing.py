@@ -2,7 +2,9 @@
 Pricing Router
 API endpoints for pricing submissions and estimates
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
@@ -23,6 +25,7 @@ from app.schemas.pricing import (
 )
 from app.utils.dependencies import get_current_user
 from app.utils.pricing_estimator import PricingEstimator
+from app.services import market_signals
 
 router = APIRouter(prefix="/pricing", tags=["pricing"])
 
@@ -94,6 +97,7 @@ async def submit_pricing_data(
 
     db.add(new_submission)
     db.commit()
+    market_signals.refresh_groups(db, market_signals.group_of(new_submission))
     db.refresh(new_submission)
 
     return new_submission
@@ -152,11 +156,14 @@ async def update_submission(
             detail="Pricing submission not found or you don't have permission"
         )
 
+    previous_group = market_signals.group_of(submission)
+
     # Update fields
     for key, value in update_data.model_dump(exclude_unset=True).items():
         setattr(submission, key, value)
 
     db.commit()
+    market_signals.refresh_groups(db, previous_group, market_signals.group_of(submission))
     db.refresh(submission)
 
     return submission
@@ -180,8 +187,10 @@ async def delete_submission(
             detail="Pricing submission not found or you don't have permission"
         )
 
+    group = market_signals.group_of(submission)
     db.delete(submission)
     db.commit()
+    market_signals.refresh_groups(db, group)
 
     return None
 
@@ -197,15 +206,8 @@ async def get_species_pricing(
     Get an evidence summary for comparable reported purchase prices.
     Public endpoint; no authentication is required.
     """
-    estimator = PricingEstimator(db)
-
     try:
-        signal = estimator.estimate_price(
-            species_id=species_id,
-            size_category=size_category,
-            sex=sex,
-            use_community_data=True
-        )
+        signal = market_signals.get_signal(db, species_id, size_category, sex)
 
         return PriceEstimate(
             **signal.__dict__,
@@ -257,12 +259,7 @@ async def get_tarantula_value(
     sex = tarantula.sex or "unknown"
 
     try:
-        signal = estimator.estimate_price(
-            species_id=str(tarantula.species_id),
-            size_category=size_category,
-            sex=sex,
-            use_community_data=True
-        )
+        signal = market_signals.get_signal(db, str(tarantula.species_id), size_category, sex)
 
         return PriceEstimate(
             **signal.__dict__,
@@ -288,12 +285,13 @@ async def get_collection_value(
     """
     Sum only supported observed ranges across the user's collection.
     Requires authentication.
+
+    Signals come from the market_signals table in one join
+    (services/market_signals.py), not a scoring pass per tarantula.
     """
-    tarantulas = db.query(Tarantula).filter(
-        Tarantula.user_id == current_user.id
-    ).all()
+    valued = market_signals.collection_signals(db, current_user.id)
 
-    if not tarantulas:
+    if not valued:
         return CollectionValue(
             total_low=Decimal("0"),
             total_high=Decimal("0"),
@@ -308,7 +306,7 @@ async def get_collection_value(
     estimator = PricingEstimator(db)
 
     try:
-        total_low, total_high, valued_count, breakdown = estimator.calculate_collection_value(tarantulas)
+        total_low, total_high, valued_count, breakdown = estimator.calculate_collection_value(valued)
 
         # Find most valuable tarantula
         most_valuable = None
@@ -323,7 +321,7 @@ async def get_collection_value(
         else:
             evidence_status = (
                 "observed_range"
-                if valued_count == len(tarantulas)
+                if valued_count == len(valued)
                 else "partial_observed_range"
             )
             evidence_quality = (
@@ -338,16 +336,16 @@ async def get_collection_value(
             "Totals include only animals with enough recent public USD purchase reports.",
             "Community reports are not independently confirmed sales and are not appraisals.",
         ]
-        if valued_count != len(tarantulas):
+        if valued_count != len(valued):
             limitations.append(
-                f"{len(tarantulas) - valued_count} of {len(tarantulas)} animals "
+                f"{len(valued) - valued_count} of {len(valued)} animals "
                 "were excluded for insufficient evidence."
             )
 
         return CollectionValue(
             total_low=response_low,
             total_high=response_high,
-            total_tarantulas=len(tarantulas),
+            total_tarantulas=len(valued),
             valued_tarantulas=valued_count,
             most_valuable=most_valuable,
             by_species=breakdown,
@@ -362,6 +360,20 @@ async def get_collection_value(
         )
 
 
+@router.post("/market-signals/refresh")
+async def refresh_market_signals(
+    x_cron_secret: str = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Secret-gated cron entrypoint (daily): rescore every market signal
+    group so reports leaving the lookback window drop out. Guarded by the
+    CRON_SECRET env var via the X-Cron-Secret header."""
+    secret = os.environ.get("CRON_SECRET")
+    if not secret or x_cron_secret != secret:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return {"groups_refreshed": market_signals.refresh_all(db)}
+
+
 @router.get("/species/{species_id}", deprecated=True)
 async def deprecated_species_pricing(species_id: str):
     """Retired because the endpoint could return synthetic price estimates."""
@@ -25,7 +25,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Header
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, status, Header
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -44,7 +44,7 @@ from app.models.species import Species
 from app.utils.dependencies import get_current_user
 from app.utils.file_validation import validate_image_bytes
 from app.utils.hero_photo import sync_hero_photo
-from app.services.storage import storage_service
+from app.services import photo_blobs, public_profiles
 from app.services.inverts_dualwrite import invert_id_if_exists  # ADR-005 A2
 from app.config import settings
 
@@ -560,7 +560,8 @@ async def upload_photo_via_token(
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        photo_url, thumbnail_url = await storage_service.upload_photo(
+        uploaded = await photo_blobs.store_photo(
+            db,
             file_data=file_data,
             filename=file.filename or "upload.jpg",
             content_type=file.content_type,
@@ -575,8 +576,7 @@ async def upload_photo_via_token(
 
         photo_kwargs = {
             "id": str(uuid.uuid4()),
-            "url": photo_url,
-            "thumbnail_url": thumbnail_url,
+            **uploaded.columns(),
             "caption": caption,
             "taken_at": datetime.utcnow(),
             "created_at": datetime.utcnow(),
@@ -605,7 +605,7 @@ async def upload_photo_via_token(
         # would update whichever row the session resolved and leave the other
         # stale, which is the bug fixed in photos.py.
         if not parent.photo_url:
-            sync_hero_photo(db, parent, photo_url)
+            sync_hero_photo(db, parent, uploaded.url)
 
         display_name = _display_name_for(kind, parent)
 
@@ -615,6 +615,7 @@ async def upload_photo_via_token(
             session.is_active = False
         db.commit()
         db.refresh(photo)
+        public_profiles.invalidate(photo.tarantula_id, photo.animal_id)
 
         resp = {
             "success": True,
@@ -649,6 +650,7 @@ async def upload_photo_via_token(
 @router.get("/t/{tarantula_id}")
 async def get_public_tarantula_profile(
     tarantula_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(_optional_user),
 ):
@@ -658,12 +660,23 @@ async def get_public_tarantula_profile(
     Access levels:
       • owner (auth matches)         → full detail including private logs
       • other keeper / unauthenticated → public info only (respects collection_visibility)
+
+    The unauthenticated view is served from the public profile cache with an
+    ETag (services/public_profiles.py).
     """
     try:
         t_uuid = uuid.UUID(tarantula_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid tarantula ID")
 
+    if current_user is None:
+        return await public_profiles.respond(
+            request, f"t:{t_uuid}", t_uuid, lambda: _tarantula_profile(t_uuid, db, None)
+        )
+    return _tarantula_profile(t_uuid, db, current_user)
+
+
+def _tarantula_profile(t_uuid: uuid.UUID, db: Session, current_user: Optional[User]) -> dict:
     tarantula = db.query(Tarantula).filter(Tarantula.id == t_uuid).first()
     if not tarantula:
         raise HTTPException(status_code=404, detail="Tarantula not found")
@@ -719,7 +732,7 @@ async def get_public_tarantula_profile(
     ).order_by(Photo.created_at.desc()).limit(10).all()
 
     # Lineage — parents via Pairing / Offspring
-    lineage = _get_lineage(tarantula_id, db)
+    lineage = _get_lineage(str(t_uuid), db)
 
     # Provenance — the immutable transfer snapshot on the unified Invert mirror
     # (Invert.id == Tarantula.id). Public-safe: the snapshot never holds
@@ -799,6 +812,7 @@ async def get_public_tarantula_profile(
 @router.get("/a/{animal_id}")
 async def get_public_animal_profile(
     animal_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(_optional_user),
 ):
@@ -810,13 +824,22 @@ async def get_public_animal_profile(
       • owner (auth matches)           → full detail (husbandry, acquisition, notes)
       • other keeper / unauthenticated → public-safe card (respects collection_visibility)
 
-    Herp biology shapes the payload — sheds/weight/length, no molts.
+    Herp biology shapes the payload — sheds/weight/length, no molts. The
+    unauthenticated view is cached like `/t/{id}`'s.
     """
     try:
         a_uuid = uuid.UUID(animal_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid animal ID")
 
+    if current_user is None:
+        return await public_profiles.respond(
+            request, f"a:{a_uuid}", a_uuid, lambda: _animal_profile(a_uuid, db, None)
+        )
+    return _animal_profile(a_uuid, db, current_user)
+
+
+def _animal_profile(a_uuid: uuid.UUID, db: Session, current_user: Optional[User]) -> dict:
     animal = db.query(Animal).filter(Animal.id == a_uuid).first()
     if not animal:
         raise HTTPException(status_code=404, detail="Animal not found")
@@ -0,0 +1,128 @@
+"""
+Realtime WebSocket: unread counts and new notifications, pushed
+(services/realtime.py).
+
+Browsers can't set headers on a WebSocket, so the token may come either as
+the usual Authorization header or as the first frame:
+
+    {"type": "auth", "token": "<access token>"}
+
+Nothing else the client sends is read. Close codes: 4401 unauthenticated,
+1013 fell too far behind (reconnect).
+"""
+import asyncio
+import json
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.direct_message import Conversation, DirectMessage
+from app.models.notification import Notification
+from app.services import realtime
+from app.utils.dependencies import get_current_user
+
+router = APIRouter()
+
+AUTH_TIMEOUT_SECONDS = 10
+PING_INTERVAL_SECONDS = 25
+
+
+def _authenticate(db: Session, token: str):
+    """The token's user id, or None if the token is no good."""
+    try:
+        user = get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+    except HTTPException:
+        return None
+    user_id = user.id
+    # Release the connection: the socket may stay open for hours.
+    db.commit()
+    return user_id
+
+
+def _unread_counts(db: Session, user_id) -> dict:
+    notifications = (
+        db.query(func.count(Notification.id))
+        .filter(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .scalar()
+    )
+    messages = (
+        db.query(func.count(DirectMessage.id))
+        .join(Conversation, Conversation.id == DirectMessage.conversation_id)
+        .filter(
+            DirectMessage.sender_id != user_id,
+            DirectMessage.is_read.is_(False),
+            or_(Conversation.participant1_id == user_id, Conversation.participant2_id == user_id),
+        )
+        .scalar()
+    )
+    db.commit()
+    return realtime.unread_event(notifications=notifications or 0, messages=messages or 0)
+
+
+async def _token(websocket: WebSocket):
+    header = websocket.headers.get("authorization", "")
+    if header.startswith("Bearer "):
+        return header[7:]
+    try:
+        frame = await asyncio.wait_for(websocket.receive_text(), AUTH_TIMEOUT_SECONDS)
+        message = json.loads(frame)
+    except (asyncio.TimeoutError, ValueError):
+        return None
+    if isinstance(message, dict) and message.get("type") == "auth":
+        return message.get("token")
+    return None
+
+
+async def _drain(websocket: WebSocket) -> None:
+    """Read (and ignore) client frames until it goes away."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+async def _push(websocket: WebSocket, subscription: realtime.Subscription) -> None:
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.get(), PING_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            event = realtime.PING
+        if event is None:
+            await websocket.close(code=1013)
+            return
+        await websocket.send_json(event)
+
+
+@router.websocket("/ws")
+async def realtime_socket(websocket: WebSocket, db: Session = Depends(get_db)):
+    await websocket.accept()
+    token = await _token(websocket)
+    user_id = None if not token else await to_thread.run_sync(_authenticate, db, token)
+    if user_id is None:
+        await websocket.close(code=4401)
+        return
+
+    # Subscribe before counting: a write committed between the count and
+    # the subscription would otherwise be in neither. The other order can
+    # at worst count one event twice, which the next reconnect corrects.
+    realtime.broker.start()
+    subscription = realtime.hub.subscribe(user_id)
+    try:
+        await websocket.send_json(await to_thread.run_sync(_unread_counts, db, user_id))
+        drain = asyncio.create_task(_drain(websocket))
+        push = asyncio.create_task(_push(websocket, subscription))
+        done, pending = await asyncio.wait({drain, push}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if not task.cancelled() and not isinstance(task.exception(), WebSocketDisconnect):
+                task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        realtime.hub.unsubscribe(subscription)
@@ -13,16 +13,23 @@ now rows in the unified `animals` table (`male_animal_id` /
 `female_animal_id`), with the shared `taxon` denormalized onto the
 pairing. Same-taxon match is enforced here in `_resolve_parents` (the
 DB-level CHECK is gone — a cross-row constraint would need a trigger).
+
+Offspring predictions (`/{id}/predicted-outcomes`, `/candidates`) run the
+server-side engine in app/services/morph_genetics.py over each parent's
+`animal_genotypes` rows.
 """
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.animal import Animal
+from app.models.animal_genotype import AnimalGenotype
 from app.models.clutch import Clutch
+from app.models.gene import Gene
 from app.models.reptile_pairing import (
     ReptilePairing,
     ReptilePairingOutcome,
@@ -30,10 +37,15 @@ from app.models.reptile_pairing import (
 )
 from app.models.user import User
 from app.schemas.reptile_breeding import (
+    PairingCandidateResponse,
+    PairingCandidatesResponse,
+    PairingPredictionResponse,
+    PredictedMorphOutcome,
     ReptilePairingCreate,
     ReptilePairingResponse,
     ReptilePairingUpdate,
 )
+from app.services import morph_genetics
 from app.utils.dependencies import get_current_user
 from app.utils.limits import enforce_hv_premium
 
@@ -133,6 +145,90 @@ def _resolve_parents(
     }
 
 
+def _load_genetics(
+    animal_ids: List[UUID],
+    db: Session,
+) -> Tuple[Dict[str, morph_genetics.GeneInfo], Dict[UUID, Dict[str, float]]]:
+    """Every genotype for a set of animals, in one joined query.
+
+    Returns (genes by id, animal id → {gene id → pass probability}).
+    Duplicate rows for the same gene collapse to the strongest claim.
+    """
+    if not animal_ids:
+        return {}, {}
+    rows = (
+        db.query(AnimalGenotype, Gene)
+        .join(Gene, Gene.id == AnimalGenotype.gene_id)
+        .filter(AnimalGenotype.animal_id.in_(animal_ids))
+        .all()
+    )
+    genes: Dict[str, morph_genetics.GeneInfo] = {}
+    raw: Dict[UUID, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+    for genotype, gene in rows:
+        gene_id = str(gene.id)
+        if gene_id not in genes:
+            genes[gene_id] = morph_genetics.GeneInfo(
+                gene_id=gene_id,
+                name=gene.common_name,
+                gene_type=gene.gene_type,
+                lethal_homozygous=bool(gene.lethal_homozygous),
+                welfare_flag=gene.welfare_flag,
+            )
+        raw[genotype.animal_id][gene_id].append(
+            (genotype.zygosity, genotype.poss_het_percentage)
+        )
+    passes = {
+        animal_id: {
+            gene_id: morph_genetics.best_pass_probability(
+                entries, genes[gene_id].gene_type
+            )
+            for gene_id, entries in by_gene.items()
+        }
+        for animal_id, by_gene in raw.items()
+    }
+    return genes, passes
+
+
+def _predict(
+    male_id: UUID,
+    female_id: UUID,
+    genes: Dict[str, morph_genetics.GeneInfo],
+    passes: Dict[UUID, Dict[str, float]],
+    max_outcomes: int,
+) -> dict:
+    """Run the engine for one pair and shape the shared response fields."""
+    male_pass = passes.get(male_id, {})
+    female_pass = passes.get(female_id, {})
+    gene_ids = set(male_pass) | set(female_pass)
+    loci = morph_genetics.build_loci(
+        [genes[g] for g in gene_ids], male_pass, female_pass
+    )
+    prediction = morph_genetics.predict_pairing(loci, max_outcomes=max_outcomes)
+    return {
+        "male_animal_id": male_id,
+        "female_animal_id": female_id,
+        "loci_count": prediction.loci_count,
+        "outcomes": [
+            PredictedMorphOutcome(
+                label=o.label,
+                probability=o.probability,
+                visual_genes=[v.label for v in o.visuals],
+                poss_hets=o.poss_hets,
+                is_lethal=o.is_lethal,
+                welfare_flags=o.welfare_flags,
+            )
+            for o in prediction.outcomes
+        ],
+        "lethal_probability": prediction.lethal_probability,
+        "welfare_probability": prediction.welfare_probability,
+        "expected_visual_genes": prediction.expected_visual_genes,
+        "pruned_probability": prediction.pruned_probability,
+        "assumed_normal_genes": sorted(
+            genes[g].name for g in gene_ids ^ (set(male_pass) & set(female_pass))
+        ),
+    }
+
+
 # ─── Routes ────────────────────────────────────────────────────────────
 
 
@@ -191,6 +287,83 @@ async def create_pairing(
     return _enrich_response(pairing, db)
 
 
+@router.get("/candidates", response_model=PairingCandidatesResponse)
+async def score_pairing_candidates(
+    taxon: Optional[str] = Query(None, description="Limit to one taxon (snake / lizard / frog)"),
+    species: Optional[str] = Query(None, description="Scientific name, case-insensitive"),
+    limit: int = Query(50, ge=1, le=500),
+    max_outcomes: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Score every possible male × female pairing in the keeper's
+    collection. Same species only; deceased and transferred-out animals
+    are excluded, and unknown-sex animals aren't guessed into a slot.
+
+    Ranked safest-first: lowest lethal odds, then lowest welfare-flag
+    odds, then most visual genes expected per offspring. Two queries
+    total (animals, genotypes) regardless of collection size; the engine
+    memoizes shared sub-results across pairs.
+    """
+    query = db.query(Animal).filter(
+        Animal.user_id == current_user.id,
+        Animal.transferred_out_at.is_(None),
+        Animal.died_at.is_(None),
+    )
+    if taxon:
+        query = query.filter(Animal.taxon == taxon)
+    animals = query.all()
+
+    def species_key(a: Animal):
+        if a.herp_species_id:
+            return a.taxon, str(a.herp_species_id)
+        return a.taxon, (a.scientific_name or "").strip().lower()
+
+    wanted_species = species.strip().lower() if species else None
+    males: Dict[tuple, List[Animal]] = defaultdict(list)
+    females: Dict[tuple, List[Animal]] = defaultdict(list)
+    for a in animals:
+        if wanted_species and (a.scientific_name or "").strip().lower() != wanted_species:
+            continue
+        key = species_key(a)
+        if not key[1]:
+            continue  # no species on file — can't know who's compatible
+        sex = a.sex.value if a.sex else None
+        if sex == "male":
+            males[key].append(a)
+        elif sex == "female":
+            females[key].append(a)
+
+    pairs = [
+        (m, f)
+        for key, group in males.items()
+        for m in group
+        for f in females.get(key, [])
+    ]
+    genes, passes = _load_genetics(
+        list({a.id for pair in pairs for a in pair}), db
+    )
+
+    candidates = [
+        PairingCandidateResponse(
+            male_display_name=_animal_display(m),
+            female_display_name=_animal_display(f),
+            species=m.scientific_name,
+            **_predict(m.id, f.id, genes, passes, max_outcomes),
+        )
+        for m, f in pairs
+    ]
+    candidates.sort(key=lambda c: (
+        round(c.lethal_probability, 9),
+        round(c.welfare_probability, 9),
+        -c.expected_visual_genes,
+    ))
+    return PairingCandidatesResponse(
+        candidates=candidates[:limit],
+        total_pairs=len(candidates),
+    )
+
+
 @router.get("/{pairing_id}", response_model=ReptilePairingResponse)
 async def get_pairing(
     pairing_id: UUID,
@@ -280,3 +453,44 @@ async def delete_pairing(
         raise HTTPException(status_code=404, detail="Pairing not found")
     db.delete(pairing)
     db.commit()
+
+
+@router.get(
+    "/{pairing_id}/predicted-outcomes",
+    response_model=PairingPredictionResponse,
+)
+async def get_pairing_predicted_outcomes(
+    pairing_id: UUID,
+    max_outcomes: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Offspring phenotype distribution for one of the keeper's pairings.
+
+    Genes only one parent has on file are predicted with the other parent
+    assumed normal, and listed in `assumed_normal_genes` so the UI can
+    prompt for the missing record.
+    """
+    pairing = (
+        db.query(ReptilePairing)
+        .filter(
+            ReptilePairing.id == pairing_id,
+            ReptilePairing.user_id == current_user.id,
+        )
+        .first()
+    )
+    if not pairing:
+        raise HTTPException(status_code=404, detail="Pairing not found")
+
+    genes, passes = _load_genetics(
+        [pairing.male_animal_id, pairing.female_animal_id], db
+    )
+    return PairingPredictionResponse(
+        **_predict(
+            pairing.male_animal_id,
+            pairing.female_animal_id,
+            genes,
+            passes,
+            max_outcomes,
+        )
+    )
@@ -32,6 +32,8 @@ from app.schemas.reptile_species import (
 )
 from app.utils.dependencies import get_current_user
 from app.utils.slugs import slugify_unique
+from app.services import species_resolver
+from app.utils import response_cache
 
 
 router = APIRouter()
@@ -236,6 +238,8 @@ async def create_reptile_species(
     )
     db.add(new_species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("reptile_species")
     db.refresh(new_species)
     return new_species
 
@@ -327,6 +331,8 @@ async def bulk_import_reptile_species(
     if results["successful"] > 0:
         try:
             db.commit()
+            species_resolver.invalidate()
+            response_cache.invalidate("reptile_species")
         except Exception as e:  # noqa: BLE001
             db.rollback()
             results["failed"] += results["successful"]
@@ -394,6 +400,8 @@ async def update_reptile_species(
         setattr(species, field, value)
 
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("reptile_species")
     db.refresh(species)
     return species
 
@@ -416,6 +424,8 @@ async def delete_reptile_species(
 
     db.delete(species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("reptile_species")
     return None
 
 
@@ -439,5 +449,6 @@ async def rate_reptile_species(
     species.community_rating = round(new_rating, 2)
 
     db.commit()
+    response_cache.invalidate("reptile_species")
     db.refresh(species)
     return species
@@ -32,6 +32,8 @@ from app.services.inverts_dualwrite import (
     mirror_scorpion_species_delete,
     mirror_scorpion_species_update,
 )
+from app.services import species_resolver
+from app.utils import response_cache
 
 router = APIRouter()
 
@@ -165,6 +167,8 @@ async def create_scorpion_species(
     db.flush()
     mirror_scorpion_species_create(db, new_species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species")
     db.refresh(new_species)
     return new_species
 
@@ -209,6 +213,8 @@ async def update_scorpion_species(
     # ADR-005 A2 mirror.
     mirror_scorpion_species_update(db, species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species")
     db.refresh(species)
     return species
 
@@ -240,4 +246,6 @@ async def delete_scorpion_species(
     # ADR-005 A2 mirror.
     mirror_scorpion_species_delete(db, species_id)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("invert_species")
     return None
@@ -28,6 +28,7 @@ from app.models.user import User
 from app.models.animal import Animal
 from app.models.shed_log import ShedLog
 from app.schemas.shed_log import ShedLogCreate, ShedLogUpdate, ShedLogResponse
+from app.services import public_profiles
 from app.utils.dependencies import get_current_user
 
 router = APIRouter()
@@ -111,6 +112,7 @@ async def create_shed(
 
     db.commit()
     db.refresh(new_shed)
+    public_profiles.invalidate(animal_id)
     return new_shed
 
 
@@ -141,6 +143,7 @@ async def update_shed(
 
     db.commit()
     db.refresh(shed)
+    public_profiles.invalidate(shed.animal_id)
     return shed
 
 
@@ -154,6 +157,8 @@ async def delete_shed(
     need a full history scan; acceptable since last_shed_at is a hint,
     not authoritative."""
     shed = _get_owned_shed(db, shed_id, current_user)
+    animal_id = shed.animal_id
     db.delete(shed)
     db.commit()
+    public_profiles.invalidate(animal_id)
     return None
@@ -3,7 +3,6 @@ Species routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, text
 from typing import List, Optional
 import uuid
 
@@ -24,6 +23,8 @@ from app.services.inverts_dualwrite import (
     mirror_species_delete,
     mirror_species_update,
 )
+from app.services import species_resolver
+from app.utils import response_cache
 
 router = APIRouter()
 
@@ -36,32 +37,12 @@ async def search_species(
 ):
     """
     Search species by scientific or common name.
-    Uses TSVECTOR full-text search when available, falls back to ILIKE.
+    Served from the in-memory catalog index (services/species_resolver.py):
+    scientific-name prefix first, then word prefix, then substring, with a
+    typo-tolerant fallback when nothing else matches.
     Returns minimal info for autocomplete.
     """
-    search_term = q.lower().strip()
-
-    # Try TSVECTOR full-text search first (faster for large datasets)
-    try:
-        ts_query = func.plainto_tsquery("english", search_term)
-        results = db.query(Species).filter(
-            or_(
-                Species.searchable.op("@@")(ts_query),
-                # Fallback to ILIKE for partial matches (TSVECTOR needs full words)
-                Species.scientific_name_lower.ilike(f"%{search_term}%"),
-                func.lower(func.array_to_string(Species.common_names, " ")).ilike(f"%{search_term}%")
-            )
-        ).limit(limit).all()
-    except Exception:
-        # Fallback if TSVECTOR column is empty or not populated
-        results = db.query(Species).filter(
-            or_(
-                Species.scientific_name_lower.ilike(f"%{search_term}%"),
-                func.lower(func.array_to_string(Species.common_names, " ")).ilike(f"%{search_term}%")
-            )
-        ).limit(limit).all()
-
-    return results
+    return species_resolver.get_index(db, Species).search(q, limit)
 
 
 @router.get("/", response_model=SpeciesPaginatedResponse)
@@ -165,6 +146,8 @@ async def create_species(
     db.flush()
     mirror_species_create(db, new_species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("species", "invert_species")
     db.refresh(new_species)
 
     return new_species
@@ -242,6 +225,8 @@ async def bulk_import_species(
     if results["successful"] > 0:
         try:
             db.commit()
+            species_resolver.invalidate()
+            response_cache.invalidate("species", "invert_species")
         except Exception as e:
             db.rollback()
             results["failed"] += results["successful"]
@@ -276,6 +261,7 @@ async def rate_species(
     species.community_rating = round(new_rating, 2)
 
     db.commit()
+    response_cache.invalidate("species", "invert_species")
     db.refresh(species)
 
     return species
@@ -311,6 +297,8 @@ async def update_species(
     # ADR-005 A2 mirror — keep invert_species in sync.
     mirror_species_update(db, species)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("species", "invert_species")
     db.refresh(species)
 
     return species
@@ -335,5 +323,7 @@ async def delete_species(
     # ADR-005 A2 mirror — drop the matching invert_species row.
     mirror_species_delete(db, species_id)
     db.commit()
+    species_resolver.invalidate()
+    response_cache.invalidate("species", "invert_species")
 
     return None
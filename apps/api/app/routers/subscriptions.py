@@ -1,21 +1,25 @@
 """
 Subscription API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy import and_
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from pydantic import BaseModel
-import stripe
+import hashlib
+import json
+import os
 import logging
 
 from app.database import get_db
 from app.config import settings
 from app.models.user import User
 from app.models.subscription import SubscriptionPlan, UserSubscription, SubscriptionStatus
+from app.models.webhook_event import WebhookEvent
 from app.schemas.subscription import (
     SubscriptionPlan as SubscriptionPlanSchema,
     SubscriptionPlanCreate,
@@ -26,14 +30,26 @@ from app.schemas.subscription import (
     ReceiptValidationRequest,
     ReceiptValidationResponse
 )
+from app.services import webhook_inbox
+from app.services.subscription_webhooks import STRIPE_HANDLERS
 from app.utils.dependencies import get_current_user, get_current_admin
 from app.utils.subscription import active_subscription_clause, expire_stale_subscriptions
 
-# Initialize Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 logger = logging.getLogger(__name__)
 
+
+def _stripe():
+    """The configured Stripe SDK, imported on first use.
+
+    The SDK takes about a second to import, and only checkout, the billing
+    portal and the webhook need it — importing it here instead of at module
+    level keeps it off the cold-start path.
+    """
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
 
@@ -561,6 +577,7 @@ def create_checkout_session(
     # Determine if this is a subscription or one-time payment
     is_subscription = request_data.price_type in ["monthly", "yearly"]
 
+    stripe = _stripe()
     try:
         # Check if user already has a Stripe customer ID
         existing_sub = db.query(UserSubscription).filter(
@@ -619,17 +636,33 @@ def create_checkout_session(
         raise HTTPException(status_code=500, detail="Failed to create checkout session")
 
 
+def _schedule_drain(background_tasks: BackgroundTasks, db: Session) -> None:
+    """Apply the inbox right after the response goes out, in its own session.
+    The cron drain below is the safety net for retries and restarts."""
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False)
+    background_tasks.add_task(webhook_inbox.drain_in_new_session, session_factory)
+
+
 @router.post("/webhook")
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+async def stripe_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     Handle Stripe webhook events.
-    Activates/updates subscriptions based on payment events.
+
+    Verifies the signature, records the event in the webhook inbox and acks.
+    The subscription changes are applied by services/webhook_inbox.py, in
+    order per customer — see models/webhook_event.py. Event types with no
+    handler are acked without being stored.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
 
+    stripe = _stripe()
     try:
-        event = stripe.Webhook.construct_event(
+        stripe.Webhook.construct_event(
             payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError:
@@ -637,185 +670,24 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     except stripe.SignatureVerificationError:
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    # Handle the event
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        await handle_checkout_completed(session, db)
-
-    elif event["type"] == "customer.subscription.updated":
-        subscription = event["data"]["object"]
-        await handle_subscription_updated(subscription, db)
-
-    elif event["type"] == "customer.subscription.deleted":
-        subscription = event["data"]["object"]
-        await handle_subscription_deleted(subscription, db)
-
-    elif event["type"] == "invoice.payment_failed":
-        invoice = event["data"]["object"]
-        await handle_payment_failed(invoice, db)
-
-    return JSONResponse(content={"status": "success"})
-
-
-async def handle_checkout_completed(session: dict, db: Session):
-    """Process completed checkout session"""
-    user_id = session.get("metadata", {}).get("user_id")
-    price_type = session.get("metadata", {}).get("price_type")
-    customer_id = session.get("customer")
-    subscription_id = session.get("subscription")  # None for one-time payments
-
-    if not user_id:
-        logger.error("No user_id in checkout session metadata")
-        return
-
-    # Resolve the plan from checkout metadata. Older sessions (and the TV web
-    # flow before this change) carry no `plan` key — default to "premium" so
-    # existing Tarantuverse purchases keep working exactly as before.
-    plan_key = session.get("metadata", {}).get("plan") or "premium"
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.name == plan_key
-    ).first()
-
-    if not plan:
-        logger.error(f"Subscription plan '{plan_key}' not found")
-        return
-
-    # Idempotency guard: Stripe retries webhooks (and events can be replayed
-    # from the dashboard). If this user already has an active Stripe sub for the
-    # same customer + price type + PLAN, this event was already processed — skip.
-    # (Plan is part of the key so an HV→bundle upgrade at the same cadence isn't
-    # mistaken for a retry of the earlier purchase.)
-    duplicate = db.query(UserSubscription).filter(
-        and_(
-            UserSubscription.user_id == user_id,
-            UserSubscription.status == "active",
-            UserSubscription.payment_provider == "stripe",
-            UserSubscription.payment_provider_id == customer_id,
-            UserSubscription.subscription_source == price_type,
-            UserSubscription.plan_id == plan.id,
-        )
-    ).first()
-
-    if duplicate:
-        logger.info(
-            f"Duplicate checkout.session.completed for user {user_id} "
-            f"(customer {customer_id}, {price_type}, {plan_key}) — skipping"
-        )
-        return
-
-    # App-scoped supersession: only cancel existing subs that this purchase
-    # actually supersedes. A 'both' (All-Access) purchase supersedes everything;
-    # an app-scoped purchase only supersedes subs for the SAME app. This mirrors
-    # the IAP validate_receipt path so a keeper can hold TV + HV independently.
-    new_app = getattr(plan, "app", None) or "tarantuverse"
-    existing_active = db.query(UserSubscription).filter(
-        and_(
-            UserSubscription.user_id == user_id,
-            UserSubscription.status == "active",
-        )
-    ).all()
-    for ex in existing_active:
-        ex_plan = db.query(SubscriptionPlan).filter(
-            SubscriptionPlan.id == ex.plan_id
-        ).first()
-        ex_app = (getattr(ex_plan, "app", None) or "tarantuverse") if ex_plan else "tarantuverse"
-        if new_app == "both" or ex_app == new_app:
-            ex.status = "cancelled"
-            ex.cancelled_at = datetime.utcnow()
-
-    # Calculate expiry based on price type
-    expires_at = None
-    if price_type == "monthly":
-        expires_at = datetime.utcnow() + timedelta(days=30)
-    elif price_type == "yearly":
-        expires_at = datetime.utcnow() + timedelta(days=365)
-    # Lifetime has no expiry
-
-    # Create new subscription
-    new_subscription = UserSubscription(
-        user_id=user_id,
-        plan_id=plan.id,
-        status="active",
-        expires_at=expires_at,
-        payment_provider="stripe",
-        payment_provider_id=customer_id,
-        subscription_source=price_type,
-        auto_renew=price_type in ["monthly", "yearly"]
-    )
-
-    db.add(new_subscription)
-    db.commit()
-
-    logger.info(f"Subscription activated for user {user_id} via Stripe ({price_type})")
-
-
-async def handle_subscription_updated(subscription: dict, db: Session):
-    """Handle subscription updates (renewals, plan changes)"""
-    customer_id = subscription.get("customer")
-    status = subscription.get("status")
-
-    # Include 'expired' rows: lazy expiry may have flipped the row just
-    # before a renewal webhook arrives — a renewal must reactivate it.
-    user_sub = db.query(UserSubscription).filter(
-        and_(
-            UserSubscription.payment_provider == "stripe",
-            UserSubscription.payment_provider_id == customer_id,
-            UserSubscription.status.in_(["active", "expired"])
-        )
-    ).order_by(UserSubscription.started_at.desc()).first()
-
-    if user_sub:
-        if status == "active":
-            # Subscription renewed - update expiry (and revive if lazily expired)
-            current_period_end = subscription.get("current_period_end")
-            if current_period_end:
-                user_sub.expires_at = datetime.utcfromtimestamp(current_period_end)
-            user_sub.status = "active"
-
-            # A free-plan row may have been auto-created by /me while
-            # this row sat lazily expired — cancel any other active
-            # rows so entitlement reads stay unambiguous.
-            others = db.query(UserSubscription).filter(
-                and_(
-                    UserSubscription.user_id == user_sub.user_id,
-                    UserSubscription.id != user_sub.id,
-                    UserSubscription.status == "active",
-                )
-            ).all()
-            for other in others:
-                other.status = "cancelled"
-                other.cancelled_at = datetime.utcnow()
-        elif status in ["past_due", "unpaid"]:
-            # Payment issue - could add grace period logic here
-            logger.warning(f"Subscription {customer_id} has payment issues: {status}")
-
-        db.commit()
-
-
-async def handle_subscription_deleted(subscription: dict, db: Session):
-    """Handle subscription cancellation"""
-    customer_id = subscription.get("customer")
-
-    user_sub = db.query(UserSubscription).filter(
-        and_(
-            UserSubscription.payment_provider == "stripe",
-            UserSubscription.payment_provider_id == customer_id,
-            UserSubscription.status == "active"
+    # Store the verified JSON as sent rather than the library's event object,
+    # so the inbox row is plain data the worker can replay on any version.
+    event = json.loads(payload)
+    if event.get("type") in STRIPE_HANDLERS:
+        obj = event["data"]["object"]
+        created = event.get("created")
+        webhook_inbox.record(
+            db,
+            provider="stripe",
+            event_id=event["id"],
+            event_type=event["type"],
+            payload=obj,
+            ordering_key=obj.get("customer"),
+            occurred_at=datetime.fromtimestamp(created, tz=timezone.utc) if created else None,
         )
-    ).first()
-
-    if user_sub:
-        user_sub.status = "cancelled"
-        user_sub.cancelled_at = datetime.utcnow()
-        db.commit()
-        logger.info(f"Subscription cancelled for customer {customer_id}")
+        _schedule_drain(background_tasks, db)
 
-
-async def handle_payment_failed(invoice: dict, db: Session):
-    """Handle failed payment"""
-    customer_id = invoice.get("customer")
-    logger.warning(f"Payment failed for customer {customer_id}")
-    # Could implement email notification here
+    return JSONResponse(content={"status": "success"})
 
 
 @router.get("/billing-portal", response_model=BillingPortalResponse)
@@ -842,6 +714,7 @@ def get_billing_portal(
             detail="No Stripe subscription found. Please subscribe first."
         )
 
+    stripe = _stripe()
     try:
         session = stripe.billing_portal.Session.create(
             customer=user_sub.payment_provider_id,
@@ -858,7 +731,11 @@ def get_billing_portal(
 # ============== APPLE APP STORE SERVER NOTIFICATIONS (V2) ==============
 
 @router.post("/apple-notifications")
-async def apple_server_notifications(request: Request, db: Session = Depends(get_db)):
+async def apple_server_notifications(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     Receive Apple App Store Server Notifications (V2).
 
@@ -869,13 +746,14 @@ async def apple_server_notifications(request: Request, db: Session = Depends(get
     Keeps IAP subscriptions in sync: renewals extend expires_at,
     expirations / refunds end premium. Signature is verified against
     Apple's pinned root certificates — unverifiable payloads are
-    rejected with 401.
+    rejected with 401. Verified notifications go to the webhook inbox
+    and are applied by the worker (services/subscription_webhooks.py).
     """
     # Lazy import so the API still boots if the library/certs are
     # missing — only this endpoint degrades.
     from app.services.apple_notification_service import (
         AppleNotificationError,
-        decode_notification,
+        decode_notification_event,
     )
 
     try:
@@ -887,115 +765,82 @@ async def apple_server_notifications(request: Request, db: Session = Depends(get
     if not signed_payload:
         raise HTTPException(status_code=400, detail="Missing signedPayload")
 
+    # The x5c chain check is CPU-bound — keep it off the event loop so a
+    # burst of renewals doesn't stall every other request on this worker.
     try:
-        notification_type, subtype, txn, environment = decode_notification(signed_payload)
+        notification = await run_in_threadpool(decode_notification_event, signed_payload)
     except AppleNotificationError as e:
         logger.error(f"Apple notification rejected: {e}")
         raise HTTPException(status_code=401, detail="Signature verification failed")
 
+    notification_type = notification["notification_type"]
+    subtype = notification["subtype"]
     logger.info(
         f"Apple notification: {notification_type}"
-        f"{f'/{subtype}' if subtype else ''} ({environment})"
+        f"{f'/{subtype}' if subtype else ''} ({notification['environment']})"
     )
 
     # TEST notifications (and some types) carry no transaction info
-    if txn is None:
-        return JSONResponse(content={"status": "ok"})
-
-    original_txn_id = getattr(txn, "originalTransactionId", None)
-    if not original_txn_id:
-        logger.warning(f"Apple notification {notification_type}: no originalTransactionId")
+    if not notification["has_transaction"]:
         return JSONResponse(content={"status": "ok"})
 
-    # Match on the original transaction id stored at receipt validation.
-    # (Initial purchases store it directly; for the very first purchase
-    # the per-renewal transactionId equals the original one, so legacy
-    # rows usually match too.)
-    user_sub = db.query(UserSubscription).filter(
-        and_(
-            UserSubscription.payment_provider == "apple",
-            UserSubscription.payment_provider_id == original_txn_id,
-        )
-    ).order_by(UserSubscription.started_at.desc()).first()
-
-    if not user_sub:
-        # 200 anyway — Apple retries on errors, and a row that predates
-        # original-id storage will never match no matter how many retries.
-        logger.warning(
-            f"Apple notification {notification_type}: no subscription matches "
-            f"originalTransactionId {original_txn_id}"
-        )
-        return JSONResponse(content={"status": "ok"})
-
-    expires_ms = getattr(txn, "expiresDate", None)
-    new_expiry = datetime.utcfromtimestamp(expires_ms / 1000) if expires_ms else None
-
-    if notification_type in ("SUBSCRIBED", "DID_RENEW", "OFFER_REDEEMED"):
-        user_sub.status = "active"
-        if new_expiry:
-            user_sub.expires_at = new_expiry
-        user_sub.auto_renew = True
-        user_sub.cancelled_at = None
+    signed_ms = notification.get("signed_date_ms")
+    webhook_inbox.record(
+        db,
+        provider="apple",
+        # notificationUUID is Apple's dedupe key across retries; the payload
+        # hash is a fallback for a notification that somehow lacks one.
+        event_id=notification["notification_uuid"] or hashlib.sha256(signed_payload.encode()).hexdigest(),
+        event_type=notification_type,
+        payload=notification,
+        ordering_key=notification.get("original_transaction_id"),
+        occurred_at=datetime.fromtimestamp(signed_ms / 1000, tz=timezone.utc) if signed_ms else None,
+    )
+    _schedule_drain(background_tasks, db)
+    return JSONResponse(content={"status": "ok"})
 
-        # Cancel shadow rows (e.g., the free row /me auto-creates while
-        # a row sat lazily expired)
-        others = db.query(UserSubscription).filter(
-            and_(
-                UserSubscription.user_id == user_sub.user_id,
-                UserSubscription.id != user_sub.id,
-                UserSubscription.status == "active",
-            )
-        ).all()
-        for other in others:
-            other.status = "cancelled"
-            other.cancelled_at = datetime.utcnow()
-
-        logger.info(
-            f"Apple {notification_type}: extended subscription for user "
-            f"{user_sub.user_id} to {new_expiry}"
-        )
 
-    elif notification_type == "DID_CHANGE_RENEWAL_STATUS":
-        user_sub.auto_renew = subtype == "AUTO_RENEW_ENABLED"
-        logger.info(
-            f"Apple renewal status for user {user_sub.user_id}: "
-            f"auto_renew={user_sub.auto_renew}"
-        )
+# ============== WEBHOOK INBOX ==============
 
-    elif notification_type in ("EXPIRED", "GRACE_PERIOD_EXPIRED"):
-        user_sub.status = "expired"
-        if new_expiry:
-            user_sub.expires_at = new_expiry
-        user_sub.auto_renew = False
-        logger.info(f"Apple {notification_type}: subscription ended for user {user_sub.user_id}")
-
-    elif notification_type in ("REFUND", "REVOKE"):
-        user_sub.status = "cancelled"
-        user_sub.cancelled_at = datetime.utcnow()
-        logger.info(f"Apple {notification_type}: subscription revoked for user {user_sub.user_id}")
-
-    elif notification_type == "REFUND_REVERSED":
-        # Apple reversed an earlier refund — reinstate. If the period
-        # already lapsed, expiry-aware reads keep premium off anyway.
-        user_sub.status = "active"
-        user_sub.cancelled_at = None
-        if new_expiry:
-            user_sub.expires_at = new_expiry
-        logger.info(f"Apple REFUND_REVERSED: subscription reinstated for user {user_sub.user_id}")
-
-    elif notification_type == "DID_FAIL_TO_RENEW":
-        # GRACE_PERIOD subtype = keep access while Apple retries billing;
-        # without it, the EXPIRED notification will follow and end access.
-        logger.warning(
-            f"Apple DID_FAIL_TO_RENEW for user {user_sub.user_id}"
-            f"{' (grace period)' if subtype == 'GRACE_PERIOD' else ''}"
-        )
+@router.post("/webhook-inbox/drain")
+def drain_webhook_inbox(
+    x_cron_secret: str = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Secret-gated cron entrypoint: apply due inbox events — retries whose
+    backoff has elapsed, and anything a restart interrupted. Same
+    CRON_SECRET guard as /notifications/run-digests. Safe to overlap with
+    the post-response drains; claims are row-locked."""
+    secret = os.environ.get("CRON_SECRET")
+    if not secret or x_cron_secret != secret:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return webhook_inbox.drain(db)
+
+
+@router.get("/admin/webhook-inbox")
+def get_webhook_inbox_metrics(
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Admin: inbox backlog, processing lag, throughput and dead letters."""
+    return webhook_inbox.metrics(db)
 
-    else:
-        logger.info(f"Apple notification {notification_type}: no handler, ignoring")
 
-    db.commit()
-    return JSONResponse(content={"status": "ok"})
+@router.post("/admin/webhook-inbox/{event_id}/requeue")
+def requeue_webhook_event(
+    event_id: UUID,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Admin: give a dead-lettered event a fresh set of attempts (after the
+    cause — a missing plan row, say — has been fixed)."""
+    event = db.query(WebhookEvent).filter(
+        WebhookEvent.id == event_id, WebhookEvent.status == "dead"
+    ).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Dead-lettered event not found")
+    webhook_inbox.requeue(db, event)
+    return {"status": "requeued", "id": str(event.id)}
 
 
 @router.post("/admin/apple-test-notification")
@@ -12,8 +12,15 @@ from app.models.tarantula import Tarantula
 from app.models.scorpion import Scorpion
 from app.models.invert import Invert
 from app.models.substrate_change import SubstrateChange
-from app.schemas.substrate_change import SubstrateChangeCreate, SubstrateChangeUpdate, SubstrateChangeResponse
+from app.schemas.bulk_log import BulkLogResult, BulkLogSkip
+from app.schemas.substrate_change import (
+    BulkSubstrateChangeRequest,
+    SubstrateChangeCreate,
+    SubstrateChangeResponse,
+    SubstrateChangeUpdate,
+)
 from app.utils.dependencies import get_current_user
+from app.services import bulk_logs
 from app.services.inverts_dualwrite import invert_id_if_exists  # ADR-005 A2
 
 router = APIRouter()
@@ -395,6 +402,56 @@ async def create_invert_substrate_change(
     return new_change
 
 
+@router.post(
+    "/inverts/bulk-substrate-changes",
+    response_model=BulkLogResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_invert_substrate_changes(
+    payload: BulkSubstrateChangeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Log one substrate change across many owned inverts (rehousing day).
+
+    Same forward-only denorm as the single-invert path, applied as one
+    UPDATE over the id set — and to the legacy tarantula/scorpion twins,
+    whose detail screens still read their own column.
+    """
+    requested = list(dict.fromkeys(payload.invert_ids))
+    owned_ids = {
+        row.id
+        for row in db.query(Invert.id)
+        .filter(Invert.id.in_(requested), Invert.user_id == current_user.id)
+        .all()
+    }
+    created_ids = [iid for iid in requested if iid in owned_ids]
+    change_fields = payload.model_dump(exclude={"invert_ids"})
+    bulk_logs.insert_rows(
+        db,
+        SubstrateChange,
+        [{"invert_id": iid, **change_fields} for iid in created_ids],
+    )
+    bulk_logs.advance_substrate(
+        db,
+        Invert,
+        created_ids,
+        payload.changed_at,
+        payload.substrate_type,
+        payload.substrate_depth,
+    )
+    db.commit()
+    return BulkLogResult(
+        created_count=len(created_ids),
+        created_ids=created_ids,
+        skipped=[
+            BulkLogSkip(invert_id=iid, reason="Not found or not yours")
+            for iid in requested
+            if iid not in owned_ids
+        ],
+    )
+
+
 @router.put("/substrate-changes/{change_id}", response_model=SubstrateChangeResponse)
 async def update_substrate_change(
     change_id: uuid.UUID,
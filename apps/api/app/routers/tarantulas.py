@@ -5,7 +5,7 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone, timedelta, date
 from collections import Counter
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from app.database import get_db
@@ -23,13 +23,14 @@ from app.schemas.tarantula import (
     TarantulaUpdate,
     TarantulaResponse,
     GrowthAnalytics,
-    GrowthDataPoint,
     FeedingStats,
     PreyTypeCount,
 )
 from app.utils.dependencies import get_current_user
 from app.utils.limits import enforce_collection_limit
+from app.services import public_profiles
 from app.services.activity_service import create_activity
+from app.services.growth_service import compute_growth_fields
 # ADR-005 Phase A2 — mirror writes to the unified `inverts` table.
 # Same SQLAlchemy session = atomic commit with the legacy write.
 from app.services.inverts_dualwrite import (
@@ -228,6 +229,7 @@ async def update_tarantula(
     mirror_tarantula_update(db, tarantula)
     db.commit()
     db.refresh(tarantula)
+    public_profiles.invalidate(tarantula.id)
 
     return tarantula
 
@@ -273,6 +275,7 @@ async def delete_tarantula(
     # deletes doesn't matter for log/photo cleanup.
     mirror_tarantula_delete(db, tarantula_id)
     db.commit()
+    public_profiles.invalidate(tarantula_id)
 
     return None
 
@@ -280,14 +283,21 @@ async def delete_tarantula(
 @router.get("/{tarantula_id}/growth", response_model=GrowthAnalytics)
 async def get_tarantula_growth(
     tarantula_id: UUID,
+    start: Optional[datetime] = Query(None, description="Only molts on or after this time."),
+    end: Optional[datetime] = Query(None, description="Only molts on or before this time."),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=5000,
+        description="Downsample data_points to about this many (LTTB). Summary stats still cover every molt.",
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get growth analytics for a tarantula
-    
+
     Returns historical molt data with calculated growth rates,
-    time between molts, and overall growth trends.
+    time between molts, and overall growth trends. Same computation as
+    the invert growth endpoint (services/growth_service.py).
     """
     tarantula = db.query(Tarantula).filter(
         Tarantula.id == tarantula_id,
@@ -300,100 +310,9 @@ async def get_tarantula_growth(
             detail="Tarantula not found"
         )
 
-    # Get all molt logs ordered by date
-    molt_logs = db.query(MoltLog).filter(
-        MoltLog.tarantula_id == tarantula_id
-    ).order_by(MoltLog.molted_at).all()
-
-    if not molt_logs:
-        # Return empty analytics if no molts recorded
-        return GrowthAnalytics(
-            tarantula_id=tarantula_id,
-            data_points=[],
-            total_molts=0
-        )
-
-    # Build data points with growth calculations
-    data_points = []
-    previous_molt = None
-    
-    for molt in molt_logs:
-        days_since_previous = None
-        weight_change = None
-        leg_span_change = None
-        
-        if previous_molt:
-            # Calculate time since previous molt
-            time_diff = molt.molted_at - previous_molt.molted_at
-            days_since_previous = time_diff.days
-            
-            # Calculate weight change
-            if molt.weight_after and previous_molt.weight_after:
-                weight_change = molt.weight_after - previous_molt.weight_after
-            
-            # Calculate leg span change
-            if molt.leg_span_after and previous_molt.leg_span_after:
-                leg_span_change = molt.leg_span_after - previous_molt.leg_span_after
-        
-        data_point = GrowthDataPoint(
-            date=molt.molted_at,
-            weight=molt.weight_after,
-            leg_span=molt.leg_span_after,
-            days_since_previous=days_since_previous,
-            weight_change=weight_change,
-            leg_span_change=leg_span_change
-        )
-        data_points.append(data_point)
-        previous_molt = molt
-
-    # Calculate summary statistics
-    total_molts = len(molt_logs)
-    
-    # Average days between molts
-    days_between = [dp.days_since_previous for dp in data_points if dp.days_since_previous]
-    average_days_between_molts = sum(days_between) / len(days_between) if days_between else None
-    
-    # Total growth
-    first_molt = molt_logs[0]
-    last_molt = molt_logs[-1]
-    
-    total_weight_gain = None
-    if first_molt.weight_after and last_molt.weight_after:
-        total_weight_gain = last_molt.weight_after - first_molt.weight_after
-    
-    total_leg_span_gain = None
-    if first_molt.leg_span_after and last_molt.leg_span_after:
-        total_leg_span_gain = last_molt.leg_span_after - first_molt.leg_span_after
-    
-    # Growth rate (per month)
-    growth_rate_weight = None
-    growth_rate_leg_span = None
-    
-    if len(molt_logs) > 1:
-        time_span = (last_molt.molted_at - first_molt.molted_at).days
-        months = time_span / 30.44  # Average days per month
-        
-        if months > 0:
-            if total_weight_gain:
-                growth_rate_weight = total_weight_gain / months
-            if total_leg_span_gain:
-                growth_rate_leg_span = total_leg_span_gain / months
-    
-    # Days since last molt
-    last_molt_date = last_molt.molted_at
-    days_since_last_molt = (datetime.now(timezone.utc) - last_molt_date).days
-
     return GrowthAnalytics(
         tarantula_id=tarantula_id,
-        data_points=data_points,
-        total_molts=total_molts,
-        average_days_between_molts=average_days_between_molts,
-        total_weight_gain=total_weight_gain,
-        total_leg_span_gain=total_leg_span_gain,
-        growth_rate_weight=growth_rate_weight,
-        growth_rate_leg_span=growth_rate_leg_span,
-        last_molt_date=last_molt_date,
-        days_since_last_molt=days_since_last_molt
+        **compute_growth_fields(db, MoltLog.tarantula_id, tarantula_id, start, end, max_points),
     )
 
 
@@ -730,6 +649,7 @@ async def get_public_link(
 async def get_public_tarantula(
     username: str,
     tarantula_slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -761,26 +681,38 @@ async def get_public_tarantula(
     #   without the client having to decide.
     normalized_slug = tarantula_slug.lower().replace(" ", "-")
 
-    user_tarantulas = db.query(Tarantula).filter(
+    # Only the columns the slug match needs; the full row is loaded on a
+    # cache miss (services/public_profiles.py).
+    user_tarantulas = db.query(
+        Tarantula.id, Tarantula.name, Tarantula.common_name
+    ).filter(
         Tarantula.user_id == user.id,
         Tarantula.visibility == 'public',
     ).all()
 
-    matching_tarantula = None
+    matching_id = None
     for t in user_tarantulas:
         t_slug = (t.name or t.common_name or "tarantula").lower().replace(" ", "-")
         if t_slug == normalized_slug or str(t.id) == tarantula_slug:
-            matching_tarantula = t
+            matching_id = t.id
             break
 
-    if not matching_tarantula:
+    if not matching_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarantula not found or is not public"
         )
 
-    tarantula = matching_tarantula
+    return await public_profiles.respond(
+        request,
+        f"public:{matching_id}",
+        matching_id,
+        lambda: _public_tarantula_payload(db, user, db.get(Tarantula, matching_id)),
+    )
+
 
+def _public_tarantula_payload(db: Session, user: User, tarantula: Tarantula) -> dict:
+    """Body of `get_public_tarantula` for an already-resolved tarantula."""
     # Get feeding logs
     feeding_logs = db.query(FeedingLog).filter(
         FeedingLog.tarantula_id == tarantula.id
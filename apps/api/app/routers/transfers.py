@@ -1,7 +1,7 @@
 """Animal transfer ("rehome") — BRIEF-animal-transfer-provenance.
 
 Seller generates a claim link for an animal they own; buyer claims it and gets a
-NEW invert pre-loaded with species + provenance + copied photos. Source record is
+NEW invert pre-loaded with species + provenance + the seller's photos. Source record is
 badged "Transferred" (Invert.transferred_out_at) and drops out of the seller's
 active counts/cap/reminders.
 
@@ -30,8 +30,7 @@ from app.models.molt_log import MoltLog
 from app.models.user import User
 from app.utils.dependencies import get_current_user
 from app.routers.qr import _optional_user  # reuse the never-raise bearer resolver
-from app.services.storage import storage_service
-from app.services import analytics_events
+from app.services import analytics_events, photo_blobs
 from app.schemas.transfer import (
     TransferCreate, TransferCreateResponse, TransferPreview, TransferListItem,
 )
@@ -170,6 +169,32 @@ def _build_animal_snapshot(db: Session, animal: Animal, seller: User) -> dict:
     }
 
 
+def _share_photos(db: Session, src_photos, **parent) -> Optional[str]:
+    """Give the new record its own photo rows over the seller's stored
+    objects, most recent first; returns the hero URL (None if no photos).
+
+    No storage calls: the objects are shared and reference-counted
+    (services/photo_blobs.py), so the seller deleting a photo later can't
+    break the buyer's record (§5) and the claim's transaction holds no
+    network I/O. It used to copy every object to new keys, serially.
+    """
+    for p in src_photos:
+        db.add(Photo(
+            id=str(uuidlib.uuid4()),
+            **parent,
+            url=p.url,
+            thumbnail_url=p.thumbnail_url,
+            width=p.width,
+            height=p.height,
+            variants=p.variants,
+            caption=p.caption,
+            taken_at=p.taken_at,
+            created_at=datetime.utcnow(),
+        ))
+    photo_blobs.share(db, (url for p in src_photos for url in photo_blobs.photo_urls(p)))
+    return src_photos[0].url if src_photos else None
+
+
 def _web_base() -> str:
     return getattr(settings, "FRONTEND_URL", "https://tarantuverse.com")
 
@@ -344,7 +369,7 @@ async def _claim_animal_transfer(
     current_user: User,
     body: "Optional[ClaimBody]",
 ) -> dict:
-    """HV claim path — create a new Animal owned by the buyer, copy photos,
+    """HV claim path — create a new Animal owned by the buyer, share photos,
     badge the source animal handed-off. Mirrors the invert claim (§5)."""
     source = db.query(Animal).filter(Animal.id == transfer.animal_id).first()
     if not source:
@@ -387,25 +412,9 @@ async def _claim_animal_transfer(
             .order_by(Photo.created_at.desc())
             .all()
         )
-        hero_set = False
-        for p in src_photos:
-            try:
-                new_url, new_thumb = await storage_service.copy_photo(p.url, p.thumbnail_url)
-            except Exception:
-                logger.exception("photo copy failed during claim (transfer %s, photo %s)", transfer.id, p.id)
-                continue
-            db.add(Photo(
-                id=str(uuidlib.uuid4()),
-                animal_id=new_animal.id,
-                url=new_url,
-                thumbnail_url=new_thumb,
-                caption=p.caption,
-                taken_at=p.taken_at,
-                created_at=datetime.utcnow(),
-            ))
-            if not hero_set:
-                new_animal.photo_url = new_url
-                hero_set = True
+        hero_url = _share_photos(db, src_photos, animal_id=new_animal.id)
+        if hero_url:
+            new_animal.photo_url = hero_url
 
     transfer.status = "claimed"
     transfer.to_user_id = current_user.id
@@ -544,7 +553,7 @@ async def claim_transfer(
     db.add(new_invert)
     db.flush()  # need new_invert.id for photo rows + transfer link
 
-    # True-copy selected photos (independent R2 objects — §5).
+    # The seller's photos, shared rather than copied (§5 — see _share_photos).
     if transfer.include_photos:
         src_photos = (
             db.query(Photo)
@@ -552,25 +561,9 @@ async def claim_transfer(
             .order_by(Photo.created_at.desc())
             .all()
         )
-        hero_set = False
-        for p in src_photos:
-            try:
-                new_url, new_thumb = await storage_service.copy_photo(p.url, p.thumbnail_url)
-            except Exception:
-                logger.exception("photo copy failed during claim (transfer %s, photo %s)", transfer.id, p.id)
-                continue
-            db.add(Photo(
-                id=str(uuidlib.uuid4()),
-                invert_id=new_invert.id,
-                url=new_url,
-                thumbnail_url=new_thumb,
-                caption=p.caption,
-                taken_at=p.taken_at,
-                created_at=datetime.utcnow(),
-            ))
-            if not hero_set:
-                new_invert.photo_url = new_url
-                hero_set = True
+        hero_url = _share_photos(db, src_photos, invert_id=new_invert.id)
+        if hero_url:
+            new_invert.photo_url = hero_url
 
     # Mark transfer claimed.
     transfer.status = "claimed"
@@ -590,7 +583,7 @@ async def claim_transfer(
         offspring.buyer_info = current_user.username
 
     # ADR-005 dual-write. Deliberately last: the hero photo is assigned during
-    # the copy loop above, and mirroring before that would leave the legacy row
+    # _share_photos above, and mirroring before that would leave the legacy row
     # with a null photo_url — the same one-directional hero bug fixed in
     # photos.py. Building the legacy row from the finished invert avoids it.
     # Without this the claimed animal exists on mobile and is absent from the
@@ -27,7 +27,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -41,14 +41,14 @@ from app.schemas.weight_log import (
     WeightLogCreate,
     WeightLogUpdate,
     WeightLogResponse,
-    WeightTrendPoint,
     WeightTrendResponse,
     PreySuggestion,
     FeedingStatus,
 )
+from app.services import public_profiles
+from app.services.growth_service import latest_weight_and_loss_30d, weight_series
 from app.services.snake_feeding_advisory import (
     compute_life_stage,
-    compute_weight_loss_30d,
     suggest_prey_range,
 )
 from app.utils.dependencies import get_current_user
@@ -150,10 +150,20 @@ async def latest_weight_log(
 )
 async def weight_trend(
     animal_id: uuid.UUID,
+    start: Optional[datetime] = Query(None, description="Only weigh-ins on or after this time."),
+    end: Optional[datetime] = Query(None, description="Only weigh-ins on or before this time."),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=5000,
+        description="Downsample the series to about this many points (LTTB).",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Return the full weight series + a 30-day loss alert.
+    """Return the weight series + a 30-day loss alert.
+
+    The series honours the optional range and point budget; the latest
+    weight and the 30-day loss always describe the animal's most recent
+    weigh-ins, whatever range is on screen.
 
     Alert suppression: if the animal is currently brumating (or
     aestivating — same flag for frogs), don't flag weight loss; it's
@@ -162,20 +172,8 @@ async def weight_trend(
     animal = _get_owned_animal(db, animal_id, current_user)
     species = _species_for_animal(db, animal)
 
-    logs = (
-        db.query(WeightLog)
-        .filter(WeightLog.animal_id == animal_id)
-        .order_by(WeightLog.weighed_at.asc())
-        .all()
-    )
-
-    series = [
-        WeightTrendPoint(weighed_at=l.weighed_at, weight_g=l.weight_g)
-        for l in logs
-    ]
-    latest_weight = logs[-1].weight_g if logs else None
-
-    loss_pct = compute_weight_loss_30d((l.weighed_at, l.weight_g) for l in logs)
+    series, total_points = weight_series(db, animal_id, start, end, max_points)
+    latest_weight, loss_pct = latest_weight_and_loss_30d(db, animal_id)
 
     alert_threshold = species.weight_loss_concern_pct_30d if species else None
     alert = False
@@ -190,6 +188,7 @@ async def weight_trend(
 
     return WeightTrendResponse(
         series=series,
+        total_points=total_points,
         latest_weight_g=latest_weight,
         loss_pct_30d=loss_pct,
         alert=alert,
@@ -229,6 +228,7 @@ async def create_weight_log(
         animal.current_weight_g = new_log.weight_g
 
     db.commit()
+    public_profiles.invalidate(animal_id)
     db.refresh(new_log)
     return new_log
 
@@ -0,0 +1,21 @@
+"""
+Bulk log result schemas
+
+Shared by every bulk log endpoint that reports per-invert skips (molts,
+substrate changes). Feeding Day keeps its own result shape because it also
+reports which animals it resumed.
+"""
+from pydantic import BaseModel
+from typing import List
+import uuid
+
+
+class BulkLogSkip(BaseModel):
+    invert_id: uuid.UUID
+    reason: str
+
+
+class BulkLogResult(BaseModel):
+    created_count: int
+    created_ids: List[uuid.UUID]
+    skipped: List[BulkLogSkip] = []
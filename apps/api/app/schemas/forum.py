@@ -141,6 +141,7 @@ class ForumThreadList(BaseModel):
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 class ForumPostList(BaseModel):
@@ -149,6 +150,7 @@ class ForumPostList(BaseModel):
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 # Fix forward references
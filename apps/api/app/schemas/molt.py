@@ -2,7 +2,7 @@
 Molt log schemas
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 import uuid
@@ -94,3 +94,12 @@ class MoltLogResponse(MoltLogBase):
 
     class Config:
         from_attributes = True
+
+
+class BulkMoltRequest(MoltLogBase):
+    """Log the same molt details across many owned inverts at once.
+
+    Mirrors BulkFeedingRequest: ids the caller doesn't own are skipped and
+    reported, never fatal."""
+    invert_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
+
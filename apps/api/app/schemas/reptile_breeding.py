@@ -247,12 +247,14 @@ class ReptileOffspringResponse(BaseModel):
 
 # ─── Predicted morph outcomes ──────────────────────────────────────────
 #
-# The actual Punnett logic lives in the front-end morph calculator (it
-# carries citations, welfare warnings, and lethal-homozygous flags that
-# we don't want to maintain in two languages). This endpoint just
-# packages the data the calculator needs: each parent's recorded
-# genotypes + the set of genes both have on file (the safe overlap to
-# predict against).
+# The interactive Punnett view lives in the front-end morph calculator (it
+# carries citations and welfare copy we don't want to maintain in two
+# languages). /clutches/{id}/parent-genotypes just packages the data the
+# calculator needs: each parent's recorded genotypes + the set of genes
+# both have on file (the safe overlap to predict against).
+#
+# Server-side scoring — many loci, many pairings at once — runs through
+# app/services/morph_genetics.py, which mirrors the calculator's math.
 
 
 class ParentGenotypeBundle(BaseModel):
@@ -281,3 +283,47 @@ class ClutchParentGenotypesResponse(BaseModel):
     female: ParentGenotypeBundle
     overlapping_gene_keys: List[str]
     note: Optional[str] = None
+
+
+class PredictedMorphOutcome(BaseModel):
+    """One visible offspring phenotype from the server-side engine.
+
+    `poss_hets` maps gene name → percent chance an offspring of this
+    phenotype carries the recessive hidden (the hobby's "66% het")."""
+    label: str
+    probability: float
+    visual_genes: List[str]
+    poss_hets: dict[str, float] = Field(default_factory=dict)
+    is_lethal: bool = False
+    welfare_flags: List[str] = Field(default_factory=list)
+
+
+class PairingPredictionResponse(BaseModel):
+    """Output of /reptile-pairings/{id}/predicted-outcomes.
+
+    `lethal_probability` / `welfare_probability` are exact — they come
+    from per-gene marginals, not from the (pruned) outcome list.
+    `pruned_probability` is the mass of outcomes too rare to list."""
+    male_animal_id: UUID
+    female_animal_id: UUID
+    loci_count: int
+    outcomes: List[PredictedMorphOutcome]
+    lethal_probability: float
+    welfare_probability: float
+    expected_visual_genes: float
+    pruned_probability: float
+    # Genes only one parent has on file — the other is assumed normal.
+    assumed_normal_genes: List[str] = Field(default_factory=list)
+
+
+class PairingCandidateResponse(PairingPredictionResponse):
+    """One male × female candidate from /reptile-pairings/candidates."""
+    male_display_name: str
+    female_display_name: str
+    species: Optional[str] = None
+
+
+class PairingCandidatesResponse(BaseModel):
+    candidates: List[PairingCandidateResponse]
+    # Total pairs evaluated before `limit` was applied.
+    total_pairs: int
@@ -2,7 +2,7 @@
 Substrate change schemas
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 import uuid
 
@@ -43,3 +43,11 @@ class SubstrateChangeResponse(SubstrateChangeBase):
 
     class Config:
         from_attributes = True
+
+
+class BulkSubstrateChangeRequest(SubstrateChangeBase):
+    """Log one substrate change across many owned inverts (rehousing day).
+
+    Same skip-don't-fail contract as BulkFeedingRequest. Results use
+    BulkLogResult from app.schemas.bulk_log."""
+    invert_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
@@ -59,9 +59,13 @@ class WeightLogResponse(WeightLogBase):
 
 
 class WeightTrendPoint(BaseModel):
-    """A single point on the weight chart — (date, grams) pair."""
+    """A single point on the weight chart — (date, grams) pair, plus the
+    change from the previous weigh-in. The previous weigh-in is the real
+    one, even when the series has been downsampled past it."""
     weighed_at: datetime
     weight_g: Decimal
+    days_since_previous: Optional[int] = None
+    change_g: Optional[Decimal] = None
 
 
 class WeightTrendResponse(BaseModel):
@@ -74,6 +78,9 @@ class WeightTrendResponse(BaseModel):
     brumating, which the server caller suppresses).
     """
     series: list[WeightTrendPoint]
+    # Weigh-ins in the requested range before downsampling; equals
+    # len(series) unless max_points thinned it.
+    total_points: int = 0
     latest_weight_g: Optional[Decimal] = None
     loss_pct_30d: Optional[Decimal] = None
     alert: bool = False
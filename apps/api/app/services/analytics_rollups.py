@@ -0,0 +1,409 @@
+"""Admin analytics rollups — refresh and read (models/analytics_rollup.py).
+
+The dashboard's date-grouped numbers come from `analytics_daily`: one
+GROUP BY per source table fills a range of days, and the endpoints sum
+rows instead of scanning users, activity_feed and the logs on every load.
+Point-in-time figures — totals, subscription state, MRR, top species —
+are still read live; they are single aggregates, not per-day scans.
+
+Freshness:
+
+  - readers call `ensure_range` first, which rolls up any day in the
+    range that was never computed, today if its row is more than
+    FRESH_FOR old, and a past day last computed before it had ended
+    (+ FRESH_FOR for late commits)
+  - the nightly cron recomputes the last RECOMPUTE_DAYS days, which is
+    what picks up backdated entries (a feeding logged today for last
+    Tuesday); anything backdated further lands on the next backfill
+  - cohorts work the same way: a month whose day-30 windows haven't all
+    closed is recomputed on read once its row is older than
+    COHORT_FRESH_FOR
+
+Days are UTC calendar days. Naive timestamp columns (activity_feed,
+forum threads and posts) are already stored in UTC.
+
+Metric rows carry an app — "tarantuverse", "herpetoverse", or "all" for
+account-level sources with no app of their own — and a dimension, which is
+"" unless the metric is split (new_users by sign-in provider,
+subscriptions by plan name).
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    and_,
+    case,
+    cast,
+    delete,
+    distinct,
+    exists,
+    func,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.activity_feed import ActivityFeed
+from app.models.analytics_rollup import (
+    AnalyticsDaily,
+    AnalyticsRetentionCohort,
+    AnalyticsRollupDay,
+)
+from app.models.direct_message import DirectMessage
+from app.models.feeding_log import FeedingLog
+from app.models.follow import Follow
+from app.models.forum import ForumPost, ForumThread
+from app.models.molt_log import MoltLog
+from app.models.subscription import SubscriptionPlan, UserSubscription
+from app.models.substrate_change import SubstrateChange
+from app.models.tarantula import Tarantula
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+FRESH_FOR = timedelta(minutes=5)
+COHORT_FRESH_FOR = timedelta(hours=1)
+RECOMPUTE_DAYS = 7
+RETENTION_DAYS = (1, 7, 30)
+
+# pg_advisory_xact_lock key: refreshes DELETE then INSERT the same days, so
+# two admins loading the dashboard at once must take turns.
+_LOCK_KEY = 0x616E6C79  # "anly"
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def day_start(day: date) -> datetime:
+    """Midnight UTC at the start of `day`."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def days_between(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+# ─── Sources ───────────────────────────────────────────────────────────
+
+
+def _utc_day(column):
+    """The UTC calendar day of a timestamp or date column."""
+    if isinstance(column.type, Date):
+        return column
+    if getattr(column.type, "timezone", False):
+        return cast(func.timezone("UTC", column, type_=DateTime), Date)
+    return cast(column, Date)
+
+
+def _in_range(column, start: date, end: date):
+    """`column` falls on a day in [start, end], written so an index on the
+    raw column can serve it."""
+    if isinstance(column.type, Date):
+        lower, upper = start, end + timedelta(days=1)
+    elif getattr(column.type, "timezone", False):
+        lower, upper = day_start(start), day_start(end + timedelta(days=1))
+    else:
+        lower = datetime.combine(start, time.min)
+        upper = datetime.combine(end + timedelta(days=1), time.min)
+    return and_(column >= lower, column < upper)
+
+
+def _count_by_day(metric, column, start, end, *, app="all", dimension="", value=None, join=None):
+    """One metric's rows for [start, end]: a count (or `value`) per UTC day,
+    app and dimension. `app` and `dimension` are a constant or a column
+    expression."""
+    day = _utc_day(column)
+    # Constant app/dimension values are selected but not grouped on.
+    grouping = [day] + [expr for expr in (app, dimension) if not isinstance(expr, str)]
+    app_expr = literal(app) if isinstance(app, str) else app
+    dimension_expr = literal(dimension) if isinstance(dimension, str) else dimension
+    stmt = select(
+        day.label("day"),
+        app_expr.label("app"),
+        literal(metric).label("metric"),
+        dimension_expr.label("dimension"),
+        (value if value is not None else func.count()).label("value"),
+    ).select_from(column.table)
+    if join is not None:
+        stmt = stmt.join(*join)
+    return stmt.where(_in_range(column, start, end)).group_by(*grouping)
+
+
+def _trailing_active(metric, window_days, start, end):
+    """Distinct active users over the `window_days` days ending on each day."""
+    series = select(
+        (literal(start, Date) + func.generate_series(0, (end - start).days)).label("day")
+    ).subquery()
+    return (
+        select(
+            series.c.day.label("day"),
+            literal("all").label("app"),
+            literal(metric).label("metric"),
+            literal("").label("dimension"),
+            func.count(distinct(ActivityFeed.user_id)).label("value"),
+        )
+        .select_from(series)
+        .join(
+            ActivityFeed,
+            and_(
+                ActivityFeed.created_at >= series.c.day - (window_days - 1),
+                ActivityFeed.created_at < series.c.day + 1,
+            ),
+        )
+        .group_by(series.c.day)
+    )
+
+
+def _sources(start: date, end: date):
+    plan_app = func.coalesce(SubscriptionPlan.app, "tarantuverse")
+    plan_join = (SubscriptionPlan, UserSubscription.plan_id == SubscriptionPlan.id)
+    feeding_app = case(
+        (FeedingLog.animal_id.isnot(None), literal("herpetoverse")),
+        else_=literal("tarantuverse"),
+    )
+    return [
+        _count_by_day("new_users", User.created_at, start, end,
+                      dimension=func.coalesce(User.oauth_provider, "email")),
+        _count_by_day("active_users", ActivityFeed.created_at, start, end,
+                      value=func.count(distinct(ActivityFeed.user_id))),
+        _trailing_active("active_users_7d", 7, start, end),
+        _trailing_active("active_users_30d", 30, start, end),
+        _count_by_day("new_tarantulas", Tarantula.created_at, start, end, app="tarantuverse"),
+        _count_by_day("feedings", FeedingLog.fed_at, start, end, app=feeding_app),
+        _count_by_day("molts", MoltLog.molted_at, start, end, app="tarantuverse"),
+        _count_by_day("substrate_changes", SubstrateChange.changed_at, start, end,
+                      app="tarantuverse"),
+        _count_by_day("forum_threads", ForumThread.created_at, start, end),
+        _count_by_day("forum_posts", ForumPost.created_at, start, end),
+        _count_by_day("messages", DirectMessage.created_at, start, end),
+        _count_by_day("follows", Follow.created_at, start, end),
+        _count_by_day("subscriptions_started", UserSubscription.started_at, start, end,
+                      app=plan_app, dimension=SubscriptionPlan.name, join=plan_join),
+        _count_by_day("subscriptions_cancelled", UserSubscription.cancelled_at, start, end,
+                      app=plan_app, dimension=SubscriptionPlan.name, join=plan_join),
+    ]
+
+
+# ─── Daily refresh ─────────────────────────────────────────────────────
+
+
+def refresh_days(db: Session, start: date, end: date) -> int:
+    """Recompute every metric for the days in [start, end] and commit.
+    Replaces the days' rows wholesale, so it is safe to rerun. Returns the
+    number of metric rows written."""
+    if end < start:
+        return 0
+    db.execute(select(func.pg_advisory_xact_lock(_LOCK_KEY)))
+    db.execute(delete(AnalyticsDaily).where(AnalyticsDaily.day.between(start, end)))
+    columns = ["day", "app", "metric", "dimension", "value"]
+    written = db.execute(
+        insert(AnalyticsDaily).from_select(columns, union_all(*_sources(start, end)))
+    ).rowcount
+    covered = insert(AnalyticsRollupDay).values([{"day": day} for day in days_between(start, end)])
+    db.execute(
+        covered.on_conflict_do_update(
+            index_elements=[AnalyticsRollupDay.day], set_={"computed_at": func.now()}
+        )
+    )
+    db.commit()
+    return written
+
+
+def _stale_days(db: Session, start: date, end: date) -> List[date]:
+    computed = dict(
+        db.execute(
+            select(AnalyticsRollupDay.day, AnalyticsRollupDay.computed_at)
+            .where(AnalyticsRollupDay.day.between(start, end))
+        ).all()
+    )
+    now = datetime.now(timezone.utc)
+    stale = []
+    for day in days_between(start, end):
+        computed_at = computed.get(day)
+        if computed_at is None:
+            stale.append(day)
+        elif computed_at < day_start(day + timedelta(days=1)) + FRESH_FOR and (
+            computed_at < now - FRESH_FOR
+        ):
+            stale.append(day)
+    return stale
+
+
+def _runs(days: Sequence[date]) -> Iterable[Tuple[date, date]]:
+    """Consecutive days as (first, last) ranges."""
+    run_start = previous = None
+    for day in days:
+        if previous is not None and day == previous + timedelta(days=1):
+            previous = day
+            continue
+        if run_start is not None:
+            yield run_start, previous
+        run_start = previous = day
+    if run_start is not None:
+        yield run_start, previous
+
+
+def ensure_range(db: Session, start: date, end: date) -> None:
+    """Roll up whatever in [start, end] is missing or stale. Days after
+    today are never computed."""
+    end = min(end, utc_today())
+    for first, last in _runs(_stale_days(db, start, end)):
+        refresh_days(db, first, last)
+
+
+def recompute_recent(db: Session, days: int = RECOMPUTE_DAYS) -> int:
+    """The nightly job: recompute the last `days` days outright."""
+    today = utc_today()
+    written = refresh_days(db, today - timedelta(days=days - 1), today)
+    logger.info(f"Analytics rollup: {written} rows for the last {days} days")
+    return written
+
+
+# ─── Read ──────────────────────────────────────────────────────────────
+
+
+def series(db: Session, metrics: Sequence[str], start: date, end: date,
+           app: Optional[str] = None) -> Dict[str, Dict[date, int]]:
+    """{metric: {day: value}} for days in [start, end], summed over
+    dimensions and — unless `app` is given — over apps. Days with no
+    activity are absent."""
+    stmt = (
+        select(AnalyticsDaily.metric, AnalyticsDaily.day, func.sum(AnalyticsDaily.value))
+        .where(AnalyticsDaily.metric.in_(metrics), AnalyticsDaily.day.between(start, end))
+        .group_by(AnalyticsDaily.metric, AnalyticsDaily.day)
+    )
+    if app is not None:
+        stmt = stmt.where(AnalyticsDaily.app == app)
+    result: Dict[str, Dict[date, int]] = {metric: {} for metric in metrics}
+    for metric, day, value in db.execute(stmt).tuples():
+        result[metric][day] = int(value)
+    return result
+
+
+def total(db: Session, metric: str, start: date, end: date) -> int:
+    """A metric summed over [start, end]. Only meaningful for counts of
+    events — not the distinct-user metrics."""
+    value = db.execute(
+        select(func.sum(AnalyticsDaily.value))
+        .where(AnalyticsDaily.metric == metric, AnalyticsDaily.day.between(start, end))
+    ).scalar()
+    return int(value or 0)
+
+
+# ─── Retention cohorts ─────────────────────────────────────────────────
+
+
+def month_start(day: date, months_back: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _cohort_end(month: date) -> date:
+    return month_start(month, -1)
+
+
+def refresh_cohorts(db: Session, months: Iterable[date]) -> int:
+    """Recompute the given signup months in one query and commit.
+
+    A member is retained on day N if they have activity in the 24 hours
+    starting N days after their own signup. They count toward day N's
+    percentage only once that window has closed, so a cohort still
+    maturing isn't dragged down by people who haven't reached day N yet."""
+    months = sorted({month_start(month) for month in months})
+    if not months:
+        return 0
+    now = func.timezone("UTC", func.now(), type_=DateTime)
+    signed_up = func.timezone("UTC", User.created_at, type_=DateTime)
+    cohort = cast(func.date_trunc("month", signed_up), Date)
+    columns = [cohort.label("cohort_month"), func.count().label("cohort_size")]
+    for n in RETENTION_DAYS:
+        opens = signed_up + timedelta(days=n)
+        closes = signed_up + timedelta(days=n + 1)
+        eligible = closes <= now
+        active = exists().where(
+            ActivityFeed.user_id == User.id,
+            ActivityFeed.created_at >= opens,
+            ActivityFeed.created_at < closes,
+        )
+        columns.append(func.count().filter(eligible).label(f"eligible_day_{n}"))
+        columns.append(func.count().filter(and_(eligible, active)).label(f"retained_day_{n}"))
+
+    rows = db.execute(
+        select(*columns)
+        .where(
+            User.created_at >= day_start(months[0]),
+            User.created_at < day_start(_cohort_end(months[-1])),
+        )
+        .group_by(cohort)
+    ).mappings().all()
+    found = {row["cohort_month"]: dict(row) for row in rows}
+    values = [
+        found.get(month) or {"cohort_month": month, "cohort_size": 0, **{
+            f"{kind}_day_{n}": 0 for n in RETENTION_DAYS for kind in ("eligible", "retained")
+        }}
+        for month in months
+    ]
+    table = AnalyticsRetentionCohort.__table__
+    stmt = insert(table).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.cohort_month],
+        set_={
+            **{name: stmt.excluded[name] for name in values[0] if name != "cohort_month"},
+            "computed_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+    return len(values)
+
+
+def _cohort_is_final(month: date, computed_at: datetime) -> bool:
+    """Every member's last retention window had closed when the row was
+    computed."""
+    last_window_closes = day_start(_cohort_end(month)) + timedelta(days=max(RETENTION_DAYS) + 1)
+    return computed_at >= last_window_closes
+
+
+def ensure_cohorts(db: Session, months: Sequence[date]) -> List[AnalyticsRetentionCohort]:
+    """The cohort rows for `months`, oldest first, recomputing any that are
+    missing or still maturing and more than COHORT_FRESH_FOR old."""
+    months = sorted({month_start(month) for month in months})
+    rows = {
+        row.cohort_month: row
+        for row in db.query(AnalyticsRetentionCohort)
+        .filter(AnalyticsRetentionCohort.cohort_month.in_(months))
+    }
+    now = datetime.now(timezone.utc)
+    stale = [
+        month for month in months
+        if month not in rows
+        or (not _cohort_is_final(month, rows[month].computed_at)
+            and rows[month].computed_at < now - COHORT_FRESH_FOR)
+    ]
+    if stale:
+        refresh_cohorts(db, stale)
+        rows = {
+            row.cohort_month: row
+            for row in db.query(AnalyticsRetentionCohort)
+            .filter(AnalyticsRetentionCohort.cohort_month.in_(months))
+        }
+    return [rows[month] for month in months if month in rows]
+
+
+def open_cohort_months(today: Optional[date] = None) -> List[date]:
+    """Signup months whose day-30 windows may still be open."""
+    today = today or utc_today()
+    oldest = month_start(today - timedelta(days=max(RETENTION_DAYS) + 1))
+    months = []
+    month = month_start(today)
+    while month >= oldest:
+        months.append(month)
+        month = month_start(month, 1)
+    return months
+
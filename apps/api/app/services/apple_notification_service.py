@@ -105,15 +105,10 @@ def _get_verifiers():
     return _verifiers
 
 
-def decode_notification(signed_payload: str) -> Tuple[str, Optional[str], object, str]:
-    """Verify + decode a V2 notification.
-
-    Returns (notification_type, subtype, transaction_payload, environment)
-    where transaction_payload is the decoded JWSTransactionDecodedPayload
-    (or None for notifications without transaction info).
-
-    Raises AppleNotificationError if no verifier accepts the payload.
-    """
+def _verify(signed_payload: str):
+    """(payload, transaction, environment) from the first verifier that
+    accepts the JWS. transaction is None for notifications without
+    transaction info (TEST, some summary types)."""
     last_error: Optional[Exception] = None
 
     for env_name, verifier in _get_verifiers():
@@ -125,13 +120,7 @@ def decode_notification(signed_payload: str) -> Tuple[str, Optional[str], object
                 transaction = verifier.verify_and_decode_signed_transaction(
                     payload.data.signedTransactionInfo
                 )
-
-            # rawNotificationType/rawSubtype keep the original strings even
-            # if Apple adds types this library version doesn't know about.
-            notification_type = payload.rawNotificationType or ""
-            subtype = payload.rawSubtype
-
-            return notification_type, subtype, transaction, env_name
+            return payload, transaction, env_name
         except Exception as exc:  # VerificationException et al.
             last_error = exc
             continue
@@ -139,6 +128,41 @@ def decode_notification(signed_payload: str) -> Tuple[str, Optional[str], object
     raise AppleNotificationError(f"Signature verification failed: {last_error}")
 
 
+def decode_notification(signed_payload: str) -> Tuple[str, Optional[str], object, str]:
+    """Verify + decode a V2 notification.
+
+    Returns (notification_type, subtype, transaction_payload, environment)
+    where transaction_payload is the decoded JWSTransactionDecodedPayload
+    (or None for notifications without transaction info).
+
+    Raises AppleNotificationError if no verifier accepts the payload.
+    """
+    payload, transaction, env_name = _verify(signed_payload)
+    # rawNotificationType/rawSubtype keep the original strings even
+    # if Apple adds types this library version doesn't know about.
+    return payload.rawNotificationType or "", payload.rawSubtype, transaction, env_name
+
+
+def decode_notification_event(signed_payload: str) -> dict:
+    """Verify + flatten a V2 notification into the plain fields the webhook
+    inbox stores and replays (JSON-safe — no library objects).
+
+    CPU-bound (x5c chain validation): call it off the event loop.
+    Raises AppleNotificationError if no verifier accepts the payload.
+    """
+    payload, transaction, env_name = _verify(signed_payload)
+    return {
+        "notification_uuid": payload.notificationUUID,
+        "notification_type": payload.rawNotificationType or "",
+        "subtype": payload.rawSubtype,
+        "environment": env_name,
+        "signed_date_ms": payload.signedDate,
+        "original_transaction_id": getattr(transaction, "originalTransactionId", None),
+        "expires_ms": getattr(transaction, "expiresDate", None),
+        "has_transaction": transaction is not None,
+    }
+
+
 # ==================== APP STORE SERVER API ====================
 # Uses the In-App Purchase key (APPLE_IAP_* settings) to talk to
 # Apple's server API: real transaction verification for receipts, and
@@ -0,0 +1,55 @@
+"""Per-page batch enrichment for list endpoints.
+
+List routes used to decorate each row with its own lookup — the colony's
+species name, the clutch's offspring count — so a page of N rows cost N+1
+queries, on screens (collection grid, feeder shelf) that already fan out.
+These helpers resolve a whole page at once: one IN query for the related
+rows, one GROUP BY for the child counts. Callers build a map first and pass
+it to their per-row builder; single-row routes go through the same helpers
+with a one-element page so there's only one code path.
+
+Both helpers are shape-only — they don't know what the columns mean, so the
+per-router rules (display-name fallbacks, "species missing" flags) stay in
+the routers where they were.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+
+def _distinct(ids: Iterable[Optional[Any]]) -> list:
+    return list({i for i in ids if i is not None})
+
+
+def rows_by_id(db: Session, model, ids: Iterable[Optional[Any]], *columns: str) -> Dict[Any, Any]:
+    """{id: row} for every id in `ids` that exists, in one query.
+
+    With `columns`, only those columns are loaded (plus id) and rows are
+    lightweight named tuples — enough for attribute access like
+    `row.scientific_name`, without hydrating full ORM objects. An id with
+    no row is simply absent from the map.
+    """
+    wanted = _distinct(ids)
+    if not wanted:
+        return {}
+    if columns:
+        q = db.query(model.id, *[getattr(model, c) for c in columns])
+    else:
+        q = db.query(model)
+    return {row.id: row for row in q.filter(model.id.in_(wanted)).all()}
+
+
+def counts_by(db: Session, fk_column, ids: Iterable[Optional[Any]], *filters) -> Dict[Any, int]:
+    """{parent id: child row count} via one GROUP BY. Parents with no
+    children are absent; read with `.get(id, 0)`."""
+    wanted = _distinct(ids)
+    if not wanted:
+        return {}
+    rows = (
+        db.query(fk_column, func.count())
+        .filter(fk_column.in_(wanted), *filters)
+        .group_by(fk_column)
+        .all()
+    )
+    return {parent_id: n for parent_id, n in rows}
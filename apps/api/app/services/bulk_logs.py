@@ -0,0 +1,198 @@
+"""Set-based bulk writes for husbandry logs (Feeding Day and friends).
+
+The per-row paths add one ORM object per animal and let the unit of work
+flush them, which is one INSERT round-trip per row plus identity-map
+bookkeeping — fine for a single feeding, the bottleneck when a keeper logs
+300+ animals at once. Everything here goes straight to Core:
+
+  * Rows go in as multi-row `INSERT ... VALUES (...), (...) RETURNING id`,
+    via SQLAlchemy's insertmanyvalues batching so the statement compiles
+    once and is reused per chunk. Every bulk endpoint caps a request at
+    500 animals, well below where COPY FROM STDIN would pay for itself.
+
+Ids are assigned here, before the write, so callers never need to re-read
+what they just wrote.
+
+The derived updates that the per-row paths do one object at a time —
+`last_fed_at`, clearing a feeding pause, the legacy twin that the inverts
+consolidation still dual-writes (ADR-005) — are single UPDATE statements
+keyed on the id set. The rules themselves are unchanged; see
+utils/feeding_pause.py for why only an accepted feeding resumes.
+
+All functions run on the caller's session and never commit, so a bulk
+write is still one transaction with everything else the route does.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from typing import Iterable, List, Sequence, Type
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.invert import Invert
+from app.models.scorpion import Scorpion
+from app.models.tarantula import Tarantula
+
+
+# Rows per INSERT statement. Postgres caps a statement at 65,535 bind
+# parameters; the widest log table is ~15 columns, so 1,000 rows stays
+# well clear while keeping round-trips low.
+INSERT_CHUNK = 1000
+
+
+# ─── Inserts ───────────────────────────────────────────────────────────
+
+
+def _complete_rows(table, rows: Sequence[dict]) -> tuple[list[str], list[dict]]:
+    """Give every row an id and the same column set.
+
+    Multi-row VALUES needs a rectangular batch. Columns a row leaves out
+    get the column's Python-side scalar default (quantity=1, accepted=True...)
+    — what the ORM would have applied. Server-side defaults (`created_at`)
+    are left to the database by never naming those columns.
+    """
+    keys = {k for row in rows for k in row} | {"id"}
+    columns = [
+        c.name
+        for c in table.columns
+        if c.name in keys or (c.default is not None and c.default.is_scalar)
+    ]
+    filled = []
+    for row in rows:
+        out = {}
+        for name in columns:
+            if name in row:
+                out[name] = row[name]
+            elif name == "id":
+                out[name] = uuid.uuid4()
+            else:
+                default = table.c[name].default
+                out[name] = (
+                    default.arg
+                    if default is not None and default.is_scalar
+                    else None
+                )
+        filled.append(out)
+    return columns, filled
+
+
+def insert_rows(db: Session, model: Type, rows: Sequence[dict]) -> List[uuid.UUID]:
+    """Insert many rows of one log model. Returns ids in input order."""
+    if not rows:
+        return []
+    table = model.__table__
+    columns, filled = _complete_rows(table, rows)
+
+    ids: List[uuid.UUID] = []
+    for start in range(0, len(filled), INSERT_CHUNK):
+        chunk = filled[start:start + INSERT_CHUNK]
+        result = db.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            chunk,
+        )
+        ids.extend(result.scalars().all())
+    return ids
+
+
+# ─── Derived updates ───────────────────────────────────────────────────
+
+
+def _twins_for(model: Type) -> tuple:
+    """Legacy/consolidated twin tables that share a PK with `model`.
+
+    Mirrors `feeding_pause._clear_twin`: Invert ↔ Tarantula/Scorpion.
+    HV animals have no twin.
+    """
+    if model is Invert:
+        return (Tarantula, Scorpion)
+    if model in (Tarantula, Scorpion):
+        return (Invert,)
+    return ()
+
+
+def resume_paused(db: Session, model: Type, ids: Iterable[uuid.UUID]) -> List[uuid.UUID]:
+    """Clear the feeding pause on every paused row in `ids`, twins included.
+
+    Set-based `resume_if_accepted` — call it only for an accepted feeding.
+    Returns the ids that were actually paused, in no particular order.
+    """
+    ids = list(ids)
+    if not ids:
+        return []
+    cleared = {
+        model.feeding_paused_reason: None,
+        model.feeding_paused_until: None,
+    }
+    resumed = list(
+        db.execute(
+            update(model)
+            .where(model.id.in_(ids), model.feeding_paused_reason.isnot(None))
+            .values(cleared)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+    if resumed:
+        for twin in _twins_for(model):
+            db.execute(
+                update(twin)
+                .where(twin.id.in_(resumed), twin.feeding_paused_reason.isnot(None))
+                .values({
+                    twin.feeding_paused_reason: None,
+                    twin.feeding_paused_until: None,
+                })
+                .execution_options(synchronize_session=False)
+            )
+    return resumed
+
+
+def bump_last_fed_at(db: Session, model: Type, ids: Iterable[uuid.UUID], fed_at: datetime) -> None:
+    """Set the denormalized `last_fed_at` on every row in `ids`."""
+    ids = list(ids)
+    if not ids:
+        return
+    db.execute(
+        update(model)
+        .where(model.id.in_(ids))
+        .values({model.last_fed_at: fed_at})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def advance_substrate(
+    db: Session,
+    model: Type,
+    ids: Iterable[uuid.UUID],
+    changed_at: date,
+    substrate_type: str | None = None,
+    substrate_depth: str | None = None,
+) -> None:
+    """Forward-only denorm of a substrate change onto the parents, twins
+    included — the legacy detail screen still reads `tarantulas`.
+
+    Same rule as the per-row path: only a change newer than the one on
+    file moves the date, and type/depth only overwrite when supplied.
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    for target in (model, *_twins_for(model)):
+        values = {target.last_substrate_change: changed_at}
+        if substrate_type:
+            values[target.substrate_type] = substrate_type
+        if substrate_depth:
+            values[target.substrate_depth] = substrate_depth
+        db.execute(
+            update(target)
+            .where(
+                target.id.in_(ids),
+                or_(
+                    target.last_substrate_change.is_(None),
+                    target.last_substrate_change < changed_at,
+                ),
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,119 @@
+"""Buffered forum thread view counts.
+
+`get_thread` used to add one to `view_count` and commit on every view, so
+each read of a popular thread took the row lock on forum_threads and
+concurrent readers queued behind each other. Views are now tallied in
+memory per process and written in batches: every thread viewed since the
+last flush, in ONE
+
+    UPDATE forum_threads SET view_count = view_count + v.delta
+    FROM (VALUES (id, delta), ...) AS v(id, delta) WHERE forum_threads.id = v.id
+
+at most every FORUM_VIEW_FLUSH_SECONDS, taken by whichever view finds the
+flush due. Thread reads never write.
+
+Counts are eventually consistent: a worker's unwritten views show up in
+the stored count within one interval, and the viewer's own response adds
+this worker's pending views so a refresh never looks like it went
+backwards. Views buffered in a process that is killed before its next
+flush are lost; an exit flush narrows that to crashes.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.forum import ForumThread
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    def __init__(self, flush_interval: Optional[float] = None, engine=None):
+        self.flush_interval = (
+            settings.FORUM_VIEW_FLUSH_SECONDS if flush_interval is None else flush_interval
+        )
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._last_flush = time.monotonic()
+        self.flushes = 0  # round trips taken, for the tests
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.database import engine
+
+            self._engine = engine
+        return self._engine
+
+    def record(self, thread_id: int) -> None:
+        """Count one view. Flushes first if the interval has passed."""
+        with self._lock:
+            self._pending[thread_id] += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def pending(self, thread_id: int) -> int:
+        """Views of `thread_id` taken here and not written yet."""
+        with self._lock:
+            return self._pending.get(thread_id, 0)
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write every pending view in one statement; returns the number of
+        threads updated. On failure the views go back in the buffer for the
+        next flush. `db` (tests) writes through that session instead of a
+        connection of our own."""
+        # One flush at a time per process; a view that finds one running
+        # leaves its increment for the next.
+        if not self._flush_lock.acquire(blocking=db is not None):
+            return 0
+        try:
+            with self._lock:
+                batch: Dict[int, int] = dict(sorted(self._pending.items()))
+                self._pending.clear()
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+            try:
+                if db is not None:
+                    db.execute(_increment(batch))
+                    db.commit()
+                else:
+                    with self.engine.begin() as conn:
+                        conn.execute(_increment(batch))
+            except Exception:
+                logger.exception("forum view flush failed; keeping %d threads for the next one", len(batch))
+                with self._lock:
+                    self._pending.update(batch)
+                return 0
+            self.flushes += 1
+            return len(batch)
+        finally:
+            self._flush_lock.release()
+
+
+def _increment(batch: Dict[int, int]):
+    """The batched UPDATE. Ids arrive sorted, so two workers flushing at
+    once lock rows in the same order and can't deadlock. updated_at is set
+    to itself: it orders the thread list by activity, and a view isn't."""
+    deltas = values(column("id", Integer), column("delta", Integer), name="v").data(
+        list(batch.items())
+    )
+    table = ForumThread.__table__
+    return (
+        update(table)
+        .where(table.c.id == deltas.c.id)
+        .values(view_count=table.c.view_count + deltas.c.delta, updated_at=table.c.updated_at)
+    )
+
+
+views = ViewCountBuffer()
+atexit.register(views.flush)
@@ -1,95 +1,259 @@
-"""Growth analytics computed from molt history (ADR-008 follow-up).
+"""Growth analytics from molt history and weigh-ins (ADR-008 follow-up).
 
-Shared by the legacy tarantula growth endpoint's logic and the generic
-invert growth endpoint. Works for any taxon: the measurements are
-whatever the keeper recorded on molt logs (leg span for spiders,
-body length for scorpions/centipedes — the client labels the numbers,
-the math is identical).
+Shared by the tarantula and invert growth endpoints and the Herpetoverse
+weight trend. Works for any taxon: the measurements are whatever the keeper
+recorded on molt logs (leg span for spiders, body length for
+scorpions/centipedes — the client labels the numbers, the math is
+identical).
+
+The per-point deltas and the summary rates are computed by Postgres with
+window functions — `lag()` over the animal's history for "since previous",
+whole-frame `first_value`/`last_value` for the totals — so the API reads
+one row per point and never builds the history in Python. Deltas are
+windowed over the FULL history before any date range is applied, so the
+first point in a range still reports its change from the molt before it.
+
+Long series can be thinned to a point budget (services/timeseries.py). The
+summary always describes every point in the range, not just the ones kept.
 """
-from datetime import datetime, timezone
-from typing import List
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Integer, and_, case, cast, func, select
+from sqlalchemy.orm import Session
 
 from app.models.molt_log import MoltLog
+from app.models.weight_log import WeightLog
 from app.schemas.tarantula import GrowthDataPoint
+from app.schemas.weight_log import WeightTrendPoint
+from app.services.snake_feeding_advisory import compute_weight_loss_30d
+from app.services.timeseries import downsample_indices
+
+# Average days per month, for the per-month growth rates.
+DAYS_PER_MONTH = Decimal("30.44")
+
+_WHOLE_FRAME = (None, None)
+
+
+def _whole_days(interval):
+    """Whole days in an interval, floored — timedelta.days semantics."""
+    return cast(func.floor(func.extract("epoch", interval) / 86400), Integer)
+
+
+def _change(current, previous):
+    """current - previous, only when both are recorded and non-zero. A zero
+    is how the old forms said "not measured", so it never anchors a delta."""
+    return case((and_(current != 0, previous != 0), current - previous))
+
+
+def _in_range(column, start: Optional[datetime], end: Optional[datetime]):
+    clauses = []
+    if start is not None:
+        clauses.append(column >= start)
+    if end is not None:
+        clauses.append(column <= end)
+    return clauses
+
+
+# ─── Molt growth ───────────────────────────────────────────────────────
+
+
+def _empty_growth() -> dict:
+    return {
+        "data_points": [],
+        "total_molts": 0,
+        "average_days_between_molts": None,
+        "total_weight_gain": None,
+        "total_leg_span_gain": None,
+        "growth_rate_weight": None,
+        "growth_rate_leg_span": None,
+        "last_molt_date": None,
+        "days_since_last_molt": None,
+    }
 
 
-def compute_growth_fields(molt_logs: List[MoltLog]) -> dict:
-    """Build growth data points + summary stats from molt logs.
+def compute_growth_fields(
+    db: Session,
+    parent_column,
+    parent_id,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: Optional[int] = None,
+) -> dict:
+    """Growth data points + summary stats for one animal's molts.
 
-    Expects molt_logs ordered ascending by molted_at. Returns a dict of
-    the common GrowthAnalytics fields (everything except the id field).
+    `parent_column` is the MoltLog column naming the animal
+    (`MoltLog.invert_id`, `MoltLog.tarantula_id`). Returns a dict of the
+    common GrowthAnalytics fields (everything except the id field).
     """
-    if not molt_logs:
-        return {
-            "data_points": [],
-            "total_molts": 0,
-            "average_days_between_molts": None,
-            "total_weight_gain": None,
-            "total_leg_span_gain": None,
-            "growth_rate_weight": None,
-            "growth_rate_leg_span": None,
-            "last_molt_date": None,
-            "days_since_last_molt": None,
-        }
-
-    data_points = []
-    previous_molt = None
-
-    for molt in molt_logs:
-        days_since_previous = None
-        weight_change = None
-        leg_span_change = None
-
-        if previous_molt:
-            days_since_previous = (molt.molted_at - previous_molt.molted_at).days
-            if molt.weight_after and previous_molt.weight_after:
-                weight_change = molt.weight_after - previous_molt.weight_after
-            if molt.leg_span_after and previous_molt.leg_span_after:
-                leg_span_change = molt.leg_span_after - previous_molt.leg_span_after
-
-        data_points.append(GrowthDataPoint(
-            date=molt.molted_at,
-            weight=molt.weight_after,
-            leg_span=molt.leg_span_after,
-            days_since_previous=days_since_previous,
-            weight_change=weight_change,
-            leg_span_change=leg_span_change,
-        ))
-        previous_molt = molt
-
-    days_between = [dp.days_since_previous for dp in data_points if dp.days_since_previous]
-    average_days_between_molts = (
-        sum(days_between) / len(days_between) if days_between else None
+    history = {"order_by": (MoltLog.molted_at, MoltLog.id)}
+    windowed = (
+        select(
+            MoltLog.id,
+            MoltLog.molted_at,
+            MoltLog.weight_after,
+            MoltLog.leg_span_after,
+            _whole_days(MoltLog.molted_at - func.lag(MoltLog.molted_at).over(**history))
+            .label("days_since_previous"),
+            _change(MoltLog.weight_after, func.lag(MoltLog.weight_after).over(**history))
+            .label("weight_change"),
+            _change(MoltLog.leg_span_after, func.lag(MoltLog.leg_span_after).over(**history))
+            .label("leg_span_change"),
+        )
+        .where(parent_column == parent_id)
+        .subquery()
     )
 
-    first_molt, last_molt = molt_logs[0], molt_logs[-1]
+    w = windowed.c
+    frame = {"order_by": (w.molted_at, w.id), "rows": _WHOLE_FRAME}
+    first_at = func.first_value(w.molted_at).over(**frame)
+    last_at = func.last_value(w.molted_at).over(**frame)
+    span_days = _whole_days(last_at - first_at)
+
+    def total_gain(column):
+        return _change(func.last_value(column).over(**frame), func.first_value(column).over(**frame))
 
-    total_weight_gain = None
-    if first_molt.weight_after and last_molt.weight_after:
-        total_weight_gain = last_molt.weight_after - first_molt.weight_after
+    def monthly_rate(column):
+        gain = total_gain(column)
+        return case(
+            (and_(span_days > 0, gain != 0), gain / (span_days / DAYS_PER_MONTH)),
+        )
 
-    total_leg_span_gain = None
-    if first_molt.leg_span_after and last_molt.leg_span_after:
-        total_leg_span_gain = last_molt.leg_span_after - first_molt.leg_span_after
+    rows = db.execute(
+        select(
+            w.molted_at,
+            w.weight_after,
+            w.leg_span_after,
+            w.days_since_previous,
+            w.weight_change,
+            w.leg_span_change,
+            func.count().over().label("total_molts"),
+            func.avg(w.days_since_previous).filter(w.days_since_previous != 0).over()
+            .label("average_days_between_molts"),
+            total_gain(w.weight_after).label("total_weight_gain"),
+            total_gain(w.leg_span_after).label("total_leg_span_gain"),
+            monthly_rate(w.weight_after).label("growth_rate_weight"),
+            monthly_rate(w.leg_span_after).label("growth_rate_leg_span"),
+            last_at.label("last_molt_date"),
+        )
+        .where(*_in_range(w.molted_at, start, end))
+        .order_by(w.molted_at, w.id)
+    ).all()
 
-    growth_rate_weight = None
-    growth_rate_leg_span = None
-    if len(molt_logs) > 1:
-        months = (last_molt.molted_at - first_molt.molted_at).days / 30.44
-        if months > 0:
-            if total_weight_gain:
-                growth_rate_weight = total_weight_gain / months
-            if total_leg_span_gain:
-                growth_rate_leg_span = total_leg_span_gain / months
+    if not rows:
+        return _empty_growth()
+
+    keep = downsample_indices(
+        [r.molted_at for r in rows],
+        [r.weight_after for r in rows],
+        [r.leg_span_after for r in rows],
+        max_points=max_points,
+    )
+    data_points = [
+        GrowthDataPoint(
+            date=r.molted_at,
+            weight=r.weight_after,
+            leg_span=r.leg_span_after,
+            days_since_previous=r.days_since_previous,
+            weight_change=r.weight_change,
+            leg_span_change=r.leg_span_change,
+        )
+        for r in (rows[i] for i in keep)
+    ]
 
+    summary = rows[0]
+    average = summary.average_days_between_molts
     return {
         "data_points": data_points,
-        "total_molts": len(molt_logs),
-        "average_days_between_molts": average_days_between_molts,
-        "total_weight_gain": total_weight_gain,
-        "total_leg_span_gain": total_leg_span_gain,
-        "growth_rate_weight": growth_rate_weight,
-        "growth_rate_leg_span": growth_rate_leg_span,
-        "last_molt_date": last_molt.molted_at,
-        "days_since_last_molt": (datetime.now(timezone.utc) - last_molt.molted_at).days,
+        "total_molts": summary.total_molts,
+        "average_days_between_molts": float(average) if average is not None else None,
+        "total_weight_gain": summary.total_weight_gain,
+        "total_leg_span_gain": summary.total_leg_span_gain,
+        "growth_rate_weight": summary.growth_rate_weight,
+        "growth_rate_leg_span": summary.growth_rate_leg_span,
+        "last_molt_date": summary.last_molt_date,
+        "days_since_last_molt": (datetime.now(timezone.utc) - summary.last_molt_date).days,
     }
+
+
+# ─── Weight series ─────────────────────────────────────────────────────
+
+
+def weight_series(
+    db: Session,
+    animal_id,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: Optional[int] = None,
+) -> tuple[list, int]:
+    """(chart points, points in range before thinning) for one animal's
+    weigh-ins, oldest first, each with its change from the previous
+    weigh-in."""
+    history = {"order_by": (WeightLog.weighed_at, WeightLog.id)}
+    windowed = (
+        select(
+            WeightLog.id,
+            WeightLog.weighed_at,
+            WeightLog.weight_g,
+            _whole_days(WeightLog.weighed_at - func.lag(WeightLog.weighed_at).over(**history))
+            .label("days_since_previous"),
+            (WeightLog.weight_g - func.lag(WeightLog.weight_g).over(**history))
+            .label("change_g"),
+        )
+        .where(WeightLog.animal_id == animal_id)
+        .subquery()
+    )
+    w = windowed.c
+    rows = db.execute(
+        select(w.weighed_at, w.weight_g, w.days_since_previous, w.change_g)
+        .where(*_in_range(w.weighed_at, start, end))
+        .order_by(w.weighed_at, w.id)
+    ).all()
+
+    keep = downsample_indices(
+        [r.weighed_at for r in rows], [r.weight_g for r in rows], max_points=max_points,
+    )
+    points = [
+        WeightTrendPoint(
+            weighed_at=r.weighed_at,
+            weight_g=r.weight_g,
+            days_since_previous=r.days_since_previous,
+            change_g=r.change_g,
+        )
+        for r in (rows[i] for i in keep)
+    ]
+    return points, len(rows)
+
+
+def latest_weight_and_loss_30d(db: Session, animal_id) -> tuple[Optional[Decimal], Optional[Decimal]]:
+    """(latest weight, 30-day loss %) from two index seeks — the newest
+    weigh-in and the oldest one in the 30 days before it — instead of the
+    whole history. The percentage itself is still compute_weight_loss_30d,
+    fed just those two points, so the rounding and the None cases are the
+    advisory's, unchanged.
+    """
+    newest = db.execute(
+        select(WeightLog.weighed_at, WeightLog.weight_g)
+        .where(WeightLog.animal_id == animal_id)
+        .order_by(WeightLog.weighed_at.desc(), WeightLog.id.desc())
+        .limit(1)
+    ).first()
+    if newest is None:
+        return None, None
+
+    oldest_in_window = db.execute(
+        select(WeightLog.weighed_at, WeightLog.weight_g)
+        .where(
+            WeightLog.animal_id == animal_id,
+            WeightLog.weighed_at >= newest.weighed_at - timedelta(days=30),
+            WeightLog.weighed_at < newest.weighed_at,
+        )
+        .order_by(WeightLog.weighed_at.asc())
+        .limit(1)
+    ).first()
+    if oldest_in_window is None:
+        return newest.weight_g, None
+    return newest.weight_g, compute_weight_loss_30d(
+        [tuple(oldest_in_window), tuple(newest)]
+    )
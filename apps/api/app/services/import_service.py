@@ -20,15 +20,16 @@ import json
 import re
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import openpyxl
 from sqlalchemy.orm import Session
 
 from app.models.invert import Invert
 from app.models.invert_species import InvertSpecies
 from app.models.animal import Animal, ANIMAL_TAXON_VALUES
 from app.models.reptile_species import ReptileSpecies
+from app.services.species_resolver import CatalogEntry, SpeciesResolver
 from app.utils.limits import active_inverts_query
 
 # Canonical taxa (keep in lockstep with models/invert.py INVERT_TAXON_VALUES).
@@ -100,9 +101,29 @@ def _clean_header(h: Any) -> str:
 
 
 # ── Parsing ──────────────────────────────────────────────────────────────────
+#
+# Rows are produced lazily. A 20k-row breeder sheet used to be materialized
+# three times over — the decoded text, openpyxl's full in-memory workbook, and
+# the list of row dicts — before a single row was looked at. XLSX now goes
+# through openpyxl's read-only mode (rows streamed off the zip, no cell
+# objects kept) and CSV through a reader over the raw bytes. JSON has no
+# incremental parser in the stdlib and exports are small, so it's still
+# loaded whole.
 
-def parse_bytes(content: bytes, filename: str) -> Tuple[List[str], List[Dict[str, Any]]]:
-    """Return (headers, rows) from csv / xlsx / json bytes."""
+# Rows sampled for column-mapping suggestions. suggest_mapping only ever
+# looks at the first 40, so that's all analyze needs to hold at once.
+SAMPLE_ROWS = 40
+
+# Rows per species resolve / commit. Big enough that per-chunk overhead
+# vanishes, small enough that a failed chunk costs little to redo.
+CHUNK_SIZE = 500
+
+
+def iter_rows(content: bytes, filename: str) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Return (headers, row iterator) from csv / xlsx / json bytes.
+
+    The iterator is single-pass. Call `parse_bytes` if you need a list.
+    """
     name = (filename or "").lower()
     if name.endswith(".json"):
         raw = json.loads(content.decode("utf-8"))
@@ -110,26 +131,57 @@ def parse_bytes(content: bytes, filename: str) -> Tuple[List[str], List[Dict[str
             raw = raw.get("tarantulas") or raw.get("animals") or raw.get("inverts") or [raw]
         rows = [dict(r) for r in raw if isinstance(r, dict)]
         headers = list({k for r in rows for k in r.keys()})
-        return headers, rows
+        return headers, iter(rows)
     if name.endswith(".xlsx") or name.endswith(".xls"):
-        wb = openpyxl.load_workbook(filename=io.BytesIO(content), data_only=True)
-        sheet = wb.active
-        grid = list(sheet.iter_rows(values_only=True))
-        if not grid:
-            return [], []
-        headers = [str(h) if h is not None else f"Column {i+1}" for i, h in enumerate(grid[0])]
-        rows = []
-        for r in grid[1:]:
-            if r is None or all(c is None for c in r):
-                continue
-            rows.append({headers[i]: r[i] for i in range(len(headers)) if i < len(r)})
-        return headers, rows
+        import openpyxl  # ~150 ms to import; only spreadsheet uploads need it
+
+        wb = openpyxl.load_workbook(filename=io.BytesIO(content), read_only=True, data_only=True)
+        grid = wb.active.iter_rows(values_only=True)
+        first = next(grid, None)
+        if first is None:
+            wb.close()
+            return [], iter(())
+        headers = [str(h) if h is not None else f"Column {i+1}" for i, h in enumerate(first)]
+
+        def xlsx_rows() -> Iterator[Dict[str, Any]]:
+            try:
+                for r in grid:
+                    if r is None or all(c is None for c in r):
+                        continue
+                    yield {headers[i]: r[i] for i in range(len(headers)) if i < len(r)}
+            finally:
+                wb.close()
+
+        return headers, xlsx_rows()
     # default: CSV
-    text = content.decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(text))
+    stream = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(stream)
     headers = list(reader.fieldnames or [])
-    rows = [dict(r) for r in reader]
-    return headers, rows
+    return headers, (dict(r) for r in reader)
+
+
+def parse_bytes(content: bytes, filename: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Return (headers, rows) from csv / xlsx / json bytes."""
+    headers, rows = iter_rows(content, filename)
+    return headers, list(rows)
+
+
+def peek_rows(
+    rows: Iterator[Dict[str, Any]], n: int = SAMPLE_ROWS
+) -> Tuple[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """Take the first `n` rows for sampling without losing them from the stream."""
+    head = list(islice(rows, n))
+    return head, chain(head, rows)
+
+
+def chunked(rows: Iterable[Dict[str, Any]], size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    size = size or CHUNK_SIZE
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 # ── Column → field suggestion ────────────────────────────────────────────────
@@ -299,34 +351,58 @@ def _coerce(field: str, value: Any) -> Any:
 
 
 # ── Species matching ─────────────────────────────────────────────────────────
+#
+# Resolution lives in services/species_resolver.py: the catalog is indexed in
+# memory once per process and each import memoizes its own names, so a sheet
+# that repeats the same species thousands of times costs one lookup per
+# distinct name and no queries past the index load.
+
+def _mapped_values(
+    rows: Iterable[Dict[str, Any]], mapping: Dict[str, Optional[str]], field: str
+) -> Iterator[str]:
+    """Every raw value in `rows` from a column mapped to `field`."""
+    headers = [h for h, f in mapping.items() if f == field]
+    for raw in rows:
+        for h in headers:
+            v = raw.get(h)
+            if v not in (None, ""):
+                yield str(v)
 
-def match_species(db: Session, scientific_name: Optional[str]) -> Optional[InvertSpecies]:
-    if not scientific_name:
-        return None
-    sci = scientific_name.strip().lower()
-    if not sci:
-        return None
-    exact = db.query(InvertSpecies).filter(InvertSpecies.scientific_name_lower == sci).first()
-    if exact:
-        return exact
-    # genus + species prefix fallback (handles trailing authority/notes)
-    like = db.query(InvertSpecies).filter(
-        InvertSpecies.scientific_name_lower.ilike(f"{sci.split()[0]} {sci.split()[1]}%")
-    ).first() if len(sci.split()) >= 2 else None
-    return like
+
+def match_species(db: Session, scientific_name: Optional[str]) -> Optional[CatalogEntry]:
+    return SpeciesResolver(db, InvertSpecies).get(scientific_name)
 
 
 # ── Row normalization + analysis ─────────────────────────────────────────────
 
+def _enumerate_chunks(
+    rows: Iterable[Dict[str, Any]],
+    resolver: SpeciesResolver,
+    mapping: Dict[str, Optional[str]],
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """enumerate(rows), resolving each chunk's species column in one call
+    before any row in it is normalized."""
+    i = 0
+    for chunk in chunked(rows):
+        resolver.resolve_many(_mapped_values(chunk, mapping, "scientific_name"))
+        for raw in chunk:
+            yield i, raw
+            i += 1
+
+
 def normalize_row(
     db: Session,
     raw: Dict[str, Any],
     mapping: Dict[str, Optional[str]],
     default_taxon: str,
     unmapped_to_notes: bool = True,
+    resolver: Optional[SpeciesResolver] = None,
 ) -> Dict[str, Any]:
     """Apply mapping to one raw row → dict with the invert payload, resolved
-    taxon (+ source), matched species, and any per-row errors."""
+    taxon (+ source), matched species, and any per-row errors.
+
+    Pass the import's `resolver` when normalizing many rows so repeated
+    names are resolved once."""
     payload: Dict[str, Any] = {}
     extra_notes: List[str] = []
 
@@ -347,7 +423,8 @@ def normalize_row(
         payload["notes"] = (base + "\n" if base else "") + "\n".join(extra_notes)
 
     # Species match + taxon resolution
-    species = match_species(db, payload.get("scientific_name"))
+    match = (resolver or SpeciesResolver(db, InvertSpecies)).match(payload.get("scientific_name"))
+    species = match.entry if match is not None else None
     if payload.get("taxon"):
         taxon, taxon_source = payload["taxon"], "column"
     elif species is not None and getattr(species, "taxon", None):
@@ -371,6 +448,7 @@ def normalize_row(
         "taxon_source": taxon_source,
         "species_matched": species is not None,
         "species_name": species.scientific_name if species else None,
+        "species_match": match.method if match is not None else None,
         "display_name": display,
         "errors": errors,
     }
@@ -384,19 +462,24 @@ def analyze(
     default_taxon: str = "tarantula",
     preview_limit: int = 20,
 ) -> Dict[str, Any]:
-    headers, rows = parse_bytes(content, filename)
-    mapping_info = suggest_mapping(headers, rows)
+    headers, rows = iter_rows(content, filename)
+    sample, rows = peek_rows(rows)
+    mapping_info = suggest_mapping(headers, sample)
     simple_mapping = {h: mapping_info[h]["field"] for h in headers}
 
     # existing (name_lower, sci_lower) for dedupe
-    existing = set()
-    for inv in active_inverts_query(db, user.id).all():
-        existing.add(((inv.name or "").strip().lower(), (inv.scientific_name or "").strip().lower()))
+    existing = {
+        ((name or "").strip().lower(), (sci or "").strip().lower())
+        for name, sci in active_inverts_query(db, user.id)
+        .with_entities(Invert.name, Invert.scientific_name)
+    }
 
+    resolver = SpeciesResolver(db, InvertSpecies)
     preview: List[Dict[str, Any]] = []
-    new_count = dup_count = err_count = matched_count = 0
-    for i, raw in enumerate(rows):
-        norm = normalize_row(db, raw, simple_mapping, default_taxon)
+    new_count = dup_count = err_count = matched_count = row_count = 0
+    for i, raw in _enumerate_chunks(rows, resolver, simple_mapping):
+        row_count += 1
+        norm = normalize_row(db, raw, simple_mapping, default_taxon, resolver=resolver)
         key = (
             (norm["payload"].get("name") or "").strip().lower(),
             (norm["payload"].get("scientific_name") or "").strip().lower(),
@@ -419,6 +502,7 @@ def analyze(
                 "taxon_source": norm["taxon_source"],
                 "species_matched": norm["species_matched"],
                 "species_name": norm["species_name"],
+                "species_match": norm["species_match"],
                 "status": status,
                 "errors": norm["errors"],
             })
@@ -432,7 +516,7 @@ def analyze(
 
     unmapped = [h for h in headers if not simple_mapping.get(h)]
     return {
-        "row_count": len(rows),
+        "row_count": row_count,
         "columns": columns,
         "fields": IMPORT_FIELDS,
         "taxa": TAXA,
@@ -565,23 +649,8 @@ def _coerce_animal(field: str, value: Any) -> Any:
     return s
 
 
-def match_herp_species(db: Session, scientific_name: Optional[str]) -> Optional[ReptileSpecies]:
-    if not scientific_name:
-        return None
-    sci = scientific_name.strip().lower()
-    if not sci:
-        return None
-    exact = db.query(ReptileSpecies).filter(
-        ReptileSpecies.scientific_name_lower == sci
-    ).first()
-    if exact:
-        return exact
-    parts = sci.split()
-    if len(parts) >= 2:
-        return db.query(ReptileSpecies).filter(
-            ReptileSpecies.scientific_name_lower.ilike(f"{parts[0]} {parts[1]}%")
-        ).first()
-    return None
+def match_herp_species(db: Session, scientific_name: Optional[str]) -> Optional[CatalogEntry]:
+    return SpeciesResolver(db, ReptileSpecies).get(scientific_name)
 
 
 def _infer_animal_from_values(samples: List[str]) -> Optional[Tuple[str, str]]:
@@ -653,6 +722,7 @@ def normalize_animal_row(
     mapping: Dict[str, Optional[str]],
     default_taxon: str,
     unmapped_to_notes: bool = True,
+    resolver: Optional[SpeciesResolver] = None,
 ) -> Dict[str, Any]:
     """Apply mapping to one raw row → an AnimalCreate-shaped payload, resolved
     taxon (+ source), matched herp species, and any per-row errors."""
@@ -673,7 +743,8 @@ def normalize_animal_row(
         base = payload.get("notes")
         payload["notes"] = (base + "\n" if base else "") + "\n".join(extra_notes)
 
-    species = match_herp_species(db, payload.get("scientific_name"))
+    match = (resolver or SpeciesResolver(db, ReptileSpecies)).match(payload.get("scientific_name"))
+    species = match.entry if match is not None else None
     if payload.get("taxon"):
         taxon, taxon_source = payload["taxon"], "column"
     elif species is not None and getattr(species, "taxon", None):
@@ -697,6 +768,7 @@ def normalize_animal_row(
         "taxon_source": taxon_source,
         "species_matched": species is not None,
         "species_name": species.scientific_name if species else None,
+        "species_match": match.method if match is not None else None,
         "display_name": display,
         "errors": errors,
     }
@@ -710,21 +782,25 @@ def analyze_animals(
     default_taxon: str = "snake",
     preview_limit: int = 20,
 ) -> Dict[str, Any]:
-    headers, rows = parse_bytes(content, filename)
-    mapping_info = suggest_animal_mapping(headers, rows)
+    headers, rows = iter_rows(content, filename)
+    sample, rows = peek_rows(rows)
+    mapping_info = suggest_animal_mapping(headers, sample)
     simple_mapping = {h: mapping_info[h]["field"] for h in headers}
 
-    existing = set()
-    for a in db.query(Animal).filter(Animal.user_id == user.id).all():
-        existing.add((
-            (a.name or "").strip().lower(),
-            (a.scientific_name or "").strip().lower(),
-        ))
+    existing = {
+        ((name or "").strip().lower(), (sci or "").strip().lower())
+        for name, sci in db.query(Animal.name, Animal.scientific_name)
+        .filter(Animal.user_id == user.id)
+    }
 
+    resolver = SpeciesResolver(db, ReptileSpecies)
     preview: List[Dict[str, Any]] = []
-    new_count = dup_count = err_count = matched_count = 0
-    for i, raw in enumerate(rows):
-        norm = normalize_animal_row(db, raw, simple_mapping, default_taxon)
+    new_count = dup_count = err_count = matched_count = row_count = 0
+    for i, raw in _enumerate_chunks(rows, resolver, simple_mapping):
+        row_count += 1
+        norm = normalize_animal_row(
+            db, raw, simple_mapping, default_taxon, resolver=resolver
+        )
         key = (
             (norm["payload"].get("name") or "").strip().lower(),
             (norm["payload"].get("scientific_name") or "").strip().lower(),
@@ -747,6 +823,7 @@ def analyze_animals(
                 "taxon_source": norm["taxon_source"],
                 "species_matched": norm["species_matched"],
                 "species_name": norm["species_name"],
+                "species_match": norm["species_match"],
                 "status": status,
                 "errors": norm["errors"],
             })
@@ -760,7 +837,7 @@ def analyze_animals(
 
     unmapped = [h for h in headers if not simple_mapping.get(h)]
     return {
-        "row_count": len(rows),
+        "row_count": row_count,
         "columns": columns,
         "fields": ANIMAL_IMPORT_FIELDS,
         "taxa": ANIMAL_TAXA,
@@ -27,13 +27,21 @@ The contract these functions honor:
   doesn't exist yet (created pre-A2, no backfill run yet), `invert_id`
   stays NULL on the new log row. Backfill will populate it later.
 
-This module is intentionally NOT a SQLAlchemy event listener — explicit
+Mirroring is NOT decided by a SQLAlchemy event listener — explicit
 calls from each router keep the data flow visible in the code, which
 matters for an expand-contract that's going to be ripped out in Phase D.
+The forward animal mirrors do hand their writes to a per-session queue
+that a flush listener drains (see "Forward write queue" below), but
+nothing is queued that a router didn't ask for.
 """
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
 from uuid import UUID
 
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models.invert import Invert
@@ -174,33 +182,182 @@ _INVERT_OWNED_TARANTULA = frozenset({"species_id", "colony_id"})
 _INVERT_OWNED_SCORPION = frozenset({"species_id", "life_stage"})
 
 
-def _apply_forward(invert: "Invert", fields: dict, owned: frozenset) -> None:
-    """Copy the legacy row's values onto its mirror, leaving invert-owned
-    columns alone."""
-    for k, v in fields.items():
-        if k in _IMMUTABLE or k in owned:
+# ---------------------------------------------------------------------------
+# Forward write queue.
+#
+# The forward mirrors used to SELECT the mirror row and setattr ~40 fields
+# onto it, so every legacy write paid a SELECT plus a full-row UPDATE on
+# top of its own statement, however little it changed. They now queue the
+# write on the session instead. The queue is drained after the flush that
+# writes the legacy change (or at commit, when nothing else was dirty), as
+# one INSERT ... ON CONFLICT (id) DO UPDATE per batch of rows, whose SET
+# list holds only the columns the legacy writes changed:
+#
+# * no SELECT — a missing mirror (pre-A2 row, no backfill yet) is simply
+#   the INSERT half of the upsert, as it was the lazy insert before;
+# * no write at all to a mirror whose legacy edit changed nothing;
+# * one statement for every row a unit of work mirrors.
+#
+# Running after the flush keeps FK order simple: the legacy write, and
+# anything it references, already exists. The catch is visibility — a
+# query between the mirror call and the next flush or commit reads the
+# mirror as it was. No caller does that; the mirror is the last thing
+# each route does before committing.
+# ---------------------------------------------------------------------------
+
+_QUEUE = "inverts_dualwrite.queue"
+_CHANGED = "inverts_dualwrite.changed"
+
+
+@dataclass
+class _Upsert:
+    source: Any
+    build: Callable[[Any], dict]
+    owned: frozenset
+    # A create writes every mirrored column; an update only what changed.
+    full: bool
+
+
+@lru_cache(maxsize=None)
+def _legacy_animal_models() -> tuple:
+    from app.models.scorpion import Scorpion
+    from app.models.tarantula import Tarantula
+
+    return (Tarantula, Scorpion)
+
+
+def _modified_columns(obj) -> set:
+    """Column attributes with unflushed changes. Assigning a value equal to
+    the loaded one is not a change, exactly as for the ORM's own UPDATE."""
+    state = inspect(obj)
+    return {
+        attr.key for attr in state.mapper.column_attrs
+        if attr.key in state.committed_state and state.attrs[attr.key].history.has_changes()
+    }
+
+
+def _queue_upsert(db: Session, source, build, owned: frozenset, full: bool) -> None:
+    queue = db.info.setdefault(_QUEUE, {})
+    previous = queue.get(source.id)
+    # Created and then edited in one unit of work: still a create.
+    full = full or (isinstance(previous, _Upsert) and previous.full)
+    queue[source.id] = _Upsert(source, build, owned, full)
+
+
+def _queue_delete(db: Session, invert_id) -> None:
+    db.info.setdefault(_QUEUE, {})[invert_id] = None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session: Session, flush_context) -> None:
+    """Remember which columns each flush wrote to a legacy animal row: a
+    mirror queued after an explicit flush still knows what changed."""
+    models = _legacy_animal_models()
+    for obj in session.dirty:
+        if isinstance(obj, models):
+            changed = _modified_columns(obj)
+            if changed:
+                session.info.setdefault(_CHANGED, defaultdict(set))[obj.id] |= changed
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _write_after_flush(session: Session, flush_context) -> None:
+    _write_queue(session)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_before_commit(session: Session) -> None:
+    if session.info.get(_QUEUE):
+        session.flush()  # writes the queue behind the legacy changes...
+        _write_queue(session)  # ...or, when there were none, here
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_after_commit(session: Session) -> None:
+    session.info.pop(_CHANGED, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_QUEUE, None)
+        session.info.pop(_CHANGED, None)
+
+
+def _write_queue(session: Session) -> None:
+    queue = session.info.pop(_QUEUE, None)
+    if not queue:
+        return
+    changed = session.info.get(_CHANGED, {})
+    table = Invert.__table__
+
+    batches = defaultdict(list)
+    deleted = []
+    for invert_id, op in sorted(queue.items(), key=lambda item: str(item[0])):
+        if op is None:
+            deleted.append(invert_id)
             continue
-        setattr(invert, k, v)
+        row = op.build(op.source)
+        mutable = row.keys() - _IMMUTABLE - op.owned
+        if op.full:
+            columns = mutable
+        else:
+            columns = mutable & (changed.pop(op.source.id, set()) | _modified_columns(op.source))
+        batches[(tuple(sorted(row)), tuple(sorted(columns)))].append(row)
+
+    for (_, columns), rows in batches.items():
+        # executemany: the driver sends the rows as multi-row VALUES.
+        session.execute(_upsert(columns), rows)
+        _expire_loaded(session, [row["id"] for row in rows], [*columns, "updated_at"])
+
+    if deleted:
+        session.execute(delete(table).where(table.c.id.in_(deleted)))
+        for invert in _loaded(session, deleted):
+            session.expunge(invert)
+
+
+@lru_cache(maxsize=256)
+def _upsert(columns: tuple):
+    """The upsert setting `columns`, built once per column set: constructing
+    `excluded` aliases the whole table. (Postgres INSERTs with ON CONFLICT
+    aren't in SQLAlchemy's compiled cache, so each execution compiles.)"""
+    table = Invert.__table__
+    stmt = insert(table)
+    if not columns:
+        # Nothing changed: write nothing, but still create a missing mirror.
+        return stmt.on_conflict_do_nothing(index_elements=[table.c.id])
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        # ON CONFLICT skips the column's onupdate; say it explicitly.
+        set_={**{c: stmt.excluded[c] for c in columns}, "updated_at": func.now()},
+    )
+
+
+def _loaded(session: Session, ids) -> list:
+    mapper = Invert.__mapper__
+    found = (session.identity_map.get(mapper.identity_key_from_primary_key([i])) for i in ids)
+    return [invert for invert in found if invert is not None]
+
+
+def _expire_loaded(session: Session, ids, columns) -> None:
+    """Keep an Invert already in the session from serving pre-upsert values."""
+    for invert in _loaded(session, ids):
+        session.expire(invert, [c for c in columns if c not in inspect(invert).committed_state])
 
 
 def mirror_tarantula_create(db: Session, t: "Tarantula") -> None:
     """Insert a matching `inverts` row for a newly-created Tarantula."""
-    db.add(Invert(**_tarantula_to_invert_kwargs(t)))
+    _queue_upsert(db, t, _tarantula_to_invert_kwargs, _INVERT_OWNED_TARANTULA, full=True)
 
 
 def mirror_tarantula_update(db: Session, t: "Tarantula") -> None:
     """Update the matching `inverts` row to reflect a Tarantula edit.
 
     If the matching Invert doesn't exist (legacy row created before A2,
-    backfill hasn't run yet), we lazily insert it — that keeps the two
+    backfill hasn't run yet), the upsert inserts it — that keeps the two
     surfaces consistent without waiting for backfill. From Phase B
     onward this path stops triggering."""
-    invert = db.query(Invert).filter(Invert.id == t.id).first()
-    fields = _tarantula_to_invert_kwargs(t)
-    if invert is None:
-        db.add(Invert(**fields))
-        return
-    _apply_forward(invert, fields, _INVERT_OWNED_TARANTULA)
+    _queue_upsert(db, t, _tarantula_to_invert_kwargs, _INVERT_OWNED_TARANTULA, full=False)
 
 
 def mirror_tarantula_delete(db: Session, tarantula_id: UUID) -> None:
@@ -210,28 +367,19 @@ def mirror_tarantula_delete(db: Session, tarantula_id: UUID) -> None:
     fires on its own FK. Logs that have both `tarantula_id` and
     `invert_id` set get cascaded by whichever side runs first; logs
     with only one column set get cascaded by that side."""
-    invert = db.query(Invert).filter(Invert.id == tarantula_id).first()
-    if invert is not None:
-        db.delete(invert)
+    _queue_delete(db, tarantula_id)
 
 
 def mirror_scorpion_create(db: Session, s: "Scorpion") -> None:
-    db.add(Invert(**_scorpion_to_invert_kwargs(s)))
+    _queue_upsert(db, s, _scorpion_to_invert_kwargs, _INVERT_OWNED_SCORPION, full=True)
 
 
 def mirror_scorpion_update(db: Session, s: "Scorpion") -> None:
-    invert = db.query(Invert).filter(Invert.id == s.id).first()
-    fields = _scorpion_to_invert_kwargs(s)
-    if invert is None:
-        db.add(Invert(**fields))
-        return
-    _apply_forward(invert, fields, _INVERT_OWNED_SCORPION)
+    _queue_upsert(db, s, _scorpion_to_invert_kwargs, _INVERT_OWNED_SCORPION, full=False)
 
 
 def mirror_scorpion_delete(db: Session, scorpion_id: UUID) -> None:
-    invert = db.query(Invert).filter(Invert.id == scorpion_id).first()
-    if invert is not None:
-        db.delete(invert)
+    _queue_delete(db, scorpion_id)
 
 
 # ---------------------------------------------------------------------------
@@ -404,6 +552,20 @@ def invert_id_if_exists(db: Session, parent_id: UUID | str | None) -> UUID | Non
     return parent_id if exists is not None else None
 
 
+def invert_id_in_insert(parent_id: UUID | str | None):
+    """invert_id_if_exists without the round trip.
+
+    Returns a scalar subquery to assign to a new log row's `invert_id`: the
+    existence check then runs inside the row's own INSERT. The attribute
+    holds the expression until the flush and reads back as the resolved id
+    (or NULL) after it, so use this only where nothing reads `invert_id`
+    before committing — the log routers refresh the row after commit.
+    """
+    if parent_id is None:
+        return None
+    return select(Invert.id).where(Invert.id == parent_id).scalar_subquery()
+
+
 # ---------------------------------------------------------------------------
 # Slug helper for tarantula species (the legacy `species` table doesn't
 # carry a slug column; invert_species REQUIRES one).
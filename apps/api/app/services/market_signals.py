@@ -0,0 +1,259 @@
+"""Materialized market signals — refresh and read (models/market_signal.py).
+
+PricingEstimator scores a comparison group; this module stores that score
+and reads it back. It never computes a number of its own, so
+MIN_CONTRIBUTORS, the emerging-evidence band, outlier exclusion and every
+other rule in the estimator apply unchanged — a stored row is exactly what
+`estimate_price` returned on `computed_on`.
+
+Freshness:
+
+  - submission create/update/delete refresh the group(s) they touch right
+    after commit (`refresh_groups`)
+  - the daily cron (`refresh_all`) rescores every known group, which is
+    how reports ageing out of the lookback window drop out
+  - a reader that finds a group missing or computed before today scores
+    it on the spot and stores it, so a read is never staler than today
+    even if the cron didn't run
+
+What that leaves: writes that bypass the routes — a keeper's account (and
+its reports) being deleted, a moderator flag set in SQL — show up at the
+next daily refresh.
+"""
+import logging
+import uuid
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, and_, case, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.market_signal import MarketSignalSnapshot
+from app.models.pricing_submission import PricingSubmission
+from app.models.species import Species
+from app.models.tarantula import Sex, Tarantula
+from app.utils.pricing_estimator import MarketSignal, PricingEstimator
+
+logger = logging.getLogger(__name__)
+
+# (species_id, size_category, sex_group)
+GroupKey = Tuple[uuid.UUID, str, str]
+
+_SIGNAL_FIELDS = (
+    "estimated_low",
+    "estimated_high",
+    "evidence_status",
+    "evidence_quality",
+    "data_points",
+    "contributor_count",
+    "vendor_count",
+    "verified_points",
+    "currency",
+    "observation_start",
+    "observation_end",
+    "last_updated",
+    "limitations",
+)
+
+
+# ─── Groups ────────────────────────────────────────────────────────────
+
+
+def sex_group(size_category: str, sex) -> str:
+    """The group an animal or a request is compared against. Mirrors the
+    sex filter in PricingEstimator._get_community_observations."""
+    if size_category not in PricingEstimator.SEX_SPECIFIC_STAGES:
+        return "any"
+    normalized = PricingEstimator._enum_value(sex)
+    return normalized if normalized in ("male", "female") else "unknown"
+
+
+def submission_group(species_id, size_category: Optional[str], sex: Optional[str]) -> Optional[GroupKey]:
+    """The group a report with these fields counts toward, or None. A
+    report with some other sex value matches no group's filter."""
+    if species_id is None or not size_category:
+        return None
+    if size_category in PricingEstimator.SEX_SPECIFIC_STAGES:
+        if sex not in (None, "unknown", "male", "female"):
+            return None
+    return (uuid.UUID(str(species_id)), size_category, sex_group(size_category, sex))
+
+
+def group_of(submission: PricingSubmission) -> Optional[GroupKey]:
+    return submission_group(submission.species_id, submission.size_category, submission.sex)
+
+
+def _tarantula_sex_group():
+    """`sex_group` for tarantulas, in SQL, for the valuation join."""
+    by_sex = case(
+        (Tarantula.sex == Sex.MALE, "male"),
+        (Tarantula.sex == Sex.FEMALE, "female"),
+        else_="unknown",
+    )
+    return case(
+        (cast(Tarantula.life_stage, String).in_(PricingEstimator.SEX_SPECIFIC_STAGES), by_sex),
+        else_="any",
+    )
+
+
+# ─── Refresh ───────────────────────────────────────────────────────────
+
+
+def _to_signal(row: MarketSignalSnapshot) -> MarketSignal:
+    values = {name: getattr(row, name) for name in _SIGNAL_FIELDS}
+    values["limitations"] = list(values["limitations"] or [])
+    return MarketSignal(**values)
+
+
+def refresh(db: Session, keys: Iterable[GroupKey]) -> Dict[GroupKey, MarketSignal]:
+    """Score each group with the estimator, upsert the rows and commit.
+    Groups whose species no longer exists are skipped."""
+    keys = sorted(set(keys), key=lambda k: (str(k[0]), k[1], k[2]))
+    if not keys:
+        return {}
+    existing = set(
+        db.execute(
+            select(Species.id).where(Species.id.in_({species_id for species_id, _, _ in keys}))
+        ).scalars()
+    )
+    estimator = PricingEstimator(db)
+    today = date.today()
+    signals: Dict[GroupKey, MarketSignal] = {}
+    rows = []
+    for key in keys:
+        species_id, size_category, group = key
+        if species_id not in existing:
+            continue
+        signal = estimator.signal_for_group(str(species_id), size_category, group)
+        signals[key] = signal
+        rows.append({
+            "species_id": species_id,
+            "size_category": size_category,
+            "sex_group": group,
+            **{name: getattr(signal, name) for name in _SIGNAL_FIELDS},
+            "computed_on": today,
+        })
+    if rows:
+        table = MarketSignalSnapshot.__table__
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.species_id, table.c.size_category, table.c.sex_group],
+            set_={
+                **{name: stmt.excluded[name] for name in _SIGNAL_FIELDS},
+                "computed_on": stmt.excluded.computed_on,
+                "computed_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+    db.commit()
+    return signals
+
+
+def refresh_groups(db: Session, *keys: Optional[GroupKey]) -> None:
+    """After a report is created, edited or deleted: rescore the groups it
+    was and is in. None entries (no group) are ignored."""
+    refresh(db, [key for key in keys if key is not None])
+
+
+def refresh_all(db: Session) -> int:
+    """Rescore every group that has reports or a stored row. For the daily
+    cron; returns the number of groups written."""
+    submitted = db.execute(
+        select(PricingSubmission.species_id, PricingSubmission.size_category, PricingSubmission.sex)
+        .where(PricingSubmission.species_id.isnot(None))
+        .distinct()
+    ).all()
+    keys = {submission_group(*row) for row in submitted}
+    keys.discard(None)
+    keys.update(
+        db.execute(
+            select(
+                MarketSignalSnapshot.species_id,
+                MarketSignalSnapshot.size_category,
+                MarketSignalSnapshot.sex_group,
+            )
+        ).tuples()
+    )
+    written = len(refresh(db, keys))
+    logger.info(f"Refreshed {written} market signal groups")
+    return written
+
+
+# ─── Read ──────────────────────────────────────────────────────────────
+
+
+def get_signal(
+    db: Session, species_id: str, size_category: Optional[str], sex=None
+) -> MarketSignal:
+    """`PricingEstimator.estimate_price`, served from the table when today's
+    row exists."""
+    estimator = PricingEstimator(db)
+    try:
+        species_uuid = uuid.UUID(str(species_id))
+    except ValueError:
+        return estimator._insufficient("Species not found.")
+    if not size_category:
+        return estimator.estimate_price(species_id, size_category, sex)
+
+    key = (species_uuid, size_category, sex_group(size_category, sex))
+    row = db.get(MarketSignalSnapshot, key)
+    if row is not None and row.computed_on == date.today():
+        return _to_signal(row)
+    signal = refresh(db, [key]).get(key)
+    if signal is None:
+        return estimator._insufficient("Species not found.")
+    return signal
+
+
+def collection_signals(db: Session, user_id) -> List[Tuple[object, Optional[MarketSignal]]]:
+    """Every tarantula the keeper owns with its group's signal, in one
+    join. Animals without a species or a recorded life stage get None;
+    groups missing or stale are scored and stored first.
+
+    Tarantulas come back as column rows (id, names, species, stage, sex),
+    not entities, so the commit after a refresh doesn't expire them."""
+    rows = db.execute(
+        select(
+            Tarantula.id,
+            Tarantula.name,
+            Tarantula.common_name,
+            Tarantula.scientific_name,
+            Tarantula.species_id,
+            Tarantula.life_stage,
+            Tarantula.sex,
+            MarketSignalSnapshot,
+        )
+        .outerjoin(
+            MarketSignalSnapshot,
+            and_(
+                MarketSignalSnapshot.species_id == Tarantula.species_id,
+                MarketSignalSnapshot.size_category == cast(Tarantula.life_stage, String),
+                MarketSignalSnapshot.sex_group == _tarantula_sex_group(),
+            ),
+        )
+        .where(Tarantula.user_id == user_id)
+    ).all()
+
+    today = date.today()
+    result: List[Tuple[object, Optional[MarketSignal]]] = []
+    pending: Dict[GroupKey, List[int]] = {}
+    for tarantula in rows:
+        snapshot = tarantula.MarketSignalSnapshot
+        size_category = PricingEstimator._enum_value(tarantula.life_stage)
+        if tarantula.species_id is None or not size_category:
+            result.append((tarantula, None))
+            continue
+        if snapshot is not None and snapshot.computed_on == today:
+            result.append((tarantula, _to_signal(snapshot)))
+            continue
+        key = (tarantula.species_id, size_category, sex_group(size_category, tarantula.sex))
+        pending.setdefault(key, []).append(len(result))
+        result.append((tarantula, None))
+
+    if pending:
+        signals = refresh(db, pending)
+        for key, positions in pending.items():
+            for position in positions:
+                result[position] = (result[position][0], signals.get(key))
+    return result
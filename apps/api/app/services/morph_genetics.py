@@ -0,0 +1,375 @@
+"""Server-side morph genetics engine for reptile pairings (PRD §5.4).
+
+Pure functions — no DB access. The router loads `Gene` rows and each
+parent's `AnimalGenotype` rows and hands them in; everything here is
+arithmetic over those values, so it's cheap to unit test and safe to run
+for hundreds of pairings in one request.
+
+The math matches `combineOffspring` in the web calculator
+(apps/web-herpetoverse/src/lib/genes.ts) so the two never disagree:
+
+  - Each gene assorts independently. No linkage, no epistasis.
+  - A parent contributes one number per gene: the probability it passes
+    the morph allele. het = 0.5, visual recessive = 1, co-dom visual =
+    0.5, super = 1, "66% poss het" = 0.66 × 0.5.
+  - Per gene, two pass probabilities give a distribution over offspring
+    allele counts 0 / 1 / 2.
+
+What differs is how loci are combined. The calculator enumerates the full
+cross product, which is 3^n genotype vectors — fine for the four genes a
+keeper clicks in by hand, hopeless for a 20-gene project animal. Here we:
+
+  1. Collapse each locus to its *visible* outcomes. A recessive het looks
+     normal, so het and wild-type merge into one "not visual" bucket;
+     the het odds come back later as a poss-het percentage, which only
+     depends on that one locus (independence again).
+  2. Fold loci pairwise, dropping combined outcomes below
+     `min_probability` (beyond a small top-K beam) as we go. Dropped
+     mass is reported, never hidden.
+  3. Memoize both the per-locus distributions and the folded sub-results.
+     Loci are sorted by gene name, so a male shared across many females
+     (the batch endpoint's common case) reuses the same sub-folds.
+
+Lethal and welfare summaries don't need the fold at all — they're exact
+products of per-locus marginals.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Default pruning floor for combined outcomes. 1 in 10,000 offspring is
+# well below anything a keeper plans around, and it bounds every fold step
+# to ~1/min_probability multiplications (see `_merge`).
+DEFAULT_MIN_PROBABILITY = 1e-4
+
+# Outcomes always kept per fold step, even under the floor. Without it a
+# project animal het for twenty recessives (every outcome ≈ 1e-6) would
+# prune to an empty result.
+DEFAULT_BEAM = 256
+
+# Gene types where a single copy is visible. `dominant` is included but
+# labels 1 and 2 copies identically — the hobby has no "super" dominant.
+_CODOMINANT_TYPES = ("codominant", "incomplete_dominant")
+
+
+@dataclass(frozen=True)
+class GeneInfo:
+    """The slice of a `Gene` row the engine needs. Frozen so it can key
+    the memo caches."""
+    gene_id: str
+    name: str
+    gene_type: str
+    lethal_homozygous: bool = False
+    welfare_flag: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LocusPhenotype:
+    """One visible outcome at one locus, e.g. "Super Pastel"."""
+    label: str
+    gene_name: str
+    is_lethal: bool = False
+    welfare_flag: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Locus:
+    """A gene plus both parents' pass probabilities. Hashable on purpose —
+    it's the memo key for `_locus_outcomes` and `_fold`."""
+    gene: GeneInfo
+    male_pass: float
+    female_pass: float
+
+
+@dataclass
+class MorphOutcome:
+    """One visible offspring phenotype and its probability."""
+    probability: float
+    visuals: List[LocusPhenotype]
+    # gene name → P(het | doesn't show the gene), as a 0-100 percentage.
+    poss_hets: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def is_lethal(self) -> bool:
+        return any(v.is_lethal for v in self.visuals)
+
+    @property
+    def welfare_flags(self) -> List[str]:
+        return sorted({v.welfare_flag for v in self.visuals if v.welfare_flag})
+
+    @property
+    def label(self) -> str:
+        return " ".join(v.label for v in self.visuals) or "Normal"
+
+
+@dataclass
+class PairingPrediction:
+    """Engine output for one male × female pairing."""
+    outcomes: List[MorphOutcome]
+    loci_count: int
+    # Exact, from per-locus marginals — not affected by pruning.
+    lethal_probability: float
+    welfare_probability: float
+    expected_visual_genes: float
+    # Probability mass dropped by `min_probability` pruning.
+    pruned_probability: float
+
+
+# ─── Per-parent inputs ─────────────────────────────────────────────────
+
+
+def allele_pass_probability(
+    zygosity: Optional[str],
+    gene_type: str,
+    poss_het_percentage: Optional[int] = None,
+) -> float:
+    """Probability a parent passes the morph allele to one offspring.
+
+    `zygosity` uses the `animal_genotypes` vocabulary (het / visual /
+    poss_het / super). None means the parent has no record for the gene
+    and is treated as wild-type, the same default the calculator's
+    'absent' picker gives.
+    """
+    z = (zygosity or "").lower().strip()
+    if z == "poss_het":
+        pct = min(100, max(0, poss_het_percentage or 0)) / 100
+        return pct * 0.5
+    if z == "het":
+        return 0.5
+    if z == "super":
+        return 1.0
+    if z == "visual":
+        # One visible copy for co-doms, two for recessives/dominants.
+        return 0.5 if gene_type in _CODOMINANT_TYPES else 1.0
+    return 0.0
+
+
+def best_pass_probability(rows: Iterable[Tuple[str, Optional[int]]], gene_type: str) -> float:
+    """Collapse multiple genotype rows for the same gene on one animal.
+
+    The schema allows duplicates (see `add_genotype`). Take the strongest
+    claim — a proven het recorded next to an old "50% poss het" entry
+    should read as het, not as the weaker estimate.
+    """
+    return max(
+        (allele_pass_probability(z, gene_type, pct) for z, pct in rows),
+        default=0.0,
+    )
+
+
+# ─── Per-locus math ────────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=1024)
+def punnett_from_pass(p_male: float, p_female: float) -> Tuple[float, float, float]:
+    """Offspring allele-count distribution (P0, P1, P2) for one gene."""
+    q_male, q_female = 1 - p_male, 1 - p_female
+    return (
+        q_male * q_female,
+        p_male * q_female + q_male * p_female,
+        p_male * p_female,
+    )
+
+
+def _phenotype_for_count(gene: GeneInfo, count: int) -> Optional[LocusPhenotype]:
+    """Visible label for an allele count, or None when it looks normal."""
+    if count == 0:
+        return None
+    if gene.gene_type == "recessive" and count == 1:
+        return None
+    if gene.gene_type in _CODOMINANT_TYPES and count == 2:
+        return LocusPhenotype(
+            label=f"Super {gene.name}",
+            gene_name=gene.name,
+            is_lethal=gene.lethal_homozygous,
+            welfare_flag=gene.welfare_flag,
+        )
+    return LocusPhenotype(
+        label=gene.name,
+        gene_name=gene.name,
+        # Dominant homozygotes look like the single-copy form, but a
+        # lethal homozygous dominant still doesn't hatch.
+        is_lethal=gene.lethal_homozygous and count == 2,
+        welfare_flag=gene.welfare_flag,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _locus_outcomes(locus: Locus) -> Tuple[Tuple[Tuple[LocusPhenotype, ...], float], ...]:
+    """Collapse one locus into its visible outcomes.
+
+    Returns ((phenotype-tuple, probability), ...) with zero-probability
+    outcomes removed. Counts that look identical (het + wild-type on a
+    recessive, 1 + 2 copies of a dominant) are merged — unless one of
+    them is lethal, which keeps it separate so it's never averaged away.
+    """
+    dist = punnett_from_pass(locus.male_pass, locus.female_pass)
+    merged: Dict[Tuple[LocusPhenotype, ...], float] = {}
+    for count, p in enumerate(dist):
+        if p <= 0:
+            continue
+        pheno = _phenotype_for_count(locus.gene, count)
+        key = (pheno,) if pheno else ()
+        merged[key] = merged.get(key, 0.0) + p
+    return tuple(merged.items())
+
+
+def _het_percentage(locus: Locus) -> Optional[float]:
+    """P(het | not visual) for a recessive locus, as a percentage.
+
+    The keeper-facing "66% het" number. None for non-recessives or when
+    no non-visual offspring can carry the gene.
+    """
+    if locus.gene.gene_type != "recessive":
+        return None
+    p0, p1, _ = punnett_from_pass(locus.male_pass, locus.female_pass)
+    if p1 <= 0 or (p0 + p1) <= 0:
+        return None
+    return p1 / (p0 + p1) * 100
+
+
+# ─── Folding loci ──────────────────────────────────────────────────────
+
+_Dist = Tuple[Tuple[Tuple[LocusPhenotype, ...], float], ...]
+
+
+def _merge(left: _Dist, right: _Dist, min_probability: float, beam: int) -> _Dist:
+    """Combine two independent outcome distributions.
+
+    Both sides are sorted descending, so pairwise products can be walked
+    largest-first with a heap. We stop once we've kept `beam` terms AND
+    the next product is under `min_probability`. Each side sums to ≤ 1,
+    so at most ~1 / min_probability products clear the floor — the work
+    per merge is bounded no matter how many outcomes either side carries.
+    The beam is what keeps flat distributions (twenty 50/50 hets, where
+    every single outcome is ~1e-6) from pruning to nothing.
+    """
+    combined: Dict[Tuple[LocusPhenotype, ...], float] = {}
+    heap = [(-left[0][1] * right[0][1], 0, 0)]
+    seen = {(0, 0)}
+    taken = 0
+    while heap:
+        neg_p, i, j = heapq.heappop(heap)
+        p = -neg_p
+        if taken >= beam and p < min_probability:
+            break
+        key = left[i][0] + right[j][0]
+        combined[key] = combined.get(key, 0.0) + p
+        taken += 1
+        for ni, nj in ((i + 1, j), (i, j + 1)):
+            if ni < len(left) and nj < len(right) and (ni, nj) not in seen:
+                seen.add((ni, nj))
+                heapq.heappush(heap, (-left[ni][1] * right[nj][1], ni, nj))
+    return tuple(sorted(combined.items(), key=lambda kv: -kv[1]))
+
+
+@lru_cache(maxsize=2048)
+def _fold(loci: Tuple[Locus, ...], min_probability: float, beam: int) -> _Dist:
+    """Divide-and-conquer fold over sorted loci, memoized on the sub-tuple.
+
+    Splitting in halves (rather than folding left to right) means two
+    pairings that share a run of identical loci share the cached half.
+    """
+    if len(loci) == 1:
+        return tuple(sorted(_locus_outcomes(loci[0]), key=lambda kv: -kv[1]))
+    mid = len(loci) // 2
+    return _merge(
+        _fold(loci[:mid], min_probability, beam),
+        _fold(loci[mid:], min_probability, beam),
+        min_probability,
+        beam,
+    )
+
+
+def build_loci(
+    genes: Sequence[GeneInfo],
+    male_pass: Dict[str, float],
+    female_pass: Dict[str, float],
+) -> Tuple[Locus, ...]:
+    """Assemble the loci for a pairing, keyed by gene id.
+
+    Genes neither parent carries are dropped — they can only produce
+    wild-type offspring and would just widen every memo key. The result
+    is sorted by gene name so equal sub-problems hash equally.
+    """
+    loci = []
+    for gene in genes:
+        pm = male_pass.get(gene.gene_id, 0.0)
+        pf = female_pass.get(gene.gene_id, 0.0)
+        if pm <= 0 and pf <= 0:
+            continue
+        loci.append(Locus(gene=gene, male_pass=pm, female_pass=pf))
+    return tuple(sorted(loci, key=lambda locus: (locus.gene.name.lower(), locus.gene.gene_id)))
+
+
+# ─── Public entry point ────────────────────────────────────────────────
+
+
+def predict_pairing(
+    loci: Tuple[Locus, ...],
+    max_outcomes: Optional[int] = 20,
+    min_probability: float = DEFAULT_MIN_PROBABILITY,
+    beam: int = DEFAULT_BEAM,
+) -> PairingPrediction:
+    """Offspring phenotype distribution for one pairing.
+
+    Outcomes are sorted viable-first, then by probability — lethal rows
+    stay listed for transparency but sink to the bottom, matching the
+    calculator. `max_outcomes=None` returns everything above the floor.
+    """
+    if not loci:
+        return PairingPrediction(
+            outcomes=[MorphOutcome(probability=1.0, visuals=[])],
+            loci_count=0,
+            lethal_probability=0.0,
+            welfare_probability=0.0,
+            expected_visual_genes=0.0,
+            pruned_probability=0.0,
+        )
+
+    dist = _fold(loci, min_probability, beam)
+
+    het_pcts = {
+        locus.gene.name: pct
+        for locus in loci
+        if (pct := _het_percentage(locus)) is not None
+    }
+
+    outcomes = []
+    for visuals, p in dist:
+        shown = {v.gene_name for v in visuals}
+        outcomes.append(MorphOutcome(
+            probability=p,
+            visuals=list(visuals),
+            poss_hets={g: pct for g, pct in het_pcts.items() if g not in shown},
+        ))
+    outcomes.sort(key=lambda o: (o.is_lethal, -o.probability))
+    if max_outcomes is not None:
+        outcomes = outcomes[:max_outcomes]
+
+    # Exact marginals — independent loci, so "no locus hits X" is a product.
+    p_no_lethal = 1.0
+    p_no_welfare = 1.0
+    expected_visual = 0.0
+    for locus in loci:
+        p0, p1, p2 = punnett_from_pass(locus.male_pass, locus.female_pass)
+        gene = locus.gene
+        if gene.lethal_homozygous:
+            p_no_lethal *= 1 - p2
+        p_visual = p2 if gene.gene_type == "recessive" else p1 + p2
+        expected_visual += p_visual
+        if gene.welfare_flag:
+            p_no_welfare *= 1 - p_visual
+
+    return PairingPrediction(
+        outcomes=outcomes,
+        loci_count=len(loci),
+        lethal_probability=1 - p_no_lethal,
+        welfare_probability=1 - p_no_welfare,
+        expected_visual_genes=expected_visual,
+        pruned_probability=max(0.0, 1.0 - sum(p for _, p in dist)),
+    )
@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from app.models.notification import Notification
 from app.models.notification_preferences import NotificationPreferences
+from app.services import realtime
 from app.utils.push_notifications import PushNotificationService
 
 logger = logging.getLogger(__name__)
@@ -104,6 +105,7 @@ def create_notification(
     db.add(notif)
     db.commit()
     db.refresh(notif)
+    realtime.publish(user_id, realtime.notification_event(notif))
 
     if push:
         try:
@@ -0,0 +1,221 @@
+"""Async object stores behind services/storage.py.
+
+StorageService used to drive R2 with a synchronous boto3 client from its
+async methods, so every PUT, HEAD and DELETE stalled the event loop for
+a full round trip, and a photo's original, thumbnail and variants went
+up one after another as single PUTs however large the original was.
+
+Two stores with the same four methods (put / exists / delete, plus
+url_for / key_for between keys and public URLs):
+
+  S3ObjectStore     R2 or any S3-compatible endpoint (MinIO included).
+                    One pooled httpx.AsyncClient per event loop keeps
+                    connections alive between requests; requests are
+                    signed with botocore's SigV4 signer, so no async
+                    AWS SDK is needed. Bodies of at least
+                    STORAGE_MULTIPART_THRESHOLD go up as a multipart
+                    upload, parts in parallel.
+  LocalObjectStore  Files under a directory, served by the app's static
+                    mount. Development mode, and the stand-in the tests
+                    run against.
+
+Both bound their concurrency by STORAGE_MAX_CONCURRENCY: the S3 store
+through its connection pool, the local one through its thread pool.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = "public, max-age=31536000"  # 1 year; objects never change
+MIB = 1024 * 1024
+
+
+class ObjectStoreError(Exception):
+    """A store request failed; the message says which and why."""
+
+
+class LocalObjectStore:
+    def __init__(self, root: str = "uploads", max_workers: int = 8):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+    def url_for(self, key: str) -> str:
+        # Relative URL, served by FastAPI StaticFiles.
+        return f"/{self.root}/{key}"
+
+    def key_for(self, url: str) -> str:
+        return url.lstrip("/").removeprefix(f"{self.root}/")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        await self._run(self._write, key, data)
+        return self.url_for(key)
+
+    async def exists(self, key: str) -> bool:
+        return await self._run(os.path.exists, self._path(key))
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._run(os.remove, self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3ObjectStore:
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key_id: str,
+        secret_access_key: str,
+        public_url_base: str,
+        region: str = "auto",
+        max_connections: int = 8,
+        multipart_threshold: int = 8 * MIB,
+        part_size: int = 5 * MIB,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        # R2 wants every part but the last the same size, S3 at least 5 MiB.
+        if part_size < 5 * MIB:
+            raise ValueError("part_size must be at least 5 MiB")
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.public_url_base = public_url_base.rstrip("/")
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self._signer = S3SigV4Auth(Credentials(access_key_id, secret_access_key), "s3", region)
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._transport = transport
+        # httpx connections belong to the loop that opened them; the app has
+        # one loop, tests and scripts may run several.
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_url_base}/{key}"
+
+    def key_for(self, url: str) -> str:
+        return url.removeprefix(f"{self.public_url_base}/")
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            for stale in [loop_ for loop_ in self._clients if loop_.is_closed()]:
+                del self._clients[stale]
+            client = self._clients[loop] = httpx.AsyncClient(
+                limits=self._limits,
+                # Waiting for a pooled connection is how concurrency is bounded,
+                # so that wait has no timeout of its own.
+                timeout=httpx.Timeout(60.0, pool=None),
+                transport=self._transport,
+            )
+        return client
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        query: str = "",
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        url = f"{self.endpoint_url}/{self.bucket}/{quote(key)}" + (f"?{query}" if query else "")
+        signed = AWSRequest(method=method, url=url, data=body, headers=headers or {})
+        self._signer.add_auth(signed)
+        return await self._client().request(method, url, content=body, headers=dict(signed.headers.items()))
+
+    @staticmethod
+    def _expect(what: str, response: httpx.Response) -> httpx.Response:
+        if response.is_success:
+            return response
+        raise ObjectStoreError(f"{what} failed: HTTP {response.status_code} {response.text[:200]}")
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        headers = {"Content-Type": content_type, "Cache-Control": CACHE_CONTROL}
+        if len(data) >= self.multipart_threshold:
+            await self._put_multipart(key, data, headers)
+        else:
+            self._expect(f"PUT {key}", await self._request("PUT", key, body=data, headers=headers))
+        return self.url_for(key)
+
+    async def _put_multipart(self, key: str, data: bytes, headers: Dict[str, str]) -> None:
+        created = self._expect(
+            f"create multipart {key}", await self._request("POST", key, "uploads", headers=headers),
+        )
+        upload_id = _xml_text(created.content, "UploadId")
+        upload = f"uploadId={quote(upload_id, safe='')}"
+        try:
+            parts = [data[i:i + self.part_size] for i in range(0, len(data), self.part_size)]
+            etags = await asyncio.gather(*(
+                self._put_part(key, upload, number, part) for number, part in enumerate(parts, start=1)
+            ))
+            completed = self._expect(
+                f"complete multipart {key}",
+                await self._request("POST", key, upload, body=_complete_body(etags)),
+            )
+            # Completion can fail after the 200 has been sent; the body says so.
+            if b"<Error>" in completed.content:
+                raise ObjectStoreError(f"complete multipart {key} failed: {completed.text[:200]}")
+        except Exception:
+            # Parts of an abandoned upload are stored (and billed) until aborted.
+            try:
+                await self._request("DELETE", key, upload)
+            except Exception:
+                logger.warning("could not abort multipart upload %s of %s", upload_id, key)
+            raise
+
+    async def _put_part(self, key: str, upload: str, number: int, part: bytes) -> str:
+        response = self._expect(
+            f"part {number} of {key}",
+            await self._request("PUT", key, f"partNumber={number}&{upload}", body=part),
+        )
+        return response.headers["ETag"]
+
+    async def exists(self, key: str) -> bool:
+        response = await self._request("HEAD", key)
+        if response.status_code == 404:
+            return False
+        self._expect(f"HEAD {key}", response)
+        return True
+
+    async def delete(self, key: str) -> None:
+        # S3 answers 204 whether or not the key existed.
+        self._expect(f"DELETE {key}", await self._request("DELETE", key))
+
+
+def _xml_text(document: bytes, tag: str) -> str:
+    """The first <tag> in an S3 XML response, namespace or not."""
+    for element in ElementTree.fromstring(document).iter():
+        if element.tag.rsplit("}", 1)[-1] == tag:
+            return element.text or ""
+    raise ObjectStoreError(f"no <{tag}> in response")
+
+
+def _complete_body(etags: List[str]) -> bytes:
+    parts = "".join(
+        f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+        for number, etag in enumerate(etags, start=1)
+    )
+    return f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode()
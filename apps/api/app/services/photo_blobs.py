@@ -0,0 +1,123 @@
+"""Shared photo objects and their reference counts (models/photo_blob.py).
+
+A transfer claim used to give the buyer independent copies of the
+seller's photos: for each photo a blocking R2 `copy_object` for the
+original, then the thumbnail, then each variant, one after another inside
+the claim's transaction. Forty photos held the transaction, and the
+event loop, for many seconds.
+
+The buyer's rows now point at the same objects and `share` counts the
+extra users, one upsert for the whole claim, no storage calls at all.
+Deleting a photo `release`s its objects and storage deletes only those
+whose count reached zero, after the commit — so the seller deleting
+their photo still can't break the buyer's copy (BRIEF §5).
+
+Uploads go through `store_photo`, which dedupes by content: the
+original's row carries the SHA-256 of the uploaded bytes, and an upload
+of bytes already stored shares those objects — no thumbnail, no
+variants, no PUT — instead of storing a second set. Object keys stay
+unique per stored set rather than being the hash itself, so an upload
+racing the garbage collection of an identical, just-deleted photo
+stores fresh objects instead of having them deleted from under it.
+
+Both sides upsert the same key, so a claim and a delete racing on one
+object serialize on its row rather than both reading "no row".
+"""
+import hashlib
+from collections import Counter
+from typing import Iterable, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.photo import Photo
+from app.models.photo_blob import PhotoBlob
+from app.services.storage import UploadedPhoto, storage_service
+
+
+def photo_urls(photo) -> List[str]:
+    """Every stored object behind one photo row."""
+    urls = [photo.url, photo.thumbnail_url]
+    urls.extend(v["url"] for v in photo.variants or [])
+    return [url for url in urls if url]
+
+
+def _counted_upsert(urls: Iterable[str], sign: int):
+    """Upsert moving each object's count by `sign` per occurrence in `urls`.
+
+    Occurrences, not distinct URLs: a parent can hold two rows over the same
+    objects (an upload deduped by content), and claiming it adds two users.
+    Rows are inserted as if the count had been 1, the implicit count of an
+    object nobody has shared yet; on conflict the same delta applies to the
+    stored count."""
+    counts = sorted(Counter(urls).items())  # one row per key per statement; stable lock order
+    if not counts:
+        return None
+    stmt = insert(PhotoBlob).values([{"url": url, "ref_count": 1 + sign * n} for url, n in counts])
+    return stmt.on_conflict_do_update(
+        index_elements=[PhotoBlob.url],
+        set_={"ref_count": PhotoBlob.ref_count + stmt.excluded.ref_count - 1},
+    )
+
+
+def share(db: Session, urls: Iterable[str]) -> None:
+    """Count one more user of each object, per occurrence. An object without
+    a row already had one user, so its first share starts the count at two."""
+    stmt = _counted_upsert(urls, +1)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def release(db: Session, urls: Iterable[str]) -> List[str]:
+    """Count one fewer user of each object, per occurrence; returns the
+    objects nobody uses any more, for the caller to delete from storage once
+    it has committed."""
+    stmt = _counted_upsert(urls, -1)
+    if stmt is None:
+        return []
+    counts = db.execute(stmt.returning(PhotoBlob.url, PhotoBlob.ref_count)).all()
+    freed = [url for url, refs in counts if refs <= 0]
+    if freed:
+        db.execute(delete(PhotoBlob).where(PhotoBlob.url.in_(freed)))
+    return freed
+
+
+async def store_photo(
+    db: Session,
+    file_data: bytes,
+    filename: str,
+    content_type: str = "image/jpeg",
+) -> UploadedPhoto:
+    """Upload a photo unless identical bytes are already stored, in which
+    case count one more user of those objects and return them. The caller
+    adds the Photo row (`**uploaded.columns()`) in the same transaction."""
+    content_hash = hashlib.sha256(file_data).hexdigest()
+
+    # Locked so a delete of the last photo using these objects can't free
+    # them between this read and the share below; if that delete committed
+    # first, the row is gone and this is an ordinary upload.
+    url = db.execute(
+        select(PhotoBlob.url).where(PhotoBlob.content_hash == content_hash).with_for_update()
+    ).scalar()
+    if url is not None:
+        existing = db.query(Photo).filter(Photo.url == url).first()
+        if existing is not None:
+            share(db, photo_urls(existing))
+            return UploadedPhoto(
+                existing.url, existing.thumbnail_url,
+                existing.width, existing.height, existing.variants or [],
+            )
+        # Its photos went with their animal (a cascade, which releases
+        # nothing). Stop matching it and store these bytes afresh.
+        db.execute(update(PhotoBlob).where(PhotoBlob.url == url).values(content_hash=None))
+
+    uploaded = await storage_service.upload_photo(file_data, filename, content_type)
+    # One user so far. An identical upload racing this one loses the
+    # unique hash and simply keeps its own objects.
+    db.execute(
+        insert(PhotoBlob)
+        .values(url=uploaded.url, ref_count=1, content_hash=content_hash)
+        .on_conflict_do_nothing()
+    )
+    return uploaded
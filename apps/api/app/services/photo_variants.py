@@ -0,0 +1,83 @@
+"""Responsive photo variants.
+
+Photo lists used to hand back the full-resolution upload plus one 300px
+thumbnail, so a gallery on a phone either squinted at the thumbnail or
+pulled several megabytes of original per tile. Each upload is now also
+resized ONCE, at upload time, to the VARIANT_WIDTHS narrower than the
+original, and the row keeps the original's dimensions and a list of
+
+    {"width": 640, "height": 480, "url": "..."}
+
+ascending by width. Responses carry that list plus a ready-made `srcset`
+(variants and the original, as "url 640w, ...") so a client can let the
+platform pick the smallest adequate size, and width/height so it can
+reserve the layout box before the image arrives.
+
+Photos uploaded before this have no dimensions and no variants; they are
+listed exactly as before, with `srcset` null.
+"""
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+# Phone grid tile, phone full width / tablet tile, tablet and desktop full
+# width. Larger than that, clients take the original.
+VARIANT_WIDTHS: Tuple[int, ...] = (320, 640, 1280)
+VARIANT_QUALITY = 82
+
+
+def render_variants(
+    image_data: bytes,
+    widths: Tuple[int, ...] = VARIANT_WIDTHS,
+) -> Tuple[int, int, List[Tuple[int, int, bytes]]]:
+    """Decode `image_data` once and return (width, height, variants) where
+    each variant is (width, height, jpeg_bytes), ascending.
+
+    Dimensions are as displayed: EXIF orientation is applied, since the
+    variants are re-encoded without it and must come out the same way up
+    as the original does in a browser. Only widths narrower than the
+    original are produced — upscaling would cost bytes and buy nothing.
+    """
+    with Image.open(BytesIO(image_data)) as opened:
+        img = ImageOps.exif_transpose(opened)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        width, height = img.size
+
+        variants = []
+        for target in sorted(widths):
+            if target >= width:
+                break
+            size = (target, max(1, round(height * target / width)))
+            resized = img.resize(size, Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, format="JPEG", quality=VARIANT_QUALITY, optimize=True)
+            variants.append((size[0], size[1], buffer.getvalue()))
+    return width, height, variants
+
+
+def srcset(photo) -> Optional[str]:
+    """"url 320w, url 640w, ..., original Nw" — None for photos uploaded
+    before variants existed, whose width isn't known."""
+    if not photo.width:
+        return None
+    candidates = [(v["url"], v["width"]) for v in photo.variants or []]
+    candidates.append((photo.url, photo.width))
+    return ", ".join(f"{url} {width}w" for url, width in candidates)
+
+
+def photo_payload(photo) -> Dict[str, Any]:
+    """The JSON shape of one photo in list and upload responses."""
+    return {
+        "id": photo.id,
+        "url": photo.url,
+        "thumbnail_url": photo.thumbnail_url,
+        "width": photo.width,
+        "height": photo.height,
+        "variants": photo.variants or [],
+        "srcset": srcset(photo),
+        "caption": photo.caption,
+        "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
+        "created_at": photo.created_at.isoformat(),
+    }
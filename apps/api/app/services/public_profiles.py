@@ -0,0 +1,112 @@
+"""Render cache for the public animal profiles that QR codes resolve to.
+
+Printed enclosure codes and shared links land on `/t/{id}` and `/a/{id}`
+(routers/qr.py) and `/tarantulas/public/{username}/{slug}`
+(routers/tarantulas.py). Each render reads the animal, owner, species,
+lineage, last feeding/molt/shed and photos; at an expo the same few codes
+are scanned hundreds of times an hour.
+
+Only the anonymous view is cached. Owners get private fields and logged-in
+keepers get a follow state, so those renders vary by viewer and always run
+the route. The anonymous body is stored in the response cache backend
+(utils/response_cache.py, RESPONSE_CACHE_URI) under the animal's own
+generation group, which is its content version: the entry is served only
+while the animal's version hasn't moved since the body was built.
+
+`invalidate(animal_id)` bumps the version. Call it after committing a
+write that changes what a profile shows:
+
+  - feeding (single and Feeding Day), molt, shed and photo writes for
+    the animal, and weigh-ins (which move `current_weight_g`)
+  - edits to and deletion of the animal itself (including per-animal
+    visibility, which the keeper-link route checks)
+  - the keeper's collection visibility or public profile (`invalidate_keeper`)
+
+Lineage, provenance and species care-sheet edits aren't hooked, so
+PROFILE_TTL bounds them, as it bounds other workers on the memory:// backend.
+
+Responses carry a content-hash ETag and `Cache-Control: public,
+max-age=MAX_AGE`, so a CDN or the scanning phone can answer repeats
+within a minute and revalidate with If-None-Match after that.
+`Vary: Authorization` keeps a shared cache from handing the anonymous
+body to a signed-in owner.
+"""
+import re
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.animal import Animal
+from app.models.tarantula import Tarantula
+from app.utils.etag import etag_for, etag_matches
+from app.utils.response_cache import CachedRoute, response_cache
+
+PROFILE_TTL = 300  # seconds an entry may live in the backend
+MAX_AGE = 60       # seconds a browser or CDN may reuse without asking
+
+# Not in CACHED_ROUTES: the middleware never sees these; the routes call
+# `respond`. The route's group ("profile") is only the stats bucket.
+PROFILE_ROUTE = CachedRoute("profile", re.compile(r"^/api/v1/(t|a)/"), PROFILE_TTL)
+
+
+def group_for(animal_id) -> str:
+    """The animal's content-version group."""
+    return f"profile:{animal_id}"
+
+
+def invalidate(*animal_ids) -> None:
+    """Call after committing a write that changes what these animals'
+    public profiles show. None entries and repeats are ignored."""
+    ids = dict.fromkeys(str(a) for a in animal_ids if a is not None)
+    response_cache.invalidate(*(group_for(a) for a in ids))
+
+
+def invalidate_keeper(db: Session, user_id) -> None:
+    """Every profile a keeper owns — after a collection visibility or
+    public profile change."""
+    ids = db.execute(
+        union_all(
+            select(Tarantula.id).where(Tarantula.user_id == user_id),
+            select(Animal.id).where(Animal.user_id == user_id),
+        )
+    ).scalars().all()
+    invalidate(*ids)
+
+
+async def respond(
+    request: Request, key: str, animal_id, build: Callable[[], dict]
+) -> Response:
+    """The anonymous profile for `animal_id`, from the cache or from
+    `build()`. `key` tells routes with different payloads apart. Errors
+    raised by `build` (404, private collection) propagate and aren't
+    cached."""
+    cache = response_cache
+    entry: Optional[tuple] = None
+    generation = None
+    if cache.backend is not None:
+        entry, generation = await cache.lookup(PROFILE_ROUTE, key, group=group_for(animal_id))
+
+    hit = entry is not None
+    if hit:
+        _, etag, body = entry
+    else:
+        body = JSONResponse(content=jsonable_encoder(build())).body
+        etag = etag_for(body)
+        if generation is not None:
+            await cache.store(PROFILE_ROUTE, key, generation, etag, body, group=group_for(animal_id))
+
+    not_modified = etag_matches(request.headers.get("if-none-match"), etag)
+    cache.record(PROFILE_ROUTE.group, hit=hit, not_modified=not_modified, size=len(body))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={MAX_AGE}",
+        "Vary": "Authorization",
+        "X-Cache": "HIT" if hit else "MISS",
+    }
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
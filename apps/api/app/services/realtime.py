@@ -0,0 +1,279 @@
+"""Realtime push of unread counts and new notifications.
+
+The web and mobile clients used to poll /notifications/unread-count,
+/messages/direct/unread-count and the notification list — an authenticated
+request and a COUNT per poll, per open app. routers/realtime.py serves a
+WebSocket instead: on connect it sends both unread counts once, then pushes
+what changes as it happens.
+
+Events (JSON, one per frame):
+
+  {"type": "unread", "unread": {"notifications": 3, "messages": 1}}
+      Absolute counts. Sent on connect, and when a count is reset outright.
+  {"type": "notification", "notification": {...}, "unread_delta": {"notifications": 1}}
+      A new row from notification_service.create_notification, in the
+      NotificationResponse shape.
+  {"type": "message", "conversation_id": ..., "message_id": ...,
+   "sender_username": ..., "unread_delta": {"messages": 1}}
+      A direct message arrived.
+  {"type": "notifications_read" | "messages_read", "unread_delta": {...: -n}}
+      The user read some on another device.
+  {"type": "ping"}
+      Keepalive, so idle sockets survive proxies.
+
+Publishers call `publish(user_id, event)` after their commit. Delivery is
+best-effort: a client that reconnects gets fresh counts, so a lost event
+costs one stale badge until then, never a wrong one for good.
+
+Fan-out (REALTIME_BROKER_URI):
+
+  memory://     in-process only. Fine for one worker; with several, a user
+                only hears about writes made on the worker holding their
+                socket.
+  database://   Postgres LISTEN/NOTIFY on the app database. `publish` sends
+                a NOTIFY; every worker runs one listener thread that hands
+                the payloads to its own hub, including the publisher's.
+
+Either way the hub below is what sockets subscribe to: one bounded queue
+per connection. A connection that falls QUEUE_SIZE events behind is closed
+rather than allowed to buffer without limit; the client reconnects and
+starts again from fresh counts.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import urllib.parse
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "realtime"
+
+QUEUE_SIZE = 100
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_NOTIFY_BYTES = 7900
+
+
+# ─── In-process hub ───────────────────────────────────────────────────────────
+
+class Subscription:
+    """One connection's queue. Created and read on the event loop; fed from
+    any thread."""
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, size: int = QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def _put(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Wake the reader so it notices and closes.
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[dict]:
+        """The next event, or None once the connection has fallen behind."""
+        event = await self.queue.get()
+        return None if self.overflowed else event
+
+
+class Hub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.delivered = 0
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(str(user_id), asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[subscription.user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def deliver(self, user_id: str, event: dict) -> int:
+        """Queue `event` for every connection `user_id` has open on this
+        process. Safe from any thread. Returns how many there were."""
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(str(user_id), ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # Loop already closed; the socket is going away anyway.
+                continue
+        self.delivered += len(subscriptions)
+        return len(subscriptions)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscriptions.values())
+
+
+# ─── Brokers ──────────────────────────────────────────────────────────────────
+
+class MemoryBroker:
+    def __init__(self, hub: Hub):
+        self.hub = hub
+
+    def start(self) -> None:
+        pass
+
+    def publish(self, user_id, event: dict) -> None:
+        self.hub.deliver(str(user_id), event)
+
+
+class DatabaseBroker:
+    """LISTEN/NOTIFY fan-out. The listener holds its own connection outside
+    the pool, started with the first subscription on this process."""
+
+    def __init__(self, hub: Hub, engine=None, poll_timeout: float = 5.0):
+        self.hub = hub
+        self._engine = engine
+        self.poll_timeout = poll_timeout
+        self._started = False
+        self._start_lock = threading.Lock()
+        self.listening = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.database import engine
+            self._engine = engine
+        return self._engine
+
+    def publish(self, user_id, event: dict) -> None:
+        payload = _notify_payload(str(user_id), event)
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT pg_notify(%(channel)s, %(payload)s)",
+                                 {"channel": CHANNEL, "payload": payload})
+            conn.commit()
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="realtime-listener", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _connect(self):
+        dialect = self.engine.dialect
+        args, kwargs = dialect.create_connect_args(self.engine.url)
+        conn = dialect.connect(*args, **kwargs)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+            except Exception:
+                logger.exception("realtime listener could not connect; retrying in %.0fs", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            backoff = 1.0
+            self.listening.set()
+            try:
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("realtime listener lost its connection; reconnecting")
+            finally:
+                self.listening.clear()
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self.hub.deliver(message["u"], message["e"])
+        except Exception:
+            logger.exception("bad realtime payload: %.200s", payload)
+
+
+def _notify_payload(user_id: str, event: dict) -> str:
+    payload = json.dumps({"u": user_id, "e": event}, default=str)
+    if len(payload.encode()) <= MAX_NOTIFY_BYTES or "notification" not in event:
+        return payload
+    # Too big for NOTIFY: send the id alone and let the client fetch the row.
+    slim = dict(event, notification={"id": str(event["notification"]["id"])})
+    return json.dumps({"u": user_id, "e": slim}, default=str)
+
+
+def broker_for(uri: str, hub: Hub):
+    scheme = urllib.parse.urlparse(uri or "memory://").scheme
+    if scheme == "memory":
+        return MemoryBroker(hub)
+    if scheme == "database":
+        return DatabaseBroker(hub)
+    raise ValueError(f"Unsupported REALTIME_BROKER_URI scheme: {scheme!r}")
+
+
+hub = Hub()
+broker = broker_for(settings.REALTIME_BROKER_URI, hub)
+
+
+# ─── Publishing ───────────────────────────────────────────────────────────────
+
+def publish(user_id, event: Dict[str, Any]) -> None:
+    """Push `event` to every connection `user_id` has open. Call after the
+    commit it describes. Never raises — a push is never worth failing the
+    write over."""
+    try:
+        broker.publish(user_id, event)
+    except Exception:
+        logger.exception("realtime publish failed for %s", event.get("type"))
+
+
+def notification_event(notification) -> dict:
+    from app.schemas.notification import NotificationResponse
+
+    return {
+        "type": "notification",
+        "notification": NotificationResponse.model_validate(notification).model_dump(mode="json"),
+        "unread_delta": {"notifications": 1},
+    }
+
+
+def read_event(kind: str, count: int, **extra) -> dict:
+    """`kind` is "notifications" or "messages"."""
+    return {"type": f"{kind}_read", "unread_delta": {kind: -count}, **extra}
+
+
+def unread_event(**counts: int) -> dict:
+    return {"type": "unread", "unread": counts}
+
+
+PING = {"type": "ping"}
@@ -0,0 +1,327 @@
+"""In-memory species catalog index — bulk name resolution and search.
+
+The catalogs are small (low thousands of rows) and almost never written, but
+they're read constantly and row-by-row: the importer resolved every
+spreadsheet row with an exact query plus an ILIKE fallback, and autocomplete
+ran a leading-wildcard ILIKE on every keystroke. A breeder sheet names the
+same few hundred species thousands of times. So the catalog is loaded once
+per process into a `SpeciesIndex` and everything resolves against memory.
+
+Resolution order, first hit wins:
+
+  exact       scientific_name_lower == the name, lowercased
+  prefix      genus + species tokens equal — handles a trailing authority,
+              subspecies, or note ("Brachypelma hamorii (Tesmoingt 1997)").
+              The importer's long-standing fallback.
+  normalized  accents folded, punctuation and "cf." / "aff." / "sp."
+              qualifiers dropped ("Grammostola cf. rosea", "Psalmopœus")
+  fuzzy       trigram candidates, confirmed by edit distance — typos like
+              "Grammastola rosea". Only a UNIQUE best match within a small
+              distance is accepted: linking an animal to the wrong care sheet
+              is worse than linking it to none, so ties resolve to no match.
+
+Every result carries the method, so callers can tell the keeper "we guessed".
+
+Staleness: an index lives for INDEX_TTL_SECONDS and is dropped immediately by
+`invalidate()`, which the catalog write routes call. Other workers catch up
+within the TTL — acceptable for a catalog that changes a few times a week.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+
+INDEX_TTL_SECONDS = 600
+
+# Trigram candidates to confirm with edit distance. The true match is
+# nearly always the top one; a handful covers transpositions in the genus.
+FUZZY_CANDIDATES = 8
+
+_QUALIFIERS = {"cf", "aff", "sp", "spp", "ssp", "subsp", "var", "nr"}
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_NON_ALPHA_RE = re.compile(r"[^a-z\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+# ─── Normalization ─────────────────────────────────────────────────────
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase, accent-folded, punctuation-free, qualifier-free form."""
+    if not name:
+        return ""
+    s = unicodedata.normalize("NFKD", name)
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    s = s.lower().replace("œ", "oe").replace("æ", "ae")
+    s = _PAREN_RE.sub(" ", s)
+    s = _NON_ALPHA_RE.sub(" ", s)
+    return " ".join(t for t in _WS_RE.split(s) if t and t not in _QUALIFIERS)
+
+
+def binomial(normalized: str) -> str:
+    """First two tokens of a normalized name — genus + specific epithet."""
+    return " ".join(normalized.split()[:2])
+
+
+def trigrams(s: str) -> set:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and
+    one trailing, so short words and word starts still produce grams."""
+    grams = set()
+    for word in s.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning limit + 1) once every
+    path exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def _max_typos(name: str) -> int:
+    # One typo per ~8 characters, at most 3. "Pamphobeteus sp" is not a
+    # typo of "Pamphobeteus antinous".
+    return min(3, max(1, len(name) // 8))
+
+
+# ─── Index ─────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """The slice of a catalog row the resolver and autocomplete need.
+
+    Attribute names match the ORM models, so an entry can stand in for a
+    species row anywhere only these fields are read (import payloads,
+    `from_attributes` response models).
+    """
+    id: object
+    scientific_name: str
+    scientific_name_lower: str
+    common_names: Tuple[str, ...] = ()
+    genus: Optional[str] = None
+    taxon: Optional[str] = None
+    care_level: Optional[str] = None
+    image_url: Optional[str] = None
+    times_kept: int = 0
+
+
+@dataclass(frozen=True)
+class SpeciesMatch:
+    entry: CatalogEntry
+    method: str  # exact | prefix | normalized | fuzzy
+    distance: int = 0
+
+
+_OPTIONAL_COLUMNS = ("genus", "taxon", "care_level", "image_url", "times_kept")
+
+
+class SpeciesIndex:
+    """Immutable lookup structures over one catalog."""
+
+    def __init__(self, entries: Iterable[CatalogEntry]):
+        self.entries: List[CatalogEntry] = sorted(
+            entries, key=lambda e: (-(e.times_kept or 0), e.scientific_name)
+        )
+        self.exact: Dict[str, CatalogEntry] = {}
+        self.normalized: Dict[str, CatalogEntry] = {}
+        self.by_binomial: Dict[str, CatalogEntry] = {}
+        self._norm: List[str] = []
+        self._grams: Dict[str, List[int]] = {}
+
+        for i, e in enumerate(self.entries):
+            norm = normalize_name(e.scientific_name)
+            self._norm.append(norm)
+            self.exact.setdefault(e.scientific_name_lower, e)
+            self.normalized.setdefault(norm, e)
+            for g in trigrams(norm):
+                self._grams.setdefault(g, []).append(i)
+        # A binomial key prefers the species itself over any subspecies
+        # ("python regius" over "python regius something"), so fill it from
+        # the shortest names first.
+        for i in sorted(range(len(self.entries)), key=lambda i: len(self._norm[i])):
+            self.by_binomial.setdefault(binomial(self._norm[i]), self.entries[i])
+
+    @classmethod
+    def load(cls, db: Session, model) -> "SpeciesIndex":
+        cols = [model.id, model.scientific_name, model.scientific_name_lower, model.common_names]
+        present = [c for c in _OPTIONAL_COLUMNS if hasattr(model, c)]
+        cols += [getattr(model, c) for c in present]
+        entries = []
+        for row in db.query(*cols).all():
+            extra = dict(zip(present, row[4:]))
+            care = extra.get("care_level")
+            if care is not None and hasattr(care, "value"):
+                extra["care_level"] = care.value
+            extra["times_kept"] = extra.get("times_kept") or 0
+            entries.append(CatalogEntry(
+                id=row[0],
+                scientific_name=row[1],
+                scientific_name_lower=row[2] or (row[1] or "").lower(),
+                common_names=tuple(row[3] or ()),
+                **extra,
+            ))
+        return cls(entries)
+
+    def resolve(self, name: Optional[str]) -> Optional[SpeciesMatch]:
+        key = (name or "").strip().lower()
+        if not key:
+            return None
+        hit = self.exact.get(key)
+        if hit is not None:
+            return SpeciesMatch(hit, "exact")
+        norm = normalize_name(key)
+        if not norm:
+            return None
+        raw_tokens = key.split()
+        if len(raw_tokens) >= 2:
+            hit = self.by_binomial.get(f"{raw_tokens[0]} {raw_tokens[1]}")
+            if hit is not None:
+                return SpeciesMatch(hit, "prefix")
+        hit = self.normalized.get(norm) or self.by_binomial.get(binomial(norm))
+        if hit is not None:
+            return SpeciesMatch(hit, "normalized")
+        return self._fuzzy(binomial(norm) if len(norm.split()) > 1 else norm)
+
+    def _fuzzy(self, norm: str) -> Optional[SpeciesMatch]:
+        grams = trigrams(norm)
+        if not grams:
+            return None
+        shared: Counter = Counter()
+        for g in grams:
+            for i in self._grams.get(g, ()):
+                shared[i] += 1
+        limit = _max_typos(norm)
+        best: Optional[Tuple[int, int]] = None  # (distance, index)
+        tied = False
+        for i, _ in shared.most_common(FUZZY_CANDIDATES):
+            target = binomial(self._norm[i]) if len(norm.split()) > 1 else self._norm[i]
+            d = edit_distance(norm, target, limit)
+            if d > limit:
+                continue
+            if best is None or d < best[0]:
+                best, tied = (d, i), False
+            elif d == best[0] and self.entries[i].id != self.entries[best[1]].id:
+                tied = True
+        if best is None or tied:
+            return None
+        return SpeciesMatch(self.entries[best[1]], "fuzzy", best[0])
+
+    def search(self, query: str, limit: int = 10, taxon: Optional[str] = None) -> List[CatalogEntry]:
+        """Autocomplete ranking: scientific-name prefix, then a word prefix in
+        any name, then substring, then (only if nothing else hit) fuzzy.
+        Within a tier, most-kept first."""
+        needle = (query or "").strip().lower()
+        if not needle:
+            return []
+        tiers: Tuple[List[CatalogEntry], ...] = ([], [], [])
+        for e in self.entries:
+            if taxon and e.taxon != taxon:
+                continue
+            names = [e.scientific_name_lower] + [c.lower() for c in e.common_names if c]
+            if e.scientific_name_lower.startswith(needle):
+                tiers[0].append(e)
+            elif any(w.startswith(needle) for n in names for w in n.split()):
+                tiers[1].append(e)
+            elif any(needle in n for n in names):
+                tiers[2].append(e)
+        out = [e for tier in tiers for e in tier][:limit]
+        if not out:
+            match = self._fuzzy(normalize_name(needle))
+            if match is not None and (not taxon or match.entry.taxon == taxon):
+                out = [match.entry]
+        return out
+
+
+# ─── Process-wide cache ────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_indexes: Dict[object, Tuple[float, SpeciesIndex]] = {}
+
+
+def get_index(db: Session, model) -> SpeciesIndex:
+    """The cached index for `model`'s catalog, loading it if missing or stale."""
+    now = time.monotonic()
+    cached = _indexes.get(model)
+    if cached is not None and now - cached[0] < INDEX_TTL_SECONDS:
+        return cached[1]
+    with _lock:
+        cached = _indexes.get(model)
+        if cached is not None and now - cached[0] < INDEX_TTL_SECONDS:
+            return cached[1]
+        index = SpeciesIndex.load(db, model)
+        _indexes[model] = (time.monotonic(), index)
+        return index
+
+
+def invalidate(model=None) -> None:
+    """Drop the cached index for `model` (or every catalog). Call after any
+    catalog write so this worker serves the change immediately."""
+    with _lock:
+        if model is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(model, None)
+
+
+# ─── Per-import resolver ───────────────────────────────────────────────
+
+
+@dataclass
+class SpeciesResolver:
+    """Resolve many names against one catalog, memoized for one import.
+
+    `resolve_many` takes a whole column; repeats cost a dict lookup.
+    """
+    db: Session
+    model: object
+    _index: Optional[SpeciesIndex] = None
+    _memo: Dict[str, Optional[SpeciesMatch]] = field(default_factory=dict)
+
+    @property
+    def index(self) -> SpeciesIndex:
+        if self._index is None:
+            self._index = get_index(self.db, self.model)
+        return self._index
+
+    def resolve_many(self, names: Iterable[Optional[str]]) -> Dict[str, Optional[SpeciesMatch]]:
+        out: Dict[str, Optional[SpeciesMatch]] = {}
+        for name in names:
+            key = (name or "").strip().lower()
+            if not key:
+                continue
+            if key not in self._memo:
+                self._memo[key] = self.index.resolve(key)
+            out[key] = self._memo[key]
+        return out
+
+    def match(self, name: Optional[str]) -> Optional[SpeciesMatch]:
+        key = (name or "").strip().lower()
+        if not key:
+            return None
+        if key not in self._memo:
+            self._memo[key] = self.index.resolve(key)
+        return self._memo[key]
+
+    def get(self, name: Optional[str]) -> Optional[CatalogEntry]:
+        m = self.match(name)
+        return m.entry if m is not None else None
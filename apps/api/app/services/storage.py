@@ -1,15 +1,42 @@
 """
 Storage service abstraction layer for handling file uploads.
-Supports both local filesystem and Cloudflare R2/S3-compatible storage.
+Supports both local filesystem and Cloudflare R2/S3-compatible storage,
+through the async object stores in services/object_store.py.
 """
+import asyncio
+import hashlib
 import os
 import uuid
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
 from io import BytesIO
 from PIL import Image
 import boto3
 from botocore.client import Config
 from app.config import settings
+from app.services.object_store import LocalObjectStore, S3ObjectStore
+from app.services.photo_variants import render_variants
+
+
+@dataclass
+class UploadedPhoto:
+    """Where an upload landed and what it measured. `columns()` is the
+    matching Photo(...) keyword arguments."""
+
+    url: str
+    thumbnail_url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[Dict[str, Any]] = field(default_factory=list)
+
+    def columns(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "thumbnail_url": self.thumbnail_url,
+            "width": self.width,
+            "height": self.height,
+            "variants": self.variants,
+        }
 
 
 class StorageService:
@@ -37,6 +64,18 @@ class StorageService:
             # Initialize R2 client (S3-compatible)
             endpoint_url = f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
             print(f"  📡 R2 Endpoint: {endpoint_url}")
+            self.store = S3ObjectStore(
+                endpoint_url,
+                settings.R2_BUCKET_NAME,
+                settings.R2_ACCESS_KEY_ID,
+                settings.R2_SECRET_ACCESS_KEY,
+                settings.R2_PUBLIC_URL,
+                max_connections=settings.STORAGE_MAX_CONCURRENCY,
+                multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD,
+                part_size=settings.STORAGE_PART_SIZE,
+            )
+            # Synchronous client for offline scripts
+            # (upload_species_images_to_r2.py); the app itself uses `store`.
             self.s3_client = boto3.client(
                 's3',
                 endpoint_url=endpoint_url,
@@ -51,10 +90,7 @@ class StorageService:
             print(f"  🌐 Public URL: {self.public_url_base}")
         else:
             # Use local filesystem
-            self.upload_dir = "uploads/photos"
-            self.thumbnail_dir = "uploads/thumbnails"
-            os.makedirs(self.upload_dir, exist_ok=True)
-            os.makedirs(self.thumbnail_dir, exist_ok=True)
+            self.store = LocalObjectStore("uploads", max_workers=settings.STORAGE_MAX_CONCURRENCY)
             print("⚠️  Using local filesystem storage (development mode)")
     
     def _create_thumbnail(self, image_data: bytes, max_size: int = 300) -> bytes:
@@ -84,6 +120,11 @@ class StorageService:
         """
         Upload an avatar image (creates a square thumbnail).
 
+        The object is named by the SHA-256 of the uploaded bytes, so
+        re-uploading the same picture finds it already stored and skips
+        the crop, the encode and the PUT. Avatars are never deleted, so a
+        shared name can't be pulled out from under another user.
+
         Args:
             file_data: Raw image bytes
             filename: Original filename
@@ -92,31 +133,14 @@ class StorageService:
         Returns:
             Avatar URL
         """
-        # Generate unique filename
-        file_extension = os.path.splitext(filename)[1] or '.jpg'
-        unique_filename = f"avatar_{uuid.uuid4()}{file_extension}"
+        key = f"avatars/avatar_{hashlib.sha256(file_data).hexdigest()}.jpg"
+        if await self.store.exists(key):
+            return self.store.url_for(key)
 
         # Create square avatar (200x200)
         avatar_data = self._create_square_avatar(file_data, size=200)
 
-        if self.use_r2:
-            # Upload to R2
-            avatar_url = await self._upload_to_r2(
-                avatar_data,
-                f"avatars/{unique_filename}",
-                "image/jpeg"
-            )
-        else:
-            # Upload to local filesystem
-            avatar_dir = "uploads/avatars"
-            os.makedirs(avatar_dir, exist_ok=True)
-            avatar_url = await self._upload_to_local(
-                avatar_data,
-                unique_filename,
-                avatar_dir
-            )
-
-        return avatar_url
+        return await self.store.put(key, avatar_data, "image/jpeg")
 
     def _create_square_avatar(self, image_data: bytes, size: int = 200) -> bytes:
         """Create a square avatar from image data (crops to center)."""
@@ -151,9 +175,9 @@ class StorageService:
         file_data: bytes,
         filename: str,
         content_type: str = "image/jpeg"
-    ) -> Tuple[str, str]:
+    ) -> UploadedPhoto:
         """
-        Upload a photo and its thumbnail.
+        Upload a photo, its thumbnail and its responsive variants.
 
         Args:
             file_data: Raw image bytes
@@ -161,175 +185,51 @@ class StorageService:
             content_type: MIME type of the image
 
         Returns:
-            Tuple of (photo_url, thumbnail_url)
+            UploadedPhoto with the URLs, the original's dimensions and the
+            variants (see services/photo_variants.py)
         """
         # Generate unique filename
         file_extension = os.path.splitext(filename)[1] or '.jpg'
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        thumbnail_filename = f"thumb_{unique_filename}"
-
-        # Create thumbnail
-        thumbnail_data = self._create_thumbnail(file_data)
-
-        if self.use_r2:
-            # Upload to R2
-            photo_url = await self._upload_to_r2(
-                file_data,
-                f"photos/{unique_filename}",
-                content_type
-            )
-            thumbnail_url = await self._upload_to_r2(
-                thumbnail_data,
-                f"thumbnails/{thumbnail_filename}",
-                "image/jpeg"
-            )
-        else:
-            # Upload to local filesystem
-            photo_url = await self._upload_to_local(
-                file_data,
-                unique_filename,
-                self.upload_dir
-            )
-            thumbnail_url = await self._upload_to_local(
-                thumbnail_data,
-                thumbnail_filename,
-                self.thumbnail_dir
-            )
+        stem = str(uuid.uuid4())
 
-        return photo_url, thumbnail_url
-    
-    async def _upload_to_r2(
-        self,
-        file_data: bytes,
-        key: str,
-        content_type: str
-    ) -> str:
-        """Upload file to Cloudflare R2."""
-        try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=file_data,
-                ContentType=content_type,
-                CacheControl='public, max-age=31536000',  # 1 year cache
-            )
-            
-            # Return public URL
-            return f"{self.public_url_base}/{key}"
-        
-        except Exception as e:
-            print(f"❌ R2 upload failed: {e}")
-            raise Exception(f"Failed to upload to R2: {str(e)}")
-    
-    async def _upload_to_local(
-        self,
-        file_data: bytes,
-        filename: str,
-        directory: str
-    ) -> str:
-        """Upload file to local filesystem."""
-        file_path = os.path.join(directory, filename)
-        
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-        
-        # Return relative URL (served by FastAPI StaticFiles)
-        return f"/{directory}/{filename}"
-    
-    async def copy_photo(
-        self,
-        photo_url: str,
-        thumbnail_url: Optional[str] = None,
-    ) -> Tuple[str, Optional[str]]:
-        """Make an INDEPENDENT copy of an existing photo (+ thumbnail).
-
-        Used by the animal-transfer claim flow: the buyer's record must own its
-        own image objects so the seller later deleting their copy can't break the
-        buyer's provenance record (BRIEF §5). Returns (new_photo_url, new_thumb_url).
-
-        R2: server-side `copy_object` to fresh UUID keys — no re-download, no
-        re-thumbnail. Local dev: read + rewrite to new filenames.
-        """
-        if self.use_r2:
-            new_photo_key = f"photos/{uuid.uuid4()}.jpg"
-            new_photo_url = self._copy_in_r2(photo_url, new_photo_key)
-            new_thumb_url = None
-            if thumbnail_url:
-                new_thumb_key = f"thumbnails/thumb_{uuid.uuid4()}.jpg"
-                new_thumb_url = self._copy_in_r2(thumbnail_url, new_thumb_key)
-            return new_photo_url, new_thumb_url
-        else:
-            new_photo_url = self._copy_local(photo_url, self.upload_dir, prefix="")
-            new_thumb_url = (
-                self._copy_local(thumbnail_url, self.thumbnail_dir, prefix="thumb_")
-                if thumbnail_url else None
-            )
-            return new_photo_url, new_thumb_url
-
-    def _copy_in_r2(self, source_url: str, dest_key: str) -> str:
-        """Server-side copy of one R2 object to a new key. Returns its public URL."""
-        source_key = source_url.replace(f"{self.public_url_base}/", "")
-        self.s3_client.copy_object(
-            Bucket=self.bucket_name,
-            CopySource={"Bucket": self.bucket_name, "Key": source_key},
-            Key=dest_key,
-            CacheControl="public, max-age=31536000",
-            MetadataDirective="COPY",
+        # Resizing a 15 MB upload is the slow part of the request; keep it
+        # off the event loop.
+        thumbnail_data, (width, height, rendered) = await asyncio.gather(
+            asyncio.to_thread(self._create_thumbnail, file_data),
+            asyncio.to_thread(render_variants, file_data),
         )
-        return f"{self.public_url_base}/{dest_key}"
 
-    def _copy_local(self, source_url: str, directory: str, prefix: str = "") -> str:
-        """Copy a local-FS photo to a new filename. Dev-mode fallback."""
-        source_path = source_url.lstrip("/")
-        new_filename = f"{prefix}{uuid.uuid4()}.jpg"
-        dest_path = os.path.join(directory, new_filename)
-        with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
-            dst.write(src.read())
-        return f"/{directory}/{new_filename}"
+        # Original, thumbnail and variants go up together.
+        photo_url, thumbnail_url, *variant_urls = await asyncio.gather(
+            self.store.put(f"photos/{stem}{file_extension}", file_data, content_type),
+            self.store.put(f"thumbnails/thumb_{stem}{file_extension}", thumbnail_data, "image/jpeg"),
+            *(
+                self.store.put(f"photos/{stem}_{variant_width}w.jpg", data, "image/jpeg")
+                for variant_width, _, data in rendered
+            ),
+        )
+        variants = [
+            {"width": variant_width, "height": variant_height, "url": url}
+            for (variant_width, variant_height, _), url in zip(rendered, variant_urls)
+        ]
+        return UploadedPhoto(photo_url, thumbnail_url, width, height, variants)
 
-    async def delete_photo(self, photo_url: str, thumbnail_url: str) -> None:
+    async def delete_objects(self, urls: Iterable[str]) -> None:
         """
-        Delete a photo and its thumbnail.
-        
-        Args:
-            photo_url: URL of the main photo
-            thumbnail_url: URL of the thumbnail
+        Delete stored objects, concurrently up to STORAGE_MAX_CONCURRENCY.
+
+        Callers pass only objects nothing references any more — for photos,
+        what services/photo_blobs.release returned — and call this after
+        their commit, so a rolled-back delete never loses a file. Failures
+        are logged, not raised: the rows are already gone.
         """
-        if self.use_r2:
-            await self._delete_from_r2(photo_url)
-            await self._delete_from_r2(thumbnail_url)
-        else:
-            await self._delete_from_local(photo_url)
-            await self._delete_from_local(thumbnail_url)
-    
-    async def _delete_from_r2(self, url: str) -> None:
-        """Delete file from R2."""
-        try:
-            # Extract key from URL
-            # Format: https://pub-xxx.r2.dev/photos/filename.jpg
-            key = url.replace(f"{self.public_url_base}/", "")
-            
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=key
-            )
-            print(f"✅ Deleted from R2: {key}")
-        
-        except Exception as e:
-            print(f"⚠️  R2 delete failed (file may not exist): {e}")
-    
-    async def _delete_from_local(self, url: str) -> None:
-        """Delete file from local filesystem."""
+        await asyncio.gather(*(self._delete(url) for url in urls if url))
+
+    async def _delete(self, url: str) -> None:
         try:
-            # Convert URL to file path
-            file_path = url.lstrip('/')
-            
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"✅ Deleted local file: {file_path}")
-        
+            await self.store.delete(self.store.key_for(url))
         except Exception as e:
-            print(f"⚠️  Local delete failed (file may not exist): {e}")
+            print(f"⚠️  Storage delete failed for {url}: {e}")
 
 
 # Global storage service instance
@@ -0,0 +1,280 @@
+"""Apply verified payment-provider events to subscriptions.
+
+These are the Stripe and Apple handlers that used to live inline in the
+webhook routes. The rules are unchanged; what changed is who calls them and
+when. The webhook inbox worker (services/webhook_inbox.py) calls them with an
+already-verified event, inside the transaction that marks the event done. So
+they never commit: a handler that raises rolls back cleanly, and its effect
+and the event's `done` mark land together or not at all.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.subscription import SubscriptionPlan, UserSubscription
+
+logger = logging.getLogger(__name__)
+
+
+def _cancel_other_active(db: Session, user_sub: UserSubscription) -> None:
+    """Cancel shadow rows (e.g. the free row /me auto-creates while this row
+    sat lazily expired) so entitlement reads stay unambiguous."""
+    others = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.user_id == user_sub.user_id,
+            UserSubscription.id != user_sub.id,
+            UserSubscription.status == "active",
+        )
+    ).all()
+    for other in others:
+        other.status = "cancelled"
+        other.cancelled_at = datetime.utcnow()
+
+
+# ─── Stripe ────────────────────────────────────────────────────────────
+
+
+def apply_checkout_completed(db: Session, session: dict) -> None:
+    """Process completed checkout session"""
+    user_id = session.get("metadata", {}).get("user_id")
+    price_type = session.get("metadata", {}).get("price_type")
+    customer_id = session.get("customer")
+
+    if not user_id:
+        logger.error("No user_id in checkout session metadata")
+        return
+
+    # Resolve the plan from checkout metadata. Older sessions (and the TV web
+    # flow before this change) carry no `plan` key — default to "premium" so
+    # existing Tarantuverse purchases keep working exactly as before.
+    plan_key = session.get("metadata", {}).get("plan") or "premium"
+    plan = db.query(SubscriptionPlan).filter(
+        SubscriptionPlan.name == plan_key
+    ).first()
+
+    if not plan:
+        logger.error(f"Subscription plan '{plan_key}' not found")
+        return
+
+    # Idempotency guard: the inbox dedupes Stripe's retries by event id, but
+    # an event can also be replayed from the dashboard under a NEW id. If this
+    # user already has an active Stripe sub for the same customer + price
+    # type + PLAN, it was already processed — skip. (Plan is part of the key
+    # so an HV→bundle upgrade at the same cadence isn't mistaken for a retry
+    # of the earlier purchase.)
+    duplicate = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.user_id == user_id,
+            UserSubscription.status == "active",
+            UserSubscription.payment_provider == "stripe",
+            UserSubscription.payment_provider_id == customer_id,
+            UserSubscription.subscription_source == price_type,
+            UserSubscription.plan_id == plan.id,
+        )
+    ).first()
+
+    if duplicate:
+        logger.info(
+            f"Duplicate checkout.session.completed for user {user_id} "
+            f"(customer {customer_id}, {price_type}, {plan_key}) — skipping"
+        )
+        return
+
+    # App-scoped supersession: only cancel existing subs that this purchase
+    # actually supersedes. A 'both' (All-Access) purchase supersedes everything;
+    # an app-scoped purchase only supersedes subs for the SAME app. This mirrors
+    # the IAP validate_receipt path so a keeper can hold TV + HV independently.
+    new_app = getattr(plan, "app", None) or "tarantuverse"
+    existing_active = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.user_id == user_id,
+            UserSubscription.status == "active",
+        )
+    ).all()
+    for ex in existing_active:
+        ex_plan = db.query(SubscriptionPlan).filter(
+            SubscriptionPlan.id == ex.plan_id
+        ).first()
+        ex_app = (getattr(ex_plan, "app", None) or "tarantuverse") if ex_plan else "tarantuverse"
+        if new_app == "both" or ex_app == new_app:
+            ex.status = "cancelled"
+            ex.cancelled_at = datetime.utcnow()
+
+    # Calculate expiry based on price type
+    expires_at = None
+    if price_type == "monthly":
+        expires_at = datetime.utcnow() + timedelta(days=30)
+    elif price_type == "yearly":
+        expires_at = datetime.utcnow() + timedelta(days=365)
+    # Lifetime has no expiry
+
+    db.add(UserSubscription(
+        user_id=user_id,
+        plan_id=plan.id,
+        status="active",
+        expires_at=expires_at,
+        payment_provider="stripe",
+        payment_provider_id=customer_id,
+        subscription_source=price_type,
+        auto_renew=price_type in ["monthly", "yearly"]
+    ))
+    db.flush()
+
+    logger.info(f"Subscription activated for user {user_id} via Stripe ({price_type})")
+
+
+def apply_subscription_updated(db: Session, subscription: dict) -> None:
+    """Handle subscription updates (renewals, plan changes)"""
+    customer_id = subscription.get("customer")
+    status = subscription.get("status")
+
+    # Include 'expired' rows: lazy expiry may have flipped the row just
+    # before a renewal webhook arrives — a renewal must reactivate it.
+    user_sub = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.payment_provider == "stripe",
+            UserSubscription.payment_provider_id == customer_id,
+            UserSubscription.status.in_(["active", "expired"])
+        )
+    ).order_by(UserSubscription.started_at.desc()).first()
+
+    if not user_sub:
+        return
+    if status == "active":
+        # Subscription renewed - update expiry (and revive if lazily expired)
+        current_period_end = subscription.get("current_period_end")
+        if current_period_end:
+            user_sub.expires_at = datetime.utcfromtimestamp(current_period_end)
+        user_sub.status = "active"
+        _cancel_other_active(db, user_sub)
+    elif status in ["past_due", "unpaid"]:
+        # Payment issue - could add grace period logic here
+        logger.warning(f"Subscription {customer_id} has payment issues: {status}")
+
+
+def apply_subscription_deleted(db: Session, subscription: dict) -> None:
+    """Handle subscription cancellation"""
+    customer_id = subscription.get("customer")
+
+    user_sub = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.payment_provider == "stripe",
+            UserSubscription.payment_provider_id == customer_id,
+            UserSubscription.status == "active"
+        )
+    ).first()
+
+    if user_sub:
+        user_sub.status = "cancelled"
+        user_sub.cancelled_at = datetime.utcnow()
+        logger.info(f"Subscription cancelled for customer {customer_id}")
+
+
+def apply_payment_failed(db: Session, invoice: dict) -> None:
+    """Handle failed payment"""
+    logger.warning(f"Payment failed for customer {invoice.get('customer')}")
+    # Could implement email notification here
+
+
+STRIPE_HANDLERS = {
+    "checkout.session.completed": apply_checkout_completed,
+    "customer.subscription.updated": apply_subscription_updated,
+    "customer.subscription.deleted": apply_subscription_deleted,
+    "invoice.payment_failed": apply_payment_failed,
+}
+
+
+def apply_stripe_event(db: Session, event_type: str, obj: dict) -> None:
+    handler = STRIPE_HANDLERS.get(event_type)
+    if handler is not None:
+        handler(db, obj)
+
+
+# ─── Apple ─────────────────────────────────────────────────────────────
+
+
+def apply_apple_notification(db: Session, n: dict) -> None:
+    """Apply one flattened App Store Server Notification (V2) — the dict
+    from apple_notification_service.decode_notification_event."""
+    notification_type = n["notification_type"]
+    subtype = n.get("subtype")
+    original_txn_id = n.get("original_transaction_id")
+    if not original_txn_id:
+        logger.warning(f"Apple notification {notification_type}: no originalTransactionId")
+        return
+
+    # Match on the original transaction id stored at receipt validation.
+    # (Initial purchases store it directly; for the very first purchase
+    # the per-renewal transactionId equals the original one, so legacy
+    # rows usually match too.)
+    user_sub = db.query(UserSubscription).filter(
+        and_(
+            UserSubscription.payment_provider == "apple",
+            UserSubscription.payment_provider_id == original_txn_id,
+        )
+    ).order_by(UserSubscription.started_at.desc()).first()
+
+    if not user_sub:
+        # Not an error — a row that predates original-id storage will never
+        # match no matter how many retries.
+        logger.warning(
+            f"Apple notification {notification_type}: no subscription matches "
+            f"originalTransactionId {original_txn_id}"
+        )
+        return
+
+    expires_ms = n.get("expires_ms")
+    new_expiry = datetime.utcfromtimestamp(expires_ms / 1000) if expires_ms else None
+
+    if notification_type in ("SUBSCRIBED", "DID_RENEW", "OFFER_REDEEMED"):
+        user_sub.status = "active"
+        if new_expiry:
+            user_sub.expires_at = new_expiry
+        user_sub.auto_renew = True
+        user_sub.cancelled_at = None
+        _cancel_other_active(db, user_sub)
+        logger.info(
+            f"Apple {notification_type}: extended subscription for user "
+            f"{user_sub.user_id} to {new_expiry}"
+        )
+
+    elif notification_type == "DID_CHANGE_RENEWAL_STATUS":
+        user_sub.auto_renew = subtype == "AUTO_RENEW_ENABLED"
+        logger.info(
+            f"Apple renewal status for user {user_sub.user_id}: "
+            f"auto_renew={user_sub.auto_renew}"
+        )
+
+    elif notification_type in ("EXPIRED", "GRACE_PERIOD_EXPIRED"):
+        user_sub.status = "expired"
+        if new_expiry:
+            user_sub.expires_at = new_expiry
+        user_sub.auto_renew = False
+        logger.info(f"Apple {notification_type}: subscription ended for user {user_sub.user_id}")
+
+    elif notification_type in ("REFUND", "REVOKE"):
+        user_sub.status = "cancelled"
+        user_sub.cancelled_at = datetime.utcnow()
+        logger.info(f"Apple {notification_type}: subscription revoked for user {user_sub.user_id}")
+
+    elif notification_type == "REFUND_REVERSED":
+        # Apple reversed an earlier refund — reinstate. If the period
+        # already lapsed, expiry-aware reads keep premium off anyway.
+        user_sub.status = "active"
+        user_sub.cancelled_at = None
+        if new_expiry:
+            user_sub.expires_at = new_expiry
+        logger.info(f"Apple REFUND_REVERSED: subscription reinstated for user {user_sub.user_id}")
+
+    elif notification_type == "DID_FAIL_TO_RENEW":
+        # GRACE_PERIOD subtype = keep access while Apple retries billing;
+        # without it, the EXPIRED notification will follow and end access.
+        logger.warning(
+            f"Apple DID_FAIL_TO_RENEW for user {user_sub.user_id}"
+            f"{' (grace period)' if subtype == 'GRACE_PERIOD' else ''}"
+        )
+
+    else:
+        logger.info(f"Apple notification {notification_type}: no handler, ignoring")
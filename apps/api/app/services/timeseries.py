@@ -0,0 +1,82 @@
+"""Downsampling for long chart series.
+
+A reptile weighed weekly for six years is ~300 points; a breeder colony's
+scale logs run to thousands. A phone chart is a few hundred pixels wide, so
+shipping every point is payload the client immediately throws away.
+
+LTTB (Largest-Triangle-Three-Buckets, Steinarsson 2013) keeps the points
+that carry the visual shape: first and last always, then per bucket the
+point forming the largest triangle with the previously kept point and the
+next bucket's average. Unlike averaging or every-nth sampling it keeps
+spikes — a sudden 15% weight drop survives, which is the point of the chart.
+
+Functions return indices into the caller's series rather than new points,
+so callers keep their own row types and any per-row fields (deltas computed
+against the true previous measurement, not the previous kept one).
+"""
+from datetime import datetime
+from typing import List, Optional, Sequence, Set
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Indices of the points LTTB keeps, ascending. The whole series when it
+    already fits (or the budget is under 3, which can't hold a triangle)."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the NEXT bucket — the third triangle vertex.
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        if avg_start >= avg_end:
+            avg_start = avg_end - 1
+        span = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / span
+        avg_y = sum(ys[avg_start:avg_end]) / span
+
+        start = int(i * every) + 1
+        end = max(int((i + 1) * every) + 1, start + 1)
+        best, best_area = start, -1.0
+        for j in range(start, min(end, n - 1)):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a])
+                - (xs[a] - xs[j]) * (avg_y - ys[a])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample_indices(
+    times: Sequence[datetime],
+    *measures: Sequence[Optional[float]],
+    max_points: Optional[int],
+) -> List[int]:
+    """Indices to keep from a series with one or more measures per point.
+
+    Each measure is thinned independently over the points where it was
+    recorded (a molt may have a leg span and no weight), then the picks are
+    merged — so `max_points` bounds each measure's line, and the first and
+    last points of the series are always kept.
+    """
+    n = len(times)
+    if max_points is None or n <= max_points:
+        return list(range(n))
+    keep: Set[int] = {0, n - 1}
+    xs_all = [t.timestamp() for t in times]
+    for values in measures:
+        present = [i for i, v in enumerate(values) if v is not None]
+        picks = lttb_indices(
+            [xs_all[i] for i in present],
+            [float(values[i]) for i in present],
+            max_points,
+        )
+        keep.update(present[p] for p in picks)
+    return sorted(keep)
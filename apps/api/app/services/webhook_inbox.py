@@ -0,0 +1,289 @@
+"""Webhook inbox worker — record verified events, apply them, report lag.
+
+The routes call `record()` and return 200; applying happens here, either
+right after the response (a BackgroundTask drains the inbox) or from the
+cron drain, which also picks up retries and anything a restart interrupted.
+See models/webhook_event.py for why the inbox exists.
+
+Claiming: `claim_next` takes one due `pending` row with FOR UPDATE SKIP
+LOCKED, so any number of workers and drains can run at once without
+applying an event twice — a second worker simply skips the locked row.
+The row stays `pending` while it's being applied; if the process dies
+mid-way the transaction rolls back, the lock drops, and the event is
+picked up again. There is no `processing` state to get stuck in.
+
+Ordering: a row is only claimable when no EARLIER pending row shares its
+(provider, ordering_key). A failing event therefore holds back its
+customer's later events — through every retry — until it succeeds or is
+dead-lettered after MAX_ATTEMPTS. Dead rows are terminal and don't block.
+"""
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import exists, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.models.webhook_event import WebhookEvent
+from app.services import subscription_webhooks
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+# A drain stops after this many events or seconds, whichever comes first, so
+# one cron run or post-response task can't monopolize a worker.
+DRAIN_LIMIT = 200
+DRAIN_BUDGET_SECONDS = 20.0
+
+
+def _apply_stripe(db: Session, event: WebhookEvent) -> None:
+    subscription_webhooks.apply_stripe_event(db, event.event_type, event.payload)
+
+
+def _apply_apple(db: Session, event: WebhookEvent) -> None:
+    subscription_webhooks.apply_apple_notification(db, event.payload)
+
+
+HANDLERS: Dict[str, Callable[[Session, WebhookEvent], None]] = {
+    "stripe": _apply_stripe,
+    "apple": _apply_apple,
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the `attempts`-th failure: 30s, 1m, 2m … 1h."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+# ─── Recording ─────────────────────────────────────────────────────────
+
+
+def record(
+    db: Session,
+    *,
+    provider: str,
+    event_id: str,
+    event_type: str,
+    payload: dict,
+    ordering_key: Optional[str] = None,
+    occurred_at: Optional[datetime] = None,
+) -> bool:
+    """Persist a verified event and commit. False when the provider is
+    redelivering one we already hold — the caller acks it all the same."""
+    stmt = (
+        insert(WebhookEvent.__table__)
+        .values(
+            id=uuid.uuid4(),
+            provider=provider,
+            event_id=event_id,
+            event_type=event_type,
+            ordering_key=ordering_key,
+            payload=payload,
+            status="pending",
+            attempts=0,
+            occurred_at=occurred_at or _now(),
+        )
+        .on_conflict_do_nothing(constraint="uq_webhook_events_provider_event")
+        .returning(WebhookEvent.__table__.c.id)
+    )
+    inserted = db.execute(stmt).first() is not None
+    db.commit()
+    if not inserted:
+        logger.info(f"Webhook {provider}:{event_id} already in inbox — duplicate delivery")
+    return inserted
+
+
+# ─── Processing ────────────────────────────────────────────────────────
+
+
+def claim_next(db: Session) -> Optional[WebhookEvent]:
+    """Lock and return the next due event whose customer has nothing
+    earlier outstanding, or None."""
+    earlier = aliased(WebhookEvent)
+    blocked = exists().where(
+        earlier.provider == WebhookEvent.provider,
+        earlier.ordering_key == WebhookEvent.ordering_key,
+        earlier.status == "pending",
+        tuple_(earlier.occurred_at, earlier.received_at, earlier.id)
+        < tuple_(WebhookEvent.occurred_at, WebhookEvent.received_at, WebhookEvent.id),
+    )
+    return (
+        db.query(WebhookEvent)
+        .filter(
+            WebhookEvent.status == "pending",
+            WebhookEvent.next_attempt_at <= func.now(),
+            ~blocked,
+        )
+        .order_by(WebhookEvent.occurred_at, WebhookEvent.received_at, WebhookEvent.id)
+        .with_for_update(skip_locked=True, of=WebhookEvent)
+        .limit(1)
+        .first()
+    )
+
+
+def process(db: Session, event: WebhookEvent) -> None:
+    """Apply a claimed event and record the outcome, in one commit.
+
+    The handler runs in a SAVEPOINT: on failure its writes roll back but
+    the row lock and the attempt bookkeeping survive.
+    """
+    event.attempts += 1
+    try:
+        with db.begin_nested():
+            HANDLERS[event.provider](db, event)
+    except Exception as exc:  # noqa: BLE001 — any handler failure is retryable
+        event.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+        if event.attempts >= MAX_ATTEMPTS:
+            event.status = "dead"
+            event.processed_at = _now()
+            logger.error(
+                f"Webhook {event.provider}:{event.event_id} dead-lettered after "
+                f"{event.attempts} attempts: {event.last_error}"
+            )
+        else:
+            event.next_attempt_at = _now() + retry_delay(event.attempts)
+            logger.warning(
+                f"Webhook {event.provider}:{event.event_id} failed (attempt "
+                f"{event.attempts}), retrying at {event.next_attempt_at}: {event.last_error}"
+            )
+    else:
+        event.status = "done"
+        event.last_error = None
+        event.processed_at = _now()
+    db.commit()
+
+
+def drain(
+    db: Session,
+    limit: int = DRAIN_LIMIT,
+    budget_seconds: float = DRAIN_BUDGET_SECONDS,
+) -> dict:
+    """Apply due events until the inbox is empty or a limit is hit."""
+    deadline = time.monotonic() + budget_seconds
+    counts = {"done": 0, "retrying": 0, "dead": 0}
+    for _ in range(limit):
+        if time.monotonic() > deadline:
+            break
+        event = claim_next(db)
+        if event is None:
+            # End the (empty) claim transaction. Commit, not rollback: a
+            # session joined to a caller's transaction must not roll it back.
+            db.commit()
+            break
+        process(db, event)
+        counts["retrying" if event.status == "pending" else event.status] += 1
+    return counts
+
+
+def drain_in_new_session(session_factory) -> dict:
+    """Background-task entry point: its own session, closed afterwards."""
+    db = session_factory()
+    try:
+        return drain(db)
+    finally:
+        db.close()
+
+
+def requeue(db: Session, event: WebhookEvent) -> None:
+    """Put a dead-lettered event back in line, due now, with a fresh
+    attempt budget. The original ordering still applies."""
+    event.status = "pending"
+    event.attempts = 0
+    event.next_attempt_at = _now()
+    event.processed_at = None
+    db.commit()
+
+
+# ─── Metrics ───────────────────────────────────────────────────────────
+
+
+def metrics(db: Session, dead_letter_limit: int = 20) -> dict:
+    """Backlog, processing lag and throughput, straight from the table so
+    every worker reports the same numbers."""
+    now = _now()
+    hour_ago = now - timedelta(hours=1)
+    by_status = dict(
+        db.query(WebhookEvent.status, func.count())
+        .group_by(WebhookEvent.status)
+        .all()
+    )
+
+    oldest_pending = (
+        db.query(func.min(WebhookEvent.received_at))
+        .filter(WebhookEvent.status == "pending")
+        .scalar()
+    )
+    due_pending = (
+        db.query(func.count())
+        .filter(WebhookEvent.status == "pending", WebhookEvent.next_attempt_at <= now)
+        .scalar()
+    )
+
+    lag = func.extract("epoch", WebhookEvent.processed_at - WebhookEvent.received_at)
+    recent = (
+        db.query(
+            func.count(),
+            func.count().filter(WebhookEvent.processed_at >= now - timedelta(minutes=5)),
+            func.avg(lag),
+            func.percentile_cont(0.95).within_group(lag),
+        )
+        .filter(WebhookEvent.status == "done", WebhookEvent.processed_at >= hour_ago)
+        .one()
+    )
+    processed_1h, processed_5m, avg_lag, p95_lag = recent
+
+    dead = (
+        db.query(WebhookEvent)
+        .filter(WebhookEvent.status == "dead")
+        .order_by(WebhookEvent.processed_at.desc())
+        .limit(dead_letter_limit)
+        .all()
+    )
+    retrying = (
+        db.query(func.count())
+        .filter(WebhookEvent.status == "pending", WebhookEvent.attempts > 0)
+        .scalar()
+    )
+
+    return {
+        "pending": by_status.get("pending", 0),
+        "pending_due": due_pending,
+        "retrying": retrying,
+        "done": by_status.get("done", 0),
+        "dead": by_status.get("dead", 0),
+        # How far behind the worker is right now: age of the oldest event
+        # not yet applied.
+        "oldest_pending_age_seconds": (
+            round((now - oldest_pending).total_seconds(), 1) if oldest_pending else None
+        ),
+        # Receipt → applied, for events applied in the last hour.
+        "lag_seconds_avg_1h": round(float(avg_lag), 2) if avg_lag is not None else None,
+        "lag_seconds_p95_1h": round(float(p95_lag), 2) if p95_lag is not None else None,
+        "processed_last_5m": processed_5m,
+        "processed_last_1h": processed_1h,
+        "throughput_per_min_5m": round(processed_5m / 5, 2),
+        "dead_letters": [
+            {
+                "id": str(e.id),
+                "provider": e.provider,
+                "event_id": e.event_id,
+                "event_type": e.event_type,
+                "ordering_key": e.ordering_key,
+                "attempts": e.attempts,
+                "last_error": e.last_error,
+                "received_at": e.received_at,
+                "dead_at": e.processed_at,
+            }
+            for e in dead
+        ],
+    }
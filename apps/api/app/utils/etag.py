@@ -0,0 +1,47 @@
+"""Conditional GET helpers — ETag / If-None-Match.
+
+The validator is a hash of the serialized response body, so it is correct
+by construction: anything that changes what the client would see changes
+the tag, including values derived from "today" (days-since-fed ticks over
+at midnight without any row changing). The saving is the payload and the
+client's re-render, not the server-side work; routes whose validator can be
+computed more cheaply than the body should do that instead.
+
+Tags are weak (W/"…"): the body is semantically identical, not guaranteed
+byte-identical across serializer versions.
+"""
+import hashlib
+from typing import Mapping, Optional
+
+from fastapi import Request, Response
+
+
+def etag_for(body: bytes) -> str:
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored.
+    bare = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == bare
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_json(
+    request: Request,
+    body: bytes,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """A 200 JSON response carrying an ETag, or a bodiless 304 when the
+    client's If-None-Match already names it."""
+    etag = etag_for(body)
+    out_headers = {"ETag": etag, **(headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=out_headers)
+    return Response(content=body, media_type="application/json", headers=out_headers)
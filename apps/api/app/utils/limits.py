@@ -8,6 +8,8 @@ route, replacing the old tarantula-only check.
 
 Premium / unlimited plans use a sentinel of -1 and are never capped.
 """
+from typing import Optional
+
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -90,6 +92,23 @@ def enforce_collection_limit(db: Session, user: User) -> None:
         )
 
 
+def remaining_collection_capacity(db: Session, user: User) -> Optional[int]:
+    """How many more inverts `user` may create before enforce_collection_limit
+    would 402. None means uncapped.
+
+    For bulk paths (the importer) that would otherwise re-count the whole
+    collection before every row: count once, then count down.
+    """
+    max_animals = user.get_subscription_limits().get("max_animals", FREE_TIER_MAX_ANIMALS)
+    if max_animals == -1:
+        return None
+    current_count = (
+        active_inverts_query(db, user.id).count()
+        + active_colonies_query(db, user.id).count()
+    )
+    return max(0, max_animals - current_count)
+
+
 def active_animals_query(db: Session, user_id):
     """Base query for a user's ACTIVE Herpetoverse animals (reptiles /
     amphibians). Excludes animals handed off via transfer, so counts and the
@@ -134,6 +153,13 @@ def enforce_animal_limit(db: Session, user: User) -> None:
         )
 
 
+def remaining_animal_capacity(db: Session, user: User) -> Optional[int]:
+    """Herpetoverse twin of remaining_collection_capacity. None means uncapped."""
+    if user.is_premium_for_app("herpetoverse"):
+        return None
+    return max(0, HV_FREE_TIER_MAX_ANIMALS - active_animals_query(db, user.id).count())
+
+
 def enforce_hv_premium(user: User, feature: str = "This") -> None:
     """Raise HTTP 402 unless the user has an active Herpetoverse entitlement.
 
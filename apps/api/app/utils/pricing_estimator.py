@@ -3,6 +3,10 @@
 Only recent, public, comparable purchase reports can produce a range. Synthetic
 trait-based prices and unprovenanced seed ranges are intentionally excluded.
 The governing decision is docs/design/ADR-014-evidence-first-market-signals.md.
+
+Signals are scored here and only here. services/market_signals.py stores
+the output of `signal_for_group` per comparison group so collection
+valuation can read it back with a join; it never re-derives a number.
 """
 from dataclasses import dataclass, field
 from datetime import date, timedelta
@@ -49,6 +53,8 @@ class PricingEstimator:
     # than five self-reported numbers can support.
     MIN_NUMERIC_CONTRIBUTORS = 12
     MODERATE_QUALITY_CONTRIBUTORS = 12
+    # Life stages whose comparison groups are split by sex.
+    SEX_SPECIFIC_STAGES = frozenset({"subadult", "adult"})
 
     def __init__(self, db: Session):
         self.db = db
@@ -69,7 +75,13 @@ class PricingEstimator:
             )
         if not use_community_data:
             return self._insufficient("Community purchase observations were not requested.")
+        return self.signal_for_group(species_id, size_category, sex)
 
+    def signal_for_group(
+        self, species_id: str, size_category: str, sex: Optional[str] = None
+    ) -> MarketSignal:
+        """Score the comparison group's current observations. The caller
+        has established that the species exists and the stage is known."""
         observations = self._get_community_observations(species_id, size_category, sex)
         if not observations:
             return self._insufficient(
@@ -194,7 +206,7 @@ class PricingEstimator:
             PricingSubmission.purchase_date <= date.today(),
         )
         normalized_sex = self._enum_value(sex)
-        if size_category in {"subadult", "adult"}:
+        if size_category in self.SEX_SPECIFIC_STAGES:
             if normalized_sex in {"male", "female"}:
                 query = query.filter(PricingSubmission.sex == normalized_sex)
             else:
@@ -245,19 +257,14 @@ class PricingEstimator:
     def _insufficient(reason: str, **metadata) -> MarketSignal:
         return MarketSignal(limitations=[reason], **metadata)
 
-    def calculate_collection_value(self, tarantulas: list):
+    def calculate_collection_value(self, valued: list):
+        """Sum the supported ranges of (tarantula, signal) pairs; a None
+        signal or one without a range is left out of the total."""
         total_low = Decimal("0")
         total_high = Decimal("0")
         breakdown = []
-        for tarantula in tarantulas:
-            if not tarantula.species_id:
-                continue
-            signal = self.estimate_price(
-                str(tarantula.species_id),
-                self._determine_size_category(tarantula),
-                self._enum_value(tarantula.sex),
-            )
-            if not signal.has_range:
+        for tarantula, signal in valued:
+            if signal is None or not signal.has_range:
                 continue
             total_low += signal.estimated_low
             total_high += signal.estimated_high
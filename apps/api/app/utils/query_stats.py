@@ -0,0 +1,175 @@
+"""Per-request SQL statement counts and timings.
+
+Engine event hooks time every statement and charge it to the request that
+issued it. `QueryStatsMiddleware` opens a `QueryStats` for each request in a
+context variable. Sync routes and dependencies run on the threadpool with a
+copy of the request's context, so their statements land on the same object.
+With the counts in hand the middleware does two things:
+
+  - outside production it adds a `Server-Timing` header. It lists the
+    statement count and DB time, the slowest statement, and the time to
+    the first response byte. Browser devtools show it in the network panel.
+  - when a request takes longer than SLOW_REQUEST_MS or issues more than
+    SLOW_REQUEST_QUERIES statements, it logs one `slow_request` record with
+    those numbers and the slowest statement's SQL text. The record has no
+    bound parameters.
+
+Tests check statement counts with the `assert_max_queries` fixture
+(tests/conftest.py), which is built on `capture()`.
+"""
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_CHARS = 300
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Optional[List[str]] = None  # kept only by capture()
+
+    def add(self, statement: str, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms >= self.slowest_ms:
+            self.slowest_ms = ms
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_captures: List[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+def current() -> Optional[QueryStats]:
+    """The running request's stats, or None outside a request."""
+    return _current.get()
+
+
+@contextmanager
+def capture() -> Iterator[QueryStats]:
+    """Every statement issued on any engine, from any thread, while the
+    block runs — for tests, where the app runs on the TestClient's own
+    thread and event loop."""
+    stats = QueryStats(statements=[])
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+# ─── Engine hooks ─────────────────────────────────────────────────────
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_stats_start")
+    if not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, ms)
+    if _captures:
+        with _captures_lock:
+            for captured in _captures:
+                captured.add(statement, ms)
+
+
+def install() -> None:
+    """Hook every engine, including ones created later (the tests')."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ─── Middleware ───────────────────────────────────────────────────────
+
+
+def _one_line(statement: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", statement or "").strip()[:STATEMENT_LOG_CHARS]
+
+
+def server_timing(stats: QueryStats, elapsed_ms: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"',
+        f"db-slowest;dur={stats.slowest_ms:.1f}",
+        f"app;dur={elapsed_ms:.1f}",
+    ])
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI, outermost, so the counts cover every other middleware."""
+
+    def __init__(
+        self,
+        app,
+        *,
+        timing_header: Optional[bool] = None,
+        slow_ms: Optional[float] = None,
+        slow_queries: Optional[int] = None,
+    ):
+        self.app = app
+        self.timing_header = (
+            settings.ENVIRONMENT != "production" if timing_header is None else timing_header
+        )
+        self.slow_ms = settings.SLOW_REQUEST_MS if slow_ms is None else slow_ms
+        self.slow_queries = settings.SLOW_REQUEST_QUERIES if slow_queries is None else slow_queries
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.timing_header:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(stats, elapsed).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed > self.slow_ms or stats.count > self.slow_queries:
+                logger.warning(
+                    "slow_request method=%s path=%s status=%s ms=%.1f queries=%d "
+                    "db_ms=%.1f slowest_ms=%.1f slowest=%r",
+                    scope["method"], scope["path"], status, elapsed, stats.count,
+                    stats.total_ms, stats.slowest_ms, _one_line(stats.slowest_statement),
+                )
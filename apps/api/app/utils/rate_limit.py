@@ -3,8 +3,57 @@ Shared rate limiter instance.
 
 Import `limiter` here and in main.py so both share the same object.
 Attach it to `app.state.limiter` in main.py and register the 429 handler.
+
+Storage: RATE_LIMIT_STORAGE_URI picks where counters live. The default,
+`memory://`, counts per process — fine for one worker, but N workers means
+N × every limit. `database://` and `resp://host:port` share one count across
+workers (utils/rate_limit_storage.py). If a shared backend goes down the
+limiter falls back to per-process counting rather than failing requests.
+
+Keys: the signed-in user's id when the request carries a valid bearer
+token, otherwise the client address. Keepers sharing one network (an expo
+hall's wifi) no longer share a budget, and an account can't dodge its limit
+by switching networks. Unauthenticated routes — login, register, password
+reset — still key by address.
 """
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from app.config import settings
+from app.utils import rate_limit_storage  # noqa: F401 — registers database:// and resp://
+from app.utils.auth import decode_access_token
+
+
+@lru_cache(maxsize=4096)
+def _token_subject(token: str) -> Optional[Tuple[str, Optional[float]]]:
+    """(user id, expiry) for a valid token. Cached: the signature check
+    costs more than everything else the limiter does per request."""
+    payload = decode_access_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+    return str(payload["sub"]), payload.get("exp")
+
+
+def rate_limit_key(request: Request) -> str:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        subject = _token_subject(token.strip())
+        if subject is not None:
+            user_id, expires = subject
+            if expires is None or expires > time.time():
+                return f"user:{user_id}"
+    return get_remote_address(request)
+
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
+limiter = Limiter(
+    key_func=rate_limit_key,
+    default_limits=["200/minute"],
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=not settings.RATE_LIMIT_STORAGE_URI.startswith("memory://"),
+)
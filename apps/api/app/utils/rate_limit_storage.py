@@ -0,0 +1,519 @@
+"""Shared counter storage for the rate limiter (utils/rate_limit.py).
+
+slowapi's default `memory://` storage counts per process, so every extra
+worker multiplied every limit. These backends share one count across all
+workers and instances; RATE_LIMIT_STORAGE_URI picks one:
+
+  database://[?sync_interval=1.0&local_share=0.1]
+      Counters in Postgres (models/rate_limit_counter.py). No new service to
+      run.
+  resp://host:6379[/db][?timeout=0.25&pool_size=16]
+      Any Redis-protocol server (Redis, Valkey, KeyDB, Dragonfly), spoken
+      over a plain socket so the API doesn't need a client library. Tests
+      and the benchmark run it against tests/resp_standin.py.
+
+Both register with `limits` by URI scheme on import and support the
+fixed-window and sliding-window-counter strategies.
+
+Batching (database://): a round trip per request would cost more than the
+request it protects. Each process keeps a local tally per key and writes
+every key it touched in ONE upsert, at most every `sync_interval` seconds —
+or immediately, once a key's unwritten hits exceed `local_share` of its
+limit. So a worker can admit at most `local_share × limit` hits the others
+haven't seen yet: 20 extra on a 200/minute limit, none at all on the
+5/minute login limit (0.1 × 5 rounds down to 0, which means write-through).
+"""
+import queue
+import socket
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from math import floor
+from typing import Dict, Optional
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.rate_limit_counter import RateLimitCounter
+
+# Expired windows are swept from the table this often, per process.
+SWEEP_INTERVAL_SECONDS = 300.0
+
+
+def _query_options(uri: Optional[str]) -> dict:
+    parsed = urllib.parse.urlparse(uri or "")
+    return dict(urllib.parse.parse_qsl(parsed.query))
+
+
+def _limit_from_key(key: str) -> int:
+    """The limit's amount, from a `limits` key (".../<amount>/<multiples>/
+    <granularity>"). 0 when the key doesn't look like one — the caller then
+    treats the limit as strict."""
+    parts = key.rsplit("/", 3)
+    try:
+        return int(parts[-3])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _window_ttls(previous_count: int, expiry: int, now: float) -> tuple[float, float]:
+    """(previous TTL, current TTL) for timestamp-bucketed sliding windows —
+    the same arithmetic as limits' MemoryStorage, so every backend weighs
+    the previous window identically."""
+    previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+    current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+    return previous_ttl, current_ttl
+
+
+# ─── Postgres ──────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Counter:
+    expiry: int           # window length in seconds, for the upsert
+    expires_at: float     # epoch seconds; the database's window end once synced
+    synced: int = 0       # shared count at the last sync, our written hits included
+    pending: int = 0      # hits taken here, not written yet
+    inflight: int = 0     # hits in the upsert running now
+    dirty: bool = True    # hit or read since the last sync
+    known: bool = False   # synced at least once
+
+    @property
+    def count(self) -> int:
+        return self.synced + self.inflight + self.pending
+
+
+class DatabaseStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate-limit counters in the app database, written in batches."""
+
+    STORAGE_SCHEME = ["database"]
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        wrap_exceptions: bool = False,
+        engine=None,
+        sync_interval: Optional[float] = None,
+        local_share: Optional[float] = None,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        query = _query_options(uri)
+        self._engine = engine
+        self.sync_interval = float(
+            sync_interval if sync_interval is not None else query.get("sync_interval", 1.0)
+        )
+        self.local_share = float(
+            local_share if local_share is not None else query.get("local_share", 0.1)
+        )
+        self._lock = threading.RLock()
+        # Serializes round trips. Held without _lock, so hits that don't need
+        # a sync never wait behind one that does.
+        self._sync_lock = threading.Lock()
+        self._counters: Dict[str, _Counter] = {}
+        # The first sync waits like any other. Starting from 0.0 made it
+        # due on the first hit whenever the host had been up longer than
+        # sync_interval, i.e. almost always.
+        self._last_sync = time.monotonic()
+        self._last_sweep = time.monotonic()
+        self.syncs = 0  # round trips taken, for the benchmark
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.database import engine
+
+            self._engine = engine
+        return self._engine
+
+    # ── local tallies ──
+
+    def _local(self, key: str, expiry: int, now: float) -> _Counter:
+        counter = self._counters.get(key)
+        if counter is None or counter.expires_at <= now:
+            # New window. Unwritten hits from the old one no longer matter.
+            counter = self._counters[key] = _Counter(expiry=expiry, expires_at=now + expiry)
+        return counter
+
+    def _sync_due(self) -> bool:
+        return time.monotonic() - self._last_sync >= self.sync_interval
+
+    def _hit(self, key: str, expiry: int, amount: int, allowance: int, now: float) -> tuple[_Counter, bool]:
+        """Count a hit locally; also returns whether a sync is due. Called
+        under _lock, so the caller runs the sync after releasing it."""
+        counter = self._local(key, expiry, now)
+        counter.pending += amount
+        counter.dirty = True
+        return counter, counter.pending > allowance or self._sync_due()
+
+    def _read(self, key: str, expiry: int, now: float) -> tuple[_Counter, bool]:
+        counter = self._local(key, expiry, now)
+        counter.dirty = True
+        return counter, not counter.known or self._sync_due()
+
+    def _sync(self, now: float) -> None:
+        """Write every dirty key's unwritten hits in one upsert and read back
+        the shared counts. Call it without _lock held: the batch is taken and
+        the results applied under it, the round trip in between is not."""
+        with self._sync_lock:
+            with self._lock:
+                # Sorted, so concurrent upserts from other workers lock rows in
+                # the same order and can't deadlock.
+                batch = {key: (c, c.pending) for key, c in sorted(self._counters.items()) if c.dirty}
+                self._last_sync = time.monotonic()
+                for c, taken in batch.values():
+                    c.inflight, c.pending, c.dirty = taken, 0, False
+            if not batch:
+                return
+
+            try:
+                rows = self._write(batch)
+            except Exception:
+                with self._lock:
+                    for c, taken in batch.values():
+                        c.pending += taken
+                        c.inflight, c.dirty = 0, True
+                raise
+
+            with self._lock:
+                for key, count, expires_at in rows:
+                    c, _ = batch[key]
+                    # Hits taken during the round trip stay pending.
+                    c.synced, c.inflight, c.known = count, 0, True
+                    c.expires_at = float(expires_at)
+                for key in [k for k, c in self._counters.items() if c.expires_at <= now and not c.dirty]:
+                    del self._counters[key]
+
+    def _write(self, batch: dict) -> list:
+        table = RateLimitCounter.__table__
+        stmt = insert(table).values([
+            {
+                "key": key,
+                "count": taken,
+                "expires_at": func.now() + timedelta(seconds=c.expiry),
+            }
+            for key, (c, taken) in batch.items()
+        ])
+        expired = table.c.expires_at <= func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "count": func.greatest(
+                    case(
+                        (expired, stmt.excluded["count"]),
+                        else_=table.c["count"] + stmt.excluded["count"],
+                    ),
+                    0,
+                ),
+                "expires_at": case((expired, stmt.excluded.expires_at), else_=table.c.expires_at),
+            },
+        ).returning(table.c.key, table.c["count"], func.extract("epoch", table.c.expires_at))
+
+        with self.engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+            if time.monotonic() - self._last_sweep >= SWEEP_INTERVAL_SECONDS:
+                conn.execute(delete(table).where(table.c.expires_at < func.now()))
+                self._last_sweep = time.monotonic()
+        self.syncs += 1
+        return rows
+
+    def flush(self) -> None:
+        """Write all unwritten hits now (shutdown, tests, the benchmark)."""
+        self._sync(time.time())
+
+    # ── fixed window ──
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        allowance = int(_limit_from_key(key) * self.local_share)
+        now = time.time()
+        with self._lock:
+            counter, due = self._hit(key, expiry, amount, allowance, now)
+        if due:
+            self._sync(now)
+        with self._lock:
+            return counter.count
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None and counter.expires_at > time.time():
+                return counter.count
+        table = RateLimitCounter.__table__
+        with self.engine.connect() as conn:
+            count = conn.execute(
+                select(table.c["count"]).where(table.c.key == key, table.c.expires_at > func.now())
+            ).scalar()
+        return count or 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None and counter.known:
+                return counter.expires_at
+        table = RateLimitCounter.__table__
+        with self.engine.connect() as conn:
+            expires_at = conn.execute(
+                select(func.extract("epoch", table.c.expires_at)).where(table.c.key == key)
+            ).scalar()
+        return float(expires_at) if expires_at is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(select(1))
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+        table = RateLimitCounter.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.key == key))
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            self._counters.clear()
+        with self.engine.begin() as conn:
+            return conn.execute(delete(RateLimitCounter.__table__)).rowcount
+
+    # ── sliding window counter ──
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._lock:
+            # The previous window is only read here; a key we've never seen
+            # is fetched by the sync the hit below triggers (or the next one).
+            previous = self._local(previous_key, 2 * expiry, now)
+            previous.dirty = True
+            current = self._local(current_key, 2 * expiry, now)
+
+            def weighted() -> float:
+                previous_ttl, _ = _window_ttls(previous.count, expiry, now)
+                return previous.count * previous_ttl / expiry + current.count
+
+            if floor(weighted()) + amount > limit:
+                return False
+            _, due = self._hit(current_key, 2 * expiry, amount, int(limit * self.local_share), now)
+        if due:
+            self._sync(now)
+        with self._lock:
+            if floor(weighted()) > limit:
+                # Lost a race to another worker: hand the hit back.
+                current.pending -= amount
+                current.dirty = True
+                return False
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._lock:
+            previous, previous_due = self._read(previous_key, 2 * expiry, now)
+            current, current_due = self._read(current_key, 2 * expiry, now)
+        if previous_due or current_due:
+            self._sync(now)
+        with self._lock:
+            previous, current = previous.count, current.count
+        previous_ttl, current_ttl = _window_ttls(previous, expiry, now)
+        return previous, previous_ttl, current, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+
+# ─── Redis protocol ────────────────────────────────────────────────────
+
+
+class RespError(Exception):
+    """An error reply from a Redis-protocol server."""
+
+
+def _encode(command) -> bytes:
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class _RespConnection:
+    def __init__(self, host: str, port: int, db: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if db:
+            self.execute(("SELECT", db))
+
+    def execute(self, *commands) -> list:
+        """Send the commands as one pipeline and return their replies."""
+        self.sock.sendall(b"".join(_encode(c) for c in commands))
+        return [self._read() for _ in commands]
+
+    def _read(self):
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("RESP connection closed mid-reply")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            return None if size < 0 else self.reader.read(size + 2)[:-2]
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise RespError(f"unexpected RESP reply {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate-limit counters on a Redis-protocol server, no client library."""
+
+    STORAGE_SCHEME = ["resp"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        parsed = urllib.parse.urlparse(uri or "resp://localhost:6379")
+        query = _query_options(uri)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.strip("/") or 0)
+        # A limiter that waits on a sick server stalls every request, so give
+        # up fast; slowapi then falls back to per-process counting.
+        self.timeout = float(options.get("timeout", query.get("timeout", 0.25)))
+        self._pool: queue.LifoQueue = queue.LifoQueue(
+            maxsize=int(options.get("pool_size", query.get("pool_size", 16)))
+        )
+
+    @property
+    def base_exceptions(self):
+        return (OSError, RespError)
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = _RespConnection(self.host, self.port, self.db, self.timeout)
+        try:
+            yield conn
+        except BaseException:
+            # Unread replies may be left on the wire; never reuse it.
+            conn.close()
+            raise
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def execute(self, *commands) -> list:
+        """Run commands as one pipeline on a pooled connection. Public so
+        utils/response_cache.py can share the client for its own keys."""
+        with self._connection() as conn:
+            return conn.execute(*commands)
+
+    # ── fixed window ──
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        ms = int(expiry * 1000)
+        with self._connection() as conn:
+            *_, (_, count, ttl) = conn.execute(
+                ("MULTI",),
+                ("SET", key, 0, "PX", ms, "NX"),
+                ("INCRBY", key, amount),
+                ("PTTL", key),
+                ("EXEC",),
+            )
+            if ttl == -1:
+                # The key expired between SET and INCRBY and came back
+                # without a TTL; give it one so it can't pin the limit.
+                conn.execute(("PEXPIRE", key, ms))
+        return count
+
+    def get(self, key: str) -> int:
+        (value,) = self.execute(("GET", key))
+        return int(value or 0)
+
+    def get_expiry(self, key: str) -> float:
+        (ttl,) = self.execute(("PTTL", key))
+        return time.time() + max(ttl, 0) / 1000
+
+    def check(self) -> bool:
+        try:
+            return self.execute(("PING",)) == ["PONG"]
+        except (OSError, RespError):
+            return False
+
+    def clear(self, key: str) -> None:
+        self.execute(("DEL", key))
+
+    def reset(self) -> Optional[int]:
+        # KEYS is O(n) on the server: an admin operation, never per request.
+        (keys,) = self.execute(("KEYS", "LIMITER*"))
+        if not keys:
+            return 0
+        (removed,) = self.execute(("DEL", *keys))
+        return removed
+
+    # ── sliding window counter ──
+
+    def _window(self, previous_key: str, current_key: str, expiry: int, now: float):
+        (values,) = self.execute(("MGET", previous_key, current_key))
+        previous, current = (int(v or 0) for v in values)
+        previous_ttl, current_ttl = _window_ttls(previous, expiry, now)
+        return previous, previous_ttl, current, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous, previous_ttl, current, _ = self._window(previous_key, current_key, expiry, now)
+        if floor(previous * previous_ttl / expiry + current) + amount > limit:
+            return False
+        current = self.incr(current_key, 2 * expiry, amount)
+        if floor(previous * previous_ttl / expiry + current) > limit:
+            # Lost a race to another worker: hand the hit back.
+            self.execute(("DECRBY", current_key, amount))
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._window(previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.execute(("DEL", previous_key, current_key))
@@ -0,0 +1,394 @@
+"""Response cache for the public catalog endpoints.
+
+Species, genes, feeder and plan lists are read on every app launch and
+change a few times a week, yet each request re-ran the query and
+re-serialized hundreds of rows. `ResponseCacheMiddleware` keeps the
+serialized 200 body per (path, query) for a per-route TTL and answers
+repeats from memory, with a content-hash ETag (utils/etag.py) so clients
+that revalidate get a bodiless 304.
+
+Only routes listed in CACHED_ROUTES are touched, and only because every
+one of them returns the same body to every caller — nothing here varies
+by user, so the cache never looks at credentials. Adding a route that
+does would leak one user's response to another. (services/public_profiles.py
+shares the backend for the QR profile pages: it caches only their anonymous
+view, and calls lookup/store itself with one generation group per animal.)
+
+Freshness: each route belongs to a group, and the admin write routes call
+`invalidate(group)` after commit, the same place they already call
+species_resolver.invalidate(). An entry remembers the group generation
+it was built under and is ignored once the generation moves on; a write
+that lands while a miss is being computed bumps the generation first, so
+the in-flight body is stored already stale. The TTL bounds everything
+that doesn't go through an admin route — times_kept ticking up as keepers
+add animals, announcements reaching starts_at/expires_at, plans edited
+in SQL.
+
+Backends (RESPONSE_CACHE_URI):
+
+  memory://            per-process LRU, RESPONSE_CACHE_MAX_BYTES in total.
+                       An invalidation only reaches the worker that took
+                       the write; the others catch up within the TTL.
+  resp://host:6379     any Redis-protocol server, via the client in
+                       utils/rate_limit_storage.py. Entries and generations
+                       are shared, so an invalidation is seen by every
+                       worker on its next request. One MGET per request.
+  (empty)              disabled; every request goes to the route.
+
+A backend error is logged and the request served uncached. Hit/miss and
+byte counters are per process; see `stats()`.
+"""
+import logging
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from anyio import to_thread
+
+from app.config import settings
+from app.utils.etag import etag_for, etag_matches
+
+logger = logging.getLogger(__name__)
+
+_UUID = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+
+
+@dataclass(frozen=True)
+class CachedRoute:
+    group: str
+    pattern: "re.Pattern[str]"
+    ttl: int  # seconds
+
+
+def _route(group: str, path: str, ttl: int) -> CachedRoute:
+    return CachedRoute(group, re.compile("^" + path.replace("{id}", _UUID) + "$"), ttl)
+
+
+CACHED_ROUTES: Tuple[CachedRoute, ...] = (
+    _route("species", "/api/v1/species/", 300),
+    _route("species", "/api/v1/species/{id}", 600),
+    _route("invert_species", "/api/v1/invert-species/", 300),
+    _route("invert_species", "/api/v1/invert-species/{id}", 600),
+    _route("reptile_species", "/api/v1/reptile-species/", 300),
+    _route("reptile_species", "/api/v1/reptile-species/{id}", 600),
+    _route("genes", "/api/v1/genes/", 600),
+    _route("feeder_species", "/api/v1/feeder-species/", 600),
+    # Short: which announcement is active moves with the clock, not a write.
+    _route("announcements", "/api/v1/announcements/active", 60),
+    _route("subscription_plans", "/api/v1/subscriptions/plans", 600),
+)
+
+# Clients may revalidate freely but must not reuse a body without asking:
+# an admin edit should show up on the next load, not after a max-age.
+CACHE_CONTROL = b"public, no-cache"
+
+
+# ─── Backends ──────────────────────────────────────────────────────────
+
+# A stored entry: (generation it was built under, etag, body).
+Entry = Tuple[int, str, bytes]
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, int, str, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, group: str, key: str) -> Tuple[Optional[Entry], int]:
+        with self._lock:
+            generation = self._generations[group]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, generation
+            expires_at, built_under, etag, body = entry
+            if built_under != generation or expires_at <= time.monotonic():
+                self._drop(key)
+                return None, generation
+            self._entries.move_to_end(key)
+            return (built_under, etag, body), generation
+
+    def store(self, group: str, key: str, generation: int, etag: str, body: bytes, ttl: int) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, generation, etag, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, group: str) -> None:
+        with self._lock:
+            self._generations[group] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[3])
+
+
+class RespBackend:
+    """Entries as `<generation>\\n<etag>\\n<body>` strings with a PX expiry,
+    beside one integer generation key per group."""
+
+    blocking = True
+    PREFIX = "respcache:"
+
+    def __init__(self, uri: str):
+        from app.utils.rate_limit_storage import RespError, RespStorage
+
+        self.client = RespStorage(uri)
+        self.errors = (OSError, RespError)
+
+    def _generation_key(self, group: str) -> str:
+        return f"{self.PREFIX}gen:{group}"
+
+    def lookup(self, group: str, key: str) -> Tuple[Optional[Entry], int]:
+        ((generation, raw),) = self.client.execute(
+            ("MGET", self._generation_key(group), self.PREFIX + key)
+        )
+        generation = int(generation or 0)
+        if raw is None:
+            return None, generation
+        built_under, etag, body = raw.split(b"\n", 2)
+        if int(built_under) != generation:
+            return None, generation
+        return (generation, etag.decode(), body), generation
+
+    def store(self, group: str, key: str, generation: int, etag: str, body: bytes, ttl: int) -> None:
+        value = b"%d\n%s\n" % (generation, etag.encode()) + body
+        self.client.execute(("SET", self.PREFIX + key, value, "PX", ttl * 1000))
+
+    def invalidate(self, group: str) -> None:
+        self.client.execute(("INCRBY", self._generation_key(group), 1))
+
+    def clear(self) -> None:
+        (keys,) = self.client.execute(("KEYS", self.PREFIX + "*"))
+        if keys:
+            self.client.execute(("DEL", *keys))
+
+
+def backend_for(uri: str, max_bytes: int):
+    if not uri:
+        return None
+    scheme = urllib.parse.urlparse(uri).scheme
+    if scheme == "memory":
+        return MemoryBackend(max_bytes)
+    if scheme == "resp":
+        return RespBackend(uri)
+    raise ValueError(f"Unsupported RESPONSE_CACHE_URI scheme: {uri!r}")
+
+
+# ─── Cache ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _GroupStats:
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    bytes_from_cache: int = 0  # bodies sent without running the route
+    bytes_not_sent: int = 0    # bodies a 304 let the client keep
+    errors: int = 0
+
+
+class ResponseCache:
+    def __init__(self, backend, routes: Tuple[CachedRoute, ...] = CACHED_ROUTES):
+        self.backend = backend
+        self.routes = routes
+        self._stats: Dict[str, _GroupStats] = defaultdict(_GroupStats)
+
+    def route_for(self, path: str) -> Optional[CachedRoute]:
+        if self.backend is None:
+            return None
+        for route in self.routes:
+            if route.pattern.match(path):
+                return route
+        return None
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await to_thread.run_sync(method, *args)
+        return method(*args)
+
+    async def lookup(
+        self, route: CachedRoute, key: str, group: Optional[str] = None
+    ) -> Tuple[Optional[Entry], Optional[int]]:
+        """`group` overrides the route's generation group — e.g. one per
+        record — while stats stay under the route's."""
+        try:
+            return await self._call(self.backend.lookup, group or route.group, key)
+        except Exception as exc:  # noqa: BLE001 — a cache fault must not fail the request
+            self._stats[route.group].errors += 1
+            logger.warning(f"Response cache lookup failed for {key}: {exc}")
+            return None, None
+
+    async def store(
+        self, route: CachedRoute, key: str, generation: int, etag: str, body: bytes,
+        group: Optional[str] = None,
+    ) -> None:
+        try:
+            await self._call(
+                self.backend.store, group or route.group, key, generation, etag, body, route.ttl
+            )
+        except Exception as exc:  # noqa: BLE001
+            self._stats[route.group].errors += 1
+            logger.warning(f"Response cache store failed for {key}: {exc}")
+
+    def invalidate(self, *groups: str) -> None:
+        if self.backend is None:
+            return
+        for group in groups:
+            try:
+                self.backend.invalidate(group)
+            except Exception as exc:  # noqa: BLE001
+                # The write already committed; the TTL bounds the staleness.
+                # Per-record groups ("profile:<id>") count under their prefix.
+                self._stats[group.partition(":")[0]].errors += 1
+                logger.warning(f"Response cache invalidation failed for {group}: {exc}")
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+        self._stats.clear()
+
+    def record(self, group: str, *, hit: bool, not_modified: bool, size: int) -> None:
+        stats = self._stats[group]
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        if not_modified:
+            stats.not_modified += 1
+            stats.bytes_not_sent += size
+        elif hit:
+            stats.bytes_from_cache += size
+
+    def stats(self) -> dict:
+        def _summary(s: _GroupStats) -> dict:
+            lookups = s.hits + s.misses
+            return {
+                "hits": s.hits,
+                "misses": s.misses,
+                "hit_ratio": round(s.hits / lookups, 4) if lookups else None,
+                "not_modified": s.not_modified,
+                "bytes_from_cache": s.bytes_from_cache,
+                "bytes_not_sent": s.bytes_not_sent,
+                "errors": s.errors,
+            }
+
+        total = _GroupStats()
+        for s in self._stats.values():
+            for field in total.__dataclass_fields__:
+                setattr(total, field, getattr(total, field) + getattr(s, field))
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "total": _summary(total),
+            "groups": {group: _summary(s) for group, s in sorted(self._stats.items())},
+        }
+
+
+response_cache = ResponseCache(
+    backend_for(settings.RESPONSE_CACHE_URI, settings.RESPONSE_CACHE_MAX_BYTES)
+)
+
+
+def invalidate(*groups: str) -> None:
+    """Call after committing a write that changes what a cached route
+    returns."""
+    response_cache.invalidate(*groups)
+
+
+# ─── Middleware ────────────────────────────────────────────────────────
+
+
+def _cache_key(scope) -> str:
+    query = urllib.parse.parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    return scope["path"] + ("?" + urllib.parse.urlencode(sorted(query)) if query else "")
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ResponseCacheMiddleware:
+    """Pure ASGI so a hit never builds a Request or enters the router."""
+
+    def __init__(self, app, cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        cache = self.cache or response_cache
+        route = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            route = cache.route_for(scope["path"])
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = _cache_key(scope)
+        if_none_match = _header(scope, b"if-none-match")
+        entry, generation = await cache.lookup(route, key)
+        if entry is not None:
+            _, etag, body = entry
+            await self._respond(send, cache, route, etag, body, if_none_match, hit=True)
+            return
+
+        start: dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        if start.get("status") != 200:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = etag_for(body)
+        if generation is not None:
+            await cache.store(route, key, generation, etag, body)
+        await self._respond(send, cache, route, etag, body, if_none_match, hit=False)
+
+    @staticmethod
+    async def _respond(send, cache, route, etag, body, if_none_match, *, hit):
+        not_modified = etag_matches(if_none_match, etag)
+        cache.record(route.group, hit=hit, not_modified=not_modified, size=len(body))
+        headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", CACHE_CONTROL),
+            (b"x-cache", b"HIT" if hit else b"MISS"),
+        ]
+        if not_modified:
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
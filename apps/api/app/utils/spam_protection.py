@@ -6,12 +6,30 @@ Implements multiple layers of protection:
 2. Account requirements - Verified email + account age
 3. Honeypot fields - Catch automated bots
 4. Content filtering - Block spam patterns
+
+Rate limiting used to run two COUNT(*) queries (threads + posts) on every
+post attempt. Each worker now keeps a small sliding window of each active
+author's recent post times: seeded from the database with one query, fed by
+`record_post()` when the forum routes commit, and re-seeded every
+RATE_LIMIT_RECONCILE_SECONDS so posts made through other workers are picked
+up. The posts themselves stay the source of truth, so a restart loses
+nothing.
+
+Content filtering: the repeated-character rule is one compiled pattern
+instead of a per-character Python loop. The keyword check stays a loop of
+`in` tests — CPython's substring search beats a single-pass alternation
+(or an Aho–Corasick automaton in Python) for a list this size — but over a
+list lowercased once, not per call. benchmarks/spam_filter.py has numbers.
 """
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Deque, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select, union_all
 import re
+import threading
+import time
 
 from app.models.user import User
 from app.models.forum import ForumThread, ForumPost
@@ -26,6 +44,12 @@ RATE_LIMIT_POSTS_PER_HOUR = 10  # Max posts per hour for established users
 RATE_LIMIT_NEW_USER_POSTS_PER_HOUR = 5  # Max posts per hour for new users
 NEW_USER_THRESHOLD_DAYS = 7  # Users under this age are "new"
 
+# Per-worker author windows: re-read from the database at least this often
+# (bounds how long another worker's posts go unseen), and at most this many
+# authors kept.
+RATE_LIMIT_RECONCILE_SECONDS = 60
+RATE_LIMIT_MAX_TRACKED_AUTHORS = 10_000
+
 # Account requirements
 MIN_ACCOUNT_AGE_HOURS = 24  # Account must be at least 24 hours old to post
 
@@ -46,6 +70,8 @@ SPAM_KEYWORDS = [
 
 # Repeated character detection (e.g., "hellooooooo" or "!!!!!!")
 REPEATED_CHAR_THRESHOLD = 5  # Same char repeated more than this is suspicious
+# Unrolled — `(.)\1\1\1\1\1` — rather than `(.)\1{5,}`: twice as fast on long posts.
+REPEATED_CHAR_PATTERN = re.compile("(.)" + r"\1" * REPEATED_CHAR_THRESHOLD, re.DOTALL)
 
 # URL patterns
 URL_PATTERN = re.compile(
@@ -57,6 +83,79 @@ URL_PATTERN = re.compile(
 # Rate Limiting
 # ============================================================================
 
+# Only "has the author hit their limit" matters, so no window ever needs
+# more than the larger limit's worth of timestamps.
+_MAX_POSTS_TRACKED = max(RATE_LIMIT_POSTS_PER_HOUR, RATE_LIMIT_NEW_USER_POSTS_PER_HOUR)
+
+
+class _AuthorWindow:
+    """One author's most recent post times, newest last."""
+
+    __slots__ = ("window", "seeded_at", "times")
+
+    def __init__(self, window: timedelta, times):
+        self.window = window
+        self.seeded_at = time.monotonic()
+        self.times: Deque[datetime] = deque(times, maxlen=_MAX_POSTS_TRACKED)
+
+
+_author_windows: "OrderedDict[str, _AuthorWindow]" = OrderedDict()
+_author_windows_lock = threading.Lock()
+
+
+def _seed_author_window(db: Session, user_id, window: timedelta, now: datetime) -> _AuthorWindow:
+    """The author's newest threads and posts inside the window — one
+    index-backed query, oldest first."""
+    window_start = now - window
+    stamps = union_all(
+        select(ForumThread.created_at.label("created_at")).where(
+            ForumThread.author_id == user_id,
+            ForumThread.created_at >= window_start,
+        ),
+        select(ForumPost.created_at.label("created_at")).where(
+            ForumPost.author_id == user_id,
+            ForumPost.created_at >= window_start,
+        ),
+    ).subquery()
+    newest = db.execute(
+        select(stamps.c.created_at)
+        .order_by(stamps.c.created_at.desc())
+        .limit(_MAX_POSTS_TRACKED)
+    ).scalars().all()
+    return _AuthorWindow(window, [t.replace(tzinfo=timezone.utc) for t in reversed(newest)])
+
+
+def _recent_post_times(db: Session, user_id, window: timedelta, now: datetime) -> Deque[datetime]:
+    key = str(user_id)
+    with _author_windows_lock:
+        entry = _author_windows.get(key)
+        if (
+            entry is None
+            or entry.window != window
+            or time.monotonic() - entry.seeded_at > RATE_LIMIT_RECONCILE_SECONDS
+        ):
+            entry = _author_windows[key] = _seed_author_window(db, user_id, window, now)
+        _author_windows.move_to_end(key)
+        while len(_author_windows) > RATE_LIMIT_MAX_TRACKED_AUTHORS:
+            _author_windows.popitem(last=False)
+        return entry.times
+
+
+def record_post(user_id, count: int = 1) -> None:
+    """Count a committed thread or post against the author's window.
+
+    A new thread is `count=2` — it writes the thread and its first post, and
+    the rate limit has always counted both rows. Authors with no window yet
+    are skipped: their first check seeds it from the database, which already
+    has the new rows.
+    """
+    now = datetime.now(timezone.utc)
+    with _author_windows_lock:
+        entry = _author_windows.get(str(user_id))
+        if entry is not None:
+            entry.times.extend([now] * count)
+
+
 def check_rate_limit(
     db: Session,
     user: User,
@@ -73,28 +172,20 @@ def check_rate_limit(
         return True, None
 
     # Determine if user is "new"
-    account_age = datetime.now(timezone.utc) - user.created_at.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    account_age = now - user.created_at.replace(tzinfo=timezone.utc)
     is_new_user = account_age < timedelta(days=NEW_USER_THRESHOLD_DAYS)
 
     # Set appropriate limit
     max_posts = RATE_LIMIT_NEW_USER_POSTS_PER_HOUR if is_new_user else RATE_LIMIT_POSTS_PER_HOUR
 
-    # Count posts in the last hour
-    window_start = datetime.now(timezone.utc) - timedelta(hours=window_hours)
-
-    # Count threads created
-    thread_count = db.query(func.count(ForumThread.id)).filter(
-        ForumThread.author_id == user.id,
-        ForumThread.created_at >= window_start
-    ).scalar() or 0
-
-    # Count posts created
-    post_count = db.query(func.count(ForumPost.id)).filter(
-        ForumPost.author_id == user.id,
-        ForumPost.created_at >= window_start
-    ).scalar() or 0
-
-    total_posts = thread_count + post_count
+    # Threads + posts in the window, from this worker's view of the author
+    window = timedelta(hours=window_hours)
+    window_start = now - window
+    total_posts = sum(
+        1 for created_at in _recent_post_times(db, user.id, window, now)
+        if created_at >= window_start
+    )
 
     if total_posts >= max_posts:
         return False, f"Rate limit exceeded. You can post up to {max_posts} times per hour. Please wait before posting again."
@@ -188,9 +279,8 @@ def check_content(content: str, title: Optional[str] = None) -> Tuple[bool, Opti
         return False, f"Too many links in your post. Maximum {SPAM_LINK_THRESHOLD} links allowed."
 
     # Check for spam keywords
-    for keyword in SPAM_KEYWORDS:
-        if keyword.lower() in full_text_lower:
-            return False, "Your post was flagged as potential spam. If you believe this is an error, please contact support."
+    if any(keyword in full_text_lower for keyword in _lowered_keywords(tuple(SPAM_KEYWORDS))):
+        return False, "Your post was flagged as potential spam. If you believe this is an error, please contact support."
 
     # Check for repeated characters (like "hellooooooo" or "!!!!!!!!")
     if has_excessive_repeated_chars(full_text):
@@ -206,24 +296,18 @@ def check_content(content: str, title: Optional[str] = None) -> Tuple[bool, Opti
     return True, None
 
 
+@lru_cache(maxsize=4)
+def _lowered_keywords(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """SPAM_KEYWORDS lowercased and deduplicated, once per version of the
+    list, so edits to it still take effect."""
+    return tuple(dict.fromkeys(k.lower() for k in keywords if k))
+
+
 def has_excessive_repeated_chars(text: str) -> bool:
     """Check if text contains excessive repeated characters."""
     if not text:
         return False
-
-    count = 1
-    prev_char = None
-
-    for char in text:
-        if char == prev_char:
-            count += 1
-            if count > REPEATED_CHAR_THRESHOLD:
-                return True
-        else:
-            count = 1
-        prev_char = char
-
-    return False
+    return REPEATED_CHAR_PATTERN.search(text) is not None
 
 
 # ============================================================================
@@ -0,0 +1,135 @@
+"""Cold-start timing and deferred router registration (app/main.py).
+
+The container sleeps when idle and is woken by the warmup ping or the first
+real request, so the time from process start to first byte is user-visible.
+Most of it is importing the router modules, which pull in nearly every model
+and schema.
+
+`StartupTimer` records how long each phase of building the app took and logs
+one `startup phase=<name> ms=<n>` line per phase, then a summary with the
+slowest router imports. The same numbers are on `app.state.startup` and in
+`/health`. `python -m benchmarks.cold_start` tracks the import side of it.
+
+With `DEFER_ROUTERS` set, the routers are imported and registered on a
+background thread instead, so the server binds and `/` and `/health` answer
+while they load. Any other request waits for registration to finish
+(`RouterGate`); a failure there turns into a 500 on every such request and is
+logged once. Off by default, so tests and local runs get import errors at
+startup rather than on a thread.
+"""
+import importlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import anyio
+
+logger = logging.getLogger("app.startup")
+
+# Paths answered before deferred routers are in: the warmup ping and uptime
+# monitors.
+ALWAYS_READY = frozenset({"/", "/health"})
+
+# Imported on first use, never at startup: Stripe (checkout, billing portal,
+# webhook), the App Store server library (Apple notifications) and openpyxl
+# (spreadsheet imports). Checked by tests/test_startup.py and the benchmark.
+LAZY_MODULES = ("stripe", "appstoreserverlibrary", "openpyxl")
+
+
+class RouterSpec(NamedTuple):
+    """One `include_router` call: module under app.routers, prefix, tags."""
+    module: str
+    prefix: str = ""
+    tags: Tuple[str, ...] = ()
+    attr: str = "router"
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.imports: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + ms
+            logger.info("startup phase=%s ms=%.1f", name, ms)
+
+    def slowest_imports(self, n: int = 5) -> List[Tuple[str, float]]:
+        return sorted(self.imports.items(), key=lambda item: -item[1])[:n]
+
+    def finish(self, routes: int) -> None:
+        slowest = ",".join(f"{name}:{ms:.0f}" for name, ms in self.slowest_imports())
+        logger.info(
+            "startup done ms=%.1f routes=%d slowest_routers=%s",
+            self.total_ms(), routes, slowest,
+        )
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> dict:
+        return {
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "slowest_routers_ms": {name: round(ms, 1) for name, ms in self.slowest_imports()},
+        }
+
+
+def include_routers(app, specs: Sequence[RouterSpec], timer: StartupTimer) -> None:
+    """Import and register `specs` in order. Order matters: it is the
+    order routes are matched in."""
+    for spec in specs:
+        start = time.perf_counter()
+        module = importlib.import_module(f"app.routers.{spec.module}")
+        timer.imports[spec.module] = timer.imports.get(spec.module, 0.0) + (
+            time.perf_counter() - start
+        ) * 1000
+        app.include_router(getattr(module, spec.attr), prefix=spec.prefix, tags=list(spec.tags))
+
+
+class DeferredRouters:
+    """Runs `register` on a daemon thread; `wait()` until it has finished."""
+
+    def __init__(self, register: Callable[[], None]):
+        self._register = register
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="deferred-routers", daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            self._register()
+        except BaseException as exc:  # noqa: BLE001 — surfaced by wait()
+            self.error = exc
+            logger.exception("startup deferred router registration failed")
+        finally:
+            self.ready.set()
+
+    async def wait(self) -> None:
+        if not self.ready.is_set():
+            await anyio.to_thread.run_sync(self.ready.wait)
+        if self.error is not None:
+            raise RuntimeError("router registration failed") from self.error
+
+
+class RouterGate:
+    """ASGI middleware holding requests until deferred routers are in.
+    Added last, so it wraps the other middleware too."""
+
+    def __init__(self, app, deferred: DeferredRouters):
+        self.app = app
+        self.deferred = deferred
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and scope["path"] not in ALWAYS_READY:
+            await self.deferred.wait()
+        await self.app(scope, receive, send)
@@ -0,0 +1,69 @@
+"""
+Admin analytics — backfill the daily rollups and retention cohorts.
+
+Run on the Render shell after the ard_20261019 migration deploys, and again
+any time history needs recomputing (say, after a bulk import of old logs):
+    cd apps/api && python3 backfill_analytics_rollups.py
+    cd apps/api && python3 backfill_analytics_rollups.py --since 2025-01-01 --chunk-days 60
+
+Without --since it starts at the first user's signup day. Days are written in
+chunks, one commit each, so a long history doesn't hold one huge transaction
+(or the dashboard's rollup lock) for the whole run.
+
+Idempotent: each chunk replaces its days' rows wholesale, so re-running — or
+running while admins load the dashboard — is safe. Cohorts are recomputed for
+every signup month in the range.
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services import analytics_rollups
+
+
+def backfill(since: date | None, until: date, chunk_days: int) -> None:
+    db = SessionLocal()
+    try:
+        if since is None:
+            first_signup = db.query(func.min(User.created_at)).scalar()
+            if first_signup is None:
+                print("No users yet — nothing to roll up.")
+                return
+            since = first_signup.astimezone(timezone.utc).date()
+
+        rows = 0
+        chunk_start = since
+        while chunk_start <= until:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), until)
+            written = analytics_rollups.refresh_days(db, chunk_start, chunk_end)
+            rows += written
+            print(f"  {chunk_start} → {chunk_end}: {written} rows")
+            chunk_start = chunk_end + timedelta(days=1)
+
+        months = []
+        month = analytics_rollups.month_start(until)
+        while month >= analytics_rollups.month_start(since):
+            months.append(month)
+            month = analytics_rollups.month_start(month, 1)
+        cohorts = analytics_rollups.refresh_cohorts(db, months)
+
+        print(f"\nRolled up {since} → {until}: {rows} rows, {cohorts} cohorts.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="First day (YYYY-MM-DD). Default: first signup.")
+    parser.add_argument("--until", type=date.fromisoformat, default=analytics_rollups.utc_today(),
+                        help="Last day (YYYY-MM-DD). Default: today (UTC).")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Days per transaction.")
+    args = parser.parse_args()
+    backfill(args.since, args.until, max(1, args.chunk_days))
@@ -0,0 +1,6 @@
+"""Standalone micro/macro benchmarks for the API.
+
+Not collected by pytest. Run from apps/api, e.g.:
+
+    python -m benchmarks.morph_genetics
+"""
@@ -0,0 +1,93 @@
+"""Bulk husbandry log writes — ORM per-row vs multi-row INSERT.
+
+Writes 500, 1k and 10k feeding logs against one invert per row, two ways.
+500 is the per-request cap on every bulk endpoint; insert_rows itself has
+no cap, and 10k is where its INSERT_CHUNK chunking actually runs.
+
+  orm     — one FeedingLog object per row, one flush. What Feeding Day did
+            before services/bulk_logs.py.
+  insert  — bulk_logs.insert_rows: chunked multi-row
+            INSERT ... VALUES ... RETURNING id.
+
+Each run is inside a transaction that is rolled back, so the benchmark can
+point at a scratch database without leaving anything behind. The derived
+pause-clearing UPDATE is timed alongside since it scales with the same
+id set.
+
+Usage (from apps/api, needs Postgres):
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.bulk_logs
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 — registers every mapper the FKs point at
+from app.models.feeding_log import FeedingLog
+from app.models.invert import Invert
+from app.models.user import User
+from app.services import bulk_logs
+
+
+def _seed(db, n: int):
+    user = User(
+        id=uuid.uuid4(),
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        username=f"bench_{uuid.uuid4().hex[:8]}",
+    )
+    db.add(user)
+    db.flush()
+    rows = [
+        {"id": uuid.uuid4(), "user_id": user.id, "taxon": "tarantula",
+         "name": f"T{i}", "feeding_paused_reason": "premolt" if i % 10 == 0 else None}
+        for i in range(n)
+    ]
+    return bulk_logs.insert_rows(db, Invert, rows)
+
+
+def _rows(ids, fed_at):
+    return [{"invert_id": i, "fed_at": fed_at, "food_type": "cricket"} for i in ids]
+
+
+def _time(Session, n: int, mode: str) -> float:
+    db = Session()
+    try:
+        ids = _seed(db, n)
+        fed_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        if mode == "orm":
+            for row in _rows(ids, fed_at):
+                db.add(FeedingLog(**row))
+            db.flush()
+        else:
+            bulk_logs.insert_rows(db, FeedingLog, _rows(ids, fed_at))
+        bulk_logs.resume_paused(db, Invert, ids)
+        return time.perf_counter() - start
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main() -> None:
+    url = os.environ.get("TEST_DATABASE_URL") or os.environ.get("DATABASE_URL")
+    if not url:
+        sys.exit("set TEST_DATABASE_URL (or DATABASE_URL) to a scratch Postgres")
+    Session = sessionmaker(bind=create_engine(url))
+    for n in (500, 1_000, 10_000):
+        results = {mode: _time(Session, n, mode) for mode in ("orm", "insert")}
+        base = results["orm"]
+        print(
+            f"{n:>6} rows | "
+            + " | ".join(
+                f"{mode}: {t * 1000:8.1f} ms ({base / t:4.1f}x)"
+                for mode, t in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
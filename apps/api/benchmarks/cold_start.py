@@ -0,0 +1,111 @@
+"""Cold start: import time of app.main, and time to first response.
+
+Each run is a fresh interpreter, as after the container wakes. Reports:
+
+  import app.main     `python -X importtime` total, median over the runs
+  by package          where that time goes, summed self time per top-level
+                      package (app, fastapi, sqlalchemy, …)
+  first response      process start → `GET /` answered, with the routers
+                      registered eagerly and with DEFER_ROUTERS
+
+and fails (exit 1) if a module that should stay lazy was imported, or the
+median import time is over --budget-ms.
+
+Usage (from apps/api):
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 5 --budget-ms 4000
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from app.utils.startup import LAZY_MODULES
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+FIRST_RESPONSE = """
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.get("/").status_code == 200
+    print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _python(args, env_extra=None):
+    env = {**os.environ, **(env_extra or {})}
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def _importtime():
+    """(total µs for app.main, {module: self µs}) from one fresh import."""
+    result = _python(["-X", "importtime", "-c", "import app.main"])
+    total, self_us = 0, {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, _, module = match.groups()
+        self_us[module] = int(own)
+        if module == "app.main":
+            total = int(cumulative)
+    return total, self_us
+
+
+def _first_response_ms(defer: bool) -> float:
+    result = _python(["-c", FIRST_RESPONSE], {"DEFER_ROUTERS": "true" if defer else "false"})
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, by_package = [], defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        total, self_us = _importtime()
+        totals.append(total / 1000)
+        packages = defaultdict(int)
+        for module, us in self_us.items():
+            packages[module.split(".")[0]] += us
+        for package, us in packages.items():
+            by_package[package].append(us / 1000)
+        imported.update(module.split(".")[0] for module in self_us)
+
+    median = statistics.median(totals)
+    print(f"import app.main     {median:8.1f} ms  (median of {args.runs})")
+    print("by package (self time):")
+    ranked = sorted(by_package.items(), key=lambda item: -statistics.median(item[1]))
+    for package, samples in ranked[: args.top]:
+        print(f"  {package:<28} {statistics.median(samples):8.1f} ms")
+
+    for defer in (False, True):
+        samples = [_first_response_ms(defer) for _ in range(args.runs)]
+        label = "deferred routers" if defer else "eager routers"
+        print(f"first response ({label:<16}) {statistics.median(samples):8.1f} ms")
+
+    failed = False
+    eager = sorted(imported.intersection(LAZY_MODULES))
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: import time {median:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Forward dual-write overhead — legacy edits mirrored to `inverts`.
+
+Edits one column of a tarantula and commits, mirrored three ways:
+
+  none    — the legacy write alone, no mirror. The floor.
+  before  — what mirror_tarantula_update did before the write queue: SELECT
+            the mirror row, setattr every mirrored field onto it, and let the
+            flush UPDATE it.
+  queued  — services/inverts_dualwrite.py now: the mirror is queued and
+            written after the flush as one upsert of the changed columns.
+
+Two shapes: one edit per commit (a PUT /tarantulas/{id}), and 200 edits in a
+single commit (an import or a bulk move). Reported per edit: wall time,
+overhead over `none`, and statements issued.
+
+Everything runs inside an outer transaction that is rolled back, with each
+commit a SAVEPOINT (the test suite's pattern), so the benchmark can point at
+a scratch database without leaving anything behind.
+
+Usage (from apps/api, needs Postgres):
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.dualwrite
+"""
+import os
+import sys
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 — registers every mapper the FKs point at
+from app.models.invert import Invert
+from app.models.tarantula import Tarantula
+from app.models.user import User
+from app.services import inverts_dualwrite
+from app.utils import query_stats
+
+ANIMALS = 200
+ROUNDS = 5
+
+
+def _mirror_before(db, t) -> None:
+    """mirror_tarantula_update as it was before the write queue."""
+    invert = db.query(Invert).filter(Invert.id == t.id).first()
+    fields = inverts_dualwrite._tarantula_to_invert_kwargs(t)
+    if invert is None:
+        db.add(Invert(**fields))
+        return
+    for k, v in fields.items():
+        if k in inverts_dualwrite._IMMUTABLE or k in inverts_dualwrite._INVERT_OWNED_TARANTULA:
+            continue
+        setattr(invert, k, v)
+
+
+MIRRORS = {
+    "none": lambda db, t: None,
+    "before": _mirror_before,
+    "queued": inverts_dualwrite.mirror_tarantula_update,
+}
+
+
+def _seed(db):
+    user = User(
+        id=uuid.uuid4(),
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        username=f"bench_{uuid.uuid4().hex[:8]}",
+    )
+    db.add(user)
+    db.flush()
+    animals = [Tarantula(id=uuid.uuid4(), user_id=user.id, name=f"T{i}", notes="") for i in range(ANIMALS)]
+    db.add_all(animals)
+    db.add_all(Invert(id=t.id, user_id=user.id, taxon="tarantula", name=t.name, notes="") for t in animals)
+    db.commit()
+    return [t.id for t in animals]
+
+
+def _edit(db, ids, mirror, tag: str, per_commit: int) -> None:
+    for start in range(0, len(ids), per_commit):
+        for t in db.query(Tarantula).filter(Tarantula.id.in_(ids[start:start + per_commit])):
+            t.notes = tag
+            mirror(db, t)
+        db.commit()
+
+
+def _time(engine, mode: str, per_commit: int):
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")()
+    try:
+        ids = _seed(db)
+        best, statements = float("inf"), 0
+        for round_ in range(ROUNDS):
+            with query_stats.capture() as stats:
+                start = time.perf_counter()
+                _edit(db, ids, MIRRORS[mode], f"{mode}-{round_}", per_commit)
+                best = min(best, time.perf_counter() - start)
+            statements = len([s for s in stats.statements if "SAVEPOINT" not in s])
+        return best / len(ids), statements / len(ids)
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+def main() -> None:
+    url = os.environ.get("TEST_DATABASE_URL") or os.environ.get("DATABASE_URL")
+    if not url:
+        sys.exit("set TEST_DATABASE_URL (or DATABASE_URL) to a scratch Postgres")
+    engine = create_engine(url)
+    query_stats.install()
+    for label, per_commit in (("1 edit per commit", 1), (f"{ANIMALS} edits per commit", ANIMALS)):
+        print(label)
+        results = {mode: _time(engine, mode, per_commit) for mode in MIRRORS}
+        floor = results["none"][0]
+        for mode, (seconds, statements) in results.items():
+            print(
+                f"  {mode:<7} {seconds * 1e3:7.3f} ms/edit   "
+                f"overhead {(seconds - floor) * 1e3:7.3f} ms   {statements:5.2f} statements/edit"
+            )
+
+
+if __name__ == "__main__":
+    main()
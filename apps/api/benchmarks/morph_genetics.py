@@ -0,0 +1,88 @@
+"""Morph genetics engine benchmark — 10 and 20 loci.
+
+Two shapes per locus count:
+
+  single  — one pairing, cold caches. The worst case for the fold.
+  batch   — every male × female pairing for a 10 × 20 breeding group
+            sharing a gene catalog, the shape /reptile-pairings/candidates
+            sees. Shows what the memoized sub-folds buy.
+
+Usage (from apps/api):
+    python -m benchmarks.morph_genetics
+"""
+import random
+import time
+
+from app.services import morph_genetics
+from app.services.morph_genetics import GeneInfo, build_loci, predict_pairing
+
+_ZYGOSITIES = (None, None, "het", "visual", "poss_het", "super")
+
+
+def _catalog(n: int):
+    rng = random.Random(n)
+    types = ("recessive", "recessive", "codominant", "dominant")
+    return [
+        GeneInfo(
+            gene_id=f"g{i}",
+            name=f"Gene{i:02d}",
+            gene_type=rng.choice(types),
+            lethal_homozygous=rng.random() < 0.1,
+            welfare_flag="neurological" if rng.random() < 0.1 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def _animal(genes, rng):
+    passes = {}
+    for g in genes:
+        z = rng.choice(_ZYGOSITIES)
+        if z == "super" and g.gene_type == "recessive":
+            z = "visual"
+        p = morph_genetics.allele_pass_probability(z, g.gene_type, 66)
+        if p:
+            passes[g.gene_id] = p
+    return passes
+
+
+def _clear_caches():
+    morph_genetics._fold.cache_clear()
+    morph_genetics._locus_outcomes.cache_clear()
+    morph_genetics.punnett_from_pass.cache_clear()
+
+
+def bench(n_loci: int, males: int = 10, females: int = 20) -> None:
+    genes = _catalog(n_loci)
+    rng = random.Random(1000 + n_loci)
+
+    # Single pairing, every locus segregating (both parents het) — the
+    # flattest, most expensive distribution for a given locus count.
+    het = {g.gene_id: 0.5 for g in genes}
+    _clear_caches()
+    start = time.perf_counter()
+    prediction = predict_pairing(build_loci(genes, het, het))
+    single_ms = (time.perf_counter() - start) * 1000
+
+    male_passes = [_animal(genes, rng) for _ in range(males)]
+    female_passes = [_animal(genes, rng) for _ in range(females)]
+    _clear_caches()
+    start = time.perf_counter()
+    for m in male_passes:
+        for f in female_passes:
+            predict_pairing(build_loci(genes, m, f), max_outcomes=5)
+    batch_s = time.perf_counter() - start
+    pairs = males * females
+    hits = morph_genetics._fold.cache_info().hits
+
+    print(
+        f"{n_loci:>2} loci | single het×het: {single_ms:8.1f} ms "
+        f"({len(prediction.outcomes)} shown, pruned {prediction.pruned_probability:.3f}) | "
+        f"batch {pairs} pairs: {batch_s * 1000:8.1f} ms "
+        f"({batch_s / pairs * 1000:.2f} ms/pair, {hits} fold cache hits)"
+    )
+
+
+if __name__ == "__main__":
+    for n in (10, 20):
+        bench(n)
@@ -0,0 +1,98 @@
+"""Rate limiter overhead per request, by storage backend.
+
+Times what a rate-limited route pays before its handler runs: the key
+function, then one `hit()` against the storage. Backends:
+
+  memory               per-process counts (the old behaviour; not shared)
+  resp                 Redis protocol over a local socket (tests/resp_standin.py)
+  database:write       Postgres, every hit written through (local_share=0)
+  database:batched     Postgres with the default batching (1s / 10% share)
+
+Keys are spread over 50 users so the batched backend is measured on a
+realistic mix of hot and cold keys, not one counter.
+
+Usage (from apps/api; the database rows need Postgres):
+    python -m benchmarks.rate_limit
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.rate_limit
+"""
+import os
+import statistics
+import time
+import uuid
+
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+from starlette.requests import Request
+
+from app.utils.auth import create_access_token
+from app.utils.rate_limit import _token_subject, rate_limit_key
+from app.utils.rate_limit_storage import DatabaseStorage, RespStorage
+from tests.resp_standin import RespStandin
+
+HITS = 5000
+USERS = 50
+LIMIT = parse("200/minute")
+
+
+def _per_hit_us(fn, n: int = HITS) -> tuple[float, float]:
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples) * 1e6, samples[int(n * 0.99)] * 1e6
+
+
+def _bench_storage(name: str, storage) -> None:
+    limiter = FixedWindowRateLimiter(storage)
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    mean, p99 = _per_hit_us(lambda i: limiter.hit(LIMIT, prefix, f"user:{i % USERS}"))
+    extra = f"  ({storage.syncs} round trips)" if hasattr(storage, "syncs") else ""
+    print(f"  {name:<20} mean {mean:8.1f} µs   p99 {p99:8.1f} µs{extra}")
+
+
+def _bench_key_func() -> None:
+    tokens = [create_access_token(data={"sub": str(uuid.uuid4())}) for _ in range(USERS)]
+    requests = [
+        Request({
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {t}".encode())],
+            "client": ("203.0.113.7", 50000),
+        })
+        for t in tokens
+    ]
+    _token_subject.cache_clear()
+    mean, _ = _per_hit_us(lambda i: rate_limit_key(requests[i]), n=USERS)
+    print(f"  {'key (cold token)':<20} mean {mean:8.1f} µs")
+    mean, p99 = _per_hit_us(lambda i: rate_limit_key(requests[i % USERS]))
+    print(f"  {'key (cached token)':<20} mean {mean:8.1f} µs   p99 {p99:8.1f} µs")
+
+
+def main() -> None:
+    print(f"{HITS} hits of {LIMIT} over {USERS} users")
+    _bench_key_func()
+    _bench_storage("memory", MemoryStorage())
+    with RespStandin() as server:
+        _bench_storage("resp", RespStorage(server.uri))
+
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        print("  (set TEST_DATABASE_URL for the database:// rows)")
+        return
+    from sqlalchemy import create_engine, delete
+
+    from app.models.rate_limit_counter import RateLimitCounter
+
+    engine = create_engine(url)
+    try:
+        _bench_storage("database:write", DatabaseStorage("database://", engine=engine, local_share=0))
+        _bench_storage("database:batched", DatabaseStorage("database://", engine=engine))
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(RateLimitCounter).where(RateLimitCounter.key.like("LIMITER/bench-%")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Realtime hub capacity: connections held and events delivered per second.
+
+Connections are hub subscriptions on one event loop — the part of a
+socket this code owns; the socket itself is uvicorn's. Measured:
+
+  connections     memory per subscription and time to subscribe N users
+  memory://       events/s from a publishing thread to the subscribers'
+                  queues, and the publish → dequeue latency
+  database://     the same through Postgres NOTIFY and the listener thread
+
+For scale: each connection replaces a poll of two unread-count endpoints,
+about one a minute per open app, so 10k connections stand in for ~330
+requests and COUNT queries a second.
+
+Usage (from apps/api; the database:// row needs Postgres):
+    python -m benchmarks.realtime
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.realtime
+"""
+import asyncio
+import os
+import statistics
+import time
+import tracemalloc
+
+from app.services.realtime import DatabaseBroker, Hub, MemoryBroker
+
+CONNECTIONS = 10_000
+EVENTS = 20_000
+DATABASE_EVENTS = 2_000
+
+
+async def _connections(n: int) -> None:
+    hub = Hub()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    subscriptions = [hub.subscribe(f"user-{i}") for i in range(n)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"  connections     {len(subscriptions):>6}   {size / n / 1024:6.2f} KiB each   "
+          f"subscribe {elapsed / n * 1e6:6.2f} µs each")
+
+
+async def _rate(name: str, broker, hub: Hub, events: int, users: int) -> None:
+    subscriptions = [hub.subscribe(f"user-{i}") for i in range(users)]
+    latencies = []
+
+    async def drain(subscription, expected):
+        for _ in range(expected):
+            event = await subscription.get()
+            latencies.append(time.perf_counter() - event["at"])
+
+    def publish():
+        for i in range(events):
+            broker.publish(f"user-{i % users}", {"type": "ping", "at": time.perf_counter()})
+
+    per_user = events // users
+    start = time.perf_counter()
+    drains = [asyncio.create_task(drain(s, per_user)) for s in subscriptions]
+    await asyncio.to_thread(publish)
+    await asyncio.gather(*drains)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"  {name:<14}  {events / elapsed:9.0f} events/s   "
+          f"latency p50 {statistics.median(latencies) * 1e3:7.3f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.3f} ms")
+    for subscription in subscriptions:
+        hub.unsubscribe(subscription)
+
+
+async def main() -> None:
+    print(f"{CONNECTIONS} connections; {EVENTS} events over 50 users")
+    await _connections(CONNECTIONS)
+    hub = Hub()
+    await _rate("memory://", MemoryBroker(hub), hub, EVENTS, 50)
+
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        print("  (set TEST_DATABASE_URL for the database:// row)")
+        return
+    from sqlalchemy import create_engine
+
+    hub = Hub()
+    broker = DatabaseBroker(hub, engine=create_engine(url), poll_timeout=0.1)
+    broker.start()
+    try:
+        await asyncio.to_thread(broker.listening.wait, 10)
+        await _rate("database://", broker, hub, DATABASE_EVENTS, 50)
+    finally:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""Forum content filter on long posts — matcher choices, old vs current.
+
+Times the parts of check_content that scale with post length, on clean
+posts (the worst case: nothing matches, so every keyword scans everything):
+
+  keywords  the old loop (lowercasing each keyword per call), the current
+            loop over the pre-lowered list, and the two single-pass
+            alternatives considered: one alternation regex and a
+            prefix-trie regex. Pure-Python Aho–Corasick is no faster than
+            the per-character loop below, so it isn't timed.
+  repeats   the old per-character Python loop vs REPEATED_CHAR_PATTERN
+
+then check_content end to end. Pure Python; no database needed.
+
+Usage (from apps/api):
+    python -m benchmarks.spam_filter
+"""
+import random
+import re
+import time
+
+from app.utils import spam_protection
+
+SIZES = (1_000, 10_000, 100_000)
+WORDS = (
+    "substrate humidity molt premolt enclosure cork bark water dish sling "
+    "juvenile adult female male burrow webbing hide cricket roach dubia "
+    "temperature ventilation rehouse feeding refused accepted"
+).split()
+
+
+def _post(size: int) -> str:
+    rng = random.Random(size)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _old_keywords(text: str) -> bool:
+    lower = text.lower()
+    for keyword in spam_protection.SPAM_KEYWORDS:
+        if keyword.lower() in lower:
+            return True
+    return False
+
+
+def _new_keywords(text: str) -> bool:
+    lower = text.lower()
+    keywords = spam_protection._lowered_keywords(tuple(spam_protection.SPAM_KEYWORDS))
+    return any(keyword in lower for keyword in keywords)
+
+
+def _trie(words) -> str:
+    """Regex source for `words` with shared prefixes factored out."""
+    root: dict = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    def source(node) -> str:
+        branches = [re.escape(c) + source(child) for c, child in sorted(node.items()) if c]
+        if "" in node:
+            branches.append("")
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return source(root)
+
+
+_LOWERED = sorted({k.lower() for k in spam_protection.SPAM_KEYWORDS}, key=len, reverse=True)
+_ALTERNATION = re.compile("|".join(re.escape(k) for k in _LOWERED))
+_TRIE = re.compile(_trie(_LOWERED))
+
+
+def _old_repeats(text: str) -> bool:
+    count, prev = 1, None
+    for char in text:
+        if char == prev:
+            count += 1
+            if count > spam_protection.REPEATED_CHAR_THRESHOLD:
+                return True
+        else:
+            count = 1
+        prev = char
+    return False
+
+
+def _us(fn, text: str) -> float:
+    runs = max(5, 200_000 // len(text))
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(text)
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main() -> None:
+    print(f"{len(spam_protection.SPAM_KEYWORDS)} keywords; clean posts (no match)")
+    print(
+        f"{'chars':>8}  {'kw old':>10}  {'kw now':>10}  {'kw alt':>10}  {'kw trie':>10}  "
+        f"{'rep old':>10}  {'rep now':>10}  {'check_content':>14}"
+    )
+    for size in SIZES:
+        text = _post(size)
+        assert not _old_keywords(text) and not _new_keywords(text)
+        print(
+            f"{size:>8}  "
+            f"{_us(_old_keywords, text):>8.1f}µs  "
+            f"{_us(_new_keywords, text):>8.1f}µs  "
+            f"{_us(lambda t: _ALTERNATION.search(t.lower()), text):>8.1f}µs  "
+            f"{_us(lambda t: _TRIE.search(t.lower()), text):>8.1f}µs  "
+            f"{_us(_old_repeats, text):>8.1f}µs  "
+            f"{_us(spam_protection.has_excessive_repeated_chars, text):>8.1f}µs  "
+            f"{_us(spam_protection.check_content, text):>12.1f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Photo upload throughput through the object stores.
+
+One photo upload stores four to five objects: the original (up to 15 MB),
+a thumbnail and the variants. Measured, per store, for a batch of
+uploads with realistic object sizes:
+
+  serial       one object after another, each a single PUT — what the
+               boto3 StorageService did, minus its blocking the loop
+  concurrent   StorageService.upload_photo's pattern: an upload's
+               objects in parallel, large originals multipart
+
+Against:
+
+  simulated R2   an in-process S3 endpoint charging RTT + size/bandwidth
+                 per request on a pool of STORAGE_MAX_CONCURRENCY
+                 connections (the store's own pool is bypassed by the
+                 in-process transport, so the endpoint enforces it)
+  local          LocalObjectStore in a temporary directory
+  S3 endpoint    a real one — MinIO, say — when BENCH_S3_ENDPOINT is set
+                 (with BENCH_S3_BUCKET, BENCH_S3_KEY, BENCH_S3_SECRET)
+
+Usage (from apps/api):
+    python -m benchmarks.storage_upload
+    BENCH_S3_ENDPOINT=http://localhost:9000 BENCH_S3_BUCKET=bench \\
+        BENCH_S3_KEY=minioadmin BENCH_S3_SECRET=minioadmin python -m benchmarks.storage_upload
+"""
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from app.config import settings
+from app.services.object_store import MIB, LocalObjectStore, S3ObjectStore
+
+UPLOADS = 12
+# Original, thumbnail, 320/640/1280 variants.
+SIZES = (9 * MIB, 25_000, 30_000, 90_000, 280_000)
+RTT = 0.04  # seconds
+BANDWIDTH = 12 * MIB  # bytes/s per connection
+
+
+def _simulated_r2() -> httpx.MockTransport:
+    pool = asyncio.Semaphore(settings.STORAGE_MAX_CONCURRENCY)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with pool:
+            await asyncio.sleep(RTT + len(request.content) / BANDWIDTH)
+        params = request.url.params
+        if "uploads" in params:
+            return httpx.Response(200, text=f"<R><UploadId>{uuid.uuid4()}</UploadId></R>")
+        if request.method == "PUT" and "partNumber" in params:
+            return httpx.Response(200, headers={"ETag": f'"{params["partNumber"]}"'})
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+async def _serial(store, payloads) -> None:
+    for _ in range(UPLOADS):
+        for data in payloads:
+            await store.put(f"bench/{uuid.uuid4()}", data, "image/jpeg")
+
+
+async def _concurrent(store, payloads) -> None:
+    for _ in range(UPLOADS):
+        await asyncio.gather(*(
+            store.put(f"bench/{uuid.uuid4()}", data, "image/jpeg") for data in payloads
+        ))
+
+
+async def _run(name: str, serial_store, concurrent_store) -> None:
+    payloads = [os.urandom(size) for size in SIZES]
+    total = UPLOADS * sum(SIZES)
+    for label, runner, store in (("serial", _serial, serial_store), ("concurrent", _concurrent, concurrent_store)):
+        start = time.perf_counter()
+        await runner(store, payloads)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<14} {label:<11} {UPLOADS / elapsed:7.2f} uploads/s   "
+              f"{total / elapsed / MIB:8.1f} MiB/s   {elapsed / UPLOADS * 1e3:7.0f} ms per upload")
+
+
+def _s3(endpoint, bucket, key, secret, **kwargs) -> S3ObjectStore:
+    return S3ObjectStore(
+        endpoint, bucket, key, secret, f"{endpoint}/{bucket}",
+        max_connections=settings.STORAGE_MAX_CONCURRENCY,
+        part_size=settings.STORAGE_PART_SIZE,
+        **kwargs,
+    )
+
+
+async def main() -> None:
+    print(f"{UPLOADS} uploads of {len(SIZES)} objects, {sum(SIZES) / MIB:.1f} MiB each; "
+          f"simulated R2 at {RTT * 1e3:.0f} ms RTT, {BANDWIDTH / MIB:.0f} MiB/s per connection")
+
+    transport = _simulated_r2()
+    creds = ("https://r2.invalid", "bench", "key", "secret")
+    await _run(
+        "simulated R2",
+        _s3(*creds, multipart_threshold=1 << 62, transport=transport),
+        _s3(*creds, multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD, transport=transport),
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            local = LocalObjectStore("uploads", max_workers=settings.STORAGE_MAX_CONCURRENCY)
+            await _run("local", local, local)
+        finally:
+            os.chdir(cwd)
+
+    endpoint = os.environ.get("BENCH_S3_ENDPOINT")
+    if not endpoint:
+        print("  S3 endpoint    skipped (set BENCH_S3_ENDPOINT)")
+        return
+    real = (endpoint, os.environ["BENCH_S3_BUCKET"], os.environ["BENCH_S3_KEY"], os.environ["BENCH_S3_SECRET"])
+    await _run(
+        "S3 endpoint",
+        _s3(*real, multipart_threshold=1 << 62),
+        _s3(*real, multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
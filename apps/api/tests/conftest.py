@@ -33,7 +33,7 @@ from typing import Iterator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 
@@ -94,21 +94,22 @@ def db_session(engine) -> Iterator[Session]:
     session joins it, and every commit from application code becomes a
     nested SAVEPOINT. At teardown we roll back the outer transaction so
     the next test sees a clean slate.
+
+    `create_savepoint` is SQLAlchemy 2.0's built-in form of this recipe. It
+    replaced a hand-rolled "restart the savepoint after every transaction"
+    listener, which broke application code that opens its own
+    `begin_nested()` (the webhook inbox worker does).
     """
     connection = engine.connect()
     transaction = connection.begin()
-    SessionLocal = sessionmaker(bind=connection, autoflush=False, autocommit=False)
+    SessionLocal = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        autocommit=False,
+        join_transaction_mode="create_savepoint",
+    )
     session = SessionLocal()
 
-    # Start a SAVEPOINT so session.commit() inside the app code doesn't end
-    # the outer transaction.
-    session.begin_nested()
-
-    @event.listens_for(session, "after_transaction_end")
-    def _restart_savepoint(sess, trans):
-        if trans.nested and not trans._parent.nested:
-            sess.begin_nested()
-
     try:
         yield session
     finally:
@@ -119,9 +120,16 @@ def db_session(engine) -> Iterator[Session]:
 
 @pytest.fixture()
 def client(db_session) -> Iterator[TestClient]:
-    """FastAPI TestClient with get_db overridden to the per-test session."""
+    """FastAPI TestClient with get_db overridden to the per-test session.
+
+    The catalog response cache is emptied first: each test rolls its rows
+    back, so a body cached by an earlier test would describe rows that no
+    longer exist."""
     from app.main import app
     from app.database import get_db
+    from app.utils.response_cache import response_cache
+
+    response_cache.clear()
 
     def _override_get_db():
         try:
@@ -171,3 +179,39 @@ def auth_headers(test_user) -> dict:
     user, _ = test_user
     token = create_access_token(data={"sub": str(user.id)})
     return {"Authorization": f"Bearer {token}"}
+
+
+# ── Query counting ───────────────────────────────────────────────────────────
+
+# The savepoint each test runs in issues these around every application
+# commit; production requests don't, so they aren't counted.
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@pytest.fixture()
+def assert_max_queries():
+    """Fail if a block issues more than `n` SQL statements.
+
+        with assert_max_queries(4):
+            client.get("/api/v1/messages/")
+
+    Counts statements on every engine and thread (utils/query_stats.py), so
+    requests through `client` are included. The failure message lists them.
+    """
+    from contextlib import contextmanager
+
+    from app.utils import query_stats
+
+    query_stats.install()
+
+    @contextmanager
+    def _assert_max_queries(n: int):
+        with query_stats.capture() as stats:
+            yield stats
+        issued = [s for s in stats.statements if not s.startswith(_SAVEPOINT_STATEMENTS)]
+        assert len(issued) <= n, (
+            f"{len(issued)} statements, expected at most {n}:\n"
+            + "\n".join(f"  {s[:200]}" for s in issued)
+        )
+
+    return _assert_max_queries
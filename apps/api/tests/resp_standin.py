@@ -0,0 +1,158 @@
+"""A tiny in-process Redis-protocol server for the `resp://` limiter storage.
+
+Implements exactly the commands utils/rate_limit_storage.RespStorage and
+utils/response_cache.RespBackend send (plus FLUSHDB), with real
+millisecond expiry and MULTI/EXEC queuing, so both are exercised over a
+real socket without a Redis install. Used by
+the rate-limit and response-cache tests and benchmarks/rate_limit.py.
+"""
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.expires = {}  # key -> monotonic deadline
+
+    def live(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+
+
+class _Error(Exception):
+    pass
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, _Error):
+        return b"-ERR %s\r\n" % str(value).encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(_encode(v) for v in value)
+
+
+def _run(state: _State, args: list):
+    name = args[0].upper()
+    now = time.monotonic()
+    if name == b"PING":
+        return "PONG"
+    if name == b"SELECT":
+        return "OK"
+    if name == b"FLUSHDB":
+        state.values.clear()
+        state.expires.clear()
+        return "OK"
+    if name == b"GET":
+        return state.values[args[1]] if state.live(args[1]) else None
+    if name == b"MGET":
+        return [state.values[k] if state.live(k) else None for k in args[1:]]
+    if name == b"SET":
+        key, value, flags = args[1], args[2], [a.upper() for a in args[3:]]
+        if b"NX" in flags and state.live(key):
+            return None
+        state.values[key] = value
+        state.expires.pop(key, None)
+        if b"PX" in flags:
+            state.expires[key] = now + int(args[3 + flags.index(b"PX") + 1]) / 1000
+        return "OK"
+    if name in (b"INCRBY", b"DECRBY"):
+        key, amount = args[1], int(args[2])
+        current = int(state.values[key]) if state.live(key) else 0
+        current += amount if name == b"INCRBY" else -amount
+        state.values[key] = str(current).encode()
+        return current
+    if name == b"PTTL":
+        if not state.live(args[1]):
+            return -2
+        deadline = state.expires.get(args[1])
+        return -1 if deadline is None else max(0, int((deadline - now) * 1000))
+    if name == b"PEXPIRE":
+        if not state.live(args[1]):
+            return 0
+        state.expires[args[1]] = now + int(args[2]) / 1000
+        return 1
+    if name == b"DEL":
+        removed = 0
+        for key in args[1:]:
+            if state.live(key):
+                del state.values[key]
+                state.expires.pop(key, None)
+                removed += 1
+        return removed
+    if name == b"KEYS":
+        pattern = args[1].decode()
+        return [k for k in list(state.values) if state.live(k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+    return _Error(f"unknown command '{name.decode()}'")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def _command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        state = self.server.state
+        queued = None
+        while True:
+            args = self._command()
+            if args is None:
+                return
+            name = args[0].upper()
+            with state.lock:
+                if name == b"MULTI":
+                    queued, reply = [], "OK"
+                elif name == b"EXEC":
+                    reply, queued = [_run(state, a) for a in queued or []], None
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "QUEUED"
+                else:
+                    reply = _run(state, args)
+            self.wfile.write(_encode(reply))
+
+
+class RespStandin(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.state = _State()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def uri(self) -> str:
+        host, port = self.server_address
+        return f"resp://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
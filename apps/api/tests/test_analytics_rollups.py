@@ -0,0 +1,201 @@
+"""Admin analytics rollups (services/analytics_rollups.py).
+
+The dashboard reads per-day counts and retention cohorts from precomputed
+tables instead of scanning the source tables on every load. What these pin:
+
+  - a rolled-up day holds exactly what the source tables say, split by
+    dimension, with trailing active-user windows
+  - re-running a day replaces it rather than adding to it
+  - readers compute missing days once; a day computed before it ended is
+    recomputed, one computed after is left alone
+  - retention is measured from each member's own signup, and a member
+    counts toward day N only once their day-N window has closed
+  - the endpoints serve the rollups; the cron entrypoint needs the secret
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models.analytics_rollup import AnalyticsRollupDay
+from app.services import analytics_rollups
+
+pytestmark = pytest.mark.requires_postgres
+
+DAY = date(2020, 3, 10)
+
+
+def _user(db, created_at, provider=None):
+    from app.models.user import User
+
+    user = User(
+        email=f"ard-{uuid.uuid4().hex[:10]}@test.local",
+        username=f"ard_{uuid.uuid4().hex[:10]}",
+        hashed_password="x",
+        oauth_provider=provider,
+        created_at=created_at,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _activity(db, user, created_at):
+    from app.models.activity_feed import ActivityFeed
+
+    db.add(ActivityFeed(user_id=user.id, action_type="feeding", created_at=created_at))
+
+
+def _at(day, hour=12):
+    return datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+
+
+def _naive(day, hour=12):
+    return datetime(day.year, day.month, day.day, hour)
+
+
+def _feeding(db, user, fed_at):
+    from app.models.feeding_log import FeedingLog
+    from app.models.invert import Invert
+
+    invert = Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name="T")
+    db.add(invert)
+    db.flush()
+    db.add(FeedingLog(invert_id=invert.id, fed_at=fed_at, accepted=True))
+
+
+# ── Daily rollup ─────────────────────────────────────────────────────────────
+
+def test_a_rolled_up_day_matches_the_source_tables(db_session):
+    early = _user(db_session, _at(DAY, 0), provider="google")
+    late = _user(db_session, _at(DAY, 23))
+    _user(db_session, _at(DAY + timedelta(days=1), 0))  # next UTC day
+    _activity(db_session, early, _naive(DAY - timedelta(days=3)))
+    _activity(db_session, early, _naive(DAY, 1))
+    _activity(db_session, early, _naive(DAY, 2))
+    _activity(db_session, late, _naive(DAY, 23))
+    _feeding(db_session, early, _at(DAY, 5))
+    _feeding(db_session, early, _at(DAY - timedelta(days=1), 23))
+    db_session.commit()
+
+    analytics_rollups.refresh_days(db_session, DAY - timedelta(days=1), DAY)
+    analytics_rollups.refresh_days(db_session, DAY, DAY)  # reruns replace
+
+    daily = analytics_rollups.series(
+        db_session, ["new_users", "active_users", "active_users_7d", "feedings"], DAY, DAY
+    )
+    assert daily == {
+        "new_users": {DAY: 2},
+        "active_users": {DAY: 2},
+        "active_users_7d": {DAY: 2},
+        "feedings": {DAY: 1},
+    }
+    assert analytics_rollups.series(db_session, ["feedings"], DAY, DAY, app="herpetoverse") == {
+        "feedings": {}
+    }
+    assert analytics_rollups.total(db_session, "feedings", DAY - timedelta(days=1), DAY) == 2
+
+    from app.models.analytics_rollup import AnalyticsDaily
+    providers = {
+        row.dimension: row.value
+        for row in db_session.query(AnalyticsDaily).filter_by(day=DAY, metric="new_users")
+    }
+    assert providers == {"google": 1, "email": 1}
+
+
+def test_readers_compute_missing_days_once(db_session):
+    _user(db_session, _at(DAY))
+    db_session.commit()
+
+    analytics_rollups.ensure_range(db_session, DAY - timedelta(days=6), DAY)
+    covered = db_session.query(AnalyticsRollupDay).filter(
+        AnalyticsRollupDay.day.between(DAY - timedelta(days=6), DAY)
+    )
+    assert covered.count() == 7
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        analytics_rollups.ensure_range(db_session, DAY - timedelta(days=6), DAY)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    assert not [s for s in statements if s.startswith(("INSERT", "DELETE"))]
+
+
+def test_a_day_computed_before_it_ended_is_recomputed(db_session):
+    _user(db_session, _at(DAY))
+    db_session.commit()
+    analytics_rollups.refresh_days(db_session, DAY - timedelta(days=1), DAY)
+
+    early = db_session.get(AnalyticsRollupDay, DAY)
+    early.computed_at = _at(DAY, 18)
+    db_session.commit()
+    _user(db_session, _at(DAY, 20))
+    db_session.commit()
+
+    analytics_rollups.ensure_range(db_session, DAY - timedelta(days=1), DAY)
+    assert analytics_rollups.total(db_session, "new_users", DAY, DAY) == 2
+
+
+# ── Retention cohorts ────────────────────────────────────────────────────────
+
+def test_retention_is_measured_from_each_members_signup(db_session):
+    month = date(2020, 1, 1)
+    signed_up = datetime(2020, 1, 20, 10)
+    back_next_day = _user(db_session, signed_up.replace(tzinfo=timezone.utc))
+    back_on_day_7 = _user(db_session, signed_up.replace(tzinfo=timezone.utc))
+    _user(db_session, signed_up.replace(tzinfo=timezone.utc))  # never back
+    _activity(db_session, back_next_day, signed_up + timedelta(days=1, hours=3))
+    _activity(db_session, back_on_day_7, signed_up + timedelta(days=7, hours=23))
+    _activity(db_session, back_on_day_7, signed_up + timedelta(hours=30))  # day 1 too
+    _activity(db_session, back_next_day, signed_up + timedelta(days=2, hours=1))  # day 2
+    db_session.commit()
+
+    [cohort] = analytics_rollups.ensure_cohorts(db_session, [month])
+    assert cohort.cohort_size == 3
+    assert (cohort.eligible_day_1, cohort.retained_day_1) == (3, 2)
+    assert (cohort.eligible_day_7, cohort.retained_day_7) == (3, 1)
+    assert (cohort.eligible_day_30, cohort.retained_day_30) == (3, 0)
+
+
+def test_members_count_only_once_their_window_closes(db_session):
+    recent = _user(db_session, datetime.now(timezone.utc) - timedelta(days=3))
+    _activity(db_session, recent, datetime.utcnow() - timedelta(days=2) + timedelta(hours=1))
+    db_session.commit()
+
+    [cohort] = analytics_rollups.ensure_cohorts(db_session, [recent.created_at.date()])
+    assert cohort.eligible_day_1 >= 1
+    assert cohort.eligible_day_7 == cohort.eligible_day_30 == 0
+    assert cohort.retained_day_7 == 0
+
+
+# ── Endpoints ────────────────────────────────────────────────────────────────
+
+def test_dashboard_reads_todays_rollup(client, db_session, test_user, auth_headers, monkeypatch):
+    user, _ = test_user
+    user.is_admin = True
+    db_session.commit()
+    _activity(db_session, user, datetime.utcnow())
+    db_session.commit()
+
+    overview = client.get("/api/v1/admin/analytics/overview", headers=auth_headers)
+    assert overview.status_code == 200, overview.text
+    body = overview.json()
+    assert body["new_users_today"] >= 1 and body["active_users_today"] >= 1
+    assert body["active_users_30d"] >= body["active_users_7d"] >= body["active_users_today"]
+
+    users = client.get("/api/v1/admin/analytics/users?period=7d", headers=auth_headers).json()
+    today = analytics_rollups.utc_today().isoformat()
+    assert any(point["date"] == today and point["new_users"] >= 1 for point in users["time_series"])
+    assert users["retention_cohorts"][0]["cohort_month"] == today[:7]
+
+    assert client.post("/api/v1/admin/analytics/rollup").status_code == 403
+    monkeypatch.setenv("CRON_SECRET", "s3cret")
+    response = client.post("/api/v1/admin/analytics/rollup", headers={"X-Cron-Secret": "s3cret"})
+    assert response.status_code == 200, response.text
+    assert response.json()["cohorts_refreshed"] >= 2
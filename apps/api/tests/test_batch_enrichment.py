@@ -0,0 +1,162 @@
+"""Per-page enrichment on list endpoints (services/batch_enrich.py).
+
+Each of these lists used to run a species (or offspring-count) query per
+row. The regression to guard against is a future builder quietly going back
+to a per-row lookup, so each test lists a page of one row and a page of
+several and requires the SAME number of queries — constant per page, not
+per row. The response content is checked too, so a test can't pass by the
+enrichment silently disappearing.
+"""
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+pytestmark = pytest.mark.requires_postgres
+
+PAGE = 6
+
+
+@contextmanager
+def _count_queries(db_session):
+    statements = []
+    bind = db_session.get_bind()
+
+    def _on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", _on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _on_execute)
+
+
+def _queries_for(client, db_session, url, headers) -> tuple[int, list]:
+    with _count_queries(db_session) as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()
+
+
+def _assert_constant_per_page(client, db_session, url, headers, add_row):
+    add_row(0)
+    db_session.commit()
+    one, body = _queries_for(client, db_session, url, headers)
+    assert len(body) == 1
+
+    for i in range(1, PAGE):
+        add_row(i)
+    db_session.commit()
+    many, body = _queries_for(client, db_session, url, headers)
+    assert len(body) == PAGE
+    assert many == one, f"{url}: {one} queries for 1 row, {many} for {PAGE}"
+    return body
+
+
+# ── Colonies ─────────────────────────────────────────────────────────────────
+
+def test_colony_list_resolves_species_per_page(client, db_session, test_user, auth_headers):
+    from app.models.colony import Colony
+    from app.models.invert_species import InvertSpecies
+
+    user, _ = test_user
+    name = f"Blaptica {uuid.uuid4().hex[:8]}"
+    sp = InvertSpecies(
+        taxon="roach", scientific_name=name, scientific_name_lower=name.lower(),
+        slug=f"b-{uuid.uuid4().hex[:8]}", common_names=["Dubia"],
+    )
+    db_session.add(sp)
+    db_session.flush()
+
+    def add_row(i):
+        db_session.add(Colony(
+            user_id=user.id, taxon="roach", name=f"Bin {i}",
+            # Every other colony points at a species that no longer exists.
+            species_id=sp.id if i % 2 == 0 else None,
+        ))
+
+    body = _assert_constant_per_page(client, db_session, "/api/v1/colonies/", auth_headers, add_row)
+    named = [c for c in body if c["species_display_name"]]
+    assert named and all(c["species_display_name"] == "Dubia" for c in named)
+
+
+# ── Feeder colonies (Tarantuverse) ───────────────────────────────────────────
+
+def test_feeder_colony_list_resolves_species_per_page(client, db_session, test_user, auth_headers):
+    from app.models.feeder_colony import FeederColony
+    from app.models.feeder_species import FeederSpecies
+
+    user, _ = test_user
+    name = f"Acheta {uuid.uuid4().hex[:8]}"
+    sp = FeederSpecies(scientific_name=name, scientific_name_lower=name.lower(), category="cricket")
+    db_session.add(sp)
+    db_session.flush()
+
+    def add_row(i):
+        db_session.add(FeederColony(user_id=user.id, name=f"Crickets {i}", feeder_species_id=sp.id, count=10))
+
+    body = _assert_constant_per_page(
+        client, db_session, "/api/v1/feeder-colonies/", auth_headers, add_row,
+    )
+    assert all(c["species_display_name"] == name for c in body)
+
+
+# ── Feeder stocks (Herpetoverse) ─────────────────────────────────────────────
+
+def test_hv_feeder_stock_list_resolves_species_per_page(client, db_session, test_user, auth_headers):
+    from app.models.hv_feeder import HvFeederSpecies, HvFeederStock
+
+    user, _ = test_user
+    name = f"Mus {uuid.uuid4().hex[:8]}"
+    sp = HvFeederSpecies(
+        scientific_name=name, scientific_name_lower=name.lower(),
+        category="rodent", common_names=["Mouse"],
+    )
+    db_session.add(sp)
+    db_session.flush()
+
+    def add_row(i):
+        db_session.add(HvFeederStock(user_id=user.id, name=f"Pinkies {i}", hv_feeder_species_id=sp.id, count=5))
+
+    body = _assert_constant_per_page(
+        client, db_session, "/api/v1/hv-feeder-stocks/", auth_headers, add_row,
+    )
+    assert all(s["species_display_name"] == "Mouse" for s in body)
+
+
+# ── Clutches ─────────────────────────────────────────────────────────────────
+
+def test_clutch_list_counts_offspring_per_page(client, db_session, test_user, auth_headers):
+    from app.models.animal import Animal
+    from app.models.clutch import Clutch
+    from app.models.reptile_offspring import ReptileOffspring
+    from app.models.reptile_pairing import ReptilePairing
+
+    user, _ = test_user
+    male = Animal(user_id=user.id, taxon="snake", name="M")
+    female = Animal(user_id=user.id, taxon="snake", name="F")
+    db_session.add_all([male, female])
+    db_session.flush()
+    pairing = ReptilePairing(
+        user_id=user.id, male_animal_id=male.id, female_animal_id=female.id,
+        taxon="snake", paired_date=date(2026, 3, 1),
+    )
+    db_session.add(pairing)
+    db_session.flush()
+
+    def add_row(i):
+        clutch = Clutch(pairing_id=pairing.id, user_id=user.id, laid_date=date(2026, 5, 1 + i))
+        db_session.add(clutch)
+        db_session.flush()
+        for _ in range(i):
+            db_session.add(ReptileOffspring(clutch_id=clutch.id, user_id=user.id))
+
+    body = _assert_constant_per_page(
+        client, db_session, f"/api/v1/reptile-pairings/{pairing.id}/clutches", auth_headers, add_row,
+    )
+    assert sorted(c["offspring_count"] for c in body) == list(range(PAGE))
@@ -0,0 +1,126 @@
+"""Set-based Feeding Day writes (services/bulk_logs.py).
+
+The bulk path replaced one ORM flush per animal with a multi-row INSERT plus
+single UPDATEs for the derived state. The risk in a rewrite like that is not
+speed, it's quietly dropping a rule the per-row path used to apply. So the DB tests here pin the rules, not the SQL:
+
+  - an accepted feeding resumes a paused animal AND its legacy twin
+  - a refusal leaves every pause alone
+  - the INSERT path fills defaults and keeps blank strings blank
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.feeding_log import FeedingLog
+from app.services import bulk_logs
+
+
+# ── Pure helpers ─────────────────────────────────────────────────────────────
+
+def test_rows_get_ids_and_python_side_defaults():
+    """A row that leaves out `quantity` / `accepted` must get what the ORM
+    would have given it, not NULL."""
+    columns, rows = bulk_logs._complete_rows(
+        FeedingLog.__table__,
+        [{"invert_id": uuid.uuid4(), "fed_at": datetime.now(timezone.utc)}],
+    )
+    assert "created_at" not in columns  # server default, left to the DB
+    assert isinstance(rows[0]["id"], uuid.UUID)
+    assert rows[0]["quantity"] == 1
+    assert rows[0]["accepted"] is True
+
+
+def test_empty_batch_is_a_no_op():
+    class ExplodingSession:
+        def execute(self, *a, **kw):  # pragma: no cover - must never be reached
+            raise AssertionError("empty batch should not touch the DB")
+
+    assert bulk_logs.insert_rows(ExplodingSession(), FeedingLog, []) == []
+
+
+# ── Against Postgres ─────────────────────────────────────────────────────────
+
+def _make_tarantula_pair(db_session, user, paused: bool):
+    """A tarantula as ADR-005 leaves it today: a legacy row and an invert
+    mirror sharing one primary key."""
+    from app.models.invert import Invert
+    from app.models.tarantula import Tarantula
+
+    shared_id = uuid.uuid4()
+    reason = "premolt" if paused else None
+    db_session.add(Tarantula(id=shared_id, user_id=user.id, name="T", feeding_paused_reason=reason))
+    db_session.add(Invert(id=shared_id, user_id=user.id, taxon="tarantula", name="T", feeding_paused_reason=reason))
+    db_session.flush()
+    return shared_id
+
+
+@pytest.mark.requires_postgres
+def test_feeding_day_resumes_paused_animal_and_its_twin(client, db_session, test_user, auth_headers):
+    from app.models.invert import Invert
+    from app.models.tarantula import Tarantula
+
+    user, _ = test_user
+    paused = _make_tarantula_pair(db_session, user, paused=True)
+    normal = _make_tarantula_pair(db_session, user, paused=False)
+    db_session.commit()
+
+    response = client.post(
+        "/api/v1/inverts/bulk-feedings",
+        json={"invert_ids": [str(paused), str(normal), str(uuid.uuid4())]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["created_count"] == 2
+    assert body["resumed_ids"] == [str(paused)]
+    assert len(body["skipped"]) == 1
+
+    db_session.expire_all()
+    assert db_session.get(Invert, paused).feeding_paused_reason is None
+    assert db_session.get(Tarantula, paused).feeding_paused_reason is None
+    assert db_session.query(FeedingLog).filter(FeedingLog.invert_id.in_([paused, normal])).count() == 2
+
+
+@pytest.mark.requires_postgres
+def test_feeding_day_refusal_leaves_pause_alone(client, db_session, test_user, auth_headers):
+    from app.models.invert import Invert
+
+    user, _ = test_user
+    paused = _make_tarantula_pair(db_session, user, paused=True)
+    db_session.commit()
+
+    response = client.post(
+        "/api/v1/inverts/bulk-feedings",
+        json={"invert_ids": [str(paused)], "accepted": False},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["resumed_ids"] == []
+    db_session.expire_all()
+    assert db_session.get(Invert, paused).feeding_paused_reason == "premolt"
+
+
+@pytest.mark.requires_postgres
+def test_insert_path_fills_defaults_and_keeps_blank_strings(db_session, test_user):
+    user, _ = test_user
+    ids = [_make_tarantula_pair(db_session, user, paused=False) for _ in range(3)]
+    fed_at = datetime(2026, 7, 1, 12, tzinfo=timezone.utc)
+    rows = [
+        {"invert_id": iid, "fed_at": fed_at, "food_type": 'dubia "large"', "notes": ""}
+        for iid in ids
+    ]
+
+    created = bulk_logs.insert_rows(db_session, FeedingLog, rows)
+
+    logs = db_session.query(FeedingLog).filter(FeedingLog.id.in_(created)).all()
+    assert len(logs) == 3
+    for log in logs:
+        assert log.fed_at == fed_at
+        assert log.food_type == 'dubia "large"'
+        assert log.notes == ""
+        assert log.quantity == 1
+        assert log.created_at is not None
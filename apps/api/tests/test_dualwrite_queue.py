@@ -0,0 +1,156 @@
+"""The forward dual-write queue (services/inverts_dualwrite.py).
+
+What these pin:
+
+  - a legacy create mirrors with one upsert and no SELECT of `inverts`
+  - a legacy edit upserts only the columns it changed, and leaves the
+    invert-owned species link alone
+  - an edit that changes nothing writes nothing, but still creates a
+    missing mirror
+  - an edit flushed before its mirror call is still mirrored
+  - a legacy delete takes the mirror with it
+  - a rollback drops queued mirrors
+  - a log row resolves its invert_id inside its own INSERT
+
+All Postgres.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.feeding_log import FeedingLog
+from app.models.invert import Invert
+from app.models.invert_species import InvertSpecies
+from app.models.tarantula import Tarantula
+from app.services.inverts_dualwrite import mirror_tarantula_update
+
+pytestmark = pytest.mark.requires_postgres
+
+
+def _inverts_sql(stats):
+    return [s for s in stats.statements if " inverts" in s]
+
+
+def _tarantula(db_session, user, with_mirror=True, **fields):
+    tarantula = Tarantula(id=uuid.uuid4(), user_id=user.id, name="Rosie", **fields)
+    db_session.add(tarantula)
+    if with_mirror:
+        db_session.add(Invert(id=tarantula.id, user_id=user.id, taxon="tarantula", name="Rosie", **fields))
+    db_session.commit()
+    return tarantula
+
+
+# ── Creates and edits ────────────────────────────────────────────────────────
+
+def test_a_create_is_one_upsert(client, db_session, auth_headers, assert_max_queries):
+    with assert_max_queries(20) as stats:
+        response = client.post("/api/v1/tarantulas/", json={"name": "Rosie", "notes": "calm"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+
+    writes = [s for s in _inverts_sql(stats) if not s.startswith("SELECT count")]
+    assert len(writes) == 1 and writes[0].startswith("INSERT INTO inverts")
+    invert = db_session.get(Invert, uuid.UUID(response.json()["id"]))
+    assert (invert.taxon, invert.name, invert.notes) == ("tarantula", "Rosie", "calm")
+
+
+def test_an_edit_sets_only_what_it_changed(client, db_session, test_user, auth_headers, assert_max_queries):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    species = InvertSpecies(
+        id=uuid.uuid4(), taxon="tarantula", scientific_name="Grammostola pulchra",
+        scientific_name_lower="grammostola pulchra", slug=f"g-pulchra-{uuid.uuid4().hex[:6]}",
+    )
+    db_session.add(species)
+    db_session.flush()
+    db_session.get(Invert, tarantula.id).species_id = species.id  # owned by the invert side
+    db_session.commit()
+
+    with assert_max_queries(10) as stats:
+        response = client.put(f"/api/v1/tarantulas/{tarantula.id}", json={"name": "Rosa"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    (upsert,) = _inverts_sql(stats)
+    assert upsert.endswith("ON CONFLICT (id) DO UPDATE SET name = excluded.name, updated_at = now()")
+    db_session.expire_all()
+    invert = db_session.get(Invert, tarantula.id)
+    assert (invert.name, invert.species_id) == ("Rosa", species.id)
+
+
+def test_an_edit_that_changes_nothing_writes_nothing(client, db_session, test_user, auth_headers, assert_max_queries):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    updated_at = db_session.get(Invert, tarantula.id).updated_at
+
+    with assert_max_queries(10) as stats:
+        client.put(f"/api/v1/tarantulas/{tarantula.id}", json={"name": "Rosie"}, headers=auth_headers)
+    (upsert,) = _inverts_sql(stats)
+    assert upsert.endswith("ON CONFLICT (id) DO NOTHING")
+    db_session.expire_all()
+    assert db_session.get(Invert, tarantula.id).updated_at == updated_at
+
+
+def test_an_edit_creates_a_missing_mirror(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user, with_mirror=False, notes="pre-A2")
+
+    client.put(f"/api/v1/tarantulas/{tarantula.id}", json={"name": "Rosa"}, headers=auth_headers)
+    invert = db_session.get(Invert, tarantula.id)
+    assert (invert.name, invert.notes) == ("Rosa", "pre-A2")
+
+
+def test_an_edit_flushed_before_its_mirror_is_still_mirrored(db_session, test_user):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+
+    tarantula.notes = "flushed first"
+    db_session.flush()
+    mirror_tarantula_update(db_session, tarantula)
+    db_session.commit()
+
+    db_session.expire_all()
+    assert db_session.get(Invert, tarantula.id).notes == "flushed first"
+
+
+# ── Deletes and rollbacks ────────────────────────────────────────────────────
+
+def test_a_delete_takes_the_mirror(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+
+    assert client.delete(f"/api/v1/tarantulas/{tarantula.id}", headers=auth_headers).status_code == 204
+    db_session.expire_all()
+    assert db_session.get(Invert, tarantula.id) is None
+
+
+def test_a_rollback_drops_queued_mirrors(db_session, test_user):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+
+    tarantula.name = "Abandoned"
+    mirror_tarantula_update(db_session, tarantula)
+    db_session.rollback()
+    db_session.commit()
+
+    assert db_session.get(Invert, tarantula.id).name == "Rosie"
+
+
+# ── Logs ─────────────────────────────────────────────────────────────────────
+
+def test_a_log_resolves_its_invert_in_its_insert(client, db_session, test_user, auth_headers, assert_max_queries):
+    user, _ = test_user
+    mirrored = _tarantula(db_session, user)
+    legacy_only = _tarantula(db_session, user, with_mirror=False)
+    body = {"fed_at": datetime.now(timezone.utc).isoformat(), "food_type": "cricket", "accepted": False}
+
+    with assert_max_queries(20) as stats:
+        response = client.post(f"/api/v1/tarantulas/{mirrored.id}/feedings", json=body, headers=auth_headers)
+    assert response.status_code == 201, response.text
+    assert not [s for s in stats.statements if s.startswith("SELECT inverts.id")]
+
+    client.post(f"/api/v1/tarantulas/{legacy_only.id}/feedings", json=body, headers=auth_headers)
+    logs = db_session.query(FeedingLog).filter(FeedingLog.tarantula_id.in_([mirrored.id, legacy_only.id]))
+    logs = {log.tarantula_id: log.invert_id for log in logs}
+    assert logs == {mirrored.id: mirrored.id, legacy_only.id: None}
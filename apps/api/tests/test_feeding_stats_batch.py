@@ -0,0 +1,142 @@
+"""Collection-wide feeding stats (GET /inverts/feeding-stats).
+
+The collection list used to request feeding stats per card. The batch route
+must give each card exactly what the per-animal route would — the two share
+one implementation, and these tests hold them to it — in a constant number of
+queries, and must let an unchanged collection revalidate with a 304.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+pytestmark = pytest.mark.requires_postgres
+
+URL = "/api/v1/inverts/feeding-stats"
+
+
+def _invert(db_session, user, name, **kwargs):
+    from app.models.invert import Invert
+
+    inv = Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name=name, **kwargs)
+    db_session.add(inv)
+    db_session.flush()
+    return inv
+
+
+def _feed(db_session, inv, days_ago, accepted=True):
+    from app.models.feeding_log import FeedingLog
+
+    db_session.add(FeedingLog(
+        invert_id=inv.id,
+        fed_at=datetime.now(timezone.utc) - timedelta(days=days_ago),
+        accepted=accepted,
+    ))
+
+
+def _collection(db_session, user, size):
+    inverts = []
+    for i in range(size):
+        inv = _invert(db_session, user, f"T{i}", feeding_interval_days=7)
+        for d in range(i):
+            _feed(db_session, inv, days_ago=3 + d * 4, accepted=d % 3 != 2)
+        inverts.append(inv)
+    db_session.commit()
+    return inverts
+
+
+def test_batch_matches_the_per_animal_route(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    inverts = _collection(db_session, user, 5)
+    inverts[1].feeding_paused_reason = "premolt"
+    db_session.commit()
+
+    batch = client.get(URL, params={"tz_offset_minutes": 240}, headers=auth_headers)
+    assert batch.status_code == 200, batch.text
+    by_id = {item["invert_id"]: item for item in batch.json()}
+    assert len(by_id) == 5
+
+    for inv in inverts:
+        single = client.get(
+            f"/api/v1/inverts/{inv.id}/feeding-stats",
+            params={"tz_offset_minutes": 240},
+            headers=auth_headers,
+        ).json()
+        assert by_id[str(inv.id)] == single
+
+    never_fed = by_id[str(inverts[0].id)]
+    assert never_fed["total_feedings"] == 0 and never_fed["last_feeding_date"] is None
+    fed = by_id[str(inverts[4].id)]
+    assert (fed["total_feedings"], fed["total_accepted"]) == (4, 3)
+    assert fed["days_since_last_feeding"] == 3
+    assert by_id[str(inverts[1].id)]["is_feeding_paused"] is True
+
+
+def test_query_count_does_not_grow_with_the_collection(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+
+    def count():
+        statements = []
+        bind = db_session.get_bind()
+
+        def _on_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", _on_execute)
+        try:
+            assert client.get(URL, headers=auth_headers).status_code == 200
+        finally:
+            event.remove(bind, "before_cursor_execute", _on_execute)
+        return len(statements)
+
+    _collection(db_session, user, 1)
+    one = count()
+    _collection(db_session, user, 8)
+    assert count() == one
+
+
+def test_unchanged_collection_revalidates_with_304(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    inverts = _collection(db_session, user, 3)
+
+    first = client.get(URL, headers=auth_headers)
+    etag = first.headers["etag"]
+    assert "no-cache" in first.headers["cache-control"]
+
+    again = client.get(URL, headers={**auth_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    _feed(db_session, inverts[0], days_ago=0)
+    db_session.commit()
+    changed = client.get(URL, headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_explicit_ids_keep_request_order_and_skip_foreign_animals(
+    client, db_session, test_user, auth_headers
+):
+    from app.models.user import User
+
+    user, _ = test_user
+    a, b = _collection(db_session, user, 2)
+    stranger = User(
+        email=f"s-{uuid.uuid4().hex[:8]}@example.com",
+        username=f"s{uuid.uuid4().hex[:8]}",
+        hashed_password="x",
+    )
+    db_session.add(stranger)
+    db_session.flush()
+    theirs = _invert(db_session, stranger, "Not yours")
+    db_session.commit()
+
+    response = client.get(
+        URL, params=[("ids", str(b.id)), ("ids", str(theirs.id)), ("ids", str(a.id))],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert [item["invert_id"] for item in response.json()] == [str(b.id), str(a.id)]
@@ -0,0 +1,102 @@
+"""Buffered forum view counts (services/forum_views.py).
+
+What these pin:
+
+  - views from many threads at once are all counted
+  - a failed flush keeps its views for the next one
+  - viewing a thread issues no write; the response still counts the view
+  - a flush writes every thread's views in one UPDATE and leaves
+    updated_at (the "recent" sort) alone (Postgres)
+  - the author's own views aren't counted (Postgres)
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.models.forum import ForumCategory, ForumThread
+from app.services import forum_views
+from app.services.forum_views import ViewCountBuffer
+
+
+# ── Buffer ───────────────────────────────────────────────────────────────────
+
+def test_concurrent_views_are_all_counted():
+    buffer = ViewCountBuffer(flush_interval=3600)
+
+    def view():
+        for _ in range(1000):
+            buffer.record(7)
+
+    workers = [threading.Thread(target=view) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert buffer.pending(7) == 8000
+
+
+def test_a_failed_flush_keeps_its_views():
+    buffer = ViewCountBuffer(flush_interval=3600, engine=create_engine("sqlite://"))
+    buffer.record(1)
+    buffer.record(1)
+    buffer.record(2)
+
+    assert buffer.flush() == 0  # no forum_threads table here
+    assert (buffer.pending(1), buffer.pending(2)) == (2, 1)
+
+
+# ── Endpoint (Postgres) ──────────────────────────────────────────────────────
+
+@pytest.fixture()
+def buffer(monkeypatch):
+    buffer = ViewCountBuffer(flush_interval=3600)
+    monkeypatch.setattr(forum_views, "views", buffer)
+    monkeypatch.setattr("app.routers.forums.thread_views", buffer)
+    return buffer
+
+
+@pytest.fixture()
+def threads(db_session, test_user):
+    user, _ = test_user
+    category = ForumCategory(name="Views", slug=f"views-{uuid.uuid4().hex[:8]}")
+    db_session.add(category)
+    db_session.flush()
+    made = [
+        ForumThread(category_id=category.id, author_id=user.id, title=f"T{n}", slug=f"t{n}",
+                    view_count=10)
+        for n in range(3)
+    ]
+    db_session.add_all(made)
+    db_session.commit()
+    return made
+
+
+@pytest.mark.requires_postgres
+def test_views_are_reads_and_flush_in_one_update(client, db_session, buffer, threads, assert_max_queries):
+    first, second, _ = threads
+    updated_at = first.updated_at
+
+    with assert_max_queries(10) as stats:
+        for _ in range(3):
+            response = client.get(f"/api/v1/forums/threads/{first.id}")
+        client.get(f"/api/v1/forums/threads/{second.id}")
+    assert not [s for s in stats.statements if s.lstrip().upper().startswith("UPDATE")]
+    assert response.json()["view_count"] == 13
+
+    with assert_max_queries(1):
+        assert buffer.flush(db_session) == 2
+    db_session.expire_all()
+    assert (first.view_count, second.view_count) == (13, 11)
+    assert first.updated_at == updated_at
+    assert buffer.pending(first.id) == 0
+
+
+@pytest.mark.requires_postgres
+def test_the_authors_views_are_not_counted(client, buffer, threads, auth_headers):
+    response = client.get(f"/api/v1/forums/threads/{threads[0].id}", headers=auth_headers)
+    assert response.json()["view_count"] == 10
+    assert buffer.pending(threads[0].id) == 0
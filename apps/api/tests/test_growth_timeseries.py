@@ -0,0 +1,197 @@
+"""Growth and weight series (services/growth_service.py, services/timeseries.py).
+
+Deltas and rates moved from Python loops over every log into window
+functions, and long series can be thinned for the chart. What these pin:
+
+  - LTTB keeps the endpoints, honours the budget, and keeps a spike
+  - molt deltas/totals/rates come out of SQL with the old rules (a zero
+    measurement never anchors a delta) — and a weight gain no longer 500s
+    on Decimal / float
+  - a date range still reports the first point's change from the molt
+    before it, and the summary covers the range, not just the kept points
+  - the weight trend's 30-day loss matches the advisory run over the full
+    history, however the series was ranged or thinned
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.services.timeseries import downsample_indices, lttb_indices
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+# ── LTTB ─────────────────────────────────────────────────────────────────────
+
+def test_lttb_keeps_endpoints_and_budget():
+    xs = list(range(1000))
+    ys = [float(i % 37) for i in xs]
+    kept = lttb_indices(xs, ys, 50)
+
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert kept == sorted(set(kept))
+
+
+def test_lttb_keeps_a_spike():
+    xs = list(range(500))
+    ys = [100.0] * 500
+    ys[321] = 60.0  # one bad weigh-in
+    assert 321 in lttb_indices(xs, ys, 20)
+
+
+def test_short_series_pass_through():
+    assert lttb_indices([0, 1, 2], [1.0, 2.0, 3.0], 10) == [0, 1, 2]
+    times = [T0 + timedelta(days=i) for i in range(5)]
+    assert downsample_indices(times, [1, 2, 3, 4, 5], max_points=None) == [0, 1, 2, 3, 4]
+
+
+def test_downsampling_thins_each_measure_over_its_own_points():
+    times = [T0 + timedelta(days=i) for i in range(200)]
+    weights = [float(i) if i % 2 else None for i in range(200)]
+    spans = [float(i) if i % 2 == 0 else None for i in range(200)]
+    kept = downsample_indices(times, weights, spans, max_points=10)
+
+    assert sum(1 for i in kept if weights[i] is not None) <= 10
+    assert sum(1 for i in kept if spans[i] is not None) <= 11  # + forced last point
+    assert kept[0] == 0 and kept[-1] == 199
+
+
+# ── Molt growth (Postgres) ───────────────────────────────────────────────────
+
+def _invert_with_molts(db_session, user, molts):
+    from app.models.invert import Invert
+    from app.models.molt_log import MoltLog
+
+    inv = Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name="G")
+    db_session.add(inv)
+    db_session.flush()
+    for days, weight, span in molts:
+        db_session.add(MoltLog(
+            invert_id=inv.id, molted_at=T0 + timedelta(days=days),
+            weight_after=weight, leg_span_after=span,
+        ))
+    db_session.commit()
+    return inv
+
+
+@pytest.mark.requires_postgres
+def test_growth_deltas_and_rates_come_from_sql(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    inv = _invert_with_molts(db_session, user, [
+        (0, Decimal("1.00"), Decimal("3.00")),
+        (61, Decimal("0"), Decimal("3.50")),     # weight not measured
+        (122, Decimal("2.50"), Decimal("4.25")),
+    ])
+
+    response = client.get(f"/api/v1/inverts/{inv.id}/growth", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    points = body["data_points"]
+    assert [p["days_since_previous"] for p in points] == [None, 61, 61]
+    assert [p["weight_change"] for p in points] == [None, None, None]
+    assert [Decimal(p["leg_span_change"]) if p["leg_span_change"] else None for p in points] == [
+        None, Decimal("0.50"), Decimal("0.75"),
+    ]
+    assert body["total_molts"] == 3
+    assert body["average_days_between_molts"] == 61.0
+    assert Decimal(body["total_weight_gain"]) == Decimal("1.50")
+    # 1.50 g over 122 days = 1.50 / (122 / 30.44) g per month
+    assert Decimal(body["growth_rate_weight"]).quantize(Decimal("0.0001")) == (
+        Decimal("1.50") / (Decimal(122) / Decimal("30.44"))
+    ).quantize(Decimal("0.0001"))
+
+
+@pytest.mark.requires_postgres
+def test_range_keeps_delta_from_the_molt_before_it(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    inv = _invert_with_molts(db_session, user, [
+        (d, None, Decimal(str(2 + d / 100))) for d in range(0, 400, 40)
+    ])
+
+    response = client.get(
+        f"/api/v1/inverts/{inv.id}/growth",
+        params={"start": (T0 + timedelta(days=100)).isoformat()},
+        headers=auth_headers,
+    )
+    body = response.json()
+    first = body["data_points"][0]
+    assert first["days_since_previous"] == 40  # from the day-80 molt, out of range
+    assert body["total_molts"] == 7            # days 120 … 360
+
+
+@pytest.mark.requires_postgres
+def test_downsampled_growth_keeps_full_summary(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    inv = _invert_with_molts(db_session, user, [
+        (d * 10, None, Decimal(str(1 + d / 10))) for d in range(60)
+    ])
+
+    body = client.get(
+        f"/api/v1/inverts/{inv.id}/growth", params={"max_points": 12}, headers=auth_headers,
+    ).json()
+    assert len(body["data_points"]) == 12
+    assert body["total_molts"] == 60
+    assert Decimal(body["total_leg_span_gain"]) == Decimal("5.90")
+
+
+# ── Weight trend (Postgres) ──────────────────────────────────────────────────
+
+@pytest.mark.requires_postgres
+def test_weight_trend_loss_matches_full_history_when_thinned(
+    client, db_session, test_user, auth_headers
+):
+    from app.models.animal import Animal
+    from app.models.reptile_species import ReptileSpecies
+    from app.models.weight_log import WeightLog
+    from app.services.snake_feeding_advisory import compute_weight_loss_30d
+
+    user, _ = test_user
+    name = f"Python regius {uuid.uuid4().hex[:6]}"
+    species = ReptileSpecies(
+        scientific_name=name, scientific_name_lower=name.lower(),
+        slug=f"pr-{uuid.uuid4().hex[:8]}", weight_loss_concern_pct_30d=Decimal("5.0"),
+    )
+    db_session.add(species)
+    db_session.flush()
+    animal = Animal(user_id=user.id, taxon="snake", name="Monty", herp_species_id=species.id)
+    db_session.add(animal)
+    db_session.flush()
+
+    history = []
+    for week in range(300):
+        weight = Decimal(1000 + week * 2)
+        if week >= 296:  # a sharp drop over the last month
+            weight = Decimal(1500 - (week - 295) * 40)
+        at = T0 + timedelta(weeks=week)
+        history.append((at, weight))
+        db_session.add(WeightLog(animal_id=animal.id, weighed_at=at, weight_g=weight))
+    db_session.commit()
+
+    response = client.get(
+        f"/api/v1/animals/{animal.id}/weight-logs/trend",
+        params={"max_points": 40},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert len(body["series"]) == 40
+    assert body["total_points"] == 300
+    assert Decimal(body["series"][1]["change_g"]) == Decimal("2.00")  # vs the real previous weigh-in
+    assert Decimal(body["latest_weight_g"]) == history[-1][1]
+    assert Decimal(body["loss_pct_30d"]) == compute_weight_loss_30d(history)
+    assert body["alert"] is True
+
+    ranged = client.get(
+        f"/api/v1/animals/{animal.id}/weight-logs/trend",
+        params={"end": (T0 + timedelta(weeks=10)).isoformat()},
+        headers=auth_headers,
+    ).json()
+    assert ranged["total_points"] == 11
+    assert ranged["loss_pct_30d"] == body["loss_pct_30d"]
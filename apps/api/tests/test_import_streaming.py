@@ -0,0 +1,182 @@
+"""Streaming collection import (services/import_service.py).
+
+The importer used to hold a breeder's whole spreadsheet in memory several
+times over and resolve species with a query or two per row. It now streams
+rows, resolves species a chunk at a time, and commits in chunks — optionally
+from a background job. What these tests pin:
+
+  - parsing is lazy and loses nothing (header row, BOM, blank XLSX rows)
+  - resolving a species column costs no queries past the catalog index load
+  - a background job imports the file and reports progress per chunk
+"""
+from __future__ import annotations
+
+import io
+import json
+import types
+import uuid
+
+import openpyxl
+import pytest
+from sqlalchemy import event
+
+from app.services import import_service
+
+
+# ── Parsing ──────────────────────────────────────────────────────────────────
+
+def test_csv_rows_are_streamed_not_materialized():
+    content = "﻿Name,Species\nRosie,Grammostola rosea\nBlue,Chromatopelma cyaneopubescens\n".encode()
+    headers, rows = import_service.iter_rows(content, "collection.csv")
+
+    assert headers == ["Name", "Species"]  # BOM stripped off the first header
+    assert isinstance(rows, types.GeneratorType)
+    assert next(rows) == {"Name": "Rosie", "Species": "Grammostola rosea"}
+    assert [r["Name"] for r in rows] == ["Blue"]
+
+
+def test_xlsx_is_read_in_read_only_mode_and_skips_blank_rows():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Name", None, "Sex"])
+    ws.append(["Rosie", "x", "F"])
+    ws.append([None, None, None])
+    ws.append(["Blue", None, "M"])
+    buf = io.BytesIO()
+    wb.save(buf)
+
+    headers, rows = import_service.iter_rows(buf.getvalue(), "collection.xlsx")
+    assert headers == ["Name", "Column 2", "Sex"]
+    assert [r["Name"] for r in rows] == ["Rosie", "Blue"]
+
+
+def test_peek_keeps_sampled_rows_in_the_stream():
+    rows = ({"n": i} for i in range(100))
+    sample, rest = import_service.peek_rows(rows, 40)
+
+    assert len(sample) == 40
+    assert [r["n"] for r in rest] == list(range(100))
+
+
+def test_chunked_yields_every_row_once():
+    chunks = list(import_service.chunked(({"n": i} for i in range(7)), 3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+
+
+# ── Against Postgres ─────────────────────────────────────────────────────────
+
+def _species(db_session, name: str):
+    from app.models.invert_species import InvertSpecies
+
+    sp = InvertSpecies(
+        taxon="tarantula",
+        scientific_name=name,
+        scientific_name_lower=name.lower(),
+        slug=f"{name.lower().replace(' ', '-')}-{uuid.uuid4().hex[:6]}",
+    )
+    db_session.add(sp)
+    db_session.flush()
+    return sp
+
+
+@pytest.fixture(autouse=True)
+def _fresh_catalog_index():
+    """The catalog index is process-wide; species created inside one test's
+    transaction must not leak into (or be missing from) the next."""
+    from app.services import species_resolver
+
+    species_resolver.invalidate()
+    yield
+    species_resolver.invalidate()
+
+
+@pytest.mark.requires_postgres
+def test_species_column_resolves_without_per_row_queries(db_session):
+    from app.models.invert_species import InvertSpecies
+    from app.services.species_resolver import SpeciesResolver
+
+    rosea = _species(db_session, "Grammostola rosea")
+    hamorii = _species(db_session, "Brachypelma hamorii")
+
+    statements = []
+
+    @event.listens_for(db_session.get_bind(), "before_cursor_execute")
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    try:
+        resolver = SpeciesResolver(db_session, InvertSpecies)
+        column = [
+            "Grammostola rosea",
+            "GRAMMOSTOLA ROSEA",                     # same key
+            "Brachypelma hamorii (Tesmoingt 1997)",  # authority suffix
+            "Nonexistent species",
+            None,
+        ] * 1000
+        resolved = resolver.resolve_many(column)
+        assert len(statements) == 1  # the index load, nothing per row
+
+        assert resolved["grammostola rosea"].entry.id == rosea.id
+        assert resolved["brachypelma hamorii (tesmoingt 1997)"].entry.id == hamorii.id
+        assert resolved["nonexistent species"] is None
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", _count)
+
+
+@pytest.mark.requires_postgres
+def test_background_job_imports_in_chunks_and_reports_progress(
+    client, db_session, test_user, auth_headers, monkeypatch
+):
+    from app.models.invert import Invert
+
+    user, _ = test_user
+    _species(db_session, "Grammostola rosea")
+    db_session.commit()
+    monkeypatch.setattr(import_service, "CHUNK_SIZE", 2)
+
+    csv_body = "Name,Species\n" + "".join(
+        f"T{i},Grammostola rosea\n" for i in range(5)
+    )
+    response = client.post(
+        "/api/v1/import/jobs",
+        files={"file": ("big.csv", csv_body.encode(), "text/csv")},
+        data={"mapping": json.dumps({"Name": "name", "Species": "scientific_name"})},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+
+    # TestClient runs background tasks before returning, so the job is done.
+    job = client.get(f"/api/v1/import/jobs/{job_id}", headers=auth_headers).json()
+    assert job["status"] == "succeeded", job
+    assert job["total_rows"] == 5
+    assert job["processed_rows"] == 5
+    assert job["imported"] == 5
+
+    db_session.expire_all()
+    imported = db_session.query(Invert).filter(Invert.user_id == user.id).all()
+    assert len(imported) == 5
+    assert all(inv.species_id is not None for inv in imported)
+
+
+@pytest.mark.requires_postgres
+def test_unknown_import_job_is_404(client, db_session, test_user, auth_headers):
+    response = client.get(f"/api/v1/import/jobs/{uuid.uuid4()}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.requires_postgres
+def test_analyze_counts_every_row_past_the_sample(db_session, test_user, monkeypatch):
+    user, _ = test_user
+    _species(db_session, "Grammostola rosea")
+    monkeypatch.setattr(import_service, "CHUNK_SIZE", 7)
+
+    csv_body = "Name,Species\n" + "".join(
+        f"T{i},{'Grammostola rosea' if i % 2 else 'Unknown thing'}\n" for i in range(60)
+    )
+    result = import_service.analyze(db_session, user, csv_body.encode(), "sheet.csv")
+
+    assert result["row_count"] == 60
+    assert result["summary"]["new"] == 60
+    assert result["summary"]["species_matched"] == 30
+    assert len(result["preview"]) == 20
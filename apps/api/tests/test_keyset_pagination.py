@@ -0,0 +1,152 @@
+"""Cursor pagination (utils/pagination.py) on the forum and keeper lists.
+
+What these pin:
+
+  - cursors round-trip their key values and a tampered one is a 400
+  - following next_cursor walks every thread exactly once, pinned first,
+    newest first, with no OFFSET and no COUNT (Postgres)
+  - the popular sort pages by view count the same way (Postgres)
+  - posts page oldest first and report the thread's cached post_count
+    (Postgres)
+  - the keeper directory hands its cursor back in X-Next-Cursor (Postgres)
+  - `page` still works for older clients (Postgres)
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.forum import ForumCategory, ForumPost, ForumThread
+from app.models.user import User
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+# ── Cursors ──────────────────────────────────────────────────────────────────
+
+def test_cursors_round_trip():
+    when = datetime(2026, 10, 19, 12, 30, 15, 123456)
+    cursor = encode_cursor([True, when, 42])
+    assert decode_cursor(cursor, (bool, datetime, int)) == [True, when, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1, 2]), encode_cursor(["1", "x", 3])])
+def test_a_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as raised:
+        decode_cursor(cursor, (bool, datetime, int))
+    assert raised.value.status_code == 400
+
+
+# ── Forum ────────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def category(db_session, test_user):
+    user, _ = test_user
+    category = ForumCategory(name="Paging", slug=f"paging-{uuid.uuid4().hex[:8]}", thread_count=23)
+    db_session.add(category)
+    db_session.flush()
+    start = datetime(2026, 1, 1)
+    db_session.add_all([
+        ForumThread(
+            category_id=category.id, author_id=user.id, title=f"T{n}", slug=f"t{n}",
+            is_pinned=n in (3, 17), view_count=n % 5,
+            # Pairs share a timestamp so the id tie-break is exercised.
+            created_at=start, updated_at=start + timedelta(hours=n // 2),
+        )
+        for n in range(23)
+    ])
+    db_session.commit()
+    return category
+
+
+def _walk(client, path, key, **params):
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        body = client.get(path, params=query).json()
+        seen.extend(body[key])
+        pages += 1
+        cursor = body["next_cursor"]
+        assert body["has_more"] is (cursor is not None)
+        if cursor is None:
+            return seen, pages, body
+
+
+@pytest.mark.requires_postgres
+def test_threads_page_by_cursor(client, category, assert_max_queries):
+    path = f"/api/v1/forums/categories/{category.slug}/threads"
+    with assert_max_queries(30) as stats:
+        threads, pages, last = _walk(client, path, "threads", limit=5)
+    assert pages == 5
+    assert last["total"] == 23
+    assert not [s for s in stats.statements if "OFFSET" in s.upper() or "count(" in s]
+
+    assert len({t["id"] for t in threads}) == 23
+    expected = sorted(threads, key=lambda t: (t["is_pinned"], t["updated_at"], t["id"]), reverse=True)
+    assert threads == expected
+    assert [t["title"] for t in threads[:2]] == ["T17", "T3"]
+
+
+@pytest.mark.requires_postgres
+def test_popular_threads_page_by_views(client, category):
+    path = f"/api/v1/forums/categories/{category.slug}/threads"
+    threads, _, _ = _walk(client, path, "threads", limit=4, sort="popular")
+    assert len({t["id"] for t in threads}) == 23
+    assert threads == sorted(threads, key=lambda t: (t["view_count"], t["id"]), reverse=True)
+
+
+@pytest.mark.requires_postgres
+def test_posts_page_oldest_first(client, db_session, category, test_user):
+    user, _ = test_user
+    thread = db_session.query(ForumThread).filter_by(category_id=category.id).first()
+    start = datetime(2026, 2, 1)
+    db_session.add_all([
+        ForumPost(thread_id=thread.id, author_id=user.id, content=f"p{n}",
+                  created_at=start + timedelta(minutes=n // 3))
+        for n in range(12)
+    ])
+    thread.post_count = 12
+    db_session.commit()
+
+    posts, pages, last = _walk(client, f"/api/v1/forums/threads/{thread.id}/posts", "posts", limit=5)
+    assert pages == 3
+    assert last["total"] == 12
+    assert posts == sorted(posts, key=lambda p: (p["created_at"], p["id"]))
+    assert len({p["id"] for p in posts}) == 12
+
+
+@pytest.mark.requires_postgres
+def test_page_numbers_still_work(client, category):
+    path = f"/api/v1/forums/categories/{category.slug}/threads"
+    walked, _, _ = _walk(client, path, "threads", limit=5)
+    second = client.get(path, params={"limit": 5, "page": 2}).json()
+    assert second["threads"] == walked[5:10]
+
+
+# ── Keeper directory ─────────────────────────────────────────────────────────
+
+@pytest.mark.requires_postgres
+def test_keepers_page_by_cursor_header(client, db_session):
+    tag = uuid.uuid4().hex[:8]
+    start = datetime(2026, 3, 1)
+    db_session.add_all([
+        User(
+            email=f"dir-{n}-{tag}@test.local", username=f"dir_{n}_{tag}",
+            collection_visibility="public", created_at=start + timedelta(days=n // 2),
+        )
+        for n in range(7)
+    ])
+    db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"search": tag, "limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/keepers/", params=params)
+        seen.extend(k["username"] for k in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 7
+    assert seen[0].startswith("dir_6_") or seen[0].startswith("dir_5_")
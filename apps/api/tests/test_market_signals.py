@@ -0,0 +1,173 @@
+"""Materialized market signals (services/market_signals.py).
+
+Collection valuation reads stored signals with one join instead of
+re-scoring every tarantula's reports. What these pin:
+
+  - a stored signal is exactly what estimate_price returns, at every
+    honesty tier: insufficient (<5), emerging (5–11, no band), observed
+  - adult groups stay split by sex; sling/juvenile groups don't
+  - valuation of a whole collection is one statement once rows are fresh,
+    and totals match the per-animal estimator
+  - deleting a report through the API refreshes its group
+  - a row computed before today is rescored on read
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import asdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models.market_signal import MarketSignalSnapshot
+from app.services import market_signals
+from app.utils.pricing_estimator import PricingEstimator
+
+pytestmark = pytest.mark.requires_postgres
+
+
+def _species(db):
+    from app.models.species import Species
+
+    name = f"Brachypelma test{uuid.uuid4().hex[:8]}"
+    species = Species(scientific_name=name, scientific_name_lower=name.lower())
+    db.add(species)
+    db.commit()
+    return species
+
+
+def _reports(db, species, size_category, prices, sex=None):
+    from app.models.pricing_submission import PricingSubmission
+    from app.models.user import User
+
+    for index, price in enumerate(prices):
+        user = User(
+            email=f"mks-{uuid.uuid4().hex[:10]}@test.local",
+            username=f"mks_{uuid.uuid4().hex[:10]}",
+            hashed_password="x",
+        )
+        db.add(user)
+        db.flush()
+        db.add(PricingSubmission(
+            user_id=user.id,
+            species_id=species.id,
+            size_category=size_category,
+            sex=sex,
+            price_paid=Decimal(price),
+            purchase_date=date.today() - timedelta(days=index + 1),
+            vendor_name=f"Vendor {index}",
+            is_public=True,
+        ))
+    db.commit()
+
+
+def _tarantula(db, user, species, life_stage, sex="unknown"):
+    from app.models.tarantula import LifeStage, Sex, Tarantula
+
+    tarantula = Tarantula(
+        user_id=user.id, species_id=species.id, name="T",
+        life_stage=LifeStage(life_stage), sex=Sex(sex),
+    )
+    db.add(tarantula)
+    db.commit()
+    return tarantula
+
+
+@pytest.mark.parametrize("prices, status", [
+    (["100", "110", "120", "130"], "insufficient_evidence"),
+    ([str(90 + 10 * i) for i in range(7)], "emerging_evidence"),
+    ([str(90 + 5 * i) for i in range(13)] + ["10000"], "observed_range"),
+])
+def test_stored_signal_is_exactly_the_estimator_output(db_session, prices, status):
+    species = _species(db_session)
+    _reports(db_session, species, "juvenile", prices)
+
+    live = PricingEstimator(db_session).estimate_price(str(species.id), "juvenile")
+    stored = market_signals.get_signal(db_session, str(species.id), "juvenile")
+    assert db_session.get(MarketSignalSnapshot, (species.id, "juvenile", "any")) is not None
+    again = market_signals.get_signal(db_session, str(species.id), "juvenile")
+
+    assert live.evidence_status == status
+    assert asdict(stored) == asdict(live) == asdict(again)
+
+
+def test_adult_groups_are_split_by_sex(db_session):
+    species = _species(db_session)
+    _reports(db_session, species, "adult", [str(200 + i) for i in range(12)], sex="female")
+
+    female = market_signals.get_signal(db_session, str(species.id), "adult", "female")
+    unsexed = market_signals.get_signal(db_session, str(species.id), "adult", None)
+    assert female.evidence_status == "observed_range"
+    assert unsexed.evidence_status == "insufficient_evidence"
+
+
+def test_collection_is_one_statement_once_fresh(db_session, test_user):
+    user, _ = test_user
+    banded, sparse = _species(db_session), _species(db_session)
+    _reports(db_session, banded, "juvenile", [str(90 + 5 * i) for i in range(12)])
+    _reports(db_session, banded, "adult", [str(300 + i) for i in range(12)], sex="female")
+    _reports(db_session, sparse, "juvenile", ["50", "60"])
+    _tarantula(db_session, user, banded, "juvenile")
+    _tarantula(db_session, user, banded, "juvenile", sex="male")  # sex ignored for juveniles
+    _tarantula(db_session, user, banded, "adult", sex="female")
+    _tarantula(db_session, user, banded, "adult", sex="male")      # no male reports
+    _tarantula(db_session, user, sparse, "juvenile")
+
+    user_id = user.id
+    first = market_signals.collection_signals(db_session, user_id)  # scores and stores
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        valued = market_signals.collection_signals(db_session, user_id)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+    estimator = PricingEstimator(db_session)
+    live = [
+        (t, estimator.estimate_price(str(t.species_id), t.life_stage.value, t.sex.value))
+        for t, _ in valued
+    ]
+    totals = estimator.calculate_collection_value(valued)[:3]
+    assert totals == estimator.calculate_collection_value(live)[:3]
+    assert totals[2] == estimator.calculate_collection_value(first)[2] == 3
+
+
+def test_deleting_a_report_refreshes_its_group(client, db_session, test_user, auth_headers):
+    from app.models.pricing_submission import PricingSubmission
+
+    user, _ = test_user
+    species = _species(db_session)
+    _reports(db_session, species, "sling", [str(20 + i) for i in range(4)])
+    own = PricingSubmission(
+        user_id=user.id, species_id=species.id, size_category="sling",
+        price_paid=Decimal("25.00"), purchase_date=date.today(), is_public=True,
+    )
+    db_session.add(own)
+    db_session.commit()
+    assert market_signals.get_signal(db_session, str(species.id), "sling").contributor_count == 5
+
+    response = client.delete(f"/api/v1/pricing/submissions/{own.id}", headers=auth_headers)
+    assert response.status_code == 204, response.text
+
+    row = db_session.get(MarketSignalSnapshot, (species.id, "sling", "any"))
+    assert (row.contributor_count, row.evidence_status) == (4, "insufficient_evidence")
+
+
+def test_a_row_from_yesterday_is_rescored_on_read(db_session):
+    species = _species(db_session)
+    _reports(db_session, species, "juvenile", [str(90 + 5 * i) for i in range(12)])
+    market_signals.get_signal(db_session, str(species.id), "juvenile")
+
+    row = db_session.get(MarketSignalSnapshot, (species.id, "juvenile", "any"))
+    row.computed_on = date.today() - timedelta(days=1)
+    row.contributor_count = 999
+    db_session.commit()
+
+    assert market_signals.get_signal(db_session, str(species.id), "juvenile").contributor_count == 12
+    assert market_signals.refresh_all(db_session) >= 1
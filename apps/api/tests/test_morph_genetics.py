@@ -0,0 +1,166 @@
+"""Server-side morph genetics engine.
+
+The numbers here are the ones keepers quote from memory — het × het is a
+quarter visual and "66% het", a super of a lethal co-dom never hatches. If
+the engine and the web calculator ever disagree on these, the engine is
+the one that's wrong.
+"""
+from itertools import product
+
+import pytest
+
+from app.services.morph_genetics import (
+    GeneInfo,
+    allele_pass_probability,
+    best_pass_probability,
+    build_loci,
+    predict_pairing,
+    punnett_from_pass,
+)
+
+
+PIED = GeneInfo(gene_id="pied", name="Pied", gene_type="recessive")
+CLOWN = GeneInfo(gene_id="clown", name="Clown", gene_type="recessive")
+PASTEL = GeneInfo(gene_id="pastel", name="Pastel", gene_type="codominant")
+SPIDER = GeneInfo(
+    gene_id="spider",
+    name="Spider",
+    gene_type="dominant",
+    welfare_flag="neurological",
+)
+SPOTNOSE = GeneInfo(
+    gene_id="spotnose",
+    name="Spotnose",
+    gene_type="codominant",
+    lethal_homozygous=True,
+)
+
+
+def _by_label(prediction):
+    return {o.label: o for o in prediction.outcomes}
+
+
+# ── Per-parent inputs ────────────────────────────────────────────────────────
+
+def test_pass_probability_matches_calculator_vocabulary():
+    assert allele_pass_probability("het", "recessive") == 0.5
+    assert allele_pass_probability("visual", "recessive") == 1.0
+    assert allele_pass_probability("visual", "codominant") == 0.5
+    assert allele_pass_probability("super", "codominant") == 1.0
+    assert allele_pass_probability(None, "recessive") == 0.0
+
+
+def test_poss_het_blends_carrier_odds_with_mendelian_odds():
+    assert allele_pass_probability("poss_het", "recessive", 66) == pytest.approx(0.33)
+
+
+def test_duplicate_rows_collapse_to_strongest_claim():
+    rows = [("poss_het", 50), ("het", None)]
+    assert best_pass_probability(rows, "recessive") == 0.5
+
+
+# ── Single locus ─────────────────────────────────────────────────────────────
+
+def test_het_by_het_recessive_is_quarter_visual_and_66_percent_het():
+    loci = build_loci([PIED], {"pied": 0.5}, {"pied": 0.5})
+    outcomes = _by_label(predict_pairing(loci))
+
+    assert outcomes["Pied"].probability == pytest.approx(0.25)
+    assert outcomes["Normal"].probability == pytest.approx(0.75)
+    assert outcomes["Normal"].poss_hets["Pied"] == pytest.approx(200 / 3)
+    # A visual can't also be a poss-het for the same gene.
+    assert "Pied" not in outcomes["Pied"].poss_hets
+
+
+def test_codominant_pairing_produces_super_form():
+    loci = build_loci([PASTEL], {"pastel": 0.5}, {"pastel": 0.5})
+    outcomes = _by_label(predict_pairing(loci))
+
+    assert outcomes["Super Pastel"].probability == pytest.approx(0.25)
+    assert outcomes["Pastel"].probability == pytest.approx(0.5)
+
+
+def test_lethal_super_is_flagged_and_sorted_last():
+    loci = build_loci([SPOTNOSE], {"spotnose": 0.5}, {"spotnose": 0.5})
+    prediction = predict_pairing(loci)
+
+    assert prediction.outcomes[-1].label == "Super Spotnose"
+    assert prediction.outcomes[-1].is_lethal
+    assert prediction.lethal_probability == pytest.approx(0.25)
+
+
+def test_lethal_dominant_homozygote_is_not_merged_into_single_copy_form():
+    gene = GeneInfo(
+        gene_id="dom", name="Dom", gene_type="dominant", lethal_homozygous=True
+    )
+    loci = build_loci([gene], {"dom": 0.5}, {"dom": 0.5})
+    lethal = [o for o in predict_pairing(loci).outcomes if o.is_lethal]
+
+    assert len(lethal) == 1
+    assert lethal[0].probability == pytest.approx(0.25)
+
+
+def test_welfare_probability_counts_any_visible_copy_of_a_dominant():
+    loci = build_loci([SPIDER], {"spider": 0.5}, {})
+    prediction = predict_pairing(loci)
+
+    assert prediction.welfare_probability == pytest.approx(0.5)
+    assert _by_label(prediction)["Spider"].welfare_flags == ["neurological"]
+
+
+def test_genes_neither_parent_carries_are_dropped():
+    loci = build_loci([PIED, CLOWN], {"pied": 0.5}, {})
+    assert [locus.gene.name for locus in loci] == ["Pied"]
+
+
+# ── Multi-locus ──────────────────────────────────────────────────────────────
+
+def test_multi_locus_matches_brute_force_cross_product():
+    """The collapsed, folded distribution must equal enumerating every
+    genotype vector and grouping by what the offspring looks like."""
+    genes = [PIED, PASTEL, SPIDER, CLOWN]
+    male = {"pied": 0.5, "pastel": 0.5, "spider": 0.5, "clown": 1.0}
+    female = {"pied": 1.0, "pastel": 0.5, "clown": 0.5}
+    loci = build_loci(genes, male, female)
+
+    expected = {}
+    dists = [punnett_from_pass(locus.male_pass, locus.female_pass) for locus in loci]
+    for counts in product(range(3), repeat=len(loci)):
+        p = 1.0
+        labels = []
+        for locus, dist, c in zip(loci, dists, counts):
+            p *= dist[c]
+            g = locus.gene
+            if c == 0 or (g.gene_type == "recessive" and c == 1):
+                continue
+            labels.append(f"Super {g.name}" if g.gene_type == "codominant" and c == 2 else g.name)
+        if p:
+            label = " ".join(labels) or "Normal"
+            expected[label] = expected.get(label, 0.0) + p
+
+    got = {o.label: o.probability for o in predict_pairing(loci, max_outcomes=None).outcomes}
+    assert got.keys() == expected.keys()
+    for label, p in expected.items():
+        assert got[label] == pytest.approx(p)
+
+
+def test_twenty_flat_loci_still_return_outcomes_and_report_pruned_mass():
+    genes = [
+        GeneInfo(gene_id=f"g{i}", name=f"Gene{i:02d}", gene_type="recessive")
+        for i in range(20)
+    ]
+    passes = {g.gene_id: 1.0 for g in genes}
+    loci = build_loci(genes, passes, {g.gene_id: 0.5 for g in genes})
+    prediction = predict_pairing(loci)
+
+    # Every outcome is 2^-20 — all below the floor, so only the beam survives.
+    assert prediction.outcomes
+    assert prediction.pruned_probability > 0.9
+    # Marginals are exact regardless of pruning.
+    assert prediction.expected_visual_genes == pytest.approx(10.0)
+
+
+def test_no_loci_means_all_normal():
+    prediction = predict_pairing(())
+    assert [o.label for o in prediction.outcomes] == ["Normal"]
+    assert prediction.outcomes[0].probability == 1.0
@@ -0,0 +1,176 @@
+"""Async object stores (services/object_store.py).
+
+The S3 store runs against FakeS3 below: an in-process, S3-compatible
+endpoint mounted as the client's httpx transport, which re-derives every
+request's SigV4 signature from what actually went over the wire.
+
+What these pin:
+
+  - the local store round-trips puts, existence and deletes, and a
+    missing object deletes quietly
+  - S3 requests are signed as sent — a key needing URL escaping included
+  - small bodies are one PUT with the long cache header; large ones are
+    a multipart upload whose parts go up in parallel and reassemble in
+    order
+  - a failed part aborts the multipart upload and raises
+  - exists() tells 404 from other failures
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import uuid
+from xml.etree import ElementTree
+
+import httpx
+import pytest
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+
+from app.services.object_store import MIB, LocalObjectStore, ObjectStoreError, S3ObjectStore
+
+CREDENTIALS = Credentials("test-key", "test-secret")
+
+
+class FakeS3:
+    """Just enough of S3 for the store: objects, multipart uploads, SigV4."""
+
+    def __init__(self, fail_part=None):
+        self.objects = {}
+        self.headers = {}
+        self.uploads = {}
+        self.aborted = []
+        self.in_flight = self.most_in_flight = 0
+        self.fail_part = fail_part
+
+    def _verify(self, request: httpx.Request) -> None:
+        received = request.headers["authorization"]
+        signed = re.search(r"SignedHeaders=([^,]+)", received).group(1).split(";")
+        check = AWSRequest(
+            method=request.method, url=str(request.url), data=request.content,
+            headers={name: request.headers[name] for name in signed if name != "host"},
+        )
+        check.context["timestamp"] = request.headers["x-amz-date"]
+        auth = S3SigV4Auth(CREDENTIALS, "s3", "auto")
+        signature = auth.signature(auth.string_to_sign(check, auth.canonical_request(check)), check)
+        assert received.endswith(f"Signature={signature}"), "signature doesn't match the request sent"
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._verify(request)
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return self._handle(request)
+        finally:
+            self.in_flight -= 1
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        key = request.url.path.split("/", 2)[2]
+        params = request.url.params
+        method = request.method
+        if method == "POST" and "uploads" in params:
+            upload_id = f"up/{uuid.uuid4()}"  # needs escaping in the query
+            self.uploads[upload_id] = {}
+            self.headers[key] = dict(request.headers)
+            return httpx.Response(200, text=(
+                '<InitiateMultipartUploadResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            ))
+        if "uploadId" in params:
+            parts = self.uploads[params["uploadId"]]
+            if method == "PUT":
+                number = int(params["partNumber"])
+                if number == self.fail_part:
+                    return httpx.Response(500, text="<Error>InternalError</Error>")
+                parts[number] = request.content
+                return httpx.Response(200, headers={"ETag": f'"etag-{number}"'})
+            if method == "DELETE":
+                self.aborted.append(params["uploadId"])
+                return httpx.Response(204)
+            listed = [int(p.text) for p in ElementTree.fromstring(request.content).iter("PartNumber")]
+            self.objects[key] = b"".join(parts[n] for n in listed)
+            return httpx.Response(200, text="<CompleteMultipartUploadResult/>")
+        if method == "PUT":
+            self.objects[key] = request.content
+            self.headers[key] = dict(request.headers)
+            return httpx.Response(200)
+        if method == "HEAD":
+            if key == "broken":
+                return httpx.Response(403)
+            return httpx.Response(200 if key in self.objects else 404)
+        if method == "DELETE":
+            self.objects.pop(key, None)
+            return httpx.Response(204)
+        return httpx.Response(405)
+
+
+def _store(fake, **kwargs):
+    return S3ObjectStore(
+        "https://account.r2.example", "bucket", CREDENTIALS.access_key, CREDENTIALS.secret_key,
+        "https://cdn.example", transport=httpx.MockTransport(fake), **kwargs,
+    )
+
+
+# ── Local ────────────────────────────────────────────────────────────────────
+
+def test_the_local_store_round_trips(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = LocalObjectStore()
+
+    async def scenario():
+        url = await store.put("photos/a b.jpg", b"data", "image/jpeg")
+        assert url == "/uploads/photos/a b.jpg" and store.key_for(url) == "photos/a b.jpg"
+        assert await store.exists("photos/a b.jpg")
+        await store.delete("photos/a b.jpg")
+        await store.delete("photos/a b.jpg")
+        assert not await store.exists("photos/a b.jpg")
+
+    asyncio.run(scenario())
+
+
+# ── S3 ───────────────────────────────────────────────────────────────────────
+
+def test_a_small_body_is_one_signed_put():
+    fake = FakeS3()
+    store = _store(fake)
+
+    async def scenario():
+        url = await store.put("photos/space & plus+.jpg", b"x" * 1000, "image/jpeg")
+        assert url == "https://cdn.example/photos/space & plus+.jpg"
+        assert await store.exists("photos/space & plus+.jpg")
+        assert not await store.exists("photos/missing.jpg")
+        await store.delete("photos/space & plus+.jpg")
+
+    asyncio.run(scenario())
+    assert fake.objects == {}
+    headers = fake.headers["photos/space & plus+.jpg"]
+    assert headers["cache-control"] == "public, max-age=31536000"
+    assert headers["content-type"] == "image/jpeg"
+
+
+def test_a_large_body_goes_up_in_parallel_parts():
+    fake = FakeS3()
+    store = _store(fake, multipart_threshold=8 * MIB, part_size=5 * MIB)
+    body = bytes(range(256)) * (17 * MIB // 256)  # four parts, the last short
+
+    asyncio.run(store.put("photos/big.jpg", body, "image/jpeg"))
+    assert fake.objects["photos/big.jpg"] == body
+    assert fake.most_in_flight == 4
+    assert fake.headers["photos/big.jpg"]["cache-control"] == "public, max-age=31536000"
+
+
+def test_a_failed_part_aborts_the_upload():
+    fake = FakeS3(fail_part=2)
+    store = _store(fake, multipart_threshold=8 * MIB, part_size=5 * MIB)
+
+    with pytest.raises(ObjectStoreError, match="part 2"):
+        asyncio.run(store.put("photos/big.jpg", b"\0" * (12 * MIB), "image/jpeg"))
+    assert fake.aborted == list(fake.uploads)
+    assert "photos/big.jpg" not in fake.objects
+
+
+def test_exists_only_swallows_not_found():
+    with pytest.raises(ObjectStoreError, match="HTTP 403"):
+        asyncio.run(_store(FakeS3()).exists("broken"))
@@ -0,0 +1,245 @@
+"""Shared, reference-counted photo objects (services/photo_blobs.py).
+
+What these pin:
+
+  - an object is freed by the release of its last user, and an object
+    that was never shared by its first
+  - a claim gives the buyer photo rows over the seller's objects with no
+    storage calls, in one upsert for every object
+  - the seller deleting a shared photo deletes no files; the buyer
+    deleting theirs afterwards deletes all of them, after the commit
+  - uploading bytes already stored shares the stored objects instead of
+    encoding and storing them again, and stops matching once the photos
+    using them are gone
+  - claiming an animal with two rows over the same objects counts both,
+    so the objects outlive every row but the last
+  - a re-uploaded avatar is found by its hash and not encoded again
+
+All Postgres but the avatar.
+"""
+from __future__ import annotations
+
+import asyncio
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.models.animal_transfer import AnimalTransfer
+from app.models.invert import Invert
+from app.models.photo import Photo
+from app.models.photo_blob import PhotoBlob
+from app.models.user import User
+from app.services import photo_blobs
+from app.services.object_store import LocalObjectStore
+from app.services.storage import storage_service
+from app.utils.auth import create_access_token
+
+
+# ── Reference counts ─────────────────────────────────────────────────────────
+
+@pytest.mark.requires_postgres
+def test_an_object_is_freed_by_its_last_user(db_session):
+    shared, solo = f"/s-{uuid.uuid4()}.jpg", f"/o-{uuid.uuid4()}.jpg"
+    photo_blobs.share(db_session, [shared])
+    photo_blobs.share(db_session, [shared])  # three users now
+
+    assert photo_blobs.release(db_session, [shared, solo]) == [solo]
+    assert photo_blobs.release(db_session, [shared]) == []
+    assert photo_blobs.release(db_session, [shared]) == [shared]
+    assert db_session.get(PhotoBlob, shared) is None
+
+
+# ── Claims ───────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def deletes(monkeypatch):
+    deleted = []
+
+    async def delete_objects(urls):
+        deleted.extend(urls)
+
+    monkeypatch.setattr(storage_service, "delete_objects", delete_objects)
+    return deleted
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"}
+
+
+@pytest.fixture()
+def claimed(client, db_session, test_user, assert_max_queries):
+    seller, _ = test_user
+    buyer = User(email=f"buyer-{uuid.uuid4().hex[:8]}@test.local", username=f"buyer_{uuid.uuid4().hex[:8]}")
+    source = Invert(id=uuid.uuid4(), user_id=seller.id, taxon="tarantula", name="Rosie")
+    db_session.add_all([buyer, source])
+    db_session.flush()
+    start = datetime(2026, 10, 1)
+    db_session.add_all([
+        Photo(
+            invert_id=source.id, url=f"/p{n}.jpg", thumbnail_url=f"/t{n}.jpg",
+            width=1000, height=750, variants=[{"width": 320, "height": 240, "url": f"/p{n}_320w.jpg"}],
+            created_at=start + timedelta(days=n),
+        )
+        for n in range(5)
+    ])
+    transfer = AnimalTransfer(
+        token=secrets.token_urlsafe(32), invert_id=source.id, from_user_id=seller.id,
+        snapshot={}, include_photos=True, expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db_session.add(transfer)
+    db_session.commit()
+    buyer_headers = _headers(buyer)
+
+    with assert_max_queries(40) as stats:
+        response = client.post(f"/api/v1/transfers/{transfer.token}/claim", headers=buyer_headers)
+    assert response.status_code == 200, response.text
+    upserts = [s for s in stats.statements if "photo_blobs" in s]
+    assert len(upserts) == 1
+    return seller, buyer, uuid.UUID(response.json()["id"])
+
+
+@pytest.mark.requires_postgres
+def test_a_claim_shares_the_sellers_objects(db_session, claimed):
+    _, _, new_id = claimed
+    copies = db_session.query(Photo).filter(Photo.invert_id == new_id).order_by(Photo.url).all()
+    assert [p.url for p in copies] == [f"/p{n}.jpg" for n in range(5)]
+    assert copies[0].variants[0]["url"] == "/p0_320w.jpg"
+    assert db_session.get(Invert, new_id).photo_url == "/p4.jpg"  # most recent
+    assert {b.ref_count for b in db_session.query(PhotoBlob).filter(PhotoBlob.url.like("/p%"))} == {2}
+
+
+@pytest.mark.requires_postgres
+def test_files_go_with_the_last_photo_using_them(client, db_session, claimed, deletes):
+    seller, buyer, new_id = claimed
+    theirs = db_session.query(Photo).filter(Photo.url == "/p2.jpg", Photo.invert_id != new_id).one()
+    mine = db_session.query(Photo).filter(Photo.url == "/p2.jpg", Photo.invert_id == new_id).one()
+
+    assert client.delete(f"/api/v1/photos/{theirs.id}", headers=_headers(seller)).status_code == 200
+    assert deletes == []
+    assert client.delete(f"/api/v1/photos/{mine.id}", headers=_headers(buyer)).status_code == 200
+    assert sorted(deletes) == ["/p2.jpg", "/p2_320w.jpg", "/t2.jpg"]
+
+
+# ── Content dedup ────────────────────────────────────────────────────────────
+
+def _jpeg(width=900, height=600, colour=(30, 90, 60)):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), colour).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage_service, "store", LocalObjectStore())
+
+    stored = []
+    upload_photo = storage_service.upload_photo
+
+    async def counting(*args, **kwargs):
+        stored.append(args)
+        return await upload_photo(*args, **kwargs)
+
+    monkeypatch.setattr(storage_service, "upload_photo", counting)
+    return stored
+
+
+def _upload(client, invert, data, headers):
+    response = client.post(
+        f"/api/v1/inverts/{invert.id}/photos",
+        files={"file": ("same.jpg", data, "image/jpeg")},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.requires_postgres
+def test_the_same_bytes_are_stored_once(client, db_session, test_user, auth_headers, local_storage, deletes):
+    user, _ = test_user
+    first, second = (Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name=n) for n in "AB")
+    db_session.add_all([first, second])
+    db_session.commit()
+    data = _jpeg()
+
+    one = _upload(client, first, data, auth_headers)
+    two = _upload(client, second, data, auth_headers)
+    assert len(local_storage) == 1
+    assert (two["url"], two["thumbnail_url"], two["srcset"]) == (one["url"], one["thumbnail_url"], one["srcset"])
+    assert db_session.get(PhotoBlob, one["url"]).ref_count == 2
+
+    client.delete(f"/api/v1/photos/{one['id']}", headers=auth_headers)
+    assert deletes == []
+    client.delete(f"/api/v1/photos/{two['id']}", headers=auth_headers)
+    assert sorted(deletes) == sorted([two["url"], two["thumbnail_url"], *(v["url"] for v in two["variants"])])
+    db_session.expire_all()
+    assert db_session.get(PhotoBlob, one["url"]) is None
+
+
+@pytest.mark.requires_postgres
+def test_a_hash_whose_photos_are_gone_stops_matching(client, db_session, test_user, auth_headers, local_storage):
+    user, _ = test_user
+    invert = Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name="Gone")
+    db_session.add(invert)
+    db_session.commit()
+    data = _jpeg(colour=(200, 10, 10))
+    first = _upload(client, invert, data, auth_headers)
+
+    # Deleting the animal cascades its photo rows without releasing them.
+    db_session.query(Photo).filter(Photo.invert_id == invert.id).delete()
+    db_session.commit()
+
+    again = _upload(client, invert, data, auth_headers)
+    assert len(local_storage) == 2 and again["url"] != first["url"]
+
+
+@pytest.mark.requires_postgres
+def test_a_claim_counts_every_row_over_shared_objects(
+    client, db_session, test_user, auth_headers, local_storage, deletes,
+):
+    seller, _ = test_user
+    buyer = User(email=f"buyer-{uuid.uuid4().hex[:8]}@test.local", username=f"buyer_{uuid.uuid4().hex[:8]}")
+    source = Invert(id=uuid.uuid4(), user_id=seller.id, taxon="tarantula", name="Twice")
+    db_session.add_all([buyer, source])
+    db_session.commit()
+    data = _jpeg(colour=(10, 10, 200))
+    first = _upload(client, source, data, auth_headers)
+    second = _upload(client, source, data, auth_headers)
+    assert second["url"] == first["url"] and len(local_storage) == 1
+
+    transfer = AnimalTransfer(
+        token=secrets.token_urlsafe(32), invert_id=source.id, from_user_id=seller.id,
+        snapshot={}, include_photos=True, expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db_session.add(transfer)
+    db_session.commit()
+    claim = client.post(f"/api/v1/transfers/{transfer.token}/claim", headers=_headers(buyer))
+    assert claim.status_code == 200, claim.text
+    assert db_session.get(PhotoBlob, first["url"]).ref_count == 4
+
+    rows = db_session.query(Photo).filter(Photo.url == first["url"]).all()
+    owners = {source.id: seller, uuid.UUID(claim.json()["id"]): buyer}
+    assert len(rows) == 4
+    for n, row in enumerate(rows, start=1):
+        response = client.delete(f"/api/v1/photos/{row.id}", headers=_headers(owners[row.invert_id]))
+        assert response.status_code == 200, response.text
+        assert bool(deletes) == (n == 4)
+    assert sorted(deletes) == sorted([first["url"], first["thumbnail_url"], *(v["url"] for v in first["variants"])])
+
+
+def test_a_reuploaded_avatar_is_not_encoded_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage_service, "store", LocalObjectStore())
+    crops = []
+    crop = storage_service._create_square_avatar
+    monkeypatch.setattr(storage_service, "_create_square_avatar", lambda *a, **k: crops.append(1) or crop(*a, **k))
+
+    data = _jpeg(400, 300)
+    first = asyncio.run(storage_service.upload_avatar(data, "me.jpg"))
+    second = asyncio.run(storage_service.upload_avatar(data, "me-again.jpg"))
+    assert first == second and len(crops) == 1
+    assert (tmp_path / first.lstrip("/")).exists()
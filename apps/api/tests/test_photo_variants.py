@@ -0,0 +1,187 @@
+"""Responsive photo variants (services/photo_variants.py) and the batched
+photo fetch (GET /photos/batch).
+
+What these pin:
+
+  - an upload is resized once to each variant width narrower than the
+    original, keeping its aspect ratio, and never upscaled
+  - dimensions are as displayed, after EXIF orientation
+  - srcset lists the variants then the original; photos from before
+    variants have none and list exactly as they used to
+  - an upload stores its dimensions and variants and returns them
+    (Postgres)
+  - the batch route groups photos by parent in two queries, keys every
+    owned parent, skips parents that aren't yours and trims to
+    `per_parent` in SQL (Postgres); it takes at most 500 ids
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.models.invert import Invert
+from app.models.photo import Photo
+from app.models.user import User
+from app.services.object_store import LocalObjectStore
+from app.services.photo_variants import photo_payload, render_variants, srcset
+from app.services.storage import storage_service
+from app.utils.auth import create_access_token
+
+
+def _jpeg(width, height, **save):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (120, 80, 40)).save(buffer, format="JPEG", **save)
+    return buffer.getvalue()
+
+
+# ── Rendering ────────────────────────────────────────────────────────────────
+
+def test_variants_are_the_narrower_widths_at_the_same_aspect():
+    width, height, variants = render_variants(_jpeg(1000, 750))
+    assert (width, height) == (1000, 750)
+    assert [(w, h) for w, h, _ in variants] == [(320, 240), (640, 480)]
+    for w, h, data in variants:
+        assert Image.open(BytesIO(data)).size == (w, h)
+
+
+def test_a_small_original_gets_no_variants():
+    assert render_variants(_jpeg(320, 200)) == (320, 200, [])
+
+
+def test_dimensions_follow_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90° clockwise to display
+    width, height, variants = render_variants(_jpeg(800, 400, exif=exif.tobytes()))
+    assert (width, height) == (400, 800)
+    assert [(w, h) for w, h, _ in variants] == [(320, 640)]
+
+
+# ── Payload ──────────────────────────────────────────────────────────────────
+
+def _photo(**fields):
+    base = dict(
+        id=uuid.uuid4(), url="/o.jpg", thumbnail_url="/t.jpg", caption=None,
+        taken_at=None, created_at=datetime(2026, 10, 19), width=None, height=None, variants=None,
+    )
+    return SimpleNamespace(**{**base, **fields})
+
+
+def test_srcset_lists_variants_then_the_original():
+    photo = _photo(width=1000, height=750, variants=[
+        {"width": 320, "height": 240, "url": "/a.jpg"},
+        {"width": 640, "height": 480, "url": "/b.jpg"},
+    ])
+    assert srcset(photo) == "/a.jpg 320w, /b.jpg 640w, /o.jpg 1000w"
+
+
+def test_older_photos_have_no_srcset():
+    payload = photo_payload(_photo())
+    assert payload["srcset"] is None and payload["variants"] == []
+    assert payload["url"] == "/o.jpg" and payload["thumbnail_url"] == "/t.jpg"
+
+
+# ── Endpoints (Postgres) ─────────────────────────────────────────────────────
+
+def _invert(db_session, user, name):
+    invert = Invert(id=uuid.uuid4(), user_id=user.id, taxon="tarantula", name=name)
+    db_session.add(invert)
+    db_session.flush()
+    return invert
+
+
+@pytest.mark.requires_postgres
+def test_an_upload_stores_its_variants(client, db_session, test_user, auth_headers, tmp_path, monkeypatch):
+    user, _ = test_user
+    invert = _invert(db_session, user, "Upload")
+    db_session.commit()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage_service, "store", LocalObjectStore())
+
+    response = client.post(
+        f"/api/v1/inverts/{invert.id}/photos",
+        files={"file": ("big.jpg", _jpeg(1600, 1200), "image/jpeg")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["width"], body["height"]) == (1600, 1200)
+    assert [(v["width"], v["height"]) for v in body["variants"]] == [(320, 240), (640, 480), (1280, 960)]
+    assert body["srcset"].endswith(f"{body['url']} 1600w")
+
+    stored = db_session.get(Photo, uuid.UUID(str(body["id"])))
+    assert stored.variants == body["variants"]
+    assert len(list((tmp_path / "uploads" / "photos").iterdir())) == 4  # original + 3
+
+
+@pytest.fixture()
+def gallery(db_session, test_user):
+    user, _ = test_user
+    start = datetime(2026, 10, 1)
+    inverts = [_invert(db_session, user, f"G{n}") for n in range(3)]
+    for n, invert in enumerate(inverts[:2]):
+        for k in range(3 + n):
+            db_session.add(Photo(
+                invert_id=invert.id, url=f"/{n}-{k}.jpg", thumbnail_url=f"/t{n}-{k}.jpg",
+                created_at=start + timedelta(days=k),
+            ))
+    db_session.commit()
+    return inverts
+
+
+@pytest.mark.requires_postgres
+def test_batch_groups_photos_by_parent(client, gallery, auth_headers, assert_max_queries):
+    ids = [str(i.id) for i in gallery]
+    with assert_max_queries(4):  # two for the route, two for auth
+        response = client.get(
+            "/api/v1/photos/batch",
+            params={"kind": "invert", "ids": ids + [str(uuid.uuid4())]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert set(body) == set(ids)
+    first, second, empty = (body[i] for i in ids)
+    assert [p["url"] for p in first] == ["/0-2.jpg", "/0-1.jpg", "/0-0.jpg"]
+    assert len(second) == 4 and empty == []
+
+
+@pytest.mark.requires_postgres
+def test_batch_trims_to_per_parent(client, gallery, auth_headers):
+    response = client.get(
+        "/api/v1/photos/batch",
+        params={"kind": "invert", "ids": [str(i.id) for i in gallery], "per_parent": 1},
+        headers=auth_headers,
+    )
+    body = response.json()
+    assert [p["url"] for p in body[str(gallery[0].id)]] == ["/0-2.jpg"]
+    assert [p["url"] for p in body[str(gallery[1].id)]] == ["/1-3.jpg"]
+
+
+@pytest.mark.requires_postgres
+def test_batch_only_lists_your_own_parents(client, db_session, gallery):
+    other = User(email=f"other-{uuid.uuid4().hex[:8]}@test.local", username=f"other_{uuid.uuid4().hex[:8]}")
+    db_session.add(other)
+    db_session.commit()
+    token = create_access_token(data={"sub": str(other.id)})
+
+    response = client.get(
+        "/api/v1/photos/batch",
+        params={"kind": "invert", "ids": [str(i.id) for i in gallery]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.json() == {}
+
+
+@pytest.mark.requires_postgres
+def test_batch_caps_the_id_list(client, auth_headers):
+    response = client.get(
+        "/api/v1/photos/batch",
+        params={"kind": "invert", "ids": [str(uuid.uuid4()) for _ in range(501)]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,166 @@
+"""Public profile render cache (services/public_profiles.py).
+
+QR codes and shared links resolve to `/t/{id}`, `/a/{id}` and
+`/tarantulas/public/{username}/{slug}`. What these pin:
+
+  - an anonymous repeat is served from the cache with the same ETag, and
+    If-None-Match gets a bodiless 304
+  - a feeding logged for the animal shows up on the next scan, including
+    a Feeding Day batch and a weigh-in on a herp
+  - the owner's view is never cached and keeps its private fields
+  - a keeper going private is enforced on the next anonymous scan
+  - the keeper-link route shares the cache and its invalidation
+"""
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.requires_postgres
+
+
+def _tarantula(db, user, **fields):
+    from app.models.tarantula import Tarantula
+
+    user.collection_visibility = "public"
+    tarantula = Tarantula(
+        id=uuid.uuid4(), user_id=user.id, name="Rampart", visibility="public", **fields
+    )
+    db.add(tarantula)
+    db.commit()
+    return tarantula
+
+
+def _feed(client, auth_headers, tarantula):
+    response = client.post(
+        f"/api/v1/tarantulas/{tarantula.id}/feedings",
+        json={"fed_at": "2026-10-01T12:00:00Z", "food_type": "cricket", "accepted": True},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+
+
+# ── Anonymous view ───────────────────────────────────────────────────────────
+
+def test_anonymous_repeats_are_served_from_the_cache(client, db_session, test_user):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    url = f"/api/v1/t/{tarantula.id}"
+
+    first = client.get(url)
+    assert first.status_code == 200, first.text
+    assert first.headers["x-cache"] == "MISS"
+    assert first.headers["cache-control"] == "public, max-age=60"
+    assert first.headers["vary"] == "Authorization"
+    assert first.json()["name"] == "Rampart"
+    assert not first.json()["is_owner"]
+
+    again = client.get(url)
+    assert again.headers["x-cache"] == "HIT"
+    assert again.headers["etag"] == first.headers["etag"]
+    assert again.content == first.content
+
+    revalidated = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_a_feeding_shows_up_on_the_next_scan(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    url = f"/api/v1/t/{tarantula.id}"
+
+    before = client.get(url)
+    assert before.json()["last_feeding"] is None
+
+    _feed(client, auth_headers, tarantula)
+
+    after = client.get(url)
+    assert after.headers["x-cache"] == "MISS"
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["last_feeding"]["food_type"] == "cricket"
+    stale = client.get(url, headers={"If-None-Match": before.headers["etag"]})
+    assert stale.status_code == 200
+
+
+def test_feeding_day_and_weigh_ins_show_up_on_the_next_scan(client, db_session, test_user, auth_headers):
+    from app.models.animal import Animal
+
+    user, _ = test_user
+    user.collection_visibility = "public"
+    animal = Animal(id=uuid.uuid4(), user_id=user.id, taxon="snake", name="Noodle")
+    db_session.add(animal)
+    db_session.commit()
+    url = f"/api/v1/a/{animal.id}"
+    assert client.get(url).json()["last_feeding"] is None
+    assert client.get(url).headers["x-cache"] == "HIT"
+
+    response = client.post(
+        "/api/v1/animals/bulk-feedings",
+        json={"animal_ids": [str(animal.id)], "food_type": "mouse"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    after = client.get(url)
+    assert after.headers["x-cache"] == "MISS"
+    assert after.json()["last_feeding"]["food_type"] == "mouse"
+
+    response = client.post(
+        f"/api/v1/animals/{animal.id}/weight-logs",
+        json={"weighed_at": "2026-10-01T12:00:00Z", "weight_g": "412.5"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    after = client.get(url)
+    assert after.headers["x-cache"] == "MISS"
+    assert after.json()["current_weight_g"] == 412.5
+
+
+# ── Other viewers ────────────────────────────────────────────────────────────
+
+def test_the_owner_view_is_not_cached(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user, notes="behind the desk")
+    url = f"/api/v1/t/{tarantula.id}"
+    client.get(url)  # warm the anonymous entry
+
+    owner = client.get(url, headers=auth_headers)
+    assert owner.status_code == 200
+    assert "x-cache" not in owner.headers
+    assert owner.json()["is_owner"] is True
+    assert owner.json()["notes"] == "behind the desk"
+    assert "notes" not in client.get(url).json()
+
+
+def test_going_private_is_enforced_on_the_next_scan(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    url = f"/api/v1/t/{tarantula.id}"
+    assert client.get(url).status_code == 200
+
+    response = client.patch(
+        "/api/v1/auth/me/visibility",
+        json={"collection_visibility": "private"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert client.get(url).status_code == 403
+
+
+def test_keeper_link_shares_the_cache(client, db_session, test_user, auth_headers):
+    user, _ = test_user
+    tarantula = _tarantula(db_session, user)
+    url = f"/api/v1/tarantulas/public/{user.username}/rampart"
+
+    first = client.get(url)
+    assert first.status_code == 200, first.text
+    assert client.get(url).headers["x-cache"] == "HIT"
+    assert first.json()["feeding_summary"]["total_feedings"] == 0
+
+    _feed(client, auth_headers, tarantula)
+
+    after = client.get(url)
+    assert after.headers["x-cache"] == "MISS"
+    assert after.json()["feeding_summary"]["total_feedings"] == 1
+    assert client.get(f"/api/v1/tarantulas/public/{user.username}/nobody").status_code == 404
@@ -0,0 +1,206 @@
+"""Query plans for the hot endpoints (idx_20261019_hot_path_indexes).
+
+Seeds a hundred keepers' worth of rows and ANALYZEs them. Each test
+calls a real endpoint, records the SQL it ran, and checks the plan with
+`EXPLAIN (FORMAT JSON)`. What these pin:
+
+  - every statement the endpoint runs against the hot table uses an index,
+    never a sequential scan
+  - the intended index is among the ones used
+
+A migration that drops or reshapes one of these indexes fails here instead
+of in production.
+"""
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+pytestmark = pytest.mark.requires_postgres
+
+KEEPERS = 100
+INVERTS_PER_KEEPER = 40
+FEEDINGS_PER_INVERT = 10
+ACTIVITY_PER_KEEPER = 100
+MESSAGES_PER_CONVERSATION = 50
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def _seed(db, user):
+    """Other keepers with full collections, then the same volume for `user`."""
+    # Each run's rows are rolled back but stay behind in the indexes as dead
+    # entries, and a reused test database's indexes bloat until the planner
+    # prices them out. Rebuilding inside the test's transaction gives it
+    # compact ones, and the rebuild itself is rolled back with everything else.
+    for table in ("inverts", "feeding_logs", "activity_feed", "conversations", "direct_messages"):
+        db.execute(text(f"REINDEX TABLE {table}"))
+    db.execute(text("""
+        INSERT INTO users (id, email, username, is_admin)
+        SELECT gen_random_uuid(), 'plan-' || n || '-' || :tag || '@test.local',
+               'plan_' || n || '_' || :tag, false
+        FROM generate_series(1, :keepers) AS n
+    """), {"keepers": KEEPERS, "tag": uuid.uuid4().hex[:8]})
+    keepers = "SELECT id FROM users WHERE email LIKE 'plan-%' OR id = :me"
+    params = {"me": user.id}
+
+    db.execute(text(f"""
+        INSERT INTO inverts (id, user_id, taxon, name, is_public, created_at, died_at,
+                             transferred_out_at)
+        SELECT gen_random_uuid(), k.id, 'tarantula', 'T' || n, false,
+               now() - n * interval '1 day',
+               CASE WHEN n % 10 = 0 THEN current_date END,
+               CASE WHEN n % 10 = 1 THEN now() END
+        FROM ({keepers}) AS k, generate_series(1, {INVERTS_PER_KEEPER}) AS n
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO feeding_logs (id, invert_id, fed_at, accepted)
+        SELECT gen_random_uuid(), i.id, now() - n * interval '5 days', n % 4 <> 0
+        FROM inverts i, generate_series(1, {FEEDINGS_PER_INVERT}) AS n
+        WHERE i.user_id IN ({keepers})
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO activity_feed (user_id, action_type, created_at)
+        SELECT k.id, 'feeding', now() - n * interval '1 hour'
+        FROM ({keepers}) AS k, generate_series(1, {ACTIVITY_PER_KEEPER}) AS n
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO conversations (id, participant1_id, participant2_id)
+        SELECT gen_random_uuid(), :me, k.id FROM ({keepers}) AS k WHERE k.id <> :me
+    """), params)
+    db.execute(text("""
+        INSERT INTO conversations (id, participant1_id, participant2_id)
+        SELECT gen_random_uuid(), a.id, b.id
+        FROM users a JOIN users b ON a.email < b.email
+        WHERE a.email LIKE 'plan-1%' AND b.email LIKE 'plan-2%'
+    """))
+    db.execute(text(f"""
+        INSERT INTO direct_messages (id, conversation_id, sender_id, content, is_read, created_at)
+        SELECT gen_random_uuid(), c.id,
+               CASE WHEN n % 2 = 0 THEN c.participant1_id ELSE c.participant2_id END,
+               'hi', n < {MESSAGES_PER_CONVERSATION - 3}, now() - n * interval '1 minute'
+        FROM conversations c, generate_series(1, {MESSAGES_PER_CONVERSATION}) AS n
+    """))
+    db.commit()
+    for table in ("inverts", "feeding_logs", "activity_feed", "conversations", "direct_messages"):
+        db.execute(text(f"ANALYZE {table}"))
+
+
+@contextmanager
+def _statements(db, table):
+    """The SELECT/UPDATE statements run against `table`, with parameters."""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        head = statement.lstrip().upper()
+        if head.startswith(("SELECT", "UPDATE")) and f" {table}" in statement:
+            seen.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+
+def _scans(plan, table):
+    """(node type, index name) for every node that reads `table`."""
+    found = []
+    if plan.get("Relation Name") == table or (
+        plan.get("Node Type") == "Bitmap Index Scan" and plan.get("Index Name", "").startswith(table)
+    ) or plan.get("Index Name", "").startswith(f"ix_{table}"):
+        found.append((plan["Node Type"], plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        found.extend(_scans(child, table))
+    return found
+
+
+def _assert_index_plans(db, statements, table, index):
+    assert statements, f"the endpoint ran nothing against {table}"
+    used = set()
+    for statement, parameters in statements:
+        [[explained]] = db.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        ).fetchall()
+        scans = _scans(explained[0]["Plan"], table)
+        assert scans, f"no scan of {table} in plan for:\n{statement}"
+        seq = [s for s in scans if s[0] == "Seq Scan"]
+        assert not seq, f"sequential scan of {table}:\n{statement}\n{explained}"
+        used.update(name for node, name in scans if node in INDEX_SCANS)
+    assert index in used, f"{index} not used; used {sorted(used)}"
+
+
+@pytest.fixture()
+def seeded(db_session, test_user):
+    user, _ = test_user
+    _seed(db_session, user)
+    return user
+
+
+# ── inverts / feeding_logs ───────────────────────────────────────────────────
+
+def test_active_collection_uses_the_partial_index(client, db_session, seeded, auth_headers):
+    with _statements(db_session, "inverts") as statements:
+        response = client.get("/api/v1/inverts/", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == INVERTS_PER_KEEPER - 8  # 10% died, 10% transferred
+    _assert_index_plans(db_session, statements, "inverts", "ix_inverts_user_id_active")
+
+
+def test_feeding_status_uses_the_accepted_index(client, db_session, seeded, auth_headers):
+    with _statements(db_session, "feeding_logs") as statements:
+        response = client.get("/api/v1/inverts/feeding-status", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    _assert_index_plans(
+        db_session, statements, "feeding_logs", "ix_feeding_logs_invert_id_accepted_fed_at"
+    )
+
+
+def test_feeding_history_uses_the_composite_index(client, db_session, seeded, auth_headers):
+    invert_id = db_session.execute(
+        text("SELECT id FROM inverts WHERE user_id = :me LIMIT 1"), {"me": seeded.id}
+    ).scalar()
+    with _statements(db_session, "feeding_logs") as statements:
+        response = client.get(f"/api/v1/inverts/{invert_id}/feedings", headers=auth_headers)
+    assert len(response.json()) == FEEDINGS_PER_INVERT
+    _assert_index_plans(db_session, statements, "feeding_logs", "ix_feeding_logs_invert_id_fed_at")
+
+
+# ── activity_feed ────────────────────────────────────────────────────────────
+
+def test_keeper_activity_uses_the_composite_index(client, db_session, seeded):
+    with _statements(db_session, "activity_feed") as statements:
+        response = client.get(f"/api/v1/activity/user/{seeded.username}")
+    assert response.json()["total"] == ACTIVITY_PER_KEEPER
+    _assert_index_plans(
+        db_session, statements, "activity_feed", "ix_activity_feed_user_created"
+    )
+
+
+# ── direct_messages ──────────────────────────────────────────────────────────
+
+def test_conversation_list_uses_the_message_indexes(client, db_session, seeded, auth_headers):
+    with _statements(db_session, "direct_messages") as statements:
+        response = client.get("/api/v1/messages/direct/conversations", headers=auth_headers)
+    assert response.status_code == 200
+    _assert_index_plans(
+        db_session, statements, "direct_messages", "ix_direct_messages_conversation_created_at"
+    )
+    _assert_index_plans(db_session, statements, "direct_messages", "ix_direct_messages_unread")
+
+
+def test_opening_a_thread_uses_the_message_indexes(client, db_session, seeded, auth_headers):
+    other = db_session.execute(
+        text("SELECT username FROM users WHERE email LIKE 'plan-1-%'")
+    ).scalar()
+    with _statements(db_session, "direct_messages") as statements:
+        response = client.get(f"/api/v1/messages/direct/conversation/{other}", headers=auth_headers)
+    assert len(response.json()["messages"]) == MESSAGES_PER_CONVERSATION
+    _assert_index_plans(
+        db_session, statements, "direct_messages", "ix_direct_messages_conversation_created_at"
+    )
+    _assert_index_plans(db_session, statements, "direct_messages", "ix_direct_messages_unread")
@@ -0,0 +1,102 @@
+"""Per-request SQL instrumentation (utils/query_stats.py).
+
+What these pin:
+
+  - statements issued by a sync route, on the threadpool, are charged to
+    its request and reported in Server-Timing
+  - production responses carry no Server-Timing header
+  - a request over either threshold is logged once as slow_request, with
+    the slowest statement's SQL and no parameters
+  - assert_max_queries counts requests made through the TestClient and
+    fails with the statements listed
+  - the real app reports its statements (Postgres)
+"""
+from __future__ import annotations
+
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.utils import query_stats
+from app.utils.query_stats import QueryStatsMiddleware
+
+
+def _app(**options):
+    query_stats.install()
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, **options)
+
+    @app.get("/things")
+    def things(n: int = 3):
+        with engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"n": n}
+
+    return TestClient(app)
+
+
+def _timing(response) -> dict:
+    return {
+        match["name"]: float(match["dur"])
+        for match in re.finditer(r"(?P<name>[\w-]+);dur=(?P<dur>[\d.]+)", response.headers["server-timing"])
+    }
+
+
+# ── Middleware ───────────────────────────────────────────────────────────────
+
+def test_server_timing_reports_the_requests_statements():
+    client = _app(timing_header=True, slow_ms=10_000, slow_queries=100)
+
+    response = client.get("/things?n=4")
+    assert 'desc="4 queries"' in response.headers["server-timing"]
+    timing = _timing(response)
+    assert timing["app"] >= timing["db"] >= timing["db-slowest"] >= 0
+
+    assert 'desc="1 queries"' in client.get("/things?n=1").headers["server-timing"]
+
+
+def test_production_has_no_server_timing():
+    client = _app(timing_header=False, slow_ms=10_000, slow_queries=100)
+    assert "server-timing" not in client.get("/things").headers
+
+
+def test_slow_requests_are_logged_once(caplog):
+    client = _app(timing_header=True, slow_ms=10_000, slow_queries=2)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+        client.get("/things?n=2")
+        client.get("/things?n=3")
+    [record] = caplog.records
+    message = record.getMessage()
+    assert "slow_request method=GET path=/things status=200" in message
+    assert "queries=3" in message
+    assert "SELECT ?" in message
+
+
+# ── assert_max_queries ───────────────────────────────────────────────────────
+
+def test_assert_max_queries_counts_requests(assert_max_queries):
+    client = _app(timing_header=False, slow_ms=10_000, slow_queries=100)
+
+    with assert_max_queries(3) as stats:
+        client.get("/things?n=3")
+    assert len(stats.statements) == 3
+
+    with pytest.raises(AssertionError, match="4 statements, expected at most 3"):
+        with assert_max_queries(3):
+            client.get("/things?n=4")
+
+
+@pytest.mark.requires_postgres
+def test_the_app_reports_its_statements(client, auth_headers, assert_max_queries):
+    with assert_max_queries(3):
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert _timing(response)["db"] >= 0
+    assert 'queries"' in response.headers["server-timing"]
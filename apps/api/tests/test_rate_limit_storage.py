@@ -0,0 +1,180 @@
+"""Shared rate-limit storage and keys (utils/rate_limit.py, utils/rate_limit_storage.py).
+
+Limits used to be counted per worker process. What these pin:
+
+  - requests with a valid bearer token are keyed by user id; anything else
+    (no token, a forged one) falls back to the client address
+  - two "workers" on the same Redis-protocol server share one count, for
+    both the fixed-window and sliding-window-counter strategies
+  - on Postgres, a low limit is write-through and exact across workers
+  - on a high limit, hits are batched: no round trip until a worker's
+    unwritten hits pass its local share, and never more than that share of
+    over-admission
+  - a hit that needs no round trip doesn't wait behind one that does, and
+    hits in flight still count
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+
+import pytest
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app.utils.rate_limit import rate_limit_key
+from app.utils.rate_limit_storage import DatabaseStorage, RespStorage
+from tests.resp_standin import RespStandin
+
+
+def _request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("203.0.113.7", 50000),
+    })
+
+
+# ── Keys ─────────────────────────────────────────────────────────────────────
+
+def test_key_is_the_user_for_a_valid_token_else_the_address():
+    from app.utils.auth import create_access_token
+
+    user_id = str(uuid.uuid4())
+    token = create_access_token(data={"sub": user_id})
+
+    assert rate_limit_key(_request({"Authorization": f"Bearer {token}"})) == f"user:{user_id}"
+    assert rate_limit_key(_request({"Authorization": "Bearer not.a.jwt"})) == "203.0.113.7"
+    assert rate_limit_key(_request({})) == "203.0.113.7"
+
+
+# ── Redis protocol ───────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def resp_server():
+    with RespStandin() as server:
+        yield server
+
+
+def test_resp_workers_share_a_fixed_window(resp_server):
+    limit = parse("3/minute")
+    worker_a = FixedWindowRateLimiter(RespStorage(resp_server.uri))
+    worker_b = FixedWindowRateLimiter(RespStorage(resp_server.uri))
+
+    assert worker_a.hit(limit, "k") and worker_b.hit(limit, "k") and worker_a.hit(limit, "k")
+    assert not worker_b.hit(limit, "k")
+    assert not worker_a.hit(limit, "k")
+    reset_at, remaining = worker_b.get_window_stats(limit, "k")
+    assert remaining == 0 and reset_at > 0
+
+
+def test_resp_workers_share_a_sliding_window(resp_server):
+    limit = parse("4/minute")
+    worker_a = SlidingWindowCounterRateLimiter(RespStorage(resp_server.uri))
+    worker_b = SlidingWindowCounterRateLimiter(RespStorage(resp_server.uri))
+
+    assert [worker_a.hit(limit, "k") for _ in range(2)] == [True, True]
+    assert [worker_b.hit(limit, "k") for _ in range(3)] == [True, True, False]
+    assert RespStorage(resp_server.uri).check()
+
+
+# ── Postgres ─────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def pg_workers(engine):
+    """Two storages on the test database, standing in for two workers. The
+    counters table is UNLOGGED scratch space; rows are removed afterwards."""
+    prefix = f"LIMITER/test-{uuid.uuid4().hex[:8]}"
+    created = []
+
+    def _worker(**options):
+        storage = DatabaseStorage("database://", engine=engine, **options)
+        created.append(storage)
+        return storage
+
+    yield prefix, _worker
+
+    from sqlalchemy import delete
+
+    from app.models.rate_limit_counter import RateLimitCounter
+
+    with engine.begin() as conn:
+        conn.execute(delete(RateLimitCounter).where(RateLimitCounter.key.like(f"{prefix}%")))
+
+
+@pytest.mark.requires_postgres
+def test_low_limit_is_exact_across_workers(pg_workers):
+    prefix, worker = pg_workers
+    limit = parse("5/minute")  # 0.1 × 5 rounds to 0: write-through
+    a = FixedWindowRateLimiter(worker())
+    b = FixedWindowRateLimiter(worker())
+
+    hits = [a.hit(limit, prefix) for _ in range(3)] + [b.hit(limit, prefix) for _ in range(2)]
+    assert hits == [True] * 5
+    assert not a.hit(limit, prefix)
+    assert not b.hit(limit, prefix)
+
+
+@pytest.mark.requires_postgres
+def test_high_limit_batches_hits_and_bounds_over_admission(pg_workers):
+    prefix, worker = pg_workers
+    limit = parse("100/minute")  # local share 10
+    storage_a = worker(sync_interval=3600)
+    storage_b = worker(sync_interval=3600)
+    a = FixedWindowRateLimiter(storage_a)
+    b = FixedWindowRateLimiter(storage_b)
+
+    for _ in range(10):
+        assert a.hit(limit, prefix)
+    assert storage_a.syncs == 0  # all ten still local
+
+    assert a.hit(limit, prefix)  # the eleventh writes the batch
+    assert storage_a.syncs == 1
+
+    admitted = 11 + sum(b.hit(limit, prefix) for _ in range(120))
+    # b learns a's 11 on its first sync; each worker can hold at most 10
+    # unwritten hits the other hasn't seen.
+    assert 100 <= admitted <= 100 + 10 * 2
+    storage_a.flush()
+    assert storage_b.get(limit.key_for(prefix)) >= 100
+
+
+@pytest.mark.requires_postgres
+def test_sliding_window_across_workers(pg_workers):
+    prefix, worker = pg_workers
+    limit = parse("4/minute")
+    a = SlidingWindowCounterRateLimiter(worker())
+    b = SlidingWindowCounterRateLimiter(worker())
+
+    assert [a.hit(limit, prefix) for _ in range(2)] == [True, True]
+    assert [b.hit(limit, prefix) for _ in range(3)] == [True, True, False]
+
+
+def test_a_hit_does_not_wait_behind_a_round_trip(monkeypatch):
+    storage = DatabaseStorage("database://", sync_interval=3600)
+    limit = parse("100/minute")
+    key = limit.key_for("shared")
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_write(batch):
+        writing.set()
+        assert release.wait(5)
+        return [(k, taken, 4102444800.0) for k, (_, taken) in batch.items()]
+
+    monkeypatch.setattr(storage, "_write", slow_write)
+    storage.incr(key, 60)
+    flusher = threading.Thread(target=storage.flush)
+    flusher.start()
+    counts = []
+    try:
+        assert writing.wait(5)
+        # The first hit is in flight; this one neither blocks nor loses it.
+        hitter = threading.Thread(target=lambda: counts.append(storage.incr(key, 60)))
+        hitter.start()
+        hitter.join(2)
+        assert counts == [2]
+    finally:
+        release.set()
+        flusher.join()
+    assert storage.incr(key, 60) == 3
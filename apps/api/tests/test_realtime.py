@@ -0,0 +1,171 @@
+"""Realtime push channel (services/realtime.py, routers/realtime.py).
+
+What these pin:
+
+  - the hub delivers to every connection a user has open, from any thread,
+    and stops once they unsubscribe
+  - a connection that falls QUEUE_SIZE events behind is told to close
+    instead of buffering without limit
+  - oversized notifications are slimmed to fit a NOTIFY payload
+  - a NOTIFY from another connection reaches the hub (Postgres)
+  - the socket sends unread counts on connect, then a DM pushes a message
+    event and a notification to the recipient, and reading pushes the
+    negative delta (Postgres)
+  - an event published while the connect-time counts are read is still
+    pushed (Postgres)
+  - the token may come as the first frame; a bad one closes with 4401
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import uuid
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.services import realtime
+from app.services.realtime import DatabaseBroker, Hub, MAX_NOTIFY_BYTES, _notify_payload
+
+
+# ── Hub ──────────────────────────────────────────────────────────────────────
+
+def test_hub_delivers_to_each_connection_from_any_thread():
+    async def run():
+        hub = Hub()
+        first, second = hub.subscribe("u1"), hub.subscribe("u1")
+        other = hub.subscribe("u2")
+
+        thread = threading.Thread(target=hub.deliver, args=("u1", {"n": 1}))
+        thread.start()
+        thread.join()
+        assert await asyncio.wait_for(first.get(), 1) == {"n": 1}
+        assert await asyncio.wait_for(second.get(), 1) == {"n": 1}
+        assert other.queue.empty()
+
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.deliver("u1", {"n": 2}) == 0
+        assert hub.connection_count() == 1
+
+    asyncio.run(run())
+
+
+def test_a_connection_that_falls_behind_is_closed():
+    async def run():
+        hub = Hub()
+        subscription = hub.subscribe("u1")
+        for n in range(realtime.QUEUE_SIZE + 1):
+            hub.deliver("u1", {"n": n})
+        await asyncio.sleep(0)
+        assert await subscription.get() is None
+
+    asyncio.run(run())
+
+
+def test_oversized_notifications_are_slimmed_for_notify():
+    notification_id = uuid.uuid4()
+    event = {"type": "notification", "notification": {"id": notification_id, "body": "x" * 10_000}}
+
+    payload = _notify_payload("u1", event)
+    assert len(payload.encode()) <= MAX_NOTIFY_BYTES
+    assert json.loads(payload)["e"]["notification"] == {"id": str(notification_id)}
+
+
+@pytest.mark.requires_postgres
+def test_notify_from_another_connection_reaches_the_hub(engine):
+    async def run():
+        hub = Hub()
+        broker = DatabaseBroker(hub, engine=engine, poll_timeout=0.1)
+        subscription = hub.subscribe("u1")
+        broker.start()
+        try:
+            assert await asyncio.to_thread(broker.listening.wait, 5)
+            await asyncio.to_thread(broker.publish, "u1", {"type": "ping"})
+            assert await asyncio.wait_for(subscription.get(), 5) == {"type": "ping"}
+        finally:
+            broker.stop()
+
+    asyncio.run(run())
+
+
+# ── Socket ───────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def sender(db_session):
+    from app.models.user import User
+    from app.utils.auth import create_access_token
+
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"rt-{uuid.uuid4().hex[:8]}@test.local",
+        username=f"rt_{uuid.uuid4().hex[:8]}",
+        hashed_password="x",
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user, {"Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"}
+
+
+@pytest.mark.requires_postgres
+def test_direct_messages_and_reads_are_pushed(client, test_user, auth_headers, sender):
+    user, _ = test_user
+    other, other_headers = sender
+
+    with client.websocket_connect("/api/v1/realtime/ws", headers=auth_headers) as ws:
+        assert ws.receive_json() == {"type": "unread", "unread": {"notifications": 0, "messages": 0}}
+
+        response = client.post(
+            "/api/v1/messages/direct/send",
+            json={"recipient_username": user.username, "content": "hello"},
+            headers=other_headers,
+        )
+        assert response.status_code == 200
+        message = ws.receive_json()
+        assert message["type"] == "message"
+        assert message["sender_username"] == other.username
+        assert message["unread_delta"] == {"messages": 1}
+        notification = ws.receive_json()
+        assert notification["type"] == "notification"
+        assert notification["notification"]["type"] == "direct_message"
+        assert notification["unread_delta"] == {"notifications": 1}
+
+        client.get(f"/api/v1/messages/direct/conversation/{other.username}", headers=auth_headers)
+        assert ws.receive_json()["unread_delta"] == {"messages": -1}
+        client.post("/api/v1/notifications/read-all", headers=auth_headers)
+        assert ws.receive_json() == {
+            "type": "notifications_read", "unread_delta": {"notifications": -1},
+        }
+
+
+@pytest.mark.requires_postgres
+def test_an_event_during_the_initial_count_is_not_lost(client, test_user, auth_headers, monkeypatch):
+    from app.routers import realtime as realtime_router
+
+    user, _ = test_user
+    count = realtime_router._unread_counts
+
+    def count_then_publish(db, user_id):
+        counts = count(db, user_id)
+        realtime.publish(user.id, realtime.read_event("messages", 1))
+        return counts
+
+    monkeypatch.setattr(realtime_router, "_unread_counts", count_then_publish)
+    with client.websocket_connect("/api/v1/realtime/ws", headers=auth_headers) as ws:
+        assert ws.receive_json()["type"] == "unread"
+        assert ws.receive_json() == {"type": "messages_read", "unread_delta": {"messages": -1}}
+
+
+@pytest.mark.requires_postgres
+def test_the_token_can_come_as_the_first_frame(client, auth_headers):
+    with client.websocket_connect("/api/v1/realtime/ws") as ws:
+        ws.send_json({"type": "auth", "token": auth_headers["Authorization"][7:]})
+        assert ws.receive_json()["type"] == "unread"
+
+    with client.websocket_connect("/api/v1/realtime/ws") as ws:
+        ws.send_json({"type": "auth", "token": "not-a-token"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 4401
@@ -0,0 +1,201 @@
+"""Catalog response cache (utils/response_cache.py).
+
+Public catalog GETs are answered from a cache keyed on path + query. What
+these pin:
+
+  - a repeat request doesn't run the route; query order doesn't matter
+  - every cached response carries a content-hash ETag and a matching
+    If-None-Match gets a bodiless 304, hit or miss
+  - invalidate() drops a group's entries, including a body that was being
+    computed when the write landed
+  - errors and unlisted paths pass straight through
+  - on the resp:// backend two workers share entries and invalidations,
+    and a dead server degrades to uncached rather than failing
+  - an admin edit shows up on the next request (Postgres)
+"""
+from __future__ import annotations
+
+import socket
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.utils.response_cache import (
+    MemoryBackend,
+    RespBackend,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    _route,
+)
+from tests.resp_standin import RespStandin
+
+ROUTES = (_route("things", "/things", 60), _route("things", "/things/{id}", 60))
+THING_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _worker(backend):
+    """An app with one counted catalog route, standing in for a worker."""
+    cache = ResponseCache(backend, ROUTES)
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    app.state.calls = 0
+    app.state.name = "first"
+
+    @app.get("/things")
+    def things(page: int = 1, size: int = 10):
+        app.state.calls += 1
+        return {"name": app.state.name, "page": page, "size": size}
+
+    @app.get("/things/{thing_id}")
+    def thing(thing_id: str):
+        app.state.calls += 1
+        raise HTTPException(status_code=404, detail="Not found")
+
+    @app.get("/other")
+    def other():
+        app.state.calls += 1
+        return {}
+
+    return app, cache, TestClient(app)
+
+
+# ── In-process ───────────────────────────────────────────────────────────────
+
+def test_repeat_requests_are_served_from_the_cache():
+    app, cache, client = _worker(MemoryBackend(1 << 20))
+
+    first = client.get("/things?page=2&size=5")
+    again = client.get("/things?size=5&page=2")
+    assert first.json() == again.json() == {"name": "first", "page": 2, "size": 5}
+    assert (first.headers["x-cache"], again.headers["x-cache"]) == ("MISS", "HIT")
+    assert app.state.calls == 1
+    assert first.headers["etag"] == again.headers["etag"]
+    assert again.headers["cache-control"] == "public, no-cache"
+
+    client.get("/things?page=3&size=5")
+    assert app.state.calls == 2
+
+    stats = cache.stats()["groups"]["things"]
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 2, 0.3333)
+    assert stats["bytes_from_cache"] == len(again.content)
+
+
+def test_if_none_match_gets_a_304_on_hit_and_miss():
+    app, cache, client = _worker(MemoryBackend(1 << 20))
+
+    etag = client.get("/things").headers["etag"]
+    hit = client.get("/things", headers={"If-None-Match": etag})
+    assert hit.status_code == 304 and hit.content == b""
+    assert hit.headers["etag"] == etag
+
+    cache.invalidate("things")
+    miss = client.get("/things", headers={"If-None-Match": etag})
+    assert miss.status_code == 304 and miss.headers["x-cache"] == "MISS"
+    assert app.state.calls == 2
+
+    stats = cache.stats()["groups"]["things"]
+    assert stats["not_modified"] == 2
+    assert stats["bytes_not_sent"] > 0
+
+
+def test_invalidate_drops_entries_and_anything_in_flight():
+    app, cache, client = _worker(MemoryBackend(1 << 20))
+
+    etag = client.get("/things").headers["etag"]
+    app.state.name = "renamed"
+    assert client.get("/things").json()["name"] == "first"  # cached
+
+    cache.invalidate("things")
+    fresh = client.get("/things")
+    assert fresh.json()["name"] == "renamed"
+    assert fresh.headers["etag"] != etag
+
+    # A write that commits while a miss is being computed: the body is
+    # stored under the generation seen at lookup and never served.
+    backend = cache.backend
+    _, generation = backend.lookup("things", "/things?page=9")
+    backend.invalidate("things")
+    backend.store("things", "/things?page=9", generation, 'W/"stale"', b"{}", 60)
+    assert backend.lookup("things", "/things?page=9")[0] is None
+
+
+def test_errors_and_unlisted_paths_pass_through():
+    app, cache, client = _worker(MemoryBackend(1 << 20))
+
+    for _ in range(2):
+        response = client.get(f"/things/{THING_ID}")
+        assert response.status_code == 404 and "etag" not in response.headers
+        assert "x-cache" not in client.get("/other").headers
+    assert app.state.calls == 4
+
+
+def test_memory_backend_stays_within_its_byte_budget():
+    backend = MemoryBackend(100)
+    for i in range(5):
+        backend.store("g", f"k{i}", 0, "e", b"x" * 40, 60)
+    assert [backend.lookup("g", f"k{i}")[0] is not None for i in range(5)] == [
+        False, False, False, True, True
+    ]
+
+
+# ── Shared (Redis protocol) ──────────────────────────────────────────────────
+
+def test_resp_workers_share_entries_and_invalidations():
+    with RespStandin() as server:
+        app_a, cache_a, client_a = _worker(RespBackend(server.uri))
+        app_b, cache_b, client_b = _worker(RespBackend(server.uri))
+
+        etag = client_a.get("/things").headers["etag"]
+        shared = client_b.get("/things")
+        assert shared.headers["x-cache"] == "HIT" and shared.headers["etag"] == etag
+        assert (app_a.state.calls, app_b.state.calls) == (1, 0)
+
+        cache_b.invalidate("things")
+        app_a.state.name = "renamed"
+        assert client_a.get("/things").json()["name"] == "renamed"
+        assert client_b.get("/things").headers["x-cache"] == "HIT"
+
+
+def test_unreachable_shared_backend_serves_uncached():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # closed again before use
+
+    app, cache, client = _worker(RespBackend(f"resp://127.0.0.1:{port}"))
+    assert client.get("/things").status_code == 200
+    assert client.get("/things").status_code == 200
+    assert app.state.calls == 2
+    assert cache.stats()["groups"]["things"]["errors"] >= 2
+    cache.invalidate("things")  # logged, not raised
+
+
+# ── Catalog routes (Postgres) ────────────────────────────────────────────────
+
+@pytest.mark.requires_postgres
+def test_admin_announcement_edit_is_visible_on_the_next_request(
+    client, db_session, test_user, auth_headers
+):
+    user, _ = test_user
+    user.is_admin = True
+    db_session.commit()
+
+    created = client.post("/api/v1/announcements/", headers=auth_headers, json={
+        "title": "Spring sale", "message": "20% off premium", "priority": 10_000,
+    })
+    assert created.status_code == 201, created.text
+    announcement_id = created.json()["id"]
+
+    assert client.get("/api/v1/announcements/active").json()["title"] == "Spring sale"
+    again = client.get("/api/v1/announcements/active")
+    assert again.headers["x-cache"] == "HIT"
+
+    response = client.put(f"/api/v1/announcements/{announcement_id}", headers=auth_headers,
+                          json={"title": "Summer sale"})
+    assert response.status_code == 200, response.text
+    fresh = client.get("/api/v1/announcements/active")
+    assert fresh.headers["x-cache"] == "MISS"
+    assert fresh.json()["title"] == "Summer sale"
+
+    stats = client.get("/api/v1/admin/response-cache", headers=auth_headers).json()
+    assert stats["groups"]["announcements"]["hits"] == 1
@@ -0,0 +1,129 @@
+"""In-memory species catalog index (services/species_resolver.py).
+
+The fuzzy tier is the one that can do damage: a wrong match links an animal
+to another species' care sheet, which is worse than no link. So beyond the
+happy paths these pin the refusals — ambiguous ties, junk input, and a
+genus-only name that merely looks close to a real species.
+"""
+import uuid
+
+import pytest
+
+from app.services.species_resolver import (
+    CatalogEntry,
+    SpeciesIndex,
+    SpeciesResolver,
+    edit_distance,
+    normalize_name,
+)
+
+
+def _entry(name, common=(), taxon="tarantula", kept=0):
+    return CatalogEntry(
+        id=uuid.uuid4(),
+        scientific_name=name,
+        scientific_name_lower=name.lower(),
+        common_names=tuple(common),
+        taxon=taxon,
+        times_kept=kept,
+    )
+
+
+ROSEA = _entry("Grammostola rosea", ["Chilean rose hair"], kept=50)
+PULCHRA = _entry("Grammostola pulchra", ["Brazilian black"], kept=20)
+HAMORII = _entry("Brachypelma hamorii", ["Mexican redknee"], kept=40)
+IRMINIA = _entry("Psalmopoeus irminia", ["Venezuelan suntiger"])
+CHAC_A = _entry("Pamphobeteus antinous")
+CHAC_B = _entry("Pamphobeteus antinoud")  # one letter from A — forces a tie
+INDEX = SpeciesIndex([ROSEA, PULCHRA, HAMORII, IRMINIA, CHAC_A, CHAC_B])
+
+
+def test_exact_match_is_case_insensitive():
+    m = INDEX.resolve("GRAMMOSTOLA ROSEA")
+    assert m.entry is ROSEA and m.method == "exact"
+
+
+def test_trailing_authority_falls_back_to_genus_and_species():
+    m = INDEX.resolve("Brachypelma hamorii Tesmoingt, Cleton & Verdez, 1997")
+    assert m.entry is HAMORII and m.method == "prefix"
+
+
+def test_normalization_folds_accents_and_drops_qualifiers():
+    assert normalize_name("Psalmopœus cf. irminia") == "psalmopoeus irminia"
+    m = INDEX.resolve("Psalmopœus cf. irminia")
+    assert m.entry is IRMINIA and m.method == "normalized"
+
+
+def test_single_typo_is_matched_and_reported_as_a_guess():
+    m = INDEX.resolve("Grammastola rosea")
+    assert m.entry is ROSEA
+    assert m.method == "fuzzy" and m.distance == 1
+
+
+def test_ambiguous_fuzzy_match_resolves_to_nothing():
+    # "antinouz" is one edit from both Pamphobeteus entries.
+    assert INDEX.resolve("Pamphobeteus antinouz") is None
+
+
+def test_junk_and_genus_only_names_are_not_guessed():
+    assert INDEX.resolve("???") is None
+    assert INDEX.resolve("Grammostola sp") is None
+
+
+def test_edit_distance_gives_up_past_the_limit():
+    assert edit_distance("rosea", "rosae", 2) == 2
+    assert edit_distance("rosea", "completely different", 2) == 3
+
+
+def test_resolver_memoizes_a_repeated_column():
+    class CountingIndex(SpeciesIndex):
+        calls = 0
+
+        def resolve(self, name):
+            CountingIndex.calls += 1
+            return super().resolve(name)
+
+    resolver = SpeciesResolver(db=None, model=None, _index=CountingIndex([ROSEA]))
+    out = resolver.resolve_many(["Grammostola rosea", "grammostola ROSEA ", None, ""] * 500)
+
+    assert CountingIndex.calls == 1
+    assert out["grammostola rosea"].entry is ROSEA
+
+
+def test_search_ranks_scientific_prefix_then_word_prefix_then_substring():
+    results = INDEX.search("gram")
+    assert [e.scientific_name for e in results[:2]] == ["Grammostola rosea", "Grammostola pulchra"]
+
+    # "red" starts a word in a common name only.
+    assert INDEX.search("red")[0] is HAMORII
+    # Substring inside a word.
+    assert INDEX.search("ammo")[0] is ROSEA
+
+
+def test_search_falls_back_to_fuzzy_only_when_nothing_else_hits():
+    assert INDEX.search("Grammostola rossea") == [ROSEA]
+
+
+def test_search_respects_taxon_filter():
+    assert INDEX.search("gram", taxon="scorpion") == []
+
+
+@pytest.mark.requires_postgres
+def test_species_search_endpoint_serves_from_the_index(client, db_session):
+    from app.models.species import Species
+    from app.services import species_resolver
+
+    name = f"Testgenus {uuid.uuid4().hex[:8]}"
+    db_session.add(Species(
+        scientific_name=name,
+        scientific_name_lower=name.lower(),
+        common_names=["Test spider"],
+    ))
+    db_session.commit()
+    species_resolver.invalidate()
+    try:
+        response = client.get("/api/v1/species/search", params={"q": name[:14]})
+        assert response.status_code == 200, response.text
+        assert response.json()[0]["scientific_name"] == name
+    finally:
+        species_resolver.invalidate()
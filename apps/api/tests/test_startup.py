@@ -0,0 +1,88 @@
+"""Cold start (app/main.py, utils/startup.py).
+
+What these pin:
+
+  - importing the app doesn't import the heavy optional SDKs
+  - with DEFER_ROUTERS the app answers / before the routers are in, and
+    ends up with the same routes in the same order as an eager start
+  - if deferred registration fails, requests get a 500 instead of a 404
+    from a half-registered app
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.startup import ALWAYS_READY, LAZY_MODULES, DeferredRouters, RouterGate
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _run(script: str, **env) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, cwd=API_DIR, env={**os.environ, **env},
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+
+def _api_routes(app) -> list:
+    return [
+        (route.path, sorted(getattr(route, "methods", None) or []))
+        for route in app.routes
+        if route.path not in ALWAYS_READY and route.path != "/uploads"
+    ]
+
+
+def test_heavy_sdks_are_imported_on_first_use_only():
+    loaded = _run(
+        "import json, sys, app.main\n"
+        f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({LAZY_MODULES!r}))))"
+    )
+    assert json.loads(loaded) == []
+
+
+def test_deferred_routers_match_an_eager_start():
+    from app.main import app  # eager, as configured for tests
+
+    routes = _run(
+        "import json\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app import main\n"
+        "with TestClient(main.app) as client:\n"
+        "    assert client.get('/').status_code == 200\n"
+        "    assert main.deferred_routers.ready.wait(60)\n"
+        "    print(json.dumps([(r.path, sorted(getattr(r, 'methods', None) or []))\n"
+        "                      for r in main.app.routes\n"
+        "                      if r.path not in ('/', '/health', '/uploads')]))",
+        DEFER_ROUTERS="true",
+    )
+    assert [tuple(r) for r in json.loads(routes)] == [tuple(r) for r in _api_routes(app)]
+    assert set(app.state.startup.summary()["phases_ms"]) == {"framework", "routers"}
+
+
+def test_failed_registration_is_a_500_not_a_404():
+    def register():
+        raise ImportError("broken router")
+
+    deferred = DeferredRouters(register)
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(RouterGate, deferred=deferred)
+    deferred.start()
+    deferred.ready.wait(5)
+
+    client = TestClient(app, raise_server_exceptions=False)
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/v1/anything").status_code == 500
@@ -0,0 +1,208 @@
+"""Payment webhook inbox (models/webhook_event.py, services/webhook_inbox.py).
+
+The Stripe and Apple routes now verify, record and ack; a worker applies the
+event. What these pin:
+
+  - a correctly signed Stripe event is stored, acked, and applied after the
+    response; a redelivery of the same event id is a no-op
+  - events for one customer apply in provider order, whatever order they
+    arrived in
+  - a failing event retries with backoff, holds back its customer's later
+    events (and only that customer's), then dead-letters
+  - the metrics endpoint reports backlog, lag and dead letters
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import webhook_inbox
+
+pytestmark = pytest.mark.requires_postgres
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+WEBHOOK_SECRET = "whsec_test_inbox"
+
+
+def _stripe_signature(body: bytes, secret: str = WEBHOOK_SECRET) -> str:
+    ts = int(time.time())
+    mac = hmac.new(secret.encode(), f"{ts}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={mac}"
+
+
+def _pending(db_session, provider="test"):
+    from app.models.webhook_event import WebhookEvent
+
+    return (
+        db_session.query(WebhookEvent)
+        .filter(WebhookEvent.provider == provider)
+        .order_by(WebhookEvent.occurred_at)
+        .all()
+    )
+
+
+@pytest.fixture()
+def recorder(monkeypatch):
+    """A "test" provider whose handler records what it applied, and fails
+    for any event whose payload says so."""
+    applied = []
+
+    def _handler(db, event):
+        if event.payload.get("fail"):
+            raise RuntimeError("upstream said no")
+        applied.append(event.event_id)
+
+    monkeypatch.setitem(webhook_inbox.HANDLERS, "test", _handler)
+    return applied
+
+
+def _record(db_session, event_id, key, minutes, **payload):
+    return webhook_inbox.record(
+        db_session, provider="test", event_id=event_id, event_type="t",
+        payload=payload, ordering_key=key, occurred_at=T0 + timedelta(minutes=minutes),
+    )
+
+
+# ── Stripe end to end ────────────────────────────────────────────────────────
+
+def test_signed_stripe_event_is_recorded_acked_and_applied_once(
+    client, db_session, test_user, monkeypatch
+):
+    from app.config import settings
+    from app.models.subscription import SubscriptionPlan, UserSubscription
+
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    user, _ = test_user
+    plan_name = f"inbox-{uuid.uuid4().hex[:8]}"
+    db_session.add(SubscriptionPlan(name=plan_name, display_name="Inbox test"))
+    db_session.commit()
+
+    customer = f"cus_{uuid.uuid4().hex[:10]}"
+    body = json.dumps({
+        "id": f"evt_{uuid.uuid4().hex[:12]}",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "created": int(T0.timestamp()),
+        "data": {"object": {
+            "object": "checkout.session",
+            "customer": customer,
+            "metadata": {"user_id": str(user.id), "price_type": "monthly", "plan": plan_name},
+        }},
+    }).encode()
+
+    for _ in range(2):  # Stripe redelivers
+        response = client.post(
+            "/api/v1/subscriptions/webhook",
+            content=body,
+            headers={"stripe-signature": _stripe_signature(body)},
+        )
+        assert response.status_code == 200, response.text
+
+    (event,) = _pending(db_session, "stripe")
+    assert event.status == "done" and event.ordering_key == customer
+    subs = db_session.query(UserSubscription).filter(
+        UserSubscription.user_id == user.id, UserSubscription.payment_provider_id == customer,
+    ).all()
+    assert len(subs) == 1 and subs[0].status == "active"
+
+
+def test_bad_stripe_signature_is_rejected_and_not_stored(client, db_session, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    body = json.dumps({"id": "evt_forged", "type": "checkout.session.completed"}).encode()
+    response = client.post(
+        "/api/v1/subscriptions/webhook",
+        content=body,
+        headers={"stripe-signature": _stripe_signature(body, secret="whsec_wrong")},
+    )
+    assert response.status_code == 400
+    assert _pending(db_session, "stripe") == []
+
+
+# ── Ordering, retries, dead letters ──────────────────────────────────────────
+
+def test_events_apply_in_provider_order_per_customer(db_session, recorder):
+    # Delivered out of order: the cancellation arrives before the renewal
+    # that preceded it.
+    _record(db_session, "cancel", "cus_a", minutes=5)
+    _record(db_session, "renew", "cus_a", minutes=1)
+    assert _record(db_session, "renew", "cus_a", minutes=1) is False  # redelivery
+
+    counts = webhook_inbox.drain(db_session)
+    assert recorder == ["renew", "cancel"]
+    assert counts["done"] == 2
+
+
+def test_failing_event_retries_then_dead_letters_without_blocking_others(
+    db_session, recorder, monkeypatch
+):
+    from app.models.webhook_event import WebhookEvent
+
+    monkeypatch.setattr(webhook_inbox, "MAX_ATTEMPTS", 2)
+    _record(db_session, "a1", "cus_a", minutes=1, fail=True)
+    _record(db_session, "a2", "cus_a", minutes=2)
+    _record(db_session, "b1", "cus_b", minutes=3)
+
+    webhook_inbox.drain(db_session)
+    a1 = db_session.query(WebhookEvent).filter(WebhookEvent.event_id == "a1").one()
+    assert recorder == ["b1"]  # a2 waits behind a1; cus_b is unaffected
+    assert (a1.status, a1.attempts) == ("pending", 1)
+    assert a1.next_attempt_at > datetime.now(timezone.utc)
+    assert "upstream said no" in a1.last_error
+
+    # Backoff elapses; the second failure exhausts the budget.
+    a1.next_attempt_at = T0
+    db_session.commit()
+    webhook_inbox.drain(db_session)
+    db_session.refresh(a1)
+    assert a1.status == "dead"
+    assert recorder == ["b1", "a2"]  # dead letters don't block
+
+    metrics = webhook_inbox.metrics(db_session)
+    assert metrics["dead"] >= 1
+    assert any(d["event_id"] == "a1" for d in metrics["dead_letters"])
+    assert metrics["processed_last_1h"] >= 2
+
+
+def test_admin_can_read_metrics_and_requeue_a_dead_letter(
+    client, db_session, test_user, auth_headers, recorder, monkeypatch
+):
+    from app.models.webhook_event import WebhookEvent
+
+    user, _ = test_user
+    user.is_admin = True
+    db_session.commit()
+
+    monkeypatch.setattr(webhook_inbox, "MAX_ATTEMPTS", 1)
+    _record(db_session, "x1", "cus_x", minutes=1, fail=True)
+    webhook_inbox.drain(db_session)
+    event = db_session.query(WebhookEvent).filter(WebhookEvent.event_id == "x1").one()
+    assert event.status == "dead"
+
+    response = client.get("/api/v1/subscriptions/admin/webhook-inbox", headers=auth_headers)
+    assert response.status_code == 200
+    assert "lag_seconds_p95_1h" in response.json()
+
+    response = client.post(
+        f"/api/v1/subscriptions/admin/webhook-inbox/{event.id}/requeue", headers=auth_headers,
+    )
+    assert response.status_code == 200
+    db_session.refresh(event)
+    assert (event.status, event.attempts) == ("pending", 0)
+
+
+def test_cron_drain_requires_the_secret(client, monkeypatch):
+    monkeypatch.setenv("CRON_SECRET", "s3cret")
+    assert client.post("/api/v1/subscriptions/webhook-inbox/drain").status_code == 403
+    response = client.post(
+        "/api/v1/subscriptions/webhook-inbox/drain", headers={"X-Cron-Secret": "s3cret"},
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"done", "retrying", "dead"}